@@ -5,6 +5,10 @@ from datetime import datetime, timedelta, date, time
 import math
 import random
 import logging
+from copy import deepcopy
+from collections import deque, OrderedDict
+from queue import Queue
+from threading import Lock
 from prettytable import PrettyTable
 from beem.instance import shared_blockchain_instance
 from .exceptions import AccountDoesNotExistsException, OfflineHasNoRPCException
@@ -18,9 +22,31 @@ from beem.rc import RC
 from beemgraphenebase.account import PrivateKey, PublicKey, PasswordKey
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_1_PERCENT, STEEM_100_PERCENT, STEEM_VOTING_MANA_REGENERATION_SECONDS
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
 log = logging.getLogger(__name__)
 
 
+def get_thread_instances(blockchain_instance, thread_num):
+    """ Returns a list of ``thread_num`` blockchain instances, the first one
+        is blockchain_instance and the remaining ones are connected
+        to the working nodes of it.
+    """
+    blockchain_instances = [blockchain_instance]
+    nodelist = blockchain_instance.rpc.nodes.export_working_nodes()
+    for i in range(thread_num - 1):
+        blockchain_instances.append(blockchain_instance.__class__(node=nodelist,
+                                                                  num_retries=blockchain_instance.rpc.num_retries,
+                                                                  num_retries_call=blockchain_instance.rpc.num_retries_call,
+                                                                  timeout=blockchain_instance.rpc.timeout))
+    return blockchain_instances
+
+
 def extract_account_name(account):
     if isinstance(account, str):
         return account
@@ -41,6 +67,9 @@ class Account(BlockchainObject):
         :param bool lazy: Use lazy loading
         :param bool full: Obtain all account data including orders, positions,
                etc.
+        :param bool use_cache: When True, an account of the same blockchain
+               instance which is already in the object cache (e.g. loaded by
+               ``Accounts``) is copied instead of fetched again (default is False)
         :param Hive hive_instance: Hive instance
         :param Steem steem_instance: Steem instance
         :returns: Account data
@@ -73,6 +102,16 @@ class Account(BlockchainObject):
     """
 
     type_id = 2
+    #: Node urls and whether their account_history api supports operation_filter_low/high.
+    #: Unknown nodes are probed by supports_operation_filter()
+    operation_filter_support = {"https://api.hive.blog": True}
+    #: Memoised op index -> (block, timestamp) of probed operations per chain and account,
+    #: at most ``history_probes_maxsize`` accounts with ``history_probes_account_maxsize``
+    #: operations each are kept. Can be cleared with ``Account.clear_history_probes()``
+    history_probes_maxsize = 1024
+    history_probes_account_maxsize = 64
+    _history_probes = OrderedDict()
+    _history_probes_lock = Lock()
 
     def __init__(
         self,
@@ -80,6 +119,7 @@ class Account(BlockchainObject):
         full=True,
         lazy=False,
         blockchain_instance=None,
+        use_cache=False,
         **kwargs
     ):
         """Initialize an account
@@ -90,6 +130,8 @@ class Account(BlockchainObject):
         :param bool lazy: Use lazy loading
         :param bool full: Obtain all account data including orders, positions,
                etc.
+        :param bool use_cache: Copy the account from the object cache when
+               it is already stored there
         """
         self.full = full
         self.lazy = lazy
@@ -99,6 +141,11 @@ class Account(BlockchainObject):
             elif kwargs.get("hive_instance"):
                 blockchain_instance = kwargs["hive_instance"]
         self.blockchain = blockchain_instance or shared_blockchain_instance()
+        if use_cache and isinstance(account, string_types) and not lazy:
+            # e.g. accounts which were loaded by Accounts
+            cached = BlockchainObject._cache.get(account, None)
+            if isinstance(cached, Account) and (cached.full or not full) and cached.blockchain == self.blockchain:
+                account = deepcopy(cached.json())
         if isinstance(account, dict):
             account = self._parse_json_data(account)
         super(Account, self).__init__(
@@ -1879,13 +1926,62 @@ class Account(BlockchainObject):
                                                               api="database")            
         return ret
 
+    @staticmethod
+    def clear_history_probes():
+        """ Clears the memoised operations which are used by
+            ``estimate_virtual_op_num()``
+        """
+        with Account._history_probes_lock:
+            Account._history_probes.clear()
+
+    def _get_history_probes(self):
+        """ Returns the memoised op index -> (block, timestamp) dict of this account"""
+        key = (self.blockchain.chain_params.get("chain_id"), self["name"])
+        with Account._history_probes_lock:
+            if key in Account._history_probes:
+                Account._history_probes.move_to_end(key)
+            else:
+                Account._history_probes[key] = OrderedDict()
+                while len(Account._history_probes) > Account.history_probes_maxsize:
+                    Account._history_probes.popitem(last=False)
+            return Account._history_probes[key]
+
+    @staticmethod
+    def _store_history_probe(probes, index, block, timestamp):
+        with Account._history_probes_lock:
+            probes[index] = (block, timestamp)
+            while len(probes) > Account.history_probes_account_maxsize:
+                probes.popitem(last=False)
+
+    def _probe_history(self, index):
+        """ Returns (index, block, timestamp) of the operation at index, or of the
+            latest operation when index is -1. None is returned when no operation was found.
+        """
+        probes = self._get_history_probes()
+        probe = probes.get(index) if index >= 0 else None
+        if probe is not None:
+            return (index, ) + probe
+        ops = self._get_account_history(start=index, limit=1)
+        if not ops:
+            return None
+        found = {}
+        for item_index, event in ops:
+            found[item_index] = (event["block"], formatTimeString(event["timestamp"]))
+            self._store_history_probe(probes, item_index, *found[item_index])
+        item_index = ops[0][0]
+        if index < 0:
+            item_index = ops[-1][0]
+        elif index in found:
+            item_index = index
+        return (item_index, ) + found[item_index]
+
     def _get_blocknum_from_hist(self, index, min_index=1):
         if index >= 0 and index < min_index:
             index = min_index
-        op = self._get_account_history(start=(index))
-        if len(op) == 0:
+        op = self._probe_history(index)
+        if op is None:
             return None
-        return op[0][1]['block']
+        return op[1]
 
     def _get_first_blocknum(self):
         min_index = 0
@@ -1897,14 +1993,18 @@ class Account(BlockchainObject):
         return created, min_index
 
     def estimate_virtual_op_num(self, blocktime, stop_diff=0, max_count=100, min_index=None):
-        """ Returns an estimation of an virtual operation index for a given time or blockindex
+        """ Returns the index of the first account operation which was created in or after
+            the given block or time. The index is found by galloping back from the latest
+            operation and a binary search, which needs O(log n) RPC calls. The probed
+            operations are memoised per account and shared by all Account objects.
 
             :param blocktime: start time or start block index from which account
                 operation should be fetched
             :type blocktime: int, datetime
-            :param int stop_diff: Sets the difference between last estimation and
-                new estimation at which the estimation stops. Must not be zero. (default is 1)
+            :param int stop_diff: Sets the difference between the upper and lower search
+                bound at which the search stops and the upper bound is returned. (default is 0)
             :param int max_count: sets the maximum number of iterations. -1 disables this (default 100)
+            :param int min_index: lowest operation index of the account (*optional*)
 
             .. testsetup::
 
@@ -1942,83 +2042,54 @@ class Account(BlockchainObject):
         if max_index < stop_diff:
             return 0
 
-        # calculate everything with block numbers
         if min_index is None:
             created, min_index = self._get_first_blocknum()
-        else:
-            created = self._get_blocknum_from_hist(0, min_index=min_index)
 
-        # convert blocktime to block number if given as a datetime/date/time
+        # times are compared with the operation timestamps, block numbers with the operation blocks
         if isinstance(blocktime, (datetime, date, time)):
-            b = Blockchain(blockchain_instance=self.blockchain)
-            target_blocknum = b.get_estimated_block_num(addTzInfo(blocktime), accurate=True)
+            target = addTzInfo(blocktime)
+            key = 2
         else:
-            target_blocknum = blocktime
+            target = blocktime
+            key = 1
 
+        first_op = self._probe_history(min_index)
         # the requested blocknum/timestamp is before the account creation date
-        if target_blocknum <= created:
+        if first_op is None or target <= first_op[key]:
             return 0
-
-        # get the block number from the account's latest operation
-        latest_blocknum = self._get_blocknum_from_hist(-1, min_index=min_index)
-
+        latest_op = self._probe_history(-1)
         # requested blocknum/timestamp is after the latest account operation
-        if target_blocknum >= latest_blocknum:
+        if target > latest_op[key]:
             return max_index
 
-        # all account ops in a single block
-        if latest_blocknum - created == 0:
-            return 0
-
-        # set initial search range
-        op_num = 0
-        op_lower = 0
-        block_lower = created
-        op_upper = max_index
-        block_upper = latest_blocknum
-        last_op_num = None
+        # op_lower is before the target and op_upper in or after the target
+        op_lower = first_op[0]
+        op_upper = latest_op[0]
+        step = 1
+        galloping = True
         cnt = 0
-
-        while True:
+        while op_upper - op_lower > 1 and op_upper - op_lower > stop_diff:
             # check if the maximum number of iterations was reached
             if max_count != -1 and cnt >= max_count:
-                # did not converge, return the current state
-                return op_num
-
-            # linear approximation between the known upper and
-            # lower bounds for the first iteration
-            if cnt < 1:
-                op_num = int((target_blocknum - block_lower) / (block_upper - block_lower) * (op_upper - op_lower) + op_lower)
+                break
+            if galloping and op_upper - step > op_lower:
+                # recent operations are requested most often, thus the search
+                # range is first narrowed down with growing steps from the top
+                op_num = op_upper - step
+                step *= 2
             else:
-                # divide and conquer for the following iterations
-                op_num = int((op_upper + op_lower) / 2)
-                if op_upper == op_lower + 1:  # round up if we're close to target
-                    op_num += 1
-
-            # get block number for current op number estimation
-            if op_num != last_op_num:
-                block_num = self._get_blocknum_from_hist(op_num, min_index=min_index)
-                while block_num is None and op_num < max_index:
-                    op_num += 1
-                    block_num = self._get_blocknum_from_hist(op_num, min_index=min_index)
-                last_op_num = op_num
-
-            # check if the required accuracy was reached
-            if op_upper - op_lower <= stop_diff or \
-               op_upper == op_lower + 1:
-                return op_num
-
-            # set new upper/lower boundaries for next iteration
-            if block_num < target_blocknum:
-                # current op number was too low -> search upwards
-                op_lower = op_num
-                block_lower = block_num
+                galloping = False
+                op_num = (op_upper + op_lower) // 2
+            op = self._probe_history(op_num)
+            if op is None or op[0] <= op_lower or op[0] >= op_upper:
+                break
+            if op[key] < target:
+                op_lower = op[0]
+                galloping = False
             else:
-                # current op number was too high or matched the target block
-                # -> search downwards
-                op_upper = op_num
-                block_upper = block_num
+                op_upper = op[0]
             cnt += 1
+        return op_upper
 
     def get_curation_reward(self, days=7):
         """Returns the curation reward of the last `days` days
@@ -2062,25 +2133,71 @@ class Account(BlockchainObject):
         if len(only_ops) > 0:
             for op in only_ops:
                 op_id = operations[op]
-                if op_id <= 64:
+                if op_id < 64:
                     operation_filter_low += 2**op_id
                 else:
-                    operation_filter_high += 2 ** (op_id - 64 - 1)
+                    operation_filter_high += 2 ** (op_id - 64)
         else:
             for op in operations:
                 op_id = operations[op]
-                if op_id <= 64:
+                if op_id < 64:
                     operation_filter_low += 2**op_id
                 else:
-                    operation_filter_high += 2 ** (op_id - 64 - 1)
+                    operation_filter_high += 2 ** (op_id - 64)
             for op in exclude_ops:
                 op_id = operations[op]
-                if op_id <= 64:
+                if op_id < 64:
                     operation_filter_low -= 2**op_id
                 else:
-                    operation_filter_high -= 2 ** (op_id - 64 - 1)
+                    operation_filter_high -= 2 ** (op_id - 64)
         return operation_filter_low, operation_filter_high
-        
+
+    def supports_operation_filter(self):
+        """ Returns True, when the connected node filters the account history
+            by operation_filter_low/high. The result is stored per node url in
+            ``Account.operation_filter_support``. When the node could not be
+            probed (e.g. a timeout), False is returned without storing it, so
+            that the node is probed again by the next call.
+        """
+        if not self.blockchain.is_connected():
+            return False
+        url = self.blockchain.rpc.url
+        if url in Account.operation_filter_support:
+            return Account.operation_filter_support[url]
+        support = self._probe_operation_filter()
+        if support is not None:
+            Account.operation_filter_support[url] = support
+        return bool(support)
+
+    def _probe_operation_filter(self):
+        """ Requests the latest operation with and without a filter that excludes its
+            type. A node that ignores the filter returns the same operation again.
+            Returns None when the account has no operations to probe with or
+            when a request failed.
+        """
+        try:
+            latest = self._get_account_history(start=-1, limit=1)
+        except Exception as e:
+            log.debug("Could not probe operation filter support: %s" % str(e))
+            return None
+        if not latest:
+            return None
+        op_type = self._get_history_op_type(latest[-1][1])
+        operation_filter_low, operation_filter_high = self._get_operation_filter(exclude_ops=[op_type])
+        try:
+            filtered = self._get_account_history(start=-1, limit=1, operation_filter_low=operation_filter_low,
+                                                 operation_filter_high=operation_filter_high)
+        except FilteredItemNotFound:
+            return True
+        except Exception as e:
+            log.debug("Could not probe operation filter support: %s" % str(e))
+            return None
+        if filtered is None:
+            return False
+        for item in filtered:
+            if self._get_history_op_type(item[1]) == op_type:
+                return False
+        return True
 
     def get_account_history(self, index, limit, order=-1, start=None, stop=None, use_block_num=True, only_ops=[], exclude_ops=[], raw_output=False):
         """ Returns a generator for individual account transactions. This call can be used in a
@@ -2117,7 +2234,7 @@ class Account(BlockchainObject):
         # self.blockchain.rpc.set_next_node_on_empty_reply(True)
         operation_filter_low = None
         operation_filter_high = None
-        if self.blockchain.rpc.url == 'https://api.hive.blog':
+        if (len(only_ops) > 0 or len(exclude_ops) > 0) and self.supports_operation_filter():
             operation_filter_low, operation_filter_high = self._get_operation_filter(only_ops=only_ops, exclude_ops=exclude_ops)
         try:
             txs = self._get_account_history(start=index, limit=limit, operation_filter_low=operation_filter_low, operation_filter_high=operation_filter_high)
@@ -2159,43 +2276,52 @@ class Account(BlockchainObject):
             elif stop is not None and not use_block_num and order == -1 and item_index < stop:
                 return
 
-            if isinstance(event['op'], list):
-                op_type, op = event['op']
-            else:
-                op_type = event['op']['type']
-                if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
-                    op_type = op_type[:-10]
-                op = event['op']['value']
-            block_props = remove_from_dict(event, keys=['op'], keep_keys=False)
-
-            def construct_op(account_name):
-                # verbatim output from steemd
-                if raw_output:
-                    return item
-
-                # index can change during reindexing in
-                # future hard-forks. Thus we cannot take it for granted.
-                immutable = op.copy()
-                immutable.update(block_props)
-                immutable.update({
-                    'account': account_name,
-                    'type': op_type,
-                })
-                _id = Blockchain.hash_op(immutable)
-                immutable.update({
-                    '_id': _id,
-                    'index': item_index,
-                })
-                return immutable
-
+            op_type = self._get_history_op_type(event)
             if exclude_ops and op_type in exclude_ops:
                 continue
             if not only_ops or op_type in only_ops:
-                yield construct_op(self["name"])
+                yield self._construct_history_op(item, raw_output=raw_output)
+
+    @staticmethod
+    def _get_history_op_type(event):
+        if isinstance(event['op'], list):
+            return event['op'][0]
+        op_type = event['op']['type']
+        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+            op_type = op_type[:-10]
+        return op_type
+
+    def _construct_history_op(self, item, raw_output=False):
+        # verbatim output from steemd
+        if raw_output:
+            return item
+        item_index, event = item
+        if isinstance(event['op'], list):
+            op_type, op = event['op']
+        else:
+            op_type = self._get_history_op_type(event)
+            op = event['op']['value']
+        block_props = remove_from_dict(event, keys=['op'], keep_keys=False)
+
+        # index can change during reindexing in
+        # future hard-forks. Thus we cannot take it for granted.
+        immutable = op.copy()
+        immutable.update(block_props)
+        immutable.update({
+            'account': self["name"],
+            'type': op_type,
+        })
+        _id = Blockchain.hash_op(immutable)
+        immutable.update({
+            '_id': _id,
+            'index': item_index,
+        })
+        return immutable
 
     def history(
         self, start=None, stop=None, use_block_num=True,
-        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False
+        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False,
+        threading=False, thread_num=8, history_store=None
     ):
         """ Returns a generator for individual account transactions. The
             earlist operation will be first. This call can be used in a
@@ -2214,6 +2340,16 @@ class Account(BlockchainObject):
             :param int batch_size: internal api call batch size (*optional*)
             :param bool raw_output: if False, the output is a dict, which
                 includes all values. Otherwise, the output is list.
+            :param bool threading: When True, the index range is split into pages of
+                ``batch_size`` operations which are fetched concurrently (default: False).
+                Server side operation filtering takes precedence: when only_ops or
+                exclude_ops is set and the node supports operation filtering, the
+                history is fetched sequentially.
+            :param int thread_num: Defines the number of threads and therefore the number
+                of pages which are fetched at the same time, when `threading` is set.
+            :param SqliteAccountHistoryStore history_store: When set, only operations
+                above the highest stored index are fetched and stored in history_store,
+                all operations are then read from history_store (*optional*)
 
             .. note::
                 only_ops and exclude_ops takes an array of strings:
@@ -2270,6 +2406,13 @@ class Account(BlockchainObject):
                 0
 
         """
+        if history_store is not None:
+            self.sync_history(history_store, batch_size=batch_size)
+            for item in self._get_stored_history(history_store, start=start, stop=stop, use_block_num=use_block_num,
+                                                 only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output,
+                                                 order=1):
+                yield item
+            return
         _limit = batch_size
         max_index = self.virtual_op_count()
         if not max_index:
@@ -2279,30 +2422,8 @@ class Account(BlockchainObject):
         if start is not None and not use_block_num and not isinstance(start, (datetime, date, time)):
             start_index = start
         elif start is not None and max_index > batch_size:
-            created, min_index = self._get_first_blocknum()
-            op_est = self.estimate_virtual_op_num(start, stop_diff=1, min_index=min_index)
-            if op_est < min_index:
-                op_est = min_index
-            est_diff = 0
-            if isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_date = formatTimeString(h["timestamp"])
-                while(op_est > est_diff + batch_size and block_date > start):
-                    est_diff += batch_size
-                    if op_est - est_diff < 0:
-                        est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_date = formatTimeString(h["timestamp"])
-            elif not isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_num = h["block"]
-                while(op_est > est_diff + batch_size and block_num > start):
-                    est_diff += batch_size
-                    if op_est - est_diff < 0:
-                        est_diff = op_est
-                    for h in self.get_account_history(op_est - est_diff, 0):
-                        block_num = h["block"]
-            start_index = op_est - est_diff
+            # first operation in or after start
+            start_index = self.estimate_virtual_op_num(start)
         else:
             start_index = 0
         
@@ -2314,84 +2435,252 @@ class Account(BlockchainObject):
         if first > max_index:
             _limit = max_index - start_index
             first = start_index + _limit - 1
+            if _limit == 0:
+                # only the latest operation is requested
+                _limit = 1
+                first = start_index
         elif first < _limit and self.blockchain.rpc.url == "https://api.hive.blog":
             first = _limit - 1
         elif first < _limit and self.blockchain.rpc.url != "https://api.hive.blog":
             first = _limit
-        last_round = False
-        
         if _limit < 0:
             return
         last_item_index = -1
-        
-        if self.blockchain.rpc.url == 'https://api.hive.blog' and (len(only_ops) > 0 or len(exclude_ops) > 0):
+
+        if (len(only_ops) > 0 or len(exclude_ops) > 0) and self.supports_operation_filter():
             operation_filter = True
         else:
             operation_filter = False
-            
+
+        if operation_filter:
+            if threading:
+                log.debug("threading is not used, the history is filtered by the node")
+            items = self._history_batches_filtered(start_index, max_index, stop=stop, use_block_num=use_block_num,
+                                                   only_ops=only_ops, exclude_ops=exclude_ops, batch_size=batch_size,
+                                                   raw_output=raw_output)
+        elif threading:
+            items = self._history_batches_threaded(start_index, max_index, stop=stop, use_block_num=use_block_num,
+                                                   only_ops=only_ops, exclude_ops=exclude_ops, batch_size=batch_size,
+                                                   raw_output=raw_output, thread_num=thread_num)
+        else:
+            items = self._history_batches(first, _limit, max_index, stop=stop, use_block_num=use_block_num,
+                                          only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output)
+        for item in items:
+            if raw_output:
+                item_index, event = item
+                op_type, op = event['op']
+                timestamp = event["timestamp"]
+                block_num = event["block"]
+            else:
+                item_index = item['index']
+                op_type = item['type']
+                timestamp = item["timestamp"]
+                block_num = item["block"]
+            if start is not None and isinstance(start, (datetime, date, time)):
+                timediff = start - formatTimeString(timestamp)
+                if timediff.total_seconds() > 0:
+                    continue
+            elif start is not None and use_block_num and block_num < start:
+                continue
+            elif start is not None and not use_block_num and item_index < start:
+                continue
+            elif last_item_index >= item_index:
+                continue
+            if stop is not None and isinstance(stop, (datetime, date, time)):
+                timediff = stop - formatTimeString(timestamp)
+                if timediff.total_seconds() < 0:
+                    return
+            elif stop is not None and use_block_num and block_num > stop:
+                return
+            elif stop is not None and not use_block_num and item_index > stop:
+                return
+            if operation_filter:
+                yield item
+            else:
+                if exclude_ops and op_type in exclude_ops:
+                    continue
+                if not only_ops or op_type in only_ops:
+                    yield item
+            last_item_index = item_index
+
+    def sync_history(self, history_store, batch_size=1000):
+        """ Fetches all operations above the highest index stored in
+            history_store and adds them to history_store.
+
+            :param SqliteAccountHistoryStore history_store: local account history cache
+            :param int batch_size: internal api call batch size (*optional*)
+            :returns: number of newly stored operations
+            :rtype: int
+        """
+        max_index = history_store.get_max_index(self["name"])
+        if max_index is None:
+            start = 0
+        else:
+            start = max_index + 1
+        new_items = []
+        count = 0
+        for item in self.history(start=start, use_block_num=False, batch_size=batch_size, raw_output=True):
+            new_items.append(item)
+            if len(new_items) >= batch_size:
+                history_store.add_history(self["name"], new_items)
+                count += len(new_items)
+                new_items = []
+        history_store.add_history(self["name"], new_items)
+        count += len(new_items)
+        return count
+
+    def _get_stored_history(self, history_store, start=None, stop=None, use_block_num=True, only_ops=[],
+                            exclude_ops=[], raw_output=False, order=1):
+        """ Reads operations from history_store, start and stop are handled as in
+            history() (order=1) and history_reverse() (order=-1)
+        """
+        start = addTzInfo(start)
+        stop = addTzInfo(stop)
+        if order == 1:
+            lower, upper = start, stop
+        else:
+            lower, upper = stop, start
+        limits = {}
+        for key, value in [("start", lower), ("stop", upper)]:
+            if value is None:
+                continue
+            elif isinstance(value, (datetime, date, time)):
+                limits[key + "_time"] = formatTimeString(value)
+            elif use_block_num:
+                limits[key + "_block"] = value
+            else:
+                limits[key + "_index"] = value
+        for item in history_store.get_history(self["name"], only_ops=only_ops, exclude_ops=exclude_ops,
+                                              order=order, **limits):
+            yield self._construct_history_op(item, raw_output=raw_output)
+
+    def _history_batches(self, first, _limit, max_index, stop=None, use_block_num=True, only_ops=[],
+                         exclude_ops=[], raw_output=False):
+        """ Pages forward through the account history, one RPC call at a time"""
+        last_round = False
         while True:
             # RPC call
             if first < _limit - 1 and self.blockchain.rpc.url == "https://api.hive.blog":
                 first = _limit - 1
             elif first < _limit and self.blockchain.rpc.url != "https://api.hive.blog":
                 first = _limit
-            batch_count = 0
             for item in self.get_account_history(first, _limit, start=None, stop=None, order=1, only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output):
-                batch_count += 1
-                if raw_output:
-                    item_index, event = item
-                    op_type, op = event['op']
-                    timestamp = event["timestamp"]
-                    block_num = event["block"]
-                else:
-                    item_index = item['index']
-                    op_type = item['type']
-                    timestamp = item["timestamp"]
-                    block_num = item["block"]
-                if start is not None and isinstance(start, (datetime, date, time)):
-                    timediff = start - formatTimeString(timestamp)
-                    if timediff.total_seconds() > 0:
-                        continue
-                elif start is not None and use_block_num and block_num < start:
-                    continue
-                elif start is not None and not use_block_num and item_index < start:
-                    continue
-                elif last_item_index >= item_index:
-                    continue
-                if stop is not None and isinstance(stop, (datetime, date, time)):
-                    timediff = stop - formatTimeString(timestamp)
-                    if timediff.total_seconds() < 0:
-                        first = max_index + _limit
-                        return
-                elif stop is not None and use_block_num and block_num > stop:
-                    return
-                elif stop is not None and not use_block_num and item_index > stop:
-                    return
-                if operation_filter:
-                    yield item
-                else:
-                    if exclude_ops and op_type in exclude_ops:
-                        continue
-                    if not only_ops or op_type in only_ops:
-                        yield item                
-                last_item_index = item_index
+                yield item
             if first < max_index and first + _limit >= max_index and not last_round:
                 _limit = max_index - first
                 first = max_index
                 last_round = True
             else:
-                if operation_filter and batch_count < _limit and first + 2000 < max_index and _limit == 1000:
-                    first += 2000
-                else:
-                    first += _limit
+                first += _limit
                 if stop is not None and not use_block_num and isinstance(stop, int) and first >= stop + _limit + 1:
                     break
                 elif first > max_index or last_round:
                     break
 
+    def _get_filtered_range(self, lower_index, upper_index, only_ops=[], exclude_ops=[], batch_size=1000):
+        """ Returns all operations with an index between lower_index and upper_index
+            which pass the server side operation filter. A filtered request returns
+            the latest ``batch_size`` matching operations up to its start index, so
+            requests are repeated below the oldest returned operation until a short
+            page or an operation below lower_index is returned.
+        """
+        items = []
+        first = upper_index
+        while first >= lower_index:
+            limit = min(batch_size, first + 1)
+            batch = list(self.get_account_history(first, limit, start=None, stop=None, order=1, only_ops=only_ops,
+                                                  exclude_ops=exclude_ops, raw_output=True))
+            items = [item for item in batch if lower_index <= item[0] <= upper_index] + items
+            if len(batch) < limit or batch[0][0] <= lower_index:
+                break
+            first = batch[0][0] - 1
+        return items
+
+    def _history_batches_filtered(self, start_index, max_index, stop=None, use_block_num=True, only_ops=[],
+                                  exclude_ops=[], batch_size=1000, raw_output=False):
+        """ Pages forward through the account history of a node which supports
+            operation filters. The index range of a page grows as long as pages
+            contain only a few matching operations.
+        """
+        if stop is not None and not use_block_num and isinstance(stop, integer_types) and stop < max_index:
+            max_index = stop
+        span = batch_size
+        lower_index = start_index
+        while lower_index <= max_index:
+            upper_index = min(lower_index + span - 1, max_index)
+            items = self._get_filtered_range(lower_index, upper_index, only_ops=only_ops,
+                                             exclude_ops=exclude_ops, batch_size=batch_size)
+            for item in items:
+                yield self._construct_history_op(item, raw_output=raw_output)
+            if len(items) < batch_size // 2:
+                span *= 2
+            else:
+                span = batch_size
+            lower_index = upper_index + 1
+
+    def _get_thread_instances(self, thread_num):
+        """ Returns a list of ``thread_num`` blockchain instances, the first one
+            is the instance of this object and the remaining ones are connected
+            to the working nodes of it.
+        """
+        return get_thread_instances(self.blockchain, thread_num)
+
+    def _history_batches_threaded(self, start_index, max_index, stop=None, use_block_num=True, only_ops=[],
+                                  exclude_ops=[], batch_size=1000, raw_output=False, thread_num=8):
+        """ Splits the index range [start_index, max_index] into pages of ``batch_size``
+            operations, fetches up to ``thread_num`` pages concurrently and yields
+            the operations ordered by their index.
+        """
+        if FUTURES_MODULE is None:
+            raise ImportError("concurrent.futures is needed for threading")
+        if stop is not None and not use_block_num and isinstance(stop, integer_types) and stop < max_index:
+            max_index = stop
+        offset = 1 if self.blockchain.rpc.url == "https://api.hive.blog" else 0
+        pages = []
+        for page_start in range(start_index, max_index + 1, batch_size):
+            first = min(page_start + batch_size - 1, max_index)
+            limit = min(batch_size, first + offset)
+            if limit < 1:
+                first = 1
+                limit = 1
+            pages.append((first, limit))
+        if len(pages) == 0:
+            return
+        if thread_num > len(pages):
+            thread_num = len(pages)
+        accounts = [self]
+        for blockchain_instance in self._get_thread_instances(thread_num)[1:]:
+            accounts.append(Account(dict(self), full=self.full, lazy=False, blockchain_instance=blockchain_instance))
+
+        def fetch_page(account, first, limit):
+            return list(account.get_account_history(first, limit, start=None, stop=None, order=1,
+                                                    only_ops=only_ops, exclude_ops=exclude_ops,
+                                                    raw_output=raw_output))
+
+        pool = ThreadPoolExecutor(max_workers=thread_num)
+        # Pages are submitted in a sliding window of thread_num pages. As the oldest
+        # page is always consumed first, the window also acts as reorder buffer and
+        # each page of a window runs on its own blockchain instance.
+        futures = deque()
+        try:
+            for page_num, (first, limit) in enumerate(pages):
+                futures.append(pool.submit(fetch_page, accounts[page_num % thread_num], first, limit))
+                if len(futures) < thread_num:
+                    continue
+                for item in futures.popleft().result():
+                    yield item
+            while len(futures) > 0:
+                for item in futures.popleft().result():
+                    yield item
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
     def history_reverse(
         self, start=None, stop=None, use_block_num=True,
-        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False
+        only_ops=[], exclude_ops=[], batch_size=1000, raw_output=False,
+        history_store=None
     ):
         """ Returns a generator for individual account transactions. The
             latest operation will be first. This call can be used in a
@@ -2412,6 +2701,9 @@ class Account(BlockchainObject):
             :param int batch_size: internal api call batch size (*optional*)
             :param bool raw_output: if False, the output is a dict, which
                 includes all values. Otherwise, the output is list.
+            :param SqliteAccountHistoryStore history_store: When set, only operations
+                above the highest stored index are fetched and stored in history_store,
+                all operations are then read from history_store (*optional*)
 
             .. note::
                 only_ops and exclude_ops takes an array of strings:
@@ -2468,6 +2760,20 @@ class Account(BlockchainObject):
                 0
 
         """
+        if history_store is not None:
+            self.sync_history(history_store, batch_size=batch_size)
+            max_index = history_store.get_max_index(self["name"])
+            if max_index is None:
+                return
+            if start is not None and isinstance(start, int) and start < 0 and not use_block_num:
+                start += max_index
+            if stop is not None and isinstance(stop, int) and stop < 0 and not use_block_num:
+                stop += max_index
+            for item in self._get_stored_history(history_store, start=start, stop=stop, use_block_num=use_block_num,
+                                                 only_ops=only_ops, exclude_ops=exclude_ops, raw_output=raw_output,
+                                                 order=-1):
+                yield item
+            return
         _limit = batch_size
         first = self.virtual_op_count()
         start = addTzInfo(start)
@@ -2479,38 +2785,19 @@ class Account(BlockchainObject):
         elif start is not None and isinstance(start, int) and not use_block_num:
             first = start
         elif start is not None and first > batch_size:
-            created, min_index = self._get_first_blocknum()
-            op_est = self.estimate_virtual_op_num(start, stop_diff=1, min_index=min_index)
-            est_diff = 0
-            if op_est < min_index:
-                op_est = min_index
+            # first operation after start, operations after start are skipped below
             if isinstance(start, (datetime, date, time)):
-                for h in self.get_account_history(op_est, 0):
-                    block_date = formatTimeString(h["timestamp"])
-                while(op_est + est_diff + batch_size < first and block_date < start):
-                    est_diff += batch_size
-                    if op_est + est_diff > first:
-                        est_diff = first - op_est
-                    for h in self.get_account_history(op_est + est_diff, 0):
-                        block_date = formatTimeString(h["timestamp"])
+                first = self.estimate_virtual_op_num(start + timedelta(seconds=1))
             else:
-                for h in self.get_account_history(op_est, 0):
-                    block_num = h["block"]
-                while(op_est + est_diff + batch_size < first and block_num < start):
-                    est_diff += batch_size
-                    if op_est + est_diff > first:
-                        est_diff = first - op_est
-                    for h in self.get_account_history(op_est + est_diff, 0):
-                        block_num = h["block"]
-            first = op_est + est_diff
+                first = self.estimate_virtual_op_num(start + 1)
         if stop is not None and isinstance(stop, int) and stop < 0 and not use_block_num:
             stop += first
             
-        if self.blockchain.rpc.url == 'https://api.hive.blog' and (len(only_ops) > 0 or len(exclude_ops) > 0):
+        if (len(only_ops) > 0 or len(exclude_ops) > 0) and self.supports_operation_filter():
             operation_filter = True
         else:
             operation_filter = False
-        
+
         last_item_index = first + 1
         while True:
             # RPC call
@@ -2531,6 +2818,7 @@ class Account(BlockchainObject):
                     op_type = item['type']
                     timestamp = item["timestamp"]
                     block_num = item["block"]
+                batch_min_index = item_index
                 if start is not None and isinstance(start, (datetime, date, time)):
                     timediff = start - formatTimeString(timestamp)
                     if timediff.total_seconds() < 0:
@@ -2560,8 +2848,12 @@ class Account(BlockchainObject):
                     if not only_ops or op_type in only_ops:
                         yield item                    
                 last_item_index = item_index
-            if operation_filter and batch_count < _limit and _limit == 1000:
-                first -= 2000
+            if operation_filter:
+                # a filtered page contains the latest matching operations below first,
+                # a short page means that no older matching operation exists
+                if batch_count < _limit:
+                    break
+                first = batch_min_index - 1
             else:
                 first -= (_limit)
             if first < 1:
@@ -3862,11 +4154,30 @@ class Accounts(AccountsObject):
         :param list name_list: list of accounts to fetch
         :param int batch_limit: (optional) maximum number of accounts
             to fetch per call, defaults to 100
+        :param bool lazy: Use lazy loading
+        :param bool full: When False, only the fields in ``Accounts.light_keys``
+            are stored (name, balances, vests, manabars, reputation and last vote)
+        :param bool threading: Enables threading, the batches are then fetched
+            concurrently by ``thread_num`` threads from different node connections
+        :param int thread_num: Defines the number of threads, when `threading` is set.
         :param Steem/Hive blockchain_instance: Steem() or Hive() instance to use when
             accessing a RPCcreator = Account(creator, blockchain_instance=self)
+
+        .. note:: The loaded accounts are stored in the object cache, so that
+            ``Account(name, use_cache=True)`` does not fetch them again until
+            the cache expires.
     """
-    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, blockchain_instance=None, **kwargs):
-        
+    #: Fields which are kept when full=False
+    light_keys = [
+        "id", "name", "balance", "hbd_balance", "sbd_balance", "vesting_shares",
+        "delegated_vesting_shares", "received_vesting_shares", "vesting_withdraw_rate",
+        "to_withdraw", "withdrawn", "next_vesting_withdrawal", "voting_power", "voting_manabar",
+        "downvote_manabar", "last_vote_time", "reputation", "proxy", "post_voting_power",
+    ]
+
+    def __init__(self, name_list, batch_limit=100, lazy=False, full=True, threading=False, thread_num=8,
+                 blockchain_instance=None, **kwargs):
+
         if blockchain_instance is None:
             if kwargs.get("steem_instance"):
                 blockchain_instance = kwargs["steem_instance"]
@@ -3877,15 +4188,34 @@ class Accounts(AccountsObject):
         if not self.blockchain.is_connected():
             return
         accounts = []
-        name_cnt = 0
+        batches = [name_list[name_cnt:batch_limit + name_cnt] for name_cnt in range(0, len(name_list), batch_limit)]
 
-        while name_cnt < len(name_list):
-            self.blockchain.rpc.set_next_node_on_empty_reply(False)
-            if self.blockchain.rpc.get_use_appbase():
-                accounts += self.blockchain.rpc.find_accounts({'accounts': name_list[name_cnt:batch_limit + name_cnt]}, api="database")["accounts"]
-            else:
-                accounts += self.blockchain.rpc.get_accounts(name_list[name_cnt:batch_limit + name_cnt])
-            name_cnt += batch_limit
+        if threading and FUTURES_MODULE is not None and len(batches) > 1:
+            thread_num = min(thread_num, len(batches))
+            # every thread takes a free node connection from the queue
+            blockchain_instances = Queue()
+            for blockchain_instance in self._get_thread_instances(thread_num):
+                blockchain_instances.put(blockchain_instance)
+
+            def fetch_batch(names):
+                blockchain_instance = blockchain_instances.get()
+                try:
+                    return self._fetch_accounts(names, blockchain_instance)
+                finally:
+                    blockchain_instances.put(blockchain_instance)
+
+            pool = ThreadPoolExecutor(max_workers=thread_num)
+            try:
+                for batch_accounts in pool.map(fetch_batch, batches):
+                    accounts += batch_accounts
+            finally:
+                pool.shutdown(wait=False)
+        else:
+            for names in batches:
+                accounts += self._fetch_accounts(names, self.blockchain)
+
+        if not full:
+            accounts = [{key: x[key] for key in self.light_keys if key in x} for x in accounts]
 
         super(Accounts, self).__init__(
             [
@@ -3893,3 +4223,14 @@ class Accounts(AccountsObject):
                 for x in accounts
             ]
         )
+
+    def _get_thread_instances(self, thread_num):
+        return get_thread_instances(self.blockchain, thread_num)
+
+    @staticmethod
+    def _fetch_accounts(names, blockchain_instance):
+        blockchain_instance.rpc.set_next_node_on_empty_reply(False)
+        if blockchain_instance.rpc.get_use_appbase():
+            return blockchain_instance.rpc.find_accounts({'accounts': names}, api="database")["accounts"]
+        else:
+            return blockchain_instance.rpc.get_accounts(names)
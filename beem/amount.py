@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from beem.instance import shared_blockchain_instance
-from beem.asset import Asset
+from beem.asset import Asset, AssetDescriptor, get_asset_table
 from decimal import Decimal, ROUND_DOWN
 
 
 def check_asset(other, self, stm):
     if isinstance(other, dict) and "asset" in other and isinstance(self, dict) and "asset" in self:
-        if not Asset(other["asset"], blockchain_instance=stm) == Asset(self["asset"], blockchain_instance=stm):
+        if other["asset"] == self["asset"]:
+            return
+        asset_table = get_asset_table(stm)
+        if not asset_table.get_descriptor(other["asset"]) == asset_table.get_descriptor(self["asset"]):
             raise AssertionError()
     else:
         if not other == self:
@@ -49,7 +52,8 @@ class Amount(dict):
 
             * ``amount`` (float)
             * ``symbol`` (str)
-            * ``asset`` (instance of :class:`beem.asset.Asset`)
+            * ``asset`` (instance of :class:`beem.asset.AssetDescriptor` from the
+              static asset table or of :class:`beem.asset.Asset`)
 
         Instances of this class can be used in regular mathematical expressions
         (``+-*/%``) such as:
@@ -84,36 +88,36 @@ class Amount(dict):
                 blockchain_instance = kwargs["hive_instance"]
         self.blockchain = blockchain_instance or shared_blockchain_instance()           
 
-        if amount and asset is None and isinstance(amount, Amount):
-            # Copy Asset object
-            self["amount"] = amount["amount"]
-            self["symbol"] = amount["symbol"]
-            self["asset"] = amount["asset"]
-
-        elif amount and asset is None and isinstance(amount, list) and len(amount) == 3:
-            # Copy Asset object
-            self["amount"] = Decimal(amount[0]) / Decimal(10 ** amount[1])
-            self["asset"] = Asset(amount[2], blockchain_instance=self.blockchain)
-            self["symbol"] = self["asset"]["symbol"]
+        # The common forms (string, NAI dict and legacy list) are checked first,
+        # their assets are taken from the static asset table of the chain
+        if amount is not None and asset is None and isinstance(amount, string_types):
+            self["amount"], self["symbol"] = amount.split(" ")
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(self["symbol"])
 
         elif amount and asset is None and isinstance(amount, dict) and "amount" in amount and "nai" in amount and "precision" in amount:
-            # Copy Asset object
             self.new_appbase_format = True
-            self["amount"] = Decimal(amount["amount"]) / Decimal(10 ** amount["precision"])
-            self["asset"] = Asset(amount["nai"], blockchain_instance=self.blockchain)
+            self["amount"] = Decimal(amount["amount"]).scaleb(-amount["precision"])
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(amount["nai"])
             self["symbol"] = self["asset"]["symbol"]
 
-        elif amount is not None and asset is None and isinstance(amount, string_types):
-            self["amount"], self["symbol"] = amount.split(" ")
-            self["asset"] = Asset(self["symbol"], blockchain_instance=self.blockchain)
+        elif amount and asset is None and isinstance(amount, list) and len(amount) == 3:
+            self["amount"] = Decimal(amount[0]).scaleb(-amount[1])
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(amount[2])
+            self["symbol"] = self["asset"]["symbol"]
+
+        elif amount and asset is None and isinstance(amount, Amount):
+            # Copy Asset object
+            self["amount"] = amount["amount"]
+            self["symbol"] = amount["symbol"]
+            self["asset"] = amount["asset"]
 
         elif (amount and asset is None and isinstance(amount, dict) and "amount" in amount and "asset_id" in amount):
-            self["asset"] = Asset(amount["asset_id"], blockchain_instance=self.blockchain)
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(amount["asset_id"])
             self["symbol"] = self["asset"]["symbol"]
             self["amount"] = Decimal(amount["amount"]) / Decimal(10 ** self["asset"]["precision"])
 
         elif (amount and asset is None and isinstance(amount, dict) and "amount" in amount and "asset" in amount):
-            self["asset"] = Asset(amount["asset"], blockchain_instance=self.blockchain)
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(amount["asset"])
             self["symbol"] = self["asset"]["symbol"]
             self["amount"] = Decimal(amount["amount"]) / Decimal(10 ** self["asset"]["precision"])
 
@@ -139,20 +143,20 @@ class Amount(dict):
 
         elif isinstance(amount, (float)) and asset and isinstance(asset, string_types):
             self["amount"] = str(amount)
-            self["asset"] = Asset(asset, blockchain_instance=self.blockchain)
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(asset)
             self["symbol"] = asset
 
         elif isinstance(amount, (integer_types, Decimal)) and asset and isinstance(asset, string_types):
             self["amount"] = amount
-            self["asset"] = Asset(asset, blockchain_instance=self.blockchain)
-            self["symbol"] = asset  
-        elif amount and asset and isinstance(asset, Asset):
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(asset)
+            self["symbol"] = asset
+        elif amount and asset and isinstance(asset, (Asset, AssetDescriptor)):
             self["amount"] = amount
             self["symbol"] = asset["symbol"]
             self["asset"] = asset
         elif amount and asset and isinstance(asset, string_types):
             self["amount"] = amount
-            self["asset"] = Asset(asset, blockchain_instance=self.blockchain)
+            self["asset"] = get_asset_table(self.blockchain).get_descriptor(asset)
             self["symbol"] = self["asset"]["symbol"]            
         else:
             raise ValueError
@@ -164,9 +168,12 @@ class Amount(dict):
     def copy(self):
         """ Copy the instance and make sure not to use a reference
         """
+        asset = self["asset"]
+        if not isinstance(asset, AssetDescriptor):
+            asset = asset.copy()
         return Amount(
             amount=self["amount"],
-            asset=self["asset"].copy(),
+            asset=asset,
             new_appbase_format=self.new_appbase_format,
             fixed_point_arithmetic=self.fixed_point_arithmetic,
             blockchain_instance=self.blockchain)
@@ -196,7 +203,8 @@ class Amount(dict):
     def asset(self):
         """ Returns the asset as instance of :class:`steem.asset.Asset`
         """
-        if not self["asset"]:
+        if not isinstance(self["asset"], Asset):
+            # the asset is resolved only on request, amounts use the static asset table
             self["asset"] = Asset(self["symbol"], blockchain_instance=self.blockchain)
         return self["asset"]
 
@@ -439,3 +447,263 @@ class Amount(dict):
     __repr__ = __str__
     __truediv__ = __div__
     __truemul__ = __mul__
+
+
+def to_satoshi(value, precision):
+    """ Converts a number or a number string into an integer amount of the
+        smallest unit of an asset with ``precision``. It is rounded down like
+        :func:`quantize`.
+    """
+    if isinstance(value, integer_types):
+        return value * 10 ** precision
+    if isinstance(value, string_types):
+        value = value.strip()
+        integer, _, fraction = value.lstrip("+-").partition(".")
+        if integer.isdigit() and (fraction == "" or fraction.isdigit()):
+            satoshi = int(integer) * 10 ** precision + int(fraction[:precision].ljust(precision, "0") or 0)
+            return -satoshi if value.startswith("-") else satoshi
+    elif isinstance(value, float):
+        value = str(value)
+    return int(quantize(value, precision).scaleb(precision))
+
+
+class FixedAmount(object):
+    """ Integer fixed point representation of an amount. The amount is stored as
+        integer in the smallest unit of the asset (satoshi) together with an
+        :class:`beem.asset.AssetDescriptor` from the static asset table of the chain,
+        so that no :class:`beem.asset.Asset` has to be resolved. Arithmetic and
+        comparisons are integer operations, results are rounded down like
+        :class:`Amount` with ``fixed_point_arithmetic=True``.
+
+        :param amount: Amount as string (``"1.000 HIVE"``), NAI dict, legacy list
+            (``["1000", 3, "@@000000021"]``), :class:`Amount`, :class:`FixedAmount` or number
+        :param asset: Symbol, NAI or :class:`beem.asset.AssetDescriptor`, when amount is a number
+        :param Steem blockchain_instance: Steem instance, which is only used to select the asset table
+
+        .. code-block:: python
+
+            >>> from beem.amount import FixedAmount
+            >>> from beem import Hive
+            >>> hv = Hive(offline=True)
+            >>> a = FixedAmount("1.000 HIVE", blockchain_instance=hv)
+            >>> b = FixedAmount({"amount": "2500", "precision": 3, "nai": "@@000000021"}, blockchain_instance=hv)
+            >>> print(a + b)
+            3.500 HIVE
+            >>> int(a + b)
+            3500
+            >>> (a + b).json()
+            {'amount': '3500', 'precision': 3, 'nai': '@@000000021'}
+
+    """
+    __slots__ = ["amount", "asset"]
+
+    def __init__(self, amount, asset=None, blockchain_instance=None, **kwargs):
+        if isinstance(amount, FixedAmount):
+            self.amount = amount.amount
+            self.asset = amount.asset
+            return
+        if asset is not None and isinstance(asset, AssetDescriptor):
+            self.asset = asset
+        elif asset is not None or not isinstance(amount, Amount):
+            if blockchain_instance is None:
+                if kwargs.get("steem_instance"):
+                    blockchain_instance = kwargs["steem_instance"]
+                elif kwargs.get("hive_instance"):
+                    blockchain_instance = kwargs["hive_instance"]
+            asset_table = get_asset_table(blockchain_instance)
+        if asset is not None:
+            if not isinstance(asset, AssetDescriptor):
+                self.asset = asset_table.get_descriptor(asset)
+            self.amount = to_satoshi(amount, self.asset.precision)
+        elif isinstance(amount, string_types):
+            amount, symbol = amount.split(" ")
+            self.asset = asset_table.get_descriptor(symbol)
+            self.amount = to_satoshi(amount, self.asset.precision)
+        elif isinstance(amount, dict) and "nai" in amount:
+            self.asset = asset_table.get_descriptor(amount["nai"])
+            self.amount = self._rescale(int(amount["amount"]), amount["precision"])
+        elif isinstance(amount, list) and len(amount) == 3:
+            self.asset = asset_table.get_descriptor(amount[2])
+            self.amount = self._rescale(int(amount[0]), amount[1])
+        elif isinstance(amount, Amount):
+            self.asset = get_asset_table(amount.blockchain).get_descriptor(amount["symbol"])
+            self.amount = int(amount)
+        else:
+            raise ValueError
+
+    def _rescale(self, satoshi, precision):
+        """ Converts satoshi with the given precision into satoshi of the asset"""
+        if precision == self.asset.precision:
+            return satoshi
+        return to_satoshi(Decimal(satoshi).scaleb(-precision), self.asset.precision)
+
+    @classmethod
+    def from_satoshi(cls, satoshi, asset):
+        """ Returns a :class:`FixedAmount` of ``satoshi`` units of the
+            :class:`beem.asset.AssetDescriptor` ``asset``
+        """
+        a = cls.__new__(cls)
+        a.amount = satoshi
+        a.asset = asset
+        return a
+
+    @property
+    def symbol(self):
+        """ Returns the symbol of the asset"""
+        return self.asset.symbol
+
+    @property
+    def precision(self):
+        """ Returns the precision of the asset"""
+        return self.asset.precision
+
+    @property
+    def nai(self):
+        """ Returns the NAI of the asset"""
+        return self.asset.asset
+
+    @property
+    def amount_decimal(self):
+        """ Returns the amount as decimal"""
+        return Decimal(self.amount).scaleb(-self.asset.precision)
+
+    def copy(self):
+        return FixedAmount.from_satoshi(self.amount, self.asset)
+
+    def tuple(self):
+        return float(self), self.symbol
+
+    def json(self, new_appbase_format=True):
+        """ Returns the amount in the NAI dict format or, when new_appbase_format
+            is False, in the legacy list format
+        """
+        if new_appbase_format:
+            return {"amount": str(self.amount), "precision": self.asset.precision, "nai": self.asset.asset}
+        return [str(self.amount), self.asset.precision, self.asset.asset]
+
+    def to_amount(self, blockchain_instance=None):
+        """ Returns the amount as :class:`Amount`"""
+        return Amount(self.amount_decimal, self.asset, fixed_point_arithmetic=True,
+                      blockchain_instance=blockchain_instance)
+
+    def __str__(self):
+        precision = self.asset.precision
+        sign = "-" if self.amount < 0 else ""
+        integer, fraction = divmod(abs(self.amount), 10 ** precision)
+        if precision == 0:
+            return "%s%d %s" % (sign, integer, self.asset.symbol)
+        return "%s%d.%0*d %s" % (sign, integer, precision, fraction, self.asset.symbol)
+
+    def __repr__(self):
+        return "<FixedAmount %s>" % str(self)
+
+    def __float__(self):
+        return self.amount / 10 ** self.asset.precision
+
+    def __int__(self):
+        return self.amount
+
+    def __hash__(self):
+        return hash((self.amount, self.asset.symbol))
+
+    def __bool__(self):
+        return self.amount != 0
+
+    __nonzero__ = __bool__
+
+    def _other_satoshi(self, other):
+        """ Returns the satoshi of ``other``, numbers are amounts in units of the asset"""
+        if isinstance(other, FixedAmount):
+            if other.asset is not self.asset and other.asset != self.asset:
+                raise AssertionError()
+            return other.amount
+        if isinstance(other, Amount):
+            check_asset(other["symbol"], self.asset.symbol, None)
+            return int(other)
+        return to_satoshi(other or 0, self.asset.precision)
+
+    def _scale(self, factor):
+        if isinstance(factor, integer_types):
+            return self.amount * factor
+        if isinstance(factor, float):
+            factor = str(factor)
+        return int(Decimal(self.amount) * Decimal(factor))
+
+    def __add__(self, other):
+        return FixedAmount.from_satoshi(self.amount + self._other_satoshi(other), self.asset)
+
+    def __radd__(self, other):
+        # allows sum() over a list of FixedAmounts
+        if isinstance(other, integer_types) and other == 0:
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return FixedAmount.from_satoshi(self.amount - self._other_satoshi(other), self.asset)
+
+    def __rsub__(self, other):
+        return FixedAmount.from_satoshi(self._other_satoshi(other) - self.amount, self.asset)
+
+    def __neg__(self):
+        return FixedAmount.from_satoshi(-self.amount, self.asset)
+
+    def __abs__(self):
+        return FixedAmount.from_satoshi(abs(self.amount), self.asset)
+
+    def __mul__(self, other):
+        if isinstance(other, (FixedAmount, Amount)):
+            raise TypeError("Amounts can only be multiplied by numbers")
+        from .price import Price
+        if isinstance(other, Price):
+            return FixedAmount(self.to_amount(other.blockchain) * other, blockchain_instance=other.blockchain)
+        return FixedAmount.from_satoshi(self._scale(other), self.asset)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, FixedAmount):
+            if other.asset != self.asset:
+                raise AssertionError()
+            return self.amount / other.amount
+        from .price import Price
+        if isinstance(other, Price):
+            return FixedAmount(self.to_amount(other.blockchain) / other, blockchain_instance=other.blockchain)
+        if isinstance(other, integer_types):
+            # rounds towards zero
+            quotient = abs(self.amount) // abs(other)
+            return FixedAmount.from_satoshi(quotient if (self.amount < 0) == (other < 0) else -quotient, self.asset)
+        if isinstance(other, float):
+            other = str(other)
+        return FixedAmount.from_satoshi(int(Decimal(self.amount) / Decimal(other)), self.asset)
+
+    __div__ = __truediv__
+
+    def __floordiv__(self, other):
+        if isinstance(other, FixedAmount):
+            if other.asset != self.asset:
+                raise AssertionError()
+            return self.amount // other.amount
+        if isinstance(other, float):
+            other = str(other)
+        return FixedAmount.from_satoshi(int(Decimal(self.amount) // Decimal(other)), self.asset)
+
+    def __mod__(self, other):
+        return FixedAmount.from_satoshi(self.amount % self._other_satoshi(other), self.asset)
+
+    def __lt__(self, other):
+        return self.amount < self._other_satoshi(other)
+
+    def __le__(self, other):
+        return self.amount <= self._other_satoshi(other)
+
+    def __eq__(self, other):
+        return self.amount == self._other_satoshi(other)
+
+    def __ne__(self, other):
+        return self.amount != self._other_satoshi(other)
+
+    def __ge__(self, other):
+        return self.amount >= self._other_satoshi(other)
+
+    def __gt__(self, other):
+        return self.amount > self._other_satoshi(other)
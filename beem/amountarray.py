@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import datetime, date
+from decimal import Decimal
+from beem.instance import shared_blockchain_instance
+from beem.amount import Amount, FixedAmount, to_satoshi
+from beem.asset import get_asset_table
+from beem.price import Price
+from beem.utils import formatTimeString, addTzInfo
+from beemgraphenebase.py23 import integer_types, string_types
+log = logging.getLogger(__name__)
+NUMPY_MODULE = None
+if not NUMPY_MODULE:
+    try:
+        import numpy as np
+        NUMPY_MODULE = "numpy"
+    except ImportError:
+        NUMPY_MODULE = None
+
+# Products above this limit do not fit into int64 and are calculated with python integers
+MAX_INT64 = 2 ** 63 - 1
+
+
+def to_seconds(timestamps):
+    """ Converts a list of datetimes, time strings or unix seconds into an int64 array
+        of seconds since epoch
+    """
+    if isinstance(timestamps, np.ndarray):
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            return timestamps.astype("datetime64[s]").astype(np.int64)
+        return timestamps.astype(np.int64)
+    seconds = []
+    for t in timestamps:
+        if isinstance(t, integer_types):
+            seconds.append(np.datetime64(t, "s"))
+            continue
+        if isinstance(t, (datetime, date)):
+            t = formatTimeString(addTzInfo(t) if isinstance(t, datetime) else datetime(t.year, t.month, t.day))
+        seconds.append(np.datetime64(t, "s"))
+    return np.array(seconds, dtype="datetime64[s]").astype(np.int64)
+
+
+def mul_div(satoshi, numerator, denominator):
+    """ Returns ``satoshi * numerator / denominator`` rounded towards zero like
+        ``int(Amount)``. ``numerator`` and ``denominator`` can be scalars or arrays.
+    """
+    numerator = np.asarray(numerator)
+    denominator = np.asarray(denominator)
+    max_satoshi = int(np.abs(satoshi).max()) if len(satoshi) > 0 else 0
+    max_numerator = int(np.abs(numerator).max()) if numerator.size > 0 else 0
+    if max_satoshi * max_numerator > MAX_INT64:
+        satoshi = satoshi.astype(object)
+        numerator = numerator.astype(object)
+        denominator = denominator.astype(object)
+    product = satoshi * numerator
+    quotient = np.abs(product) // np.abs(denominator)
+    result = np.where((product < 0) != (denominator < 0), -quotient, quotient)
+    return result.astype(np.int64)
+
+
+class AmountArray(object):
+    """ Holds many amounts of a single asset as int64 array in the smallest unit
+        of the asset (satoshi), so that they can be summed, grouped and converted
+        in vectorized operations instead of python loops over :class:`beem.amount.Amount`.
+
+        Single amounts are returned as :class:`beem.amount.Amount`, and
+        :class:`beem.amount.Amount`/:class:`beem.amount.FixedAmount` objects can be
+        added to, subtracted from and compared with an AmountArray.
+
+        :param list amounts: amounts as strings, NAI dicts, legacy lists,
+            :class:`beem.amount.Amount` or :class:`beem.amount.FixedAmount`
+        :param str asset: symbol or NAI of the asset, it is needed when amounts is empty
+        :param Steem blockchain_instance: Steem instance
+
+        .. code-block:: python
+
+            >>> from beem.amountarray import AmountArray
+            >>> from beem import Hive
+            >>> hv = Hive(offline=True)
+            >>> transfers = [{"to": "alice", "amount": "1.000 HIVE"}, {"to": "bob", "amount": "2.500 HIVE"},
+            ...              {"to": "alice", "amount": {"amount": "500", "precision": 3, "nai": "@@000000021"}}]
+            >>> amounts = AmountArray([t["amount"] for t in transfers], blockchain_instance=hv)
+            >>> print(amounts.sum())
+            4.000 HIVE
+            >>> groups = amounts.groupby([t["to"] for t in transfers])
+            >>> print(groups["alice"])
+            1.500 HIVE
+
+    """
+    def __init__(self, amounts=[], asset=None, blockchain_instance=None, **kwargs):
+        if NUMPY_MODULE is None:
+            raise ImportError("Missing dependency: numpy")
+        if blockchain_instance is None:
+            if kwargs.get("steem_instance"):
+                blockchain_instance = kwargs["steem_instance"]
+            elif kwargs.get("hive_instance"):
+                blockchain_instance = kwargs["hive_instance"]
+        self.blockchain = blockchain_instance or shared_blockchain_instance()
+        self.asset_table = get_asset_table(self.blockchain)
+        self.asset = None
+        if asset is not None:
+            self.asset = self.asset_table.get_descriptor(asset)
+        satoshi = []
+        for amount in amounts:
+            amount_satoshi, amount_asset = self._parse_amount(amount)
+            if self.asset is None:
+                self.asset = amount_asset
+            elif amount_asset is not self.asset and amount_asset != self.asset:
+                raise AssertionError()
+            satoshi.append(amount_satoshi)
+        if self.asset is None:
+            raise ValueError("asset must be given for an empty AmountArray")
+        self.satoshi = np.array(satoshi, dtype=np.int64)
+
+    def _parse_amount(self, amount):
+        """ Returns the satoshi and the asset descriptor of a single amount"""
+        if isinstance(amount, string_types):
+            number, symbol = amount.split(" ")
+            asset = self.asset_table.get_descriptor(symbol)
+            return to_satoshi(number, asset["precision"]), asset
+        if isinstance(amount, FixedAmount):
+            return amount.amount, amount.asset
+        if isinstance(amount, Amount):
+            return int(amount), self.asset_table.get_descriptor(amount["symbol"])
+        if isinstance(amount, dict) and "nai" in amount:
+            satoshi, precision, nai = int(amount["amount"]), amount["precision"], amount["nai"]
+        elif isinstance(amount, (list, tuple)) and len(amount) == 3:
+            satoshi, precision, nai = int(amount[0]), amount[1], amount[2]
+        else:
+            raise ValueError("Couldn't parse amount %s" % str(amount))
+        asset = self.asset_table.get_descriptor(nai)
+        if precision != asset["precision"]:
+            satoshi = to_satoshi(Decimal(satoshi).scaleb(-precision), asset["precision"])
+        return satoshi, asset
+
+    @classmethod
+    def from_satoshi(cls, satoshi, asset, blockchain_instance=None):
+        """ Returns an AmountArray of an int64 satoshi array
+
+            :param satoshi: array or list of integer amounts in the smallest unit of the asset
+            :param asset: symbol, NAI or :class:`beem.asset.AssetDescriptor` of the asset
+        """
+        amounts = cls([], asset=asset, blockchain_instance=blockchain_instance)
+        amounts.satoshi = np.asarray(satoshi, dtype=np.int64)
+        return amounts
+
+    def _new(self, satoshi, asset=None):
+        amounts = AmountArray.__new__(AmountArray)
+        amounts.blockchain = self.blockchain
+        amounts.asset_table = self.asset_table
+        amounts.asset = asset or self.asset
+        amounts.satoshi = satoshi
+        return amounts
+
+    def _to_amount(self, satoshi, asset=None):
+        asset = asset or self.asset
+        return Amount(Decimal(int(satoshi)).scaleb(-asset["precision"]), asset, blockchain_instance=self.blockchain)
+
+    @property
+    def symbol(self):
+        """ Returns the symbol of the asset"""
+        return self.asset["symbol"]
+
+    @property
+    def precision(self):
+        """ Returns the precision of the asset"""
+        return self.asset["precision"]
+
+    def __len__(self):
+        return len(self.satoshi)
+
+    def __iter__(self):
+        for satoshi in self.satoshi.tolist():
+            yield self._to_amount(satoshi)
+
+    def __getitem__(self, index):
+        if isinstance(index, integer_types) or isinstance(index, np.integer):
+            return self._to_amount(self.satoshi[index])
+        return self._new(self.satoshi[index])
+
+    def __repr__(self):
+        return "<AmountArray of %d %s amounts>" % (len(self), self.symbol)
+
+    def to_amounts(self):
+        """ Returns a list of :class:`beem.amount.Amount`"""
+        return list(self)
+
+    def to_float(self):
+        """ Returns the amounts as float64 array"""
+        return self.satoshi / 10 ** self.precision
+
+    def append(self, other):
+        """ Returns a new AmountArray with the amounts of ``other`` appended"""
+        if not isinstance(other, AmountArray):
+            other = AmountArray(other, asset=self.asset, blockchain_instance=self.blockchain)
+        if other.asset != self.asset:
+            raise AssertionError()
+        return self._new(np.concatenate((self.satoshi, other.satoshi)))
+
+    def _sum(self, satoshi):
+        if len(satoshi) > 0 and int(np.abs(satoshi).max()) * len(satoshi) > MAX_INT64:
+            return sum(satoshi.tolist())
+        return int(satoshi.sum())
+
+    def sum(self):
+        """ Returns the sum of all amounts as :class:`beem.amount.Amount`"""
+        return self._to_amount(self._sum(self.satoshi))
+
+    def cumsum(self):
+        """ Returns the cumulative sums as AmountArray"""
+        return self._new(np.cumsum(self.satoshi))
+
+    def groupby(self, keys):
+        """ Returns a dict with the sum of the amounts of each key
+
+            :param list keys: one key (e.g. an account name) for each amount
+        """
+        keys = np.asarray(keys)
+        if len(keys) != len(self):
+            raise ValueError("keys must have the same length as the amounts")
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        satoshi = self.satoshi
+        if len(satoshi) > 0 and int(np.abs(satoshi).max()) * len(satoshi) > MAX_INT64:
+            # the sums may not fit into int64
+            satoshi = satoshi.astype(object)
+        sums = np.zeros(len(unique_keys), dtype=satoshi.dtype)
+        np.add.at(sums, inverse, satoshi)
+        return {key: self._to_amount(value) for key, value in zip(unique_keys.tolist(), sums.tolist())}
+
+    def groupby_day(self, timestamps):
+        """ Returns a dict with the sum of the amounts of each day (as :class:`datetime.date`)
+
+            :param list timestamps: one timestamp (datetime, time string or unix seconds) for each amount
+        """
+        days = to_seconds(timestamps).astype("datetime64[s]").astype("datetime64[D]")
+        return self.groupby(days)
+
+    def convert(self, price, timestamps=None):
+        """ Converts the amounts with a :class:`beem.price.Price` or with the prices
+            of a :class:`PriceSeries` which were valid at ``timestamps``.
+            Amounts in the quote asset are converted into the base asset and vice versa.
+        """
+        if isinstance(price, PriceSeries):
+            if timestamps is None:
+                raise ValueError("timestamps are needed for converting with a PriceSeries")
+            return price.convert(self, timestamps)
+        if not isinstance(price, Price):
+            price = Price(price, blockchain_instance=self.blockchain)
+        base_asset = self.asset_table.get_descriptor(price["base"]["symbol"])
+        quote_asset = self.asset_table.get_descriptor(price["quote"]["symbol"])
+        base, quote = int(price["base"]), int(price["quote"])
+        if self.asset == quote_asset:
+            return self._new(mul_div(self.satoshi, base, quote), base_asset)
+        elif self.asset == base_asset:
+            return self._new(mul_div(self.satoshi, quote, base), quote_asset)
+        raise AssertionError()
+
+    def _other_satoshi(self, other):
+        """ Returns the satoshi of ``other``, numbers are amounts in units of the asset"""
+        if isinstance(other, AmountArray):
+            if other.asset != self.asset:
+                raise AssertionError()
+            if len(other) != len(self):
+                raise ValueError("AmountArrays must have the same length")
+            return other.satoshi
+        if isinstance(other, (Amount, FixedAmount, string_types, dict, list)):
+            satoshi, asset = self._parse_amount(other)
+            if asset != self.asset:
+                raise AssertionError()
+            return satoshi
+        return to_satoshi(other, self.precision)
+
+    def __add__(self, other):
+        return self._new(self.satoshi + self._other_satoshi(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._new(self.satoshi - self._other_satoshi(other))
+
+    def __rsub__(self, other):
+        return self._new(self._other_satoshi(other) - self.satoshi)
+
+    def __neg__(self):
+        return self._new(-self.satoshi)
+
+    def __abs__(self):
+        return self._new(np.abs(self.satoshi))
+
+    def __mul__(self, other):
+        if isinstance(other, (Price, PriceSeries)):
+            return self.convert(other)
+        if isinstance(other, (AmountArray, Amount, FixedAmount)):
+            raise TypeError("Amounts can only be multiplied by numbers")
+        if isinstance(other, integer_types):
+            return self._new(mul_div(self.satoshi, other, 1))
+        numerator, denominator = Decimal(str(other)).as_integer_ratio()
+        return self._new(mul_div(self.satoshi, numerator, denominator))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Price):
+            return self.convert(other)
+        if isinstance(other, (AmountArray, Amount, FixedAmount)):
+            return self.satoshi / self._other_satoshi(other)
+        numerator, denominator = Decimal(str(other)).as_integer_ratio()
+        return self._new(mul_div(self.satoshi, denominator, numerator))
+
+    __div__ = __truediv__
+
+    def __lt__(self, other):
+        return self.satoshi < self._other_satoshi(other)
+
+    def __le__(self, other):
+        return self.satoshi <= self._other_satoshi(other)
+
+    def __eq__(self, other):
+        return self.satoshi == self._other_satoshi(other)
+
+    def __ne__(self, other):
+        return self.satoshi != self._other_satoshi(other)
+
+    def __ge__(self, other):
+        return self.satoshi >= self._other_satoshi(other)
+
+    def __gt__(self, other):
+        return self.satoshi > self._other_satoshi(other)
+
+    __hash__ = None
+
+
+class PriceSeries(object):
+    """ Prices of an asset pair over time, e.g. historical feed prices. Amounts are
+        converted with the last price which was valid at their timestamp; the
+        first price is used for timestamps before it.
+
+        :param list timestamps: time (datetime, time string or unix seconds) of each price
+        :param list prices: :class:`beem.price.Price` objects or price dicts with
+            ``base`` and ``quote``
+        :param Steem blockchain_instance: Steem instance
+
+        .. code-block:: python
+
+            >>> from beem.amountarray import AmountArray, PriceSeries
+            >>> from beem import Hive
+            >>> hv = Hive(offline=True)
+            >>> feed = PriceSeries(["2020-01-01T00:00:00", "2020-01-02T00:00:00"],
+            ...                    [{"base": "0.250 HBD", "quote": "1.000 HIVE"},
+            ...                     {"base": "0.500 HBD", "quote": "1.000 HIVE"}], blockchain_instance=hv)
+            >>> amounts = AmountArray(["2.000 HIVE", "2.000 HIVE"], blockchain_instance=hv)
+            >>> hbd = amounts.convert(feed, ["2020-01-01T12:00:00", "2020-01-02T12:00:00"])
+            >>> print(hbd.sum())
+            1.500 HBD
+
+    """
+    def __init__(self, timestamps, prices, blockchain_instance=None, **kwargs):
+        if NUMPY_MODULE is None:
+            raise ImportError("Missing dependency: numpy")
+        if blockchain_instance is None:
+            if kwargs.get("steem_instance"):
+                blockchain_instance = kwargs["steem_instance"]
+            elif kwargs.get("hive_instance"):
+                blockchain_instance = kwargs["hive_instance"]
+        self.blockchain = blockchain_instance or shared_blockchain_instance()
+        asset_table = get_asset_table(self.blockchain)
+        if len(timestamps) != len(prices) or len(prices) == 0:
+            raise ValueError("timestamps and prices must have the same length and must not be empty")
+        base = []
+        quote = []
+        self.base_asset = None
+        self.quote_asset = None
+        for price in prices:
+            if not isinstance(price, Price):
+                price = Price(price, blockchain_instance=self.blockchain)
+            base_asset = asset_table.get_descriptor(price["base"]["symbol"])
+            quote_asset = asset_table.get_descriptor(price["quote"]["symbol"])
+            if self.base_asset is None:
+                self.base_asset, self.quote_asset = base_asset, quote_asset
+            elif base_asset != self.base_asset or quote_asset != self.quote_asset:
+                raise AssertionError()
+            base.append(int(price["base"]))
+            quote.append(int(price["quote"]))
+        seconds = to_seconds(timestamps)
+        order = np.argsort(seconds, kind="stable")
+        self.timestamps = seconds[order]
+        self.base_satoshi = np.array(base, dtype=np.int64)[order]
+        self.quote_satoshi = np.array(quote, dtype=np.int64)[order]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        return Price(None, base=Amount(Decimal(int(self.base_satoshi[index])).scaleb(-self.base_asset["precision"]),
+                                       self.base_asset, blockchain_instance=self.blockchain),
+                     quote=Amount(Decimal(int(self.quote_satoshi[index])).scaleb(-self.quote_asset["precision"]),
+                                  self.quote_asset, blockchain_instance=self.blockchain),
+                     blockchain_instance=self.blockchain)
+
+    def get_index(self, timestamps):
+        """ Returns the index of the price which was valid at each timestamp"""
+        index = np.searchsorted(self.timestamps, to_seconds(timestamps), side="right") - 1
+        return np.maximum(index, 0)
+
+    def get_price(self, timestamp):
+        """ Returns the :class:`beem.price.Price` which was valid at ``timestamp``"""
+        return self[int(self.get_index([timestamp])[0])]
+
+    def convert(self, amounts, timestamps):
+        """ Converts an :class:`AmountArray` with the prices which were valid at ``timestamps``.
+            Amounts in the quote asset are converted into the base asset and vice versa.
+        """
+        if len(timestamps) != len(amounts):
+            raise ValueError("timestamps must have the same length as the amounts")
+        index = self.get_index(timestamps)
+        base = self.base_satoshi[index]
+        quote = self.quote_satoshi[index]
+        if amounts.asset == self.quote_asset:
+            return amounts._new(mul_div(amounts.satoshi, base, quote), self.base_asset)
+        elif amounts.asset == self.base_asset:
+            return amounts._new(mul_div(amounts.satoshi, quote, base), self.quote_asset)
+        raise AssertionError()
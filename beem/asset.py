@@ -2,6 +2,8 @@
 import json
 from .exceptions import AssetDoesNotExistsException
 from .blockchainobject import BlockchainObject
+from .instance import shared_blockchain_instance
+from beemgraphenebase.chains import known_chains
 
 
 class Asset(BlockchainObject):
@@ -43,7 +45,6 @@ class Asset(BlockchainObject):
         """
         self.chain_params = self.blockchain.get_network()
         if self.chain_params is None:
-            from beemgraphenebase.chains import known_chains
             self.chain_params = known_chains["HIVE"]
         self["asset"] = ""
         found_asset = False
@@ -81,3 +82,114 @@ class Asset(BlockchainObject):
             return self["symbol"] != other["symbol"] or self["asset"] != other["asset"] or self["precision"] != other["precision"]
         else:
             return self["symbol"] != other
+
+
+class AssetDescriptor(dict):
+    """ Static description of an asset (symbol, NAI, precision and id). It has
+        the same keys as an :class:`Asset` and can be used instead of it, but
+        it is never refreshed from the network.
+
+        :param str symbol: Symbol of the asset
+        :param str asset: NAI (or legacy asset name) of the asset
+        :param int precision: Precision of the asset
+        :param int asset_id: Id of the asset
+    """
+    __slots__ = []
+
+    def __init__(self, symbol, asset, precision, asset_id):
+        super(AssetDescriptor, self).__init__(asset=asset, precision=precision, id=asset_id, symbol=symbol)
+
+    @property
+    def symbol(self):
+        return self["symbol"]
+
+    @property
+    def asset(self):
+        return self["asset"]
+
+    @property
+    def precision(self):
+        return self["precision"]
+
+    @property
+    def id(self):
+        return self["id"]
+
+    def json(self):
+        return dict(self)
+
+    def __setitem__(self, key, value):
+        # descriptors are shared by all amounts of an asset
+        raise TypeError("AssetDescriptor is read only")
+
+    def __reduce__(self):
+        return (AssetDescriptor, (self["symbol"], self["asset"], self["precision"], self["id"]))
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return self["symbol"] == other["symbol"] and self["asset"] == other["asset"] and self["precision"] == other["precision"]
+        else:
+            return self["symbol"] == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self["symbol"], self["asset"], self["precision"]))
+
+    def __repr__(self):
+        return "<AssetDescriptor %s>" % self["symbol"]
+
+
+class AssetTable(dict):
+    """ Maps the symbols, NAIs and ids of all assets of a chain to their
+        :class:`AssetDescriptor`.
+
+        :param dict chain_params: chain parameters with ``chain_assets``
+    """
+    def __init__(self, chain_params):
+        super(AssetTable, self).__init__()
+        self.chain_params = chain_params
+        self.descriptors = []
+        for asset in chain_params["chain_assets"]:
+            descriptor = AssetDescriptor(asset["symbol"], asset["asset"], asset["precision"], asset["id"])
+            self.descriptors.append(descriptor)
+            self[asset["symbol"]] = descriptor
+        # symbols have priority over NAIs and legacy asset names
+        for descriptor in self.descriptors:
+            self.setdefault(descriptor.asset, descriptor)
+            self.setdefault(descriptor.id, descriptor)
+
+    def get_descriptor(self, asset):
+        """ Returns the :class:`AssetDescriptor` of a symbol, NAI, id or asset dict"""
+        if isinstance(asset, AssetDescriptor):
+            return asset
+        if isinstance(asset, dict):
+            asset = asset["symbol"]
+        if asset not in self:
+            raise AssetDoesNotExistsException(str(asset) + " chain_assets:" + str(self.chain_params["chain_assets"]))
+        return self[asset]
+
+
+_asset_tables = {}
+
+
+def get_asset_table(blockchain_instance=None):
+    """ Returns the :class:`AssetTable` of the chain of ``blockchain_instance``.
+        The tables are built once for each chain.
+    """
+    chain_params = (blockchain_instance or shared_blockchain_instance()).chain_params
+    if chain_params is None:
+        chain_params = known_chains["HIVE"]
+    # chain_params are usually the same dict object, so the table is found by its id first
+    asset_table = _asset_tables.get(id(chain_params))
+    if asset_table is not None and asset_table.chain_params is chain_params:
+        return asset_table
+    key = (chain_params.get("chain_id"), chain_params.get("prefix"),
+           tuple((asset["symbol"], asset["asset"]) for asset in chain_params["chain_assets"]))
+    if key not in _asset_tables:
+        _asset_tables[key] = AssetTable(chain_params)
+    asset_table = _asset_tables[key]
+    if asset_table.chain_params is chain_params:
+        _asset_tables[id(chain_params)] = asset_table
+    return asset_table
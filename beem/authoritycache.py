@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+import logging
+log = logging.getLogger(__name__)
+
+_caches_lock = threading.Lock()
+
+
+class AuthorityCache(object):
+    """ Stores the signing keys which
+        :func:`beem.transactionbuilder.TransactionBuilder.appendSigner`
+        resolved for an account and permission, so that repeated
+        transactions of the same signer skip loading the accounts, walking
+        their ``account_auths`` and asking the wallet.
+
+        Entries expire after ``ttl`` seconds. They are removed by
+        :func:`invalidate`, which the wallet calls when it is locked or
+        its keys change.
+
+        :param float ttl: lifetime of an entry in seconds
+
+        .. code-block:: python
+
+            from beem.authoritycache import get_authority_cache
+            cache = get_authority_cache(hive)
+            cache.invalidate("holger80")  # e.g. after an account update
+
+    """
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, account, permission):
+        """ Returns a dict with ``wifs``, ``weight`` and ``threshold`` or
+            None when nothing valid is stored
+        """
+        with self.lock:
+            entry = self.entries.get((account, permission))
+            if entry is None or entry["expires"] < time.time():
+                if entry is not None:
+                    del self.entries[(account, permission)]
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def set(self, account, permission, wifs, weight, threshold):
+        """ Stores the resolved signing keys
+
+            :param str account: account name
+            :param str permission: ``owner``, ``active`` or ``posting``
+            :param list wifs: private keys which sign for the account
+            :param int weight: sum of the weights of the keys
+            :param int threshold: weight threshold of the permission
+        """
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[(account, permission)] = {"wifs": list(wifs), "weight": weight, "threshold": threshold,
+                                                   "expires": time.time() + self.ttl}
+
+    def invalidate(self, account=None, permission=None):
+        """ Removes the entries of ``account`` (all accounts when None) and
+            ``permission`` (all permissions when None)
+        """
+        with self.lock:
+            for key in list(self.entries.keys()):
+                if (account is None or key[0] == account) and (permission is None or key[1] == permission):
+                    del self.entries[key]
+
+
+def get_authority_cache(blockchain_instance):
+    """ Returns the :class:`AuthorityCache` shared by all users of
+        ``blockchain_instance``
+    """
+    cache = getattr(blockchain_instance, "_authority_cache", None)
+    if cache is None:
+        with _caches_lock:
+            cache = getattr(blockchain_instance, "_authority_cache", None)
+            if cache is None:
+                cache = AuthorityCache()
+                blockchain_instance._authority_cache = cache
+    return cache
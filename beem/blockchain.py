@@ -14,6 +14,8 @@ from beemapi.node import Nodes
 from .exceptions import BatchedCallsNotSupported, BlockDoesNotExistsException, BlockWaitTimeExceeded, OfflineHasNoRPCException
 from beemapi.exceptions import NumRetriesReached, UnknownTransaction
 from beemgraphenebase.py23 import py23_bytes
+from beembase.signedtransactions import get_transaction_hex, get_transaction_id
+from .refblock import get_ref_block_provider
 from beem.instance import shared_blockchain_instance
 from .amount import Amount
 import beem as stm
@@ -261,11 +263,20 @@ class Blockchain(object):
             ret = self.blockchain.rpc.get_transaction(transaction_id, api="database")
         return ret
 
-    def get_transaction_hex(self, transaction):
+    def get_transaction_hex(self, transaction, local=True):
         """ Returns a hexdump of the serialized binary form of a transaction.
 
             :param dict transaction: transaction
+            :param bool local: when True (default), the transaction is
+                serialized locally, the node is only asked when this fails
         """
+        if local:
+            try:
+                return get_transaction_hex(transaction, prefix=self.blockchain.prefix)
+            except Exception as e:
+                if not self.blockchain.is_connected():
+                    raise e
+                log.debug("Could not serialize transaction locally: %s" % str(e))
         if not self.blockchain.is_connected():
             raise OfflineHasNoRPCException("No RPC available in offline mode!")
         self.blockchain.rpc.set_next_node_on_empty_reply(False)
@@ -275,6 +286,14 @@ class Blockchain(object):
             ret = self.blockchain.rpc.get_transaction_hex(transaction, api="database")
         return ret
 
+    def get_transaction_id(self, transaction):
+        """ Returns the transaction id (trx_id) of a transaction, which is
+            computed locally without RPC call
+
+            :param dict transaction: transaction, e.g. from a block
+        """
+        return get_transaction_id(transaction, prefix=self.blockchain.prefix)
+
     def get_current_block_num(self):
         """ This call returns the current block number
 
@@ -560,6 +579,9 @@ class Blockchain(object):
                 for blocknum in range(start, head_block + 1):
                     # Get full block
                     block = self.wait_for_and_get_block(blocknum, only_ops=only_ops, only_virtual_ops=only_virtual_ops, block_number_check_cnt=5, last_current_block_num=current_block_num)
+                    if head_block_reached and not only_ops and not only_virtual_ops:
+                        # New blocks can be used as reference block for transactions
+                        get_ref_block_provider(self.blockchain).update(block, irreversible=self.is_irreversible_mode())
                     yield block
             # Set new start
             start = head_block + 1
@@ -659,6 +681,48 @@ class Blockchain(object):
                 ops_stat = block.ops_statistics(add_to_ops_stat=ops_stat)
         return ops_stat
 
+    def verify_signatures(self, start, stop=None, processes=None, batch_size=100, **kwargs):
+        """ Recovers the signing keys of all transactions starting from
+            ``start`` and yields ``(block, signers)`` for each block, where
+            ``signers`` is a list with the set of public keys of each
+            transaction (see :class:`beembase.signatureverifier.SignatureVerifier`).
+            The entry is None for transactions with an operation which cannot be
+            serialized locally (see ``beembase.signedtransactions.non_protocol_operations``).
+
+            :param int start: Starting block
+            :param int stop: Stop at this block, if set to None, the current_block_num is taken
+            :param int processes: number of worker processes for the key recovery
+            :param int batch_size: number of blocks which are verified together
+
+            All other parameters are passed to :func:`blocks`.
+
+            .. code-block:: python
+
+                from beem.blockchain import Blockchain
+                blockchain = Blockchain()
+                compromised = "STM..."
+                for block, signers in blockchain.verify_signatures(50000000, 50000100, processes=4):
+                    for trx_num, keys in enumerate(signers):
+                        if keys is not None and compromised in keys:
+                            print(block.block_num, trx_num)
+
+        """
+        from beembase.signatureverifier import SignatureVerifier
+        if stop is None:
+            stop = self.get_current_block_num()
+        with SignatureVerifier(chain=self.blockchain.chain_params, prefix=self.blockchain.prefix,
+                               processes=processes) as verifier:
+            blocks = []
+            for block in self.blocks(start=start, stop=stop, **kwargs):
+                blocks.append(block)
+                if len(blocks) >= batch_size:
+                    for b, signers in zip(blocks, verifier.verify_blocks(blocks)):
+                        yield b, signers
+                    blocks = []
+            if len(blocks) > 0:
+                for b, signers in zip(blocks, verifier.verify_blocks(blocks)):
+                    yield b, signers
+
     def stream(self, opNames=[], raw_ops=False, *args, **kwargs):
         """ Yield specific operations (e.g. comments) only
 
@@ -797,13 +861,23 @@ class Blockchain(object):
                       uniquely.
         """
         counter = 0
+        trx_id = transaction.get("trx_id", transaction.get("transaction_id"))
+        if trx_id is None:
+            try:
+                trx_id = self.get_transaction_id(transaction)
+            except Exception:
+                trx_id = None
         for block in self.blocks():
             counter += 1
-            for tx in block["transactions"]:
-                if sorted(
-                    tx["signatures"]
-                ) == sorted(transaction["signatures"]):
-                    return tx
+            if trx_id is not None and "transaction_ids" in block:
+                if trx_id in block["transaction_ids"]:
+                    return block["transactions"][block["transaction_ids"].index(trx_id)]
+            else:
+                for tx in block["transactions"]:
+                    if sorted(
+                        tx["signatures"]
+                    ) == sorted(transaction["signatures"]):
+                        return tx
             if counter > limit:
                 raise Exception(
                     "The operation has not been added after %d blocks!" % (limit))
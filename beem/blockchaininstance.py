@@ -24,6 +24,7 @@ from .exceptions import (
 from .wallet import Wallet
 from .hivesigner import HiveSigner
 from .transactionbuilder import TransactionBuilder
+from .broadcastqueue import BroadcastQueue
 from .utils import formatTime, resolve_authorperm, derive_permlink, sanitize_permlink, remove_from_dict, addTzInfo, formatToTimeStamp
 from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_100_PERCENT, STEEM_1_PERCENT, STEEM_RC_REGEN_TIME, CURVE_CONSTANT, \
      CURVE_CONSTANT_X4, SQUARED_CURVE_CONSTANT
@@ -562,13 +563,26 @@ class BlockChainInstance(object):
         """Returns the resource pool"""
         return self.rpc.get_resource_pool(api="rc")["resource_pool"]
 
-    def get_rc_cost(self, resource_count):
-        """Returns the RC costs based on the resource_count"""
-        pools = self.get_resource_pool()
-        params = self.get_resource_params()
+    def get_rc_regen(self):
+        """Returns the RC regeneration per block, which is used for the RC costs"""
         dyn_param = self.get_dynamic_global_properties()
-        rc_regen = int(Amount(dyn_param["total_vesting_shares"], blockchain_instance=self)) / \
+        return int(Amount(dyn_param["total_vesting_shares"], blockchain_instance=self)) / \
             (STEEM_RC_REGEN_TIME / self.get_block_interval())
+
+    def get_rc_cost(self, resource_count, pools=None, params=None, rc_regen=None):
+        """Returns the RC costs based on the resource_count
+
+            :param dict resource_count: resource counts by resource type
+            :param dict pools: resource pool, is fetched when not set
+            :param dict params: resource params, are fetched when not set
+            :param float rc_regen: RC regeneration, is calculated when not set
+        """
+        if pools is None:
+            pools = self.get_resource_pool()
+        if params is None:
+            params = self.get_resource_params()
+        if rc_regen is None:
+            rc_regen = self.get_rc_regen()
         total_cost = 0
         if rc_regen == 0:
             return total_cost
@@ -884,7 +898,9 @@ class BlockChainInstance(object):
                 signing (active, owner, posting)
             :param TransactionBuilder append_to: This allows to provide an instance of
                 TransactionBuilder (see :func:`BlockChainInstance.new_tx()`) to specify
-                where to put a specific operation.
+                where to put a specific operation. When a
+                :class:`beem.broadcastqueue.BroadcastQueue` is given, the
+                operation is queued and a future is returned.
 
             .. note:: ``append_to`` is exposed to every method used in the
                 BlockChainInstance class
@@ -908,6 +924,8 @@ class BlockChainInstance(object):
 
             # Append to the append_to and return
             append_to = kwargs["append_to"]
+            if isinstance(append_to, BroadcastQueue):
+                return append_to.append(ops, account, permission)
             parent = append_to.get_parent()
             if not isinstance(append_to, (TransactionBuilder)):
                 raise AssertionError()
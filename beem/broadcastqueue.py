@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from concurrent.futures import Future, wait
+from datetime import datetime, timedelta
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction, get_transaction_id
+from beemgraphenebase.batchsigner import BatchSigner
+from beemgraphenebase.py23 import py23_bytes
+from .transactionbuilder import TransactionBuilder
+from .refblock import get_ref_block_provider
+from .exceptions import TransactionExpired
+from .utils import addTzInfo, formatTimeString
+from beem.instance import shared_blockchain_instance
+import logging
+log = logging.getLogger(__name__)
+
+
+def _set_result(future, result):
+    if not future.cancelled():
+        future.set_result(result)
+
+
+def _set_exception(future, exception):
+    if not future.cancelled():
+        future.set_exception(exception)
+
+
+class BroadcastQueue(object):
+    """ Collects operations and broadcasts them in as few transactions and
+        RPC calls as possible.
+
+        Every queued operation returns a :class:`concurrent.futures.Future`.
+        :func:`flush` packs the operations of the same account and
+        permission into transactions of at most ``max_ops`` operations and
+        ``max_size`` serialized bytes, signs all transactions of a signer
+        with a :class:`beemgraphenebase.batchsigner.BatchSigner` and sends
+        ``batch_size`` transactions per JSON-RPC batch call. When a batch
+        fails, its transactions are sent again one by one, so that only the
+        futures of the rejected transactions receive the error.
+
+        When ``confirm`` is True, a background thread follows the new blocks
+        and resolves a future when its transaction is included into a block
+        (``block_num`` and ``trx_num`` are added to the result). Otherwise
+        the future is resolved when the node has accepted the transaction.
+        The result is the signed transaction with its ``trx_id``. All
+        operations of a transaction share its result, they fail together.
+
+        :param Hive/Steem blockchain_instance: Hive or Steem instance
+        :param int max_ops: maximum number of operations of a transaction
+        :param int max_size: maximum serialized size of the operations of
+            a transaction in bytes
+        :param int batch_size: number of transactions of a JSON-RPC batch call
+        :param int max_pending: :func:`flush` is called automatically when
+            this number of operations is queued
+        :param bool confirm: wait for the inclusion into a block
+        :param str mode: ``head`` or ``irreversible`` blocks are used for
+            the confirmation
+        :param Hive/Steem confirm_instance: instance which is used by the
+            confirmation thread, a new instance with the working nodes of
+            ``blockchain_instance`` is created when not set
+
+        .. code-block:: python
+
+            from beem.account import Account
+            from beem.broadcastqueue import BroadcastQueue
+            account = Account("holger80", blockchain_instance=hive)
+            with BroadcastQueue(blockchain_instance=hive) as queue:
+                futures = [account.transfer(receiver, amount, "HIVE", append_to=queue)
+                           for receiver, amount in payouts]
+                queue.flush()
+                results = [future.result() for future in futures]
+
+    """
+    def __init__(
+        self,
+        blockchain_instance=None,
+        max_ops=50,
+        max_size=60000,
+        batch_size=20,
+        max_pending=1000,
+        confirm=True,
+        mode="head",
+        confirm_instance=None,
+        **kwargs
+    ):
+        if blockchain_instance is None:
+            if kwargs.get("steem_instance"):
+                blockchain_instance = kwargs["steem_instance"]
+            elif kwargs.get("hive_instance"):
+                blockchain_instance = kwargs["hive_instance"]
+        self.blockchain = blockchain_instance or shared_blockchain_instance()
+        if self.blockchain.use_ledger or self.blockchain.use_sc2:
+            raise ValueError("BroadcastQueue can only sign with keys from the wallet!")
+        self.max_ops = max_ops
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.confirm = confirm
+        self.mode = mode
+        self.confirm_instance = confirm_instance
+        self.lock = threading.Lock()
+        # (account, permission, ops, future)
+        self.pending = []
+        self.pending_ops = 0
+        # trx_id -> (futures, result, expiration)
+        self.unconfirmed = {}
+        self.confirm_thread = None
+        self.confirm_block_num = None
+        # futures which are not done yet
+        self.futures = []
+        # (account, permission) -> BatchSigner
+        self.signers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+        self.close()
+
+    def close(self):
+        """ Shuts down the process pools of the signers"""
+        for signer in self.signers.values():
+            signer.close()
+
+    def append(self, ops, account, permission="active", callback=None):
+        """ Queues one operation or a list of operations, which are
+            signed by ``account`` with ``permission``, and returns a
+            future for the result
+
+            :param ops: operation or list of operations
+            :param Account account: account which signs the operations
+            :param str permission: posting, active or owner
+            :param callback: is added to the future with ``add_done_callback``
+        """
+        if permission not in ["active", "owner", "posting"]:
+            raise AssertionError("Invalid permission")
+        if not isinstance(ops, list):
+            ops = [ops]
+        if isinstance(account, dict):
+            account = account["name"]
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        with self.lock:
+            self.pending.append((account, permission, ops, future))
+            self.pending_ops += len(ops)
+            self.futures.append(future)
+            flush = self.pending_ops >= self.max_pending
+        if flush:
+            self.flush()
+        return future
+
+    def get_operations(self, ops):
+        """ Wraps the ops into Operations"""
+        if self.blockchain.is_connected() and self.blockchain.rpc.get_use_appbase():
+            appbase = not bool(self.blockchain.config["use_condenser"])
+        else:
+            appbase = False
+        return [Operation(op, appbase=appbase, prefix=self.blockchain.prefix) for op in ops]
+
+    def pack(self, items):
+        """ Packs the queued operations into transactions. Operations of the
+            same account and permission are combined in queue order.
+
+            Returns a list of dicts with ``account``, ``permission``,
+            ``ops`` and ``futures``.
+        """
+        transactions = []
+        open_transactions = {}
+        for account, permission, ops, future in items:
+            ops = self.get_operations(ops)
+            size = sum([len(py23_bytes(op)) for op in ops])
+            tx = open_transactions.get((account, permission))
+            if tx is not None and (len(tx["ops"]) + len(ops) > self.max_ops or tx["size"] + size > self.max_size):
+                tx = None
+            if tx is None:
+                tx = {"account": account, "permission": permission, "ops": [], "futures": [], "size": 0}
+                open_transactions[(account, permission)] = tx
+                transactions.append(tx)
+            tx["ops"].extend(ops)
+            tx["futures"].append(future)
+            tx["size"] += size
+        return transactions
+
+    def get_signer(self, account, permission):
+        """ Returns the :class:`beemgraphenebase.batchsigner.BatchSigner`
+            with the keys of ``account`` from the wallet
+        """
+        builder = TransactionBuilder(blockchain_instance=self.blockchain)
+        builder.appendSigner(account, permission)
+        wifs = sorted(builder.wifs)
+        signer = self.signers.get((account, permission))
+        if signer is None or sorted(signer.wifs) != wifs:
+            if signer is not None:
+                signer.close()
+            signer = BatchSigner(wifs, chain=self.blockchain.chain_params)
+            self.signers[(account, permission)] = signer
+        return signer
+
+    def flush(self):
+        """ Signs and broadcasts all queued operations and returns the list
+            of broadcasted transactions. When signing fails for an account
+            and permission, only the futures of its operations fail.
+        """
+        with self.lock:
+            items = [item for item in self.pending if item[3].set_running_or_notify_cancel()]
+            self.pending = []
+            self.pending_ops = 0
+        if not items:
+            return []
+        try:
+            transactions = self.pack(items)
+            props = self.blockchain.get_dynamic_global_properties(use_stored_data=False)
+            ref_block_num, ref_block_prefix = get_ref_block_provider(self.blockchain).get_block_params()
+            now = formatTimeString(props["time"]).replace(tzinfo=None)
+            expiration = now + timedelta(seconds=int(self.blockchain.expiration))
+            expiration = expiration.replace(microsecond=0).isoformat()
+            for tx in transactions:
+                tx["tx"] = Signed_Transaction(
+                    ref_block_prefix=ref_block_prefix,
+                    expiration=expiration,
+                    operations=tx["ops"],
+                    ref_block_num=ref_block_num,
+                    custom_chains=self.blockchain.custom_chains,
+                    prefix=self.blockchain.prefix
+                )
+        except Exception as e:
+            for account, permission, ops, future in items:
+                _set_exception(future, e)
+            return []
+
+        # A signing error (e.g. a missing key) fails only the transactions of this signer
+        failed = set()
+        for key in set([(tx["account"], tx["permission"]) for tx in transactions]):
+            signer_transactions = [tx for tx in transactions if (tx["account"], tx["permission"]) == key]
+            try:
+                self.get_signer(*key).sign([tx["tx"] for tx in signer_transactions])
+            except Exception as e:
+                log.debug("Signing for %s (%s) failed: %s" % (key[0], key[1], str(e)))
+                failed.add(key)
+                for tx in signer_transactions:
+                    for future in tx["futures"]:
+                        _set_exception(future, e)
+        transactions = [tx for tx in transactions if (tx["account"], tx["permission"]) not in failed]
+        if not transactions:
+            return []
+
+        results = []
+        for tx in transactions:
+            result = tx["tx"].json()
+            result["trx_id"] = tx["tx"].id
+            results.append(result)
+        errors = self.submit(results)
+        if self.confirm and not self.blockchain.nobroadcast and self.confirm_block_num is None:
+            self.confirm_block_num = props["head_block_number"]
+        for tx, result, error in zip(transactions, results, errors):
+            if error is not None:
+                for future in tx["futures"]:
+                    _set_exception(future, error)
+            elif self.confirm and not self.blockchain.nobroadcast:
+                self.track(result, tx["futures"])
+            else:
+                for future in tx["futures"]:
+                    _set_result(future, result)
+        with self.lock:
+            self.futures = [future for future in self.futures if not future.done()]
+        if self.confirm:
+            self.start_confirmation()
+        return results
+
+    def submit(self, transactions):
+        """ Broadcasts signed transactions in JSON-RPC batches and returns
+            for every transaction None or the exception of the node
+        """
+        if self.blockchain.nobroadcast:
+            log.info("Not broadcasting anything!")
+            return [None] * len(transactions)
+        errors = []
+        for i in range(0, len(transactions), self.batch_size):
+            batch = transactions[i:i + self.batch_size]
+            try:
+                self.broadcast_batch(batch)
+                errors.extend([None] * len(batch))
+                continue
+            except Exception as e:
+                log.debug("Batch broadcast failed: %s" % str(e))
+            # Find out which transactions were rejected
+            for tx in batch:
+                try:
+                    self.broadcast_batch([tx])
+                    errors.append(None)
+                except Exception as e:
+                    if "duplicate" in str(e).lower():
+                        errors.append(None)
+                    else:
+                        errors.append(e)
+        return errors
+
+    def broadcast_batch(self, transactions):
+        """ Sends the transactions in one JSON-RPC batch call"""
+        use_condenser_api = bool(self.blockchain.config["use_condenser"])
+        self.blockchain.rpc.set_next_node_on_empty_reply(False)
+        for i, tx in enumerate(transactions):
+            add_to_queue = i < len(transactions) - 1
+            tx = dict(tx)
+            tx.pop("trx_id", None)
+            if use_condenser_api:
+                self.blockchain.rpc.broadcast_transaction(tx, api="condenser", add_to_queue=add_to_queue)
+            else:
+                self.blockchain.rpc.broadcast_transaction({'trx': tx, 'max_block_age': -1},
+                                                          api="network_broadcast", add_to_queue=add_to_queue)
+
+    def track(self, result, futures):
+        """ Waits for the inclusion of the broadcasted transaction
+            ``result`` into a block, ``futures`` are resolved then
+        """
+        expiration = formatTimeString(result["expiration"])
+        with self.lock:
+            self.unconfirmed[result["trx_id"]] = (futures, result, expiration)
+
+    def start_confirmation(self):
+        """ Starts the confirmation thread"""
+        with self.lock:
+            if not self.unconfirmed or self.confirm_thread is not None:
+                return
+            self.confirm_thread = threading.Thread(target=self._confirm_loop)
+            self.confirm_thread.daemon = True
+            self.confirm_thread.start()
+
+    def get_confirm_instance(self):
+        if self.confirm_instance is None:
+            self.confirm_instance = self.blockchain.__class__(
+                node=self.blockchain.rpc.nodes.export_working_nodes(),
+                num_retries=self.blockchain.rpc.num_retries,
+                num_retries_call=self.blockchain.rpc.num_retries_call,
+                timeout=self.blockchain.rpc.timeout)
+        return self.confirm_instance
+
+    def _confirm_loop(self):
+        from .blockchain import Blockchain
+        blockchain = None
+        while True:
+            with self.lock:
+                if not self.unconfirmed:
+                    self.confirm_thread = None
+                    return
+            try:
+                if blockchain is None:
+                    blockchain = Blockchain(blockchain_instance=self.get_confirm_instance(), mode=self.mode)
+                current_block_num = blockchain.get_current_block_num()
+                if self.confirm_block_num > current_block_num:
+                    time.sleep(blockchain.block_interval)
+                    continue
+                for block in blockchain.blocks(start=self.confirm_block_num, stop=current_block_num):
+                    self.confirm_block(block)
+                    self.confirm_block_num = block.block_num + 1
+            except Exception as e:
+                log.warning("Confirmation failed: %s" % str(e))
+                time.sleep(3)
+
+    def confirm_block(self, block):
+        """ Resolves the futures of the transactions of ``block`` and fails
+            the transactions which expired before the block
+        """
+        if "transaction_ids" in block:
+            trx_ids = block["transaction_ids"]
+        else:
+            trx_ids = []
+            for tx in block["transactions"]:
+                try:
+                    trx_ids.append(get_transaction_id(tx, prefix=self.blockchain.prefix))
+                except ValueError:
+                    # the trx_id of non-protocol operations cannot be computed locally,
+                    # these transactions were not broadcasted by BroadcastQueue
+                    trx_ids.append(None)
+        timestamp = block["timestamp"]
+        if not isinstance(timestamp, datetime):
+            timestamp = formatTimeString(timestamp)
+        timestamp = addTzInfo(timestamp)
+        confirmed = []
+        expired = []
+        with self.lock:
+            for trx_num, trx_id in enumerate(trx_ids):
+                entry = self.unconfirmed.pop(trx_id, None)
+                if entry is not None:
+                    confirmed.append((entry, trx_num))
+            for trx_id in list(self.unconfirmed.keys()):
+                if self.unconfirmed[trx_id][2] < timestamp:
+                    expired.append(self.unconfirmed.pop(trx_id))
+        for (futures, result, expiration), trx_num in confirmed:
+            result = dict(result)
+            result["block_num"] = block.block_num
+            result["trx_num"] = trx_num
+            for future in futures:
+                _set_result(future, result)
+        for futures, result, expiration in expired:
+            for future in futures:
+                _set_exception(future, TransactionExpired(result["trx_id"]))
+        if confirmed or expired:
+            with self.lock:
+                self.futures = [future for future in self.futures if not future.done()]
+
+    def wait(self, timeout=None):
+        """ Flushes the queue and waits until all futures are done,
+            returns the futures which are not done after ``timeout``
+
+            :param float timeout: maximum time to wait in seconds
+        """
+        self.flush()
+        with self.lock:
+            futures = list(self.futures)
+        done, not_done = wait(futures, timeout=timeout)
+        with self.lock:
+            self.futures = [future for future in self.futures if not future.done()]
+        return not_done
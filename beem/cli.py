@@ -42,7 +42,6 @@ from beem.transactionbuilder import TransactionBuilder
 from timeit import default_timer as timer
 from beembase import operations
 from beemgraphenebase.account import PrivateKey, PublicKey, BrainKey, PasswordKey, MnemonicKey, Mnemonic
-from beemgraphenebase.base58 import Base58
 from beem.nodelist import NodeList, node_answer_time
 from beem.conveyor import Conveyor
 from beem.imageuploader import ImageUploader
@@ -4703,20 +4702,13 @@ def verify(blocknumber, trx, use_api):
     t = PrettyTable(["trx", "Signer key", "Account"])
     t.align = "l"
     if not use_api:
-        from beembase.signedtransactions import Signed_Transaction
-    for trx in trxs:
-        if not use_api:
-            # trx is now identical to the output of get_transaction
-            # This is just for testing porpuse
-            if True:
-                signed_tx = Signed_Transaction(trx.copy())
-            else:
-                tx = b.get_transaction(trx["transaction_id"])
-                signed_tx = Signed_Transaction(tx)
-            public_keys = []
-            for key in signed_tx.verify(chain=stm.chain_params, recover_parameter=True):
-                public_keys.append(format(Base58(key, prefix=stm.prefix), stm.prefix))
+        from beembase.signatureverifier import SignatureVerifier
+        signers = SignatureVerifier(chain=stm.chain_params, prefix=stm.prefix).verify_transactions(trxs)
+    for trx_num, trx in enumerate(trxs):
+        if not use_api and signers[trx_num] is not None:
+            public_keys = sorted(signers[trx_num])
         else:
+            # transactions which cannot be serialized locally are checked by the node
             tx = TransactionBuilder(tx=trx, blockchain_instance=stm)
             public_keys = tx.get_potential_signatures()
         accounts = []
@@ -145,3 +145,9 @@ class BlockWaitTimeExceeded(Exception):
     """ Wait time for new block exceeded
     """
     pass
+
+
+class TransactionExpired(Exception):
+    """ The transaction was not included into a block before it expired
+    """
+    pass
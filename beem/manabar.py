@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import datetime, timedelta
+from decimal import Decimal
+from beem.instance import shared_blockchain_instance
+from beem.amount import Amount
+from beem.utils import formatTimeString, addTzInfo
+from beemgraphenebase.py23 import integer_types, string_types
+from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_100_PERCENT, STEEM_VOTING_MANA_REGENERATION_SECONDS, \
+    CURVE_CONSTANT, CURVE_CONSTANT_X4, SQUARED_CURVE_CONSTANT
+log = logging.getLogger(__name__)
+NUMPY_MODULE = None
+if not NUMPY_MODULE:
+    try:
+        import numpy as np
+        NUMPY_MODULE = "numpy"
+    except ImportError:
+        NUMPY_MODULE = None
+
+# Rows containing integers above this limit cannot be converted to float64
+# without rounding and are calculated with python integers instead
+MAX_EXACT_INT = 2 ** 53
+EPOCH = addTzInfo(datetime(1970, 1, 1))
+
+
+def time_to_microseconds(t):
+    """ Converts a datetime, a time string or unix seconds into microseconds since epoch
+    """
+    if isinstance(t, integer_types):
+        return t * 1000000
+    if isinstance(t, string_types):
+        t = formatTimeString(t)
+    delta = addTzInfo(t) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def vests_to_satoshi(vests):
+    """ Converts a VESTS amount (Amount, string, NAI dict or legacy list) into an integer
+        in units of 10^-6 VESTS
+    """
+    if vests is None:
+        return 0
+    if isinstance(vests, Amount):
+        return int(vests)
+    if isinstance(vests, dict):
+        return int(vests["amount"])
+    if isinstance(vests, (list, tuple)):
+        return int(vests[0])
+    if isinstance(vests, string_types):
+        return int(Decimal(vests.split(" ")[0]) * 1000000)
+    return int(vests)
+
+
+class ManabarTable(object):
+    """ Packs the voting and downvoting manabars of many accounts into numpy arrays,
+        so that the current mana, voting power, recharge time and vote value of all
+        accounts can be calculated in one vectorized pass.
+
+        The results are identical to the ones of
+        :func:`beem.account.Account.get_manabar`,
+        :func:`beem.account.Account.get_downvote_manabar`,
+        :func:`beem.account.Account.get_voting_power` and
+        :func:`beem.account.Account.get_voting_value`.
+
+        :param list accounts: list of :class:`beem.account.Account` objects,
+            a :class:`beem.account.Accounts` object or a list of account dicts
+            as returned by the API
+        :param Steem blockchain_instance: Steem instance
+
+        .. code-block:: python
+
+            >>> from beem.account import Accounts
+            >>> from beem.manabar import ManabarTable
+            >>> from beem import Hive
+            >>> hv = Hive("https://api.hive.blog")
+            >>> table = ManabarTable(Accounts(["gtg", "holger80"], blockchain_instance=hv), blockchain_instance=hv)
+            >>> vp = table.get_voting_power()
+
+    """
+    def __init__(self, accounts, blockchain_instance=None, **kwargs):
+        if NUMPY_MODULE is None:
+            raise ImportError("Missing dependency: numpy")
+        if blockchain_instance is None:
+            if kwargs.get("steem_instance"):
+                blockchain_instance = kwargs["steem_instance"]
+            elif kwargs.get("hive_instance"):
+                blockchain_instance = kwargs["hive_instance"]
+        self.blockchain = blockchain_instance or shared_blockchain_instance()
+        names = []
+        vests = []
+        effective_vests = []
+        last_mana = []
+        last_update_time = []
+        has_manabar = []
+        last_down_mana = []
+        last_down_update_time = []
+        has_downvote_manabar = []
+        legacy_voting_power = []
+        last_vote_time = []
+        for account in accounts:
+            names.append(account["name"])
+            own_vests = vests_to_satoshi(account.get("vesting_shares"))
+            if "delegated_vesting_shares" in account and "received_vesting_shares" in account:
+                own_vests = own_vests - vests_to_satoshi(account["delegated_vesting_shares"]) + \
+                    vests_to_satoshi(account["received_vesting_shares"])
+            vests.append(own_vests)
+            effective_vests.append(self._get_effective_vesting_shares(account, own_vests))
+            if "voting_manabar" in account:
+                has_manabar.append(True)
+                last_mana.append(int(account["voting_manabar"]["current_mana"]))
+                last_update_time.append(int(account["voting_manabar"]["last_update_time"]))
+            else:
+                has_manabar.append(False)
+                last_mana.append(0)
+                last_update_time.append(0)
+            if "downvote_manabar" in account:
+                has_downvote_manabar.append(True)
+                last_down_mana.append(int(account["downvote_manabar"]["current_mana"]))
+                last_down_update_time.append(int(account["downvote_manabar"]["last_update_time"]))
+            else:
+                has_downvote_manabar.append(False)
+                last_down_mana.append(0)
+                last_down_update_time.append(0)
+            legacy_voting_power.append(int(account.get("voting_power", 0)))
+            if account.get("last_vote_time") is not None:
+                last_vote_time.append(time_to_microseconds(account["last_vote_time"]))
+            else:
+                last_vote_time.append(0)
+        self.names = names
+        self.vests = np.array(vests, dtype=np.int64)
+        self.effective_vests = np.array(effective_vests, dtype=np.int64)
+        self.last_mana = np.array(last_mana, dtype=np.int64)
+        self.last_update_time = np.array(last_update_time, dtype=np.int64)
+        self.has_manabar = np.array(has_manabar, dtype=bool)
+        self.last_down_mana = np.array(last_down_mana, dtype=np.int64)
+        self.last_down_update_time = np.array(last_down_update_time, dtype=np.int64)
+        self.has_downvote_manabar = np.array(has_downvote_manabar, dtype=bool)
+        self.legacy_voting_power = np.array(legacy_voting_power, dtype=np.int64)
+        self.last_vote_time = np.array(last_vote_time, dtype=np.int64)
+        self._min_max_mana = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        """ Returns the row of an account"""
+        return self.names.index(name)
+
+    @staticmethod
+    def _get_effective_vesting_shares(account, vesting_shares):
+        next_vesting_withdrawal = account.get("next_vesting_withdrawal")
+        if next_vesting_withdrawal is None:
+            return vesting_shares
+        if time_to_microseconds(next_vesting_withdrawal) > 0 and "vesting_withdraw_rate" in account and \
+           "to_withdraw" in account and "withdrawn" in account:
+            vesting_shares -= min(vests_to_satoshi(account["vesting_withdraw_rate"]),
+                                  int(account["to_withdraw"]) - int(account["withdrawn"]))
+        return vesting_shares
+
+    def _get_min_max_mana(self):
+        """ Returns the max_mana which is used for accounts without effective vests"""
+        if self._min_max_mana is None:
+            props = self.blockchain.get_chain_properties()
+            required_fee_token = Amount(props["account_creation_fee"], blockchain_instance=self.blockchain)
+            self._min_max_mana = (int(self.blockchain.token_power_to_vests(required_fee_token)),
+                                  int(self.blockchain.token_power_to_vests(required_fee_token) / 4))
+        return self._min_max_mana
+
+    @staticmethod
+    def _get_now(now):
+        if now is None:
+            now = datetime.utcnow()
+        return time_to_microseconds(now)
+
+    @staticmethod
+    def _regenerate(last_mana, last_update_time, max_mana, now):
+        """ Returns current_mana and current_mana_pct for a single row with python numbers"""
+        diff_in_seconds = (now - last_update_time * 1000000) / 1000000
+        current_mana = int(last_mana + diff_in_seconds * max_mana / STEEM_VOTING_MANA_REGENERATION_SECONDS)
+        if current_mana > max_mana:
+            current_mana = max_mana
+        if max_mana > 0:
+            current_mana_pct = current_mana / max_mana * 100
+        else:
+            current_mana_pct = 0
+        return current_mana, current_mana_pct
+
+    def _get_manabar(self, last_mana, last_update_time, max_mana, now):
+        diff_in_seconds = (now - last_update_time * 1000000) / 1e6
+        current_mana = (last_mana.astype(np.float64) + diff_in_seconds * max_mana /
+                        STEEM_VOTING_MANA_REGENERATION_SECONDS).astype(np.int64)
+        current_mana = np.where(current_mana > max_mana, max_mana, current_mana)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            current_mana_pct = np.where(max_mana > 0, current_mana / max_mana * 100, 0.)
+        unsafe = np.nonzero((np.abs(last_mana) >= MAX_EXACT_INT) | (np.abs(max_mana) >= MAX_EXACT_INT))[0]
+        if len(unsafe) > 0:
+            current_mana = current_mana.astype(object)
+            for i in unsafe:
+                max_mana_i = max_mana[i].item()
+                current_mana[i], current_mana_pct[i] = self._regenerate(int(last_mana[i]), int(last_update_time[i]),
+                                                                        max_mana_i, now)
+        return {"last_mana": last_mana, "last_update_time": last_update_time, "current_mana": current_mana,
+                "max_mana": max_mana, "current_mana_pct": current_mana_pct}
+
+    def get_manabar(self, now=None):
+        """ Returns the voting manabar of all accounts as dict of arrays
+
+            :param datetime now: time for which the manabar is calculated (default is utcnow)
+
+            The returned dict has the same keys as :func:`beem.account.Account.get_manabar`
+        """
+        now = self._get_now(now)
+        max_mana = self.effective_vests
+        if np.any(max_mana == 0):
+            max_mana = np.where(max_mana == 0, self._get_min_max_mana()[0], max_mana)
+        return self._get_manabar(self.last_mana, self.last_update_time, max_mana, now)
+
+    def get_downvote_manabar(self, now=None):
+        """ Returns the downvote manabar of all accounts as dict of arrays.
+            The ``has_downvote_manabar`` array marks the accounts with a downvote manabar.
+
+            :param datetime now: time for which the manabar is calculated (default is utcnow)
+        """
+        now = self._get_now(now)
+        max_mana = self.effective_vests / 4
+        if np.any(max_mana == 0):
+            max_mana = np.where(max_mana == 0, float(self._get_min_max_mana()[1]), max_mana)
+        manabar = self._get_manabar(self.last_down_mana, self.last_down_update_time, max_mana, now)
+        manabar["has_downvote_manabar"] = self.has_downvote_manabar
+        return manabar
+
+    @staticmethod
+    def _limit_power(total_vp):
+        total_vp = np.where(total_vp > 100, 100., total_vp)
+        return np.where(total_vp < 0, 0., total_vp)
+
+    def _get_power(self, manabar, with_regeneration):
+        if with_regeneration:
+            return manabar["current_mana_pct"].astype(np.float64)
+        max_mana = manabar["max_mana"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total_vp = np.where(max_mana > 0, manabar["last_mana"] / max_mana * 100, 0.)
+        unsafe = np.nonzero((np.abs(manabar["last_mana"]) >= MAX_EXACT_INT) | (np.abs(max_mana) >= MAX_EXACT_INT))[0]
+        for i in unsafe:
+            total_vp[i] = int(manabar["last_mana"][i]) / max_mana[i].item() * 100
+        return total_vp
+
+    def get_voting_power(self, now=None, with_regeneration=True):
+        """ Returns the voting power of all accounts in the range of 0-100%
+
+            :param datetime now: time for which the voting power is calculated (default is utcnow)
+            :param bool with_regeneration: When True, voting power regeneration is
+                included into the result (default True)
+        """
+        total_vp = self._get_power(self.get_manabar(now=now), with_regeneration)
+        if not np.all(self.has_manabar):
+            if with_regeneration:
+                diff_in_seconds = (self._get_now(now) - self.last_vote_time) / 1e6
+                regenerated_vp = diff_in_seconds * STEEM_100_PERCENT / STEEM_VOTE_REGENERATION_SECONDS / 100
+            else:
+                regenerated_vp = 0
+            total_vp = np.where(self.has_manabar, total_vp, self.legacy_voting_power / 100 + regenerated_vp)
+        return self._limit_power(total_vp)
+
+    def get_downvoting_power(self, now=None, with_regeneration=True):
+        """ Returns the downvoting power of all accounts in the range of 0-100%
+
+            :param datetime now: time for which the downvoting power is calculated (default is utcnow)
+            :param bool with_regeneration: When True, downvoting power regeneration is
+                included into the result (default True)
+        """
+        total_down_vp = self._get_power(self.get_downvote_manabar(now=now), with_regeneration)
+        return np.where(self.has_downvote_manabar, self._limit_power(total_down_vp), 0.)
+
+    def get_recharge_seconds(self, voting_power_goal=100, now=None):
+        """ Returns the seconds until the voting power of each account reaches voting_power_goal
+
+            :param float voting_power_goal: voting power goal in percentage (default is 100)
+            :param datetime now: start time (default is utcnow)
+        """
+        missing_vp = voting_power_goal - self.get_voting_power(now=now)
+        return np.where(missing_vp < 0, 0., missing_vp * 100 * STEEM_VOTING_MANA_REGENERATION_SECONDS / STEEM_100_PERCENT)
+
+    def get_recharge_timedelta(self, voting_power_goal=100, now=None):
+        """ Returns the voting power recharge time of each account as list of timedelta objects
+
+            :param float voting_power_goal: voting power goal in percentage (default is 100)
+            :param datetime now: start time (default is utcnow)
+        """
+        missing_vp = voting_power_goal - self.get_voting_power(now=now)
+        recharge_seconds = missing_vp * 100 * STEEM_VOTING_MANA_REGENERATION_SECONDS / STEEM_100_PERCENT
+        return [0 if missing < 0 else timedelta(seconds=seconds) for missing, seconds in zip(missing_vp.tolist(),
+                                                                                                 recharge_seconds.tolist())]
+
+    def get_token_power(self):
+        """ Returns the Hive/Steem power of all accounts (own vests + delegations)"""
+        token_per_mvest = self.blockchain.get_token_per_mvest()
+        return self.vests / 1e6 / 1e6 * token_per_mvest
+
+    def _get_backed_token_per_rshares(self):
+        """ Returns reward_balance, recent_claims and the median price of the reward fund"""
+        reward_fund = self.blockchain.get_reward_funds()
+        reward_balance = float(Amount(reward_fund["reward_balance"], blockchain_instance=self.blockchain))
+        recent_claims = float(reward_fund["recent_claims"])
+        median_price = self.blockchain.get_median_price()
+        if median_price is None:
+            return reward_balance, recent_claims, None
+        price = float(median_price * (Amount(1, self.blockchain.token_symbol, blockchain_instance=self.blockchain)))
+        return reward_balance, recent_claims, price
+
+    def get_voting_value(self, post_rshares=0, voting_weight=100, now=None, not_broadcasted_vote=True):
+        """ Returns the vote value of all accounts in HBD/SBD
+
+            :param int post_rshares: rshares of post which is voted
+            :param float voting_weight: vote weight in percentage (default is 100)
+            :param datetime now: time for which the voting power is calculated (default is utcnow)
+            :param bool not_broadcasted_vote: not_broadcasted or already broadcasted vote (True = not_broadcasted vote).
+        """
+        voting_power = self.get_voting_power(now=now) * 100
+        vote_pct = voting_weight * 100
+        token_per_mvest = self.blockchain.get_token_per_mvest()
+        token_power = self.vests / 1e6 / 1e6 * token_per_mvest
+        vests = np.trunc(token_power * 1e6 / token_per_mvest)
+
+        used_power = np.trunc((voting_power * abs(vote_pct)) / STEEM_100_PERCENT * (60 * 60 * 24))
+        max_vote_denom = self.blockchain._max_vote_denom()
+        used_power = np.trunc((used_power + max_vote_denom - 1) / max_vote_denom)
+        rshares = np.trunc(np.copysign(vests * 1e6 * used_power / STEEM_100_PERCENT, vote_pct))
+        dust_threshold = self.blockchain.get_dust_threshold()
+        is_dust = np.abs(rshares) <= dust_threshold
+        rshares = rshares - np.copysign(dust_threshold, vote_pct)
+
+        post_rshares_normalized = post_rshares + CURVE_CONSTANT
+        post_rshares_curve = (post_rshares_normalized * post_rshares_normalized - SQUARED_CURVE_CONSTANT) / (post_rshares + CURVE_CONSTANT_X4)
+        post_rshares_after_vote_normalized = post_rshares + rshares + float(CURVE_CONSTANT)
+        post_rshares_curve_after_vote = (post_rshares_after_vote_normalized * post_rshares_after_vote_normalized - float(SQUARED_CURVE_CONSTANT)) / (post_rshares + rshares + float(CURVE_CONSTANT_X4))
+        rshares = np.where(is_dust, 0., post_rshares_curve_after_vote - post_rshares_curve)
+
+        reward_balance, recent_claims, price = self._get_backed_token_per_rshares()
+        if price is None:
+            return np.zeros(len(self))
+        if not_broadcasted_vote:
+            recent_claims = recent_claims + rshares
+        else:
+            recent_claims = recent_claims + np.zeros(len(self))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vote_value = np.where(recent_claims == 0, 0., rshares * (reward_balance / recent_claims * price))
+
+        unsafe = np.nonzero(np.abs(self.vests) >= MAX_EXACT_INT)[0]
+        for i in unsafe:
+            token_power_i = float(Decimal(int(self.vests[i])) / 1000000) / 1e6 * token_per_mvest
+            vote_value[i] = self.blockchain.token_power_to_token_backed_dollar(
+                token_power_i, post_rshares=post_rshares, voting_power=voting_power[i].item(), vote_pct=vote_pct,
+                not_broadcasted_vote=not_broadcasted_vote)
+        return vote_value
@@ -4,22 +4,13 @@ from fractions import Fraction
 from beem.instance import shared_blockchain_instance
 from .exceptions import InvalidAssetException
 from .account import Account
-from .amount import Amount, quantize
-from .asset import Asset
+from .amount import Amount, quantize, check_asset
+from .asset import Asset, AssetDescriptor, get_asset_table
 from .utils import formatTimeString
 from .utils import parse_time, assets_from_string
 from decimal import Decimal
 
 
-def check_asset(other, self, stm):
-    if isinstance(other, dict) and "asset" in other and isinstance(self, dict) and "asset" in self:
-        if not Asset(other["asset"], blockchain_instance=stm) == Asset(self["asset"], blockchain_instance=stm):
-            raise AssertionError()
-    else:
-        if not other == self:
-            raise AssertionError()
-
-
 class Price(dict):
     """ This class deals with all sorts of prices of any pair of assets to
         simplify dealing with the tuple::
@@ -98,8 +89,8 @@ class Price(dict):
             import re
             price, assets = price.split(" ")
             base_symbol, quote_symbol = assets_from_string(assets)
-            base = Asset(base_symbol, blockchain_instance=self.blockchain)
-            quote = Asset(quote_symbol, blockchain_instance=self.blockchain)
+            base = get_asset_table(self.blockchain).get_descriptor(base_symbol)
+            quote = get_asset_table(self.blockchain).get_descriptor(quote_symbol)
             frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
             self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
             self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
@@ -118,14 +109,14 @@ class Price(dict):
             #    self["quote"] = Amount(price["base"], blockchain_instance=self.blockchain)
             #    self["base"] = Amount(price["quote"], blockchain_instance=self.blockchain)
 
-        elif (price is not None and isinstance(base, Asset) and isinstance(quote, Asset)):
+        elif (price is not None and isinstance(base, (Asset, AssetDescriptor)) and isinstance(quote, (Asset, AssetDescriptor))):
             frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
             self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
             self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
 
         elif (price is not None and isinstance(base, string_types) and isinstance(quote, string_types)):
-            base = Asset(base, blockchain_instance=self.blockchain)
-            quote = Asset(quote, blockchain_instance=self.blockchain)
+            base = get_asset_table(self.blockchain).get_descriptor(base)
+            quote = get_asset_table(self.blockchain).get_descriptor(quote)
             frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
             self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
             self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
@@ -150,8 +141,8 @@ class Price(dict):
                 isinstance(base, string_types)):
             import re
             base_symbol, quote_symbol = assets_from_string(base)
-            base = Asset(base_symbol, blockchain_instance=self.blockchain)
-            quote = Asset(quote_symbol, blockchain_instance=self.blockchain)
+            base = get_asset_table(self.blockchain).get_descriptor(base_symbol)
+            quote = get_asset_table(self.blockchain).get_descriptor(quote_symbol)
             frac = Fraction(float(price)).limit_denominator(10 ** base["precision"])
             self["quote"] = Amount(amount=frac.denominator, asset=quote, blockchain_instance=self.blockchain)
             self["base"] = Amount(amount=frac.numerator, asset=base, blockchain_instance=self.blockchain)
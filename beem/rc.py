@@ -1,23 +1,42 @@
 # -*- coding: utf-8 -*-
 import logging
 import json
+import time
 from .instance import shared_blockchain_instance
-from beem.constants import state_object_size_info, resource_execution_time, EXEC_FOLLOW_CUSTOM_OP_SCALE
+from beem.constants import state_object_size_info, resource_execution_time, EXEC_FOLLOW_CUSTOM_OP_SCALE, RC_DEFAULT_EXEC_COST
 import hashlib
-from binascii import hexlify, unhexlify
+from binascii import unhexlify
 import os
 from pprint import pprint
 from beem.amount import Amount
 from beembase import operations
 from beembase.objects import Operation
-from beembase.signedtransactions import Signed_Transaction
 from beemgraphenebase.py23 import py23_bytes, bytes_types
+from beemgraphenebase.types import varint
 
 
 class RC(object):
+    """ Calculates RC costs of operations
+
+        The resource pool, the resource params and the RC regeneration are
+        fetched at most once per ``ttl`` seconds. They can also be set with
+        :func:`set_rc_params`, e.g. for estimating without a node.
+
+        :param Hive/Steem blockchain_instance: Hive or Steem instance
+        :param float ttl: lifetime of the fetched resource params in seconds,
+            when None they are fetched only once
+
+        .. code-block:: python
+
+            from beem.rc import RC
+            rc = RC(blockchain_instance=hive)
+            costs = rc.estimate_operations(custom_json_ops)
+
+    """
     def __init__(
         self,
         blockchain_instance=None,
+        ttl=60,
         **kwargs
     ):
         if blockchain_instance is None:
@@ -26,23 +45,120 @@ class RC(object):
             elif kwargs.get("hive_instance"):
                 blockchain_instance = kwargs["hive_instance"]
         self.blockchain = blockchain_instance or shared_blockchain_instance()
+        self.ttl = ttl
+        self.rc_params = None
+        self.rc_params_updated = None
+
+    def set_rc_params(self, pools, params, rc_regen):
+        """ Sets the resource pool, the resource params and the RC regeneration
+
+            :param dict pools: resource pool (see :func:`beem.blockchaininstance.BlockChainInstance.get_resource_pool`)
+            :param dict params: resource params (see :func:`beem.blockchaininstance.BlockChainInstance.get_resource_params`)
+            :param float rc_regen: RC regeneration (see :func:`beem.blockchaininstance.BlockChainInstance.get_rc_regen`)
+        """
+        self.rc_params = (pools, params, rc_regen)
+        self.rc_params_updated = time.time()
+
+    def get_rc_params(self):
+        """Returns the resource pool, the resource params and the RC regeneration, which are fetched when
+        they are older than ``ttl``"""
+        if self.rc_params is None or (self.ttl is not None and time.time() - self.rc_params_updated >= self.ttl):
+            self.set_rc_params(self.blockchain.get_resource_pool(), self.blockchain.get_resource_params(),
+                               self.blockchain.get_rc_regen())
+        return self.rc_params
+
+    def get_rc_cost(self, resource_count):
+        """Returns the RC costs of the resource_count"""
+        pools, params, rc_regen = self.get_rc_params()
+        return self.blockchain.get_rc_cost(resource_count, pools=pools, params=params, rc_regen=rc_regen)
 
     def get_tx_size(self, op):
         """Returns the tx size of an operation"""
-        ops = [Operation(op)]
-        prefix = u"STEEM"
-        wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
-        ref_block_num = 34294
-        ref_block_prefix = 3707022213
-        expiration = "2016-04-06T08:29:27"
-        tx = Signed_Transaction(ref_block_num=ref_block_num,
-                                ref_block_prefix=ref_block_prefix,
-                                expiration=expiration,
-                                operations=ops)
-        tx = tx.sign([wif], chain=prefix)
-        txWire = hexlify(py23_bytes(tx)).decode("ascii")
-        tx_size = len(txWire)
-        return tx_size
+        return self.get_ops_tx_size([op])
+
+    def get_ops_tx_size(self, ops):
+        """Returns the tx size of a transaction with one signature, which contains ops. The operations
+        are serialized, but nothing is signed."""
+        # ref_block_num, ref_block_prefix, expiration, operations, extensions and one signature
+        tx_size = 2 + 4 + 4 + len(varint(len(ops))) + 1 + 1 + 65
+        for op in ops:
+            if not isinstance(op, Operation):
+                op = Operation(op)
+            tx_size += len(py23_bytes(op))
+        # The tx size is the length of the hex string
+        return 2 * tx_size
+
+    def get_op_resources(self, op):
+        """Returns execution time, state bytes, new account op count and market op count of an operation"""
+        if not isinstance(op, Operation):
+            op = Operation(op)
+        name = op.name.lower()
+        execution_time_count = resource_execution_time.get(name + "_operation_exec_time", RC_DEFAULT_EXEC_COST)
+        state_bytes_count = 0
+        new_account_op_count = 0
+        market_op_count = 0
+        if name == "comment":
+            data = op.op.toJson()
+            state_bytes_count = state_object_size_info["comment_object_base_size"]
+            state_bytes_count += state_object_size_info["comment_object_permlink_char_size"] * len(data["permlink"])
+            state_bytes_count += state_object_size_info["comment_object_parent_permlink_char_size"] * len(data["parent_permlink"])
+        elif name == "vote":
+            state_bytes_count = state_object_size_info["comment_vote_object_base_size"]
+        elif name == "transfer":
+            market_op_count = 1
+        elif name == "custom_json":
+            if op.op.toJson()["id"] == "follow":
+                execution_time_count *= EXEC_FOLLOW_CUSTOM_OP_SCALE
+        elif name == "claim_account":
+            new_account_op_count = 1
+        elif name in ["account_create", "create_claimed_account"]:
+            data = op.op.toJson()
+            state_bytes_count = state_object_size_info["account_object_base_size"]
+            state_bytes_count += state_object_size_info["account_authority_object_base_size"]
+            state_bytes_count += self.get_authority_byte_count(data["owner"])
+            state_bytes_count += self.get_authority_byte_count(data["active"])
+            state_bytes_count += self.get_authority_byte_count(data["posting"])
+            execution_time_count = resource_execution_time["account_update_operation_exec_time"]
+        return execution_time_count, state_bytes_count, new_account_op_count, market_op_count
+
+    def get_ops_resource_count(self, ops):
+        """Returns the resource_count of a transaction which contains ops"""
+        execution_time_count = 0
+        state_bytes_count = 0
+        new_account_op_count = 0
+        market_op_count = 0
+        ops = [op if isinstance(op, Operation) else Operation(op) for op in ops]
+        for op in ops:
+            resources = self.get_op_resources(op)
+            execution_time_count += resources[0]
+            state_bytes_count += resources[1]
+            new_account_op_count += resources[2]
+            market_op_count += resources[3]
+        tx_size = self.get_ops_tx_size(ops)
+        return self.get_resource_count(tx_size, execution_time_count, state_bytes_count=state_bytes_count,
+                                       new_account_op_count=new_account_op_count, market_op_count=market_op_count)
+
+    def estimate_operations(self, ops):
+        """Returns the RC costs of each operation, when every operation is broadcasted in its own transaction
+
+        Example for estimating the RC costs of many custom_json operations
+
+        .. code-block:: python
+
+            from beem.rc import RC
+            from beembase import operations
+            ops = [operations.Custom_json(**{"json": {"n": i}, "required_auths": [],
+                                             "required_posting_auths": ["holger80"], "id": "test"})
+                   for i in range(1000)]
+            rc = RC()
+            costs = rc.estimate_operations(ops)
+
+        """
+        return [self.get_rc_cost(self.get_ops_resource_count([op])) for op in ops]
+
+    def estimate_transaction(self, ops):
+        """Returns the RC costs of a transaction which contains all ops"""
+        return self.get_rc_cost(self.get_ops_resource_count(ops))
 
     def get_resource_count(self, tx_size, execution_time_count, state_bytes_count=0, new_account_op_count=0, market_op_count=0):
         """Creates the resource_count dictionary based on tx_size, state_bytes_count, new_account_op_count and market_op_count"""
@@ -88,7 +204,7 @@ class RC(object):
         state_bytes_count += state_object_size_info["comment_object_parent_permlink_char_size"] * parent_permlink_length
         execution_time_count = resource_execution_time["comment_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, state_bytes_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def vote_dict(self, vote_dict):
         """Calc RC costs for a vote
@@ -116,7 +232,7 @@ class RC(object):
         state_bytes_count = state_object_size_info["comment_vote_object_base_size"]
         execution_time_count = resource_execution_time["vote_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, state_bytes_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def transfer_dict(self, transfer_dict):
         """Calc RC costs for a transfer dict object
@@ -146,7 +262,7 @@ class RC(object):
         """Calc RC of a transfer"""
         execution_time_count = resource_execution_time["transfer_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, market_op_count=market_op_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def custom_json_dict(self, custom_json_dict):
         """Calc RC costs for a custom_json
@@ -182,7 +298,7 @@ class RC(object):
         if follow_id:
             execution_time_count *= EXEC_FOLLOW_CUSTOM_OP_SCALE
         resource_count = self.get_resource_count(tx_size, execution_time_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def account_update_dict(self, account_update_dict):
         """Calc RC costs for account update"""
@@ -190,13 +306,13 @@ class RC(object):
         tx_size = self.get_tx_size(op)
         execution_time_count = resource_execution_time["account_update_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def claim_account(self, tx_size=300):
         """Claim account"""
         execution_time_count = resource_execution_time["claim_account_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, new_account_op_count=1)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def get_authority_byte_count(self, auth):
         return (state_object_size_info["authority_base_size"]
@@ -214,7 +330,7 @@ class RC(object):
         tx_size = self.get_tx_size(op)
         execution_time_count = resource_execution_time["account_update_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, state_bytes_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def create_claimed_account_dict(self, create_claimed_account_dict):
         """Calc RC costs for claimed account create"""
@@ -227,7 +343,7 @@ class RC(object):
         tx_size = self.get_tx_size(op)
         execution_time_count = resource_execution_time["account_update_operation_exec_time"]
         resource_count = self.get_resource_count(tx_size, execution_time_count, state_bytes_count)
-        return self.blockchain.get_rc_cost(resource_count)
+        return self.get_rc_cost(resource_count)
 
     def set_slot_delegator(self, from_pool, to_account, to_slot, signer):
         """ Set a slot to receive RC from a pool
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import struct
+import threading
+import time
+from binascii import unhexlify
+from datetime import datetime, timedelta
+from .utils import addTzInfo
+import logging
+log = logging.getLogger(__name__)
+
+_providers_lock = threading.Lock()
+
+
+def fetch_block_params(blockchain_instance, use_head_block=False):
+    """ Returns ``ref_block_num`` and ``ref_block_prefix`` of the last
+        irreversible block (or of the head block) from the node
+    """
+    dynBCParams = blockchain_instance.get_dynamic_global_properties(use_stored_data=False)
+    # fix for corner case where last_irreversible_block_num == head_block_number
+    # then int(dynBCParams["last_irreversible_block_num"]) + 1 does not exists
+    # and BlockHeader throws error
+    if use_head_block or int(dynBCParams["last_irreversible_block_num"]) == int(dynBCParams["head_block_number"]):
+        ref_block_num = dynBCParams["head_block_number"] & 0xFFFF
+        ref_block_prefix = struct.unpack_from(
+            "<I", unhexlify(dynBCParams["head_block_id"]), 4
+        )[0]
+    else:
+        # need to get subsequent block because block head doesn't return 'id' - stupid
+        from .block import BlockHeader
+        block = BlockHeader(int(dynBCParams["last_irreversible_block_num"]) + 1, blockchain_instance=blockchain_instance)
+        ref_block_num = dynBCParams["last_irreversible_block_num"] & 0xFFFF
+        ref_block_prefix = struct.unpack_from(
+            "<I", unhexlify(block["previous"]), 4
+        )[0]
+    return ref_block_num, ref_block_prefix
+
+
+class RefBlockProvider(object):
+    """ Provides ``ref_block_num`` and ``ref_block_prefix`` for new
+        transactions and asks the node at most once per ``max_age``
+        seconds. It is shared by all :class:`beem.transactionbuilder.TransactionBuilder`
+        of a blockchain instance (see :func:`get_ref_block_provider`) and
+        can be used from several threads.
+
+        The parameters can also be taken from a block stream with
+        :func:`update`, :func:`beem.blockchain.Blockchain.blocks` does this
+        for new blocks.
+
+        :param Hive/Steem blockchain_instance: Hive or Steem instance
+        :param float max_age: maximum age of the parameters in seconds,
+            the block interval is used when not set
+
+        .. code-block:: python
+
+            from beem.refblock import get_ref_block_provider
+            ref_block_num, ref_block_prefix = get_ref_block_provider(hive).get_block_params()
+
+    """
+    def __init__(self, blockchain_instance, max_age=None):
+        self.blockchain = blockchain_instance
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        # use_head_block -> (ref_block_num, ref_block_prefix, block_num, updated)
+        self.params = {}
+        self.fetches = 0
+
+    def get_max_age(self):
+        if self.max_age is None:
+            self.max_age = self.blockchain.get_block_interval()
+        return self.max_age
+
+    def get_block_params(self, use_head_block=False):
+        """ Returns ``ref_block_num`` and ``ref_block_prefix``, which are
+            fetched from the node when the stored values are too old
+        """
+        max_age = self.get_max_age()
+        with self.lock:
+            params = self.params.get(use_head_block)
+            if params is not None and time.time() - params[3] < max_age:
+                return params[0], params[1]
+            ref_block_num, ref_block_prefix = fetch_block_params(self.blockchain, use_head_block=use_head_block)
+            self.fetches += 1
+            self.params[use_head_block] = (ref_block_num, ref_block_prefix, None, time.time())
+            return ref_block_num, ref_block_prefix
+
+    def update(self, block, irreversible=True):
+        """ Stores the parameters of a new block from a stream. Blocks which
+            are older than one minute are ignored.
+
+            :param block: :class:`beem.block.Block` or block dict with
+                ``block_id`` and ``timestamp``
+            :param bool irreversible: True when the block is irreversible,
+                otherwise the block is only used for ``use_head_block=True``
+        """
+        if "block_id" not in block or "timestamp" not in block:
+            return
+        timestamp = block["timestamp"]
+        if not isinstance(timestamp, datetime):
+            from .utils import formatTimeString
+            timestamp = formatTimeString(timestamp)
+        if addTzInfo(timestamp) < addTzInfo(datetime.utcnow()) - timedelta(seconds=60):
+            return
+        block_id = unhexlify(block["block_id"])
+        block_num = struct.unpack_from(">I", block_id, 0)[0]
+        ref_block_num = block_num & 0xFFFF
+        ref_block_prefix = struct.unpack_from("<I", block_id, 4)[0]
+        now = time.time()
+        with self.lock:
+            for use_head_block in ([False, True] if irreversible else [True]):
+                params = self.params.get(use_head_block)
+                if params is not None and params[2] is not None and params[2] > block_num:
+                    continue
+                self.params[use_head_block] = (ref_block_num, ref_block_prefix, block_num, now)
+
+    def clear(self):
+        """ Removes the stored parameters"""
+        with self.lock:
+            self.params = {}
+
+
+def get_ref_block_provider(blockchain_instance):
+    """ Returns the :class:`RefBlockProvider` shared by all users of
+        ``blockchain_instance``
+    """
+    provider = getattr(blockchain_instance, "_ref_block_provider", None)
+    if provider is None:
+        with _providers_lock:
+            provider = getattr(blockchain_instance, "_ref_block_provider", None)
+            if provider is None:
+                provider = RefBlockProvider(blockchain_instance)
+                blockchain_instance._ref_block_provider = provider
+    return provider
@@ -6,15 +6,34 @@ from datetime import datetime, timedelta, date, time
 import math
 import random
 import logging
-from bisect import bisect_left
+import threading
+import time as timelib
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
 from beem.utils import formatTimeString, formatTimedelta, remove_from_dict, reputation_to_score, addTzInfo, parse_time
 from beem.amount import Amount
-from beem.account import Account
+from beem.asset import get_asset_table
+from beem.account import Account, get_thread_instances
 from beem.vote import Vote
 from beem.instance import shared_blockchain_instance
-from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_1_PERCENT, STEEM_100_PERCENT
+from beem.constants import STEEM_VOTE_REGENERATION_SECONDS, STEEM_1_PERCENT, STEEM_100_PERCENT, STEEM_VOTING_MANA_REGENERATION_SECONDS
+from beemgraphenebase.py23 import string_types
 
 log = logging.getLogger(__name__)
+NUMPY_MODULE = None
+if not NUMPY_MODULE:
+    try:
+        import numpy as np
+        NUMPY_MODULE = "numpy"
+    except ImportError:
+        NUMPY_MODULE = None
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
 
 
 class AccountSnapshot(list):
@@ -65,6 +84,9 @@ class AccountSnapshot(list):
         self.downvote_vp_timestamp = []
         self.rep = []
         self.rep_timestamp = []
+        self.last_op_index = -1
+        self.build_options = {"only_ops": [], "exclude_ops": [], "enable_rewards": False,
+                              "enable_out_votes": False, "enable_in_votes": False}
 
     def search(self, search_str, start=None, stop=None, use_block_num=True):
         """ Returns ops in the given range"""
@@ -200,8 +222,10 @@ class AccountSnapshot(list):
             print("Could not find: %s" % v)
             return
 
-    def update(self, timestamp, own, delegated_in=None, delegated_out=None, steem=0, sbd=0):
-        """ Updates the internal state arrays
+    def update(self, timestamp=None, own=0, delegated_in=None, delegated_out=None, steem=0, sbd=0):
+        """ Updates the internal state arrays. When called without a timestamp,
+            all operations newer than ``last_op_index`` are fetched from the
+            account history and applied with the options of the last :func:`build`.
 
             :param datetime timestamp: datetime of the update
             :param own: vests
@@ -212,8 +236,18 @@ class AccountSnapshot(list):
             :type steem: amount.Amount, float
             :param sbd: sbd
             :type sbd: amount.Amount, float
+            :returns: number of fetched operations, when timestamp is None
+
+            .. code-block:: python
+
+                >>> acc_snapshot = AccountSnapshot("holger80")  # doctest: +SKIP
+                >>> acc_snapshot.load("holger80.json")  # doctest: +SKIP
+                >>> acc_snapshot.update()  # doctest: +SKIP
+                >>> acc_snapshot.save("holger80.json")  # doctest: +SKIP
 
         """
+        if timestamp is None:
+            return self.update_history()
         self.timestamps.append(timestamp - timedelta(seconds=1))
         self.own_vests.append(self.own_vests[-1])
         self.own_steem.append(self.own_steem[-1])
@@ -261,11 +295,23 @@ class AccountSnapshot(list):
                 generator (*optional*)
 
         """
+        self.build_options = {"only_ops": list(only_ops), "exclude_ops": list(exclude_ops),
+                              "enable_rewards": enable_rewards, "enable_out_votes": enable_out_votes,
+                              "enable_in_votes": enable_in_votes}
         if len(self.timestamps) > 0:
             start_timestamp = self.timestamps[-1]
         else:
             start_timestamp = None
-        for op in sorted(self, key=lambda k: k['timestamp']):
+        self._build_ops(self, start_timestamp)
+
+    def _build_ops(self, ops, start_timestamp):
+        """ Parses ops in the order of their timestamps and skips ops before start_timestamp"""
+        options = self.build_options
+        only_ops = options["only_ops"]
+        exclude_ops = options["exclude_ops"]
+        for op in sorted(ops, key=lambda k: k['timestamp']):
+            if "index" in op and op["index"] > self.last_op_index:
+                self.last_op_index = op["index"]
             ts = parse_time(op['timestamp'])
             if start_timestamp is not None and start_timestamp > ts:
                 continue
@@ -274,7 +320,78 @@ class AccountSnapshot(list):
             if len(only_ops) > 0 and op['type'] not in only_ops:
                 continue
             self.ops_statistics[op['type']] += 1
-            self.parse_op(op, only_ops=only_ops, enable_rewards=enable_rewards, enable_out_votes=enable_out_votes, enable_in_votes=enable_in_votes)
+            self.parse_op(op, only_ops=only_ops, enable_rewards=options["enable_rewards"],
+                          enable_out_votes=options["enable_out_votes"], enable_in_votes=options["enable_in_votes"])
+
+    def update_history(self):
+        """ Fetches all operations newer than ``last_op_index`` and applies them to
+            the state. Returns the number of fetched operations.
+        """
+        ops = list(self.account.history(start=self.last_op_index + 1, use_block_num=False))
+        ops = [op for op in ops if op["index"] > self.last_op_index]
+        self._build_ops(ops, None)
+        self.extend(ops)
+        return len(ops)
+
+    #: State which is stored by :func:`save`
+    state_keys = [
+        "timestamps", "own_vests", "own_steem", "own_sbd", "delegated_vests_in", "delegated_vests_out",
+        "reward_timestamps", "author_rewards", "curation_rewards", "out_vote_timestamp", "out_vote_weight",
+        "in_vote_timestamp", "in_vote_weight", "in_vote_rep", "in_vote_rshares",
+    ]
+
+    def _dump_value(self, value):
+        if isinstance(value, Amount):
+            return {"__amount__": "%s %s" % (str(value["amount"]), value["symbol"])}
+        elif isinstance(value, datetime):
+            return {"__time__": formatTimeString(value)}
+        elif isinstance(value, dict):
+            return {key: self._dump_value(value[key]) for key in value}
+        elif isinstance(value, (list, tuple)):
+            return [self._dump_value(v) for v in value]
+        return value
+
+    def _load_value(self, value):
+        if isinstance(value, dict) and "__amount__" in value:
+            return Amount(value["__amount__"], blockchain_instance=self.blockchain)
+        elif isinstance(value, dict) and "__time__" in value:
+            return formatTimeString(value["__time__"])
+        elif isinstance(value, dict):
+            return {key: self._load_value(value[key]) for key in value}
+        elif isinstance(value, list):
+            return [self._load_value(v) for v in value]
+        return value
+
+    def save(self, filename):
+        """ Stores the state of the snapshot (including the in and out votes)
+            into a json file. The raw account history and the arrays of
+            :func:`build_sp_arrays`, :func:`build_vp_arrays`, ... are not stored.
+
+            :param str filename: file name
+        """
+        state = {key: self._dump_value(getattr(self, key)) for key in self.state_keys}
+        state["account"] = self.account["name"]
+        state["last_op_index"] = self.last_op_index
+        state["build_options"] = self.build_options
+        state["ops_statistics"] = {key: value for key, value in self.ops_statistics.items() if value > 0}
+        with open(filename, "w") as f:
+            json.dump(state, f)
+
+    def load(self, filename):
+        """ Restores a snapshot which was stored with :func:`save`
+
+            :param str filename: file name
+        """
+        with open(filename) as f:
+            state = json.load(f)
+        if state["account"] != self.account["name"]:
+            raise ValueError("%s is a snapshot of %s and not of %s" % (filename, state["account"], self.account["name"]))
+        self.reset()
+        for key in self.state_keys:
+            setattr(self, key, self._load_value(state[key]))
+        self.last_op_index = state["last_op_index"]
+        self.build_options = state["build_options"]
+        self.ops_statistics.update(state["ops_statistics"])
 
     def parse_op(self, op, only_ops=[], enable_rewards=False, enable_out_votes=False, enable_in_votes=False):
         """ Parse account history operation"""
@@ -595,38 +712,105 @@ class AccountSnapshot(list):
         self.downvote_vp_timestamp.append(datetime.utcnow())
         self.vp_timestamp.append(datetime.utcnow())
 
-    def build_curation_arrays(self, end_date=None, sum_days=7):
-        """ Build curation arrays"""
-        self.curation_per_1000_SP_timestamp = []
-        self.curation_per_1000_SP = []
-        if sum_days <= 0:
-            raise ValueError("sum_days must be greater than 0")
+    def _get_curation_per_1000_SP_per_reward(self):
+        """ Returns the timestamps and the curation reward per 1000 SP of all curation rewards"""
+        timestamps = []
+        values = []
         index = 0
-        curation_sum = 0
-        days = (self.reward_timestamps[-1] - self.reward_timestamps[0]).days // sum_days * sum_days
-        if end_date is None:
-            end_date = self.reward_timestamps[-1] - timedelta(days=days)
         for (ts, vests) in zip(self.reward_timestamps, self.curation_rewards):
             if vests == 0:
                 continue
-            from beem import Steem
-            if isinstance(self.blockchain, Steem):
-                sp = self.blockchain.vests_to_sp(vests, timestamp=ts)
-            else:
-                sp = self.blockchain.vests_to_hp(vests, timestamp=ts)
+            sp = self.blockchain.vests_to_token_power(vests, timestamp=ts)
             data = self.get_data(timestamp=ts, index=index)
-            index = data["index"]
+            index = data.get("index", index)
             if "sp_eff" in data and data["sp_eff"] > 0:
-                curation_1k_sp = sp / data["sp_eff"] * 1000 / sum_days * 7
+                curation_1k_sp = sp / data["sp_eff"] * 1000
             else:
                 curation_1k_sp = 0
-            if ts < end_date:
-                curation_sum += curation_1k_sp
-            else:
-                self.curation_per_1000_SP_timestamp.append(end_date)
-                self.curation_per_1000_SP.append(curation_sum)
-                end_date = end_date + timedelta(days=sum_days)
-                curation_sum = 0
+            timestamps.append(ts)
+            values.append(curation_1k_sp)
+        return timestamps, values
+
+    def _sum_windows(self, timestamps, values, end_dates, window_days):
+        """ Sums values in the windows (end_date - window_days, end_date] with prefix sums"""
+        prefix_sum = [0]
+        for value in values:
+            prefix_sum.append(prefix_sum[-1] + value)
+        window = timedelta(days=window_days)
+        window_sums = []
+        for end_date in end_dates:
+            window_sums.append(prefix_sum[bisect_right(timestamps, end_date)] -
+                               prefix_sum[bisect_right(timestamps, end_date - window)])
+        return window_sums
+
+    def get_curation_per_1000_SP(self, window_days=[1, 7, 30], end_date=None, step_days=None):
+        """ Returns the curation rewards per 1000 SP and week, summed over sliding windows.
+            The curation per 1000 SP of each reward is calculated only once for all window lengths.
+
+            :param list window_days: window lengths in days
+            :param datetime end_date: end of the last window (default is the last curation reward)
+            :param float step_days: distance between two windows in days, when not set
+                the window length is used
+            :returns: dict with the window length as key and a (window end timestamps,
+                curation per 1000 SP) tuple as value
+
+            .. code-block:: python
+
+                >>> acc_snapshot.build(enable_rewards=True)  # doctest: +SKIP
+                >>> curation = acc_snapshot.get_curation_per_1000_SP(window_days=[1, 7, 30])  # doctest: +SKIP
+                >>> timestamps, curation_per_1000_sp = curation[7]  # doctest: +SKIP
+
+        """
+        timestamps, values = self._get_curation_per_1000_SP_per_reward()
+        ret = {}
+        if len(timestamps) == 0:
+            for days in window_days:
+                ret[days] = ([], [])
+            return ret
+        if end_date is None:
+            end_date = timestamps[-1]
+        end_date = addTzInfo(end_date)
+        for days in window_days:
+            if days <= 0:
+                raise ValueError("window_days must be greater than 0")
+            step = timedelta(days=step_days or days)
+            end_dates = []
+            window_end = end_date
+            while window_end >= timestamps[0]:
+                end_dates.append(window_end)
+                window_end = window_end - step
+            end_dates = end_dates[::-1]
+            window_sums = self._sum_windows(timestamps, values, end_dates, days)
+            ret[days] = (end_dates, [window_sum / days * 7 for window_sum in window_sums])
+        return ret
+
+    def build_curation_arrays(self, end_date=None, sum_days=7):
+        """ Build curation arrays
+
+            :param datetime end_date: end of the first window (default is chosen
+                so that the last window ends with the last reward)
+            :param int sum_days: window length in days
+        """
+        if sum_days <= 0:
+            raise ValueError("sum_days must be greater than 0")
+        self.curation_per_1000_SP_timestamp = []
+        self.curation_per_1000_SP = []
+        timestamps, values = self._get_curation_per_1000_SP_per_reward()
+        if len(timestamps) == 0:
+            return
+        first_timestamp = self.reward_timestamps[0]
+        last_timestamp = self.reward_timestamps[-1]
+        days = (last_timestamp - first_timestamp).days // sum_days * sum_days
+        if end_date is None:
+            end_date = last_timestamp - timedelta(days=days)
+        end_date = addTzInfo(end_date)
+        end_dates = []
+        while end_date <= last_timestamp:
+            end_dates.append(end_date)
+            end_date = end_date + timedelta(days=sum_days)
+        window_sums = self._sum_windows(timestamps, values, end_dates, sum_days)
+        self.curation_per_1000_SP_timestamp = end_dates
+        self.curation_per_1000_SP = [window_sum / sum_days * 7 for window_sum in window_sums]
 
     def __str__(self):
         return self.__repr__()
@@ -634,3 +818,966 @@ class AccountSnapshot(list):
     def __repr__(self):
         return "<%s %s>" % (
             self.__class__.__name__, str(self.account["name"]))
+
+
+class ArraySeries(object):
+    """ Read only sequence on top of an array. Items are converted with
+        ``getter`` when they are accessed, so that the arrays of an
+        :class:`ArrayAccountSnapshot` can be used like the lists of an
+        :class:`AccountSnapshot`.
+
+        :param values: numpy array or list with the stored values
+        :param getter: converts a stored value into the returned item
+    """
+    def __init__(self, values, getter):
+        self.values = values
+        self.getter = getter
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.getter(value) for value in self.values[index]]
+        return self.getter(self.values[index])
+
+    def __iter__(self):
+        for value in self.values:
+            yield self.getter(value)
+
+
+class ArrayAccountSnapshot(AccountSnapshot):
+    """ Array backed :class:`AccountSnapshot`. The account history is parsed into
+        typed numpy columns (timestamps in seconds, amounts as int64 in satoshi)
+        and the vests, token, backed token, delegation and SP series are calculated
+        with cumulative sums instead of ``Amount`` arithmetic for every operation.
+
+        ``timestamps``, ``own_vests``, ``own_steem``, ``own_sbd``, ``delegated_vests_in``,
+        ``delegated_vests_out`` and the reward and vote lists are :class:`ArraySeries`,
+        which return the same item types as the lists of :class:`AccountSnapshot`.
+        The raw arrays are stored in ``columns`` and :func:`get_series`.
+
+        :param str account_name: Name of the account
+        :param Steem blockchain_instance: Steem
+               instance
+
+        .. code-block:: python
+
+            >>> from beem.snapshot import ArrayAccountSnapshot
+            >>> from beem import Hive
+            >>> hv = Hive("https://api.hive.blog")
+            >>> acc_snapshot = ArrayAccountSnapshot("holger80", blockchain_instance=hv)
+            >>> acc_snapshot.get_account_history()
+            >>> acc_snapshot.build()
+            >>> acc_snapshot.build_sp_arrays()
+
+    """
+    #: dtypes of the stored columns
+    column_types = {
+        "ops_timestamp": "int64", "ops_vests": "int64", "ops_token": "int64", "ops_backed": "int64",
+        "delegation_in_row": "int64", "delegation_in_amount": "int64", "delegation_in_account": "str",
+        "delegation_out_row": "int64", "delegation_out_amount": "int64", "delegation_out_account": "str",
+        "reward_timestamp": "int64", "reward_curation": "int64", "reward_vests": "int64",
+        "reward_token": "int64", "reward_backed": "int64",
+        "out_vote_timestamp": "int64", "out_vote_weight": "int64",
+        "in_vote_timestamp": "int64", "in_vote_weight": "int64", "in_vote_rep": "int64", "in_vote_rshares": "int64",
+    }
+
+    def __init__(self, account, account_history=[], blockchain_instance=None, **kwargs):
+        if NUMPY_MODULE is None:
+            raise ImportError("Missing dependency: numpy")
+        super(ArrayAccountSnapshot, self).__init__(account, account_history=account_history,
+                                                   blockchain_instance=blockchain_instance, **kwargs)
+
+    def reset(self):
+        """ Resets the arrays not the stored account history
+        """
+        import beembase.operationids
+        self.ops_statistics = beembase.operationids.operations.copy()
+        for key in self.ops_statistics:
+            self.ops_statistics[key] = 0
+        self.columns = {}
+        for key in self.column_types:
+            self.columns[key] = np.array([], dtype=self.column_types[key])
+        self._pending = {}
+        self._row_count = 0
+        self._last_timestamp = 0
+        self._series = None
+        self._token_per_mvest = np.array([], dtype=np.float64)
+        self.last_op_index = -1
+        self.build_options = {"only_ops": [], "exclude_ops": [], "enable_rewards": False,
+                              "enable_out_votes": False, "enable_in_votes": False}
+        self._assets = get_asset_table(self.blockchain)
+        self._symbols = [self.blockchain.vest_token_symbol, self.blockchain.token_symbol,
+                         self.blockchain.backed_token_symbol]
+        self.curation_per_1000_SP_timestamp = []
+        self.curation_per_1000_SP = []
+        self.vp = []
+        self.vp_timestamp = []
+        self.downvote_vp = []
+        self.downvote_vp_timestamp = []
+        self.rep = []
+        self.rep_timestamp = []
+
+    def _append(self, key, value):
+        if key not in self._pending:
+            self._pending[key] = []
+        self._pending[key].append(value)
+        self._series = None
+
+    def _flush(self):
+        """ Moves all pending values into the numpy columns"""
+        if not self._pending:
+            return
+        for key in self._pending:
+            values = np.array(self._pending[key], dtype=self.column_types[key])
+            self.columns[key] = np.concatenate((self.columns[key], values))
+        self._pending = {}
+
+    def _parse_amount(self, amount):
+        """ Returns satoshi and symbol of an amount string, a legacy list or an appbase dict"""
+        if isinstance(amount, Amount):
+            return int(amount), amount["symbol"]
+        if isinstance(amount, dict):
+            return int(amount["amount"]), self._assets[amount["nai"]]["symbol"]
+        if isinstance(amount, (list, tuple)):
+            return int(amount[0]), self._assets[amount[2]]["symbol"]
+        number, symbol = amount.split(" ")
+        precision = self._assets[symbol]["precision"] if symbol in self._assets else 3
+        if "." in number:
+            fraction = len(number) - number.index(".") - 1
+            if fraction <= precision:
+                return int(number.replace(".", "")) * 10 ** (precision - fraction), symbol
+        return int(Decimal(number).scaleb(precision)), symbol
+
+    def _add_amount(self, delta, amount, sign=1):
+        """ Adds an amount to the [vests, token, backed token] delta list"""
+        satoshi, symbol = self._parse_amount(amount)
+        if symbol in self._symbols:
+            delta[self._symbols.index(symbol)] += sign * satoshi
+
+    def _to_vests_satoshi(self, token_amount, timestamp):
+        """ Converts a token amount into vests satoshi with the conversion rate of timestamp"""
+        satoshi, symbol = self._parse_amount(token_amount)
+        token_power = satoshi / 10 ** self._assets[symbol]["precision"]
+        return int(round(self.blockchain.token_power_to_vests(token_power, timestamp=timestamp) * 1e6))
+
+    def _add_row(self, timestamp, delta=None, delegated_in=None, delegated_out=None):
+        """ Adds a new state row
+
+            :param int timestamp: timestamp in seconds
+            :param list delta: changes of [vests, token, backed token] in satoshi
+            :param tuple delegated_in: (account, vests satoshi) of an incoming delegation
+            :param tuple delegated_out: (account, vests satoshi) of an outgoing delegation,
+                account is an empty string for a returned delegation
+        """
+        if delta is None:
+            delta = [0, 0, 0]
+        row = self._row_count
+        self._append("ops_timestamp", timestamp)
+        self._append("ops_vests", delta[0])
+        self._append("ops_token", delta[1])
+        self._append("ops_backed", delta[2])
+        if delegated_in is not None:
+            self._append("delegation_in_row", row)
+            self._append("delegation_in_account", delegated_in[0])
+            self._append("delegation_in_amount", delegated_in[1])
+        if delegated_out is not None:
+            self._append("delegation_out_row", row)
+            self._append("delegation_out_account", delegated_out[0] or "")
+            self._append("delegation_out_amount", delegated_out[1])
+        self._row_count += 1
+        self._last_timestamp = timestamp
+
+    @staticmethod
+    def _to_seconds(timestamps):
+        """ Converts a list of time strings or datetime objects into seconds since epoch"""
+        timestamps = [t if isinstance(t, string_types) else formatTimeString(t) for t in timestamps]
+        return np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+
+    @staticmethod
+    def _to_datetime(timestamp):
+        return addTzInfo(datetime(1970, 1, 1)) + timedelta(seconds=int(timestamp))
+
+    def _vests_amount(self, satoshi):
+        return self._to_amount(satoshi, 0)
+
+    def _to_amount(self, satoshi, asset_index):
+        symbol = self._symbols[asset_index]
+        return Amount(Decimal(int(satoshi)) / Decimal(10 ** self._assets[symbol]["precision"]), symbol,
+                      blockchain_instance=self.blockchain)
+
+    def update(self, timestamp=None, own=0, delegated_in=None, delegated_out=None, steem=0, sbd=0):
+        """ Updates the internal state arrays. When called without a timestamp,
+            all operations newer than ``last_op_index`` are fetched from the
+            account history and applied with the options of the last :func:`build`.
+
+            :param datetime timestamp: datetime of the update
+            :param own: vests
+            :type own: amount.Amount, float
+            :param dict delegated_in: Incoming delegation
+            :param dict delegated_out: Outgoing delegation
+            :param steem: steem
+            :type steem: amount.Amount, float
+            :param sbd: sbd
+            :type sbd: amount.Amount, float
+            :returns: number of fetched operations, when timestamp is None
+
+            .. code-block:: python
+
+                >>> acc_snapshot = ArrayAccountSnapshot("holger80")  # doctest: +SKIP
+                >>> acc_snapshot.load("holger80.npz")  # doctest: +SKIP
+                >>> acc_snapshot.update()  # doctest: +SKIP
+                >>> acc_snapshot.save("holger80.npz")  # doctest: +SKIP
+
+        """
+        if timestamp is None:
+            return self.update_history()
+        delta = []
+        for value, asset_index in [(own, 0), (steem, 1), (sbd, 2)]:
+            if isinstance(value, Amount):
+                delta.append(int(value))
+            else:
+                delta.append(int(round(value * 10 ** self._assets[self._symbols[asset_index]]["precision"])))
+        din = None
+        dout = None
+        if delegated_in is not None and delegated_in:
+            din = (delegated_in["account"], int(delegated_in["amount"]))
+        if delegated_out is not None and delegated_out:
+            dout = (delegated_out["account"], int(delegated_out["amount"]))
+        self._add_row(int(self._to_seconds([timestamp])[0]), delta, din, dout)
+
+    def update_rewards(self, timestamp, curation_reward, author_vests, author_steem, author_sbd):
+        self._append("reward_timestamp", timestamp)
+        self._append("reward_curation", curation_reward)
+        self._append("reward_vests", author_vests)
+        self._append("reward_token", author_steem)
+        self._append("reward_backed", author_sbd)
+
+    def update_out_vote(self, timestamp, weight):
+        self._append("out_vote_timestamp", timestamp)
+        self._append("out_vote_weight", weight)
+
+    def update_in_vote(self, timestamp, weight, op):
+        v = Vote(op, blockchain_instance=self.blockchain)
+        try:
+            v.refresh()
+            self._append("in_vote_timestamp", timestamp)
+            self._append("in_vote_weight", weight)
+            self._append("in_vote_rep", int(v["reputation"]))
+            self._append("in_vote_rshares", int(v["rshares"]))
+        except:
+            print("Could not find: %s" % v)
+            return
+
+    def build(self, only_ops=[], exclude_ops=[], enable_rewards=False, enable_out_votes=False, enable_in_votes=False):
+        """ Builds the account history based on all account operations
+
+            :param array only_ops: Limit generator by these
+                operations (*optional*)
+            :param array exclude_ops: Exclude these operations from
+                generator (*optional*)
+
+        """
+        self.build_options = {"only_ops": list(only_ops), "exclude_ops": list(exclude_ops),
+                              "enable_rewards": enable_rewards, "enable_out_votes": enable_out_votes,
+                              "enable_in_votes": enable_in_votes}
+        self._build_ops(self, self._last_timestamp)
+
+    def _build_ops(self, ops, start_timestamp):
+        """ Parses ops in the order of their timestamps and skips ops before start_timestamp"""
+        if len(ops) == 0:
+            return
+        if start_timestamp is None:
+            start_timestamp = 0
+        options = self.build_options
+        only_ops = options["only_ops"]
+        exclude_ops = options["exclude_ops"]
+        timestamps = self._to_seconds([op["timestamp"] for op in ops])
+        for i in np.argsort(timestamps, kind="stable").tolist():
+            op = ops[i]
+            ts = int(timestamps[i])
+            if "index" in op and op["index"] > self.last_op_index:
+                self.last_op_index = op["index"]
+            if start_timestamp > ts:
+                continue
+            if op['type'] in exclude_ops:
+                continue
+            if len(only_ops) > 0 and op['type'] not in only_ops:
+                continue
+            self.ops_statistics[op['type']] = self.ops_statistics.get(op['type'], 0) + 1
+            self._parse_op(op, ts, only_ops=only_ops, enable_rewards=options["enable_rewards"],
+                           enable_out_votes=options["enable_out_votes"], enable_in_votes=options["enable_in_votes"])
+        self._flush()
+
+    def save(self, filename):
+        """ Stores the state of the snapshot into a compressed numpy file. The raw
+            account history is not stored.
+
+            :param str filename: file name, ``.npz`` is appended when missing
+        """
+        self._flush()
+        meta = {"account": self.account["name"], "last_op_index": self.last_op_index,
+                "last_timestamp": self._last_timestamp, "row_count": self._row_count,
+                "build_options": self.build_options,
+                "ops_statistics": {key: value for key, value in self.ops_statistics.items() if value > 0}}
+        arrays = dict(self.columns)
+        arrays["token_per_mvest"] = self._token_per_mvest
+        arrays["meta"] = np.array(json.dumps(meta))
+        np.savez_compressed(filename, **arrays)
+
+    def load(self, filename):
+        """ Restores a snapshot which was stored with :func:`save`
+
+            :param str filename: file name
+        """
+        with np.load(filename, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["account"] != self.account["name"]:
+                raise ValueError("%s is a snapshot of %s and not of %s" % (filename, meta["account"], self.account["name"]))
+            self.reset()
+            for key in self.column_types:
+                self.columns[key] = data[key].astype(self.column_types[key])
+            self._token_per_mvest = data["token_per_mvest"]
+        self.last_op_index = meta["last_op_index"]
+        self._last_timestamp = meta["last_timestamp"]
+        self._row_count = meta["row_count"]
+        self.build_options = meta["build_options"]
+        self.ops_statistics.update(meta["ops_statistics"])
+
+    def parse_op(self, op, only_ops=[], enable_rewards=False, enable_out_votes=False, enable_in_votes=False):
+        """ Parse account history operation"""
+        ts = int(self._to_seconds([op["timestamp"]])[0])
+        self._parse_op(op, ts, only_ops=only_ops, enable_rewards=enable_rewards,
+                       enable_out_votes=enable_out_votes, enable_in_votes=enable_in_votes)
+
+    def _parse_op(self, op, ts, only_ops=[], enable_rewards=False, enable_out_votes=False, enable_in_votes=False):
+        name = self.account["name"]
+        op_type = op['type']
+        if op_type == "account_create":
+            if op['new_account_name'] == name:
+                self._add_row(ts, [self._to_vests_satoshi(op['fee'], ts), 0, 0])
+            elif op['creator'] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op['fee'], -1)
+                self._add_row(ts, delta)
+
+        elif op_type == "account_create_with_delegation":
+            if op['new_account_name'] == name:
+                delegation, symbol = self._parse_amount(op['delegation'])
+                delegated_in = (op['creator'], delegation) if delegation > 0 else None
+                self._add_row(ts, [self._to_vests_satoshi(op['fee'], ts), 0, 0], delegated_in=delegated_in)
+            elif op['creator'] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op['fee'], -1)
+                delegation, symbol = self._parse_amount(op['delegation'])
+                self._add_row(ts, delta, delegated_out=(op['new_account_name'], delegation))
+
+        elif op_type == "delegate_vesting_shares":
+            vests, symbol = self._parse_amount(op['vesting_shares'])
+            if op['delegator'] == name:
+                self._add_row(ts, delegated_out=(op['delegatee'], vests))
+            elif op['delegatee'] == name:
+                self._add_row(ts, delegated_in=(op['delegator'], vests))
+
+        elif op_type == "transfer":
+            if op['from'] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op['amount'], -1)
+                self._add_row(ts, delta)
+            if op['to'] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op['amount'])
+                self._add_row(ts, delta)
+
+        elif op_type == "fill_order":
+            if op["current_owner"] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op["current_pays"], -1)
+                self._add_amount(delta, op["open_pays"])
+                self._add_row(ts, delta)
+            if op["open_owner"] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op["current_pays"])
+                self._add_amount(delta, op["open_pays"], -1)
+                self._add_row(ts, delta)
+
+        elif op_type == "transfer_to_vesting":
+            delta = [0, 0, 0]
+            if op['to'] == name:
+                delta[0] = self._to_vests_satoshi(op['amount'], ts)
+            if op['from'] == name:
+                self._add_amount(delta, op['amount'], -1)
+            self._add_row(ts, delta)
+
+        elif op_type == "fill_vesting_withdraw":
+            delta = [0, 0, 0]
+            self._add_amount(delta, op['withdrawn'], -1)
+            self._add_row(ts, delta)
+
+        elif op_type == "return_vesting_delegation":
+            vests, symbol = self._parse_amount(op['vesting_shares'])
+            self._add_row(ts, delegated_out=(None, vests))
+
+        elif op_type == "claim_reward_balance":
+            delta = [0, 0, 0]
+            for key in ["reward_vests", "reward_steem", "reward_hive", "reward_sbd", "reward_hbd"]:
+                if key in op:
+                    self._add_amount(delta, op[key])
+            self._add_row(ts, delta)
+
+        elif op_type == "curation_reward":
+            vests, symbol = self._parse_amount(op['reward'])
+            if "curation_reward" in only_ops:
+                self._add_row(ts, [vests, 0, 0])
+            if enable_rewards:
+                self.update_rewards(ts, vests, 0, 0, 0)
+
+        elif op_type == "author_reward":
+            delta = [0, 0, 0]
+            for key in ["vesting_payout", "steem_payout", "hive_payout", "sbd_payout", "hbd_payout"]:
+                if key in op:
+                    self._add_amount(delta, op[key])
+            if "author_reward" in only_ops:
+                self._add_row(ts, delta)
+            if enable_rewards:
+                self.update_rewards(ts, 0, delta[0], delta[1], delta[2])
+
+        elif op_type == "producer_reward":
+            delta = [0, 0, 0]
+            self._add_amount(delta, op['vesting_shares'])
+            self._add_row(ts, delta)
+
+        elif op_type == "comment_benefactor_reward":
+            if op['benefactor'] == name:
+                delta = [0, 0, 0]
+                if "reward" in op:
+                    self._add_amount(delta, op['reward'])
+                else:
+                    for key in ["vesting_payout", "steem_payout", "hive_payout", "sbd_payout", "hbd_payout"]:
+                        if key in op:
+                            self._add_amount(delta, op[key])
+                self._add_row(ts, delta)
+
+        elif op_type == "fill_convert_request":
+            if op["owner"] == name:
+                delta = [0, 0, 0]
+                self._add_amount(delta, op["amount_out"])
+                self._add_amount(delta, op["amount_in"], -1)
+                self._add_row(ts, delta)
+
+        elif op_type == "interest":
+            delta = [0, 0, 0]
+            self._add_amount(delta, op["interest"])
+            self._add_row(ts, delta)
+
+        elif op_type == "vote":
+            if "vote" in only_ops or enable_out_votes:
+                if op["voter"] == name:
+                    self.update_out_vote(ts, int(op['weight']))
+            if "vote" in only_ops or enable_in_votes and op["author"] == name:
+                self.update_in_vote(ts, int(op['weight']), op)
+
+        elif op_type == 'hardfork_hive':
+            delta = [0, 0, 0]
+            for key in ["vests_converted", "steem_transferred", "sbd_transferred"]:
+                self._add_amount(delta, op[key], -1)
+            self._add_row(ts, delta)
+
+    def _build_delegations(self, rows, accounts, amounts, n, outgoing):
+        """ Returns the delegation sum of each row and the delegation dict after each delegation change"""
+        delta = np.zeros(n, dtype=np.int64)
+        state = {}
+        states = [state]
+        for row, account, amount in zip(rows.tolist(), accounts.tolist(), amounts.tolist()):
+            state = dict(state)
+            if outgoing and account == "":
+                # return_vesting_delegation
+                for delegatee in state:
+                    if state[delegatee] == amount:
+                        del state[delegatee]
+                        delta[row] -= amount
+                        break
+            elif outgoing:
+                # skip undelegations here, wait for 'return_vesting_delegation'
+                if amount != 0:
+                    delta[row] += amount - state.get(account, 0)
+                    state[account] = amount
+            elif amount == 0:
+                delta[row] -= state.pop(account, 0)
+            else:
+                delta[row] += amount - state.get(account, 0)
+                state[account] = amount
+            states.append(state)
+        return np.cumsum(delta), states
+
+    def get_series(self):
+        """ Returns the state series as dict of numpy arrays. Every operation adds two rows,
+            one with the previous state one second before the operation and one with the
+            new state. Amounts are in satoshi, timestamps in seconds since epoch.
+        """
+        if self._series is not None:
+            return self._series
+        self._flush()
+        columns = self.columns
+        n = len(columns["ops_timestamp"])
+        series = {}
+        timestamps = np.zeros(2 * n + 1, dtype=np.int64)
+        timestamps[1::2] = columns["ops_timestamp"] - 1
+        timestamps[2::2] = columns["ops_timestamp"]
+        series["timestamp"] = timestamps
+
+        def interleave(total):
+            values = np.zeros(2 * n + 1, dtype=np.int64)
+            values[2::2] = total
+            values[3::2] = total[:-1]
+            return values
+
+        series["own_vests"] = interleave(np.cumsum(columns["ops_vests"]))
+        series["own_steem"] = interleave(np.cumsum(columns["ops_token"]))
+        series["own_sbd"] = interleave(np.cumsum(columns["ops_backed"]))
+        rows_applied = np.arange(2 * n + 1) // 2
+        for direction in ["in", "out"]:
+            rows = columns["delegation_%s_row" % direction]
+            total, states = self._build_delegations(rows, columns["delegation_%s_account" % direction],
+                                                    columns["delegation_%s_amount" % direction], n,
+                                                    direction == "out")
+            series["delegated_vests_%s" % direction] = interleave(total)
+            series["delegated_vests_%s_state" % direction] = np.searchsorted(rows, rows_applied, side="left")
+            series["delegated_vests_%s_states" % direction] = states
+        self._series = series
+        return series
+
+    def _delegation_series(self, direction):
+        series = self.get_series()
+        states = series["delegated_vests_%s_states" % direction]
+        return ArraySeries(series["delegated_vests_%s_state" % direction],
+                           lambda i: {key: self._vests_amount(value) for key, value in states[i].items()})
+
+    @property
+    def timestamps(self):
+        return ArraySeries(self.get_series()["timestamp"], self._to_datetime)
+
+    @property
+    def own_vests(self):
+        return ArraySeries(self.get_series()["own_vests"], lambda value: self._to_amount(value, 0))
+
+    @property
+    def own_steem(self):
+        return ArraySeries(self.get_series()["own_steem"], lambda value: self._to_amount(value, 1))
+
+    @property
+    def own_sbd(self):
+        return ArraySeries(self.get_series()["own_sbd"], lambda value: self._to_amount(value, 2))
+
+    @property
+    def delegated_vests_in(self):
+        return self._delegation_series("in")
+
+    @property
+    def delegated_vests_out(self):
+        return self._delegation_series("out")
+
+    @property
+    def reward_timestamps(self):
+        self._flush()
+        return ArraySeries(self.columns["reward_timestamp"], self._to_datetime)
+
+    @property
+    def curation_rewards(self):
+        self._flush()
+        return ArraySeries(self.columns["reward_curation"], lambda value: self._to_amount(value, 0))
+
+    @property
+    def author_rewards(self):
+        self._flush()
+        columns = self.columns
+        return ArraySeries(np.arange(len(columns["reward_timestamp"])),
+                           lambda i: {"vests": self._to_amount(columns["reward_vests"][i], 0),
+                                      "steem": self._to_amount(columns["reward_token"][i], 1),
+                                      "sbd": self._to_amount(columns["reward_backed"][i], 2)})
+
+    @property
+    def out_vote_timestamp(self):
+        self._flush()
+        return ArraySeries(self.columns["out_vote_timestamp"], self._to_datetime)
+
+    @property
+    def out_vote_weight(self):
+        self._flush()
+        return ArraySeries(self.columns["out_vote_weight"], int)
+
+    @property
+    def in_vote_timestamp(self):
+        self._flush()
+        return ArraySeries(self.columns["in_vote_timestamp"], self._to_datetime)
+
+    @property
+    def in_vote_weight(self):
+        self._flush()
+        return ArraySeries(self.columns["in_vote_weight"], int)
+
+    @property
+    def in_vote_rep(self):
+        self._flush()
+        return ArraySeries(self.columns["in_vote_rep"], int)
+
+    @property
+    def in_vote_rshares(self):
+        self._flush()
+        return ArraySeries(self.columns["in_vote_rshares"], int)
+
+    def get_data(self, timestamp=None, index=0):
+        """ Returns snapshot for given timestamp"""
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        delta = addTzInfo(timestamp) - addTzInfo(datetime(1970, 1, 1))
+        seconds = delta.days * 86400 + delta.seconds + (1 if delta.microseconds > 0 else 0)
+        series = self.get_series()
+        # Find rightmost value less than timestamp
+        i = int(np.searchsorted(series["timestamp"], seconds, side="left"))
+        if i:
+            index = i - 1
+        else:
+            return {}
+        ts = self._to_datetime(series["timestamp"][index])
+        own = self._to_amount(series["own_vests"][index], 0)
+        din = self.delegated_vests_in[index]
+        dout = self.delegated_vests_out[index]
+        sp_in = self.blockchain.vests_to_token_power(series["delegated_vests_in"][index] / 1e6, timestamp=ts)
+        sp_out = self.blockchain.vests_to_token_power(series["delegated_vests_out"][index] / 1e6, timestamp=ts)
+        sp_own = self.blockchain.vests_to_token_power(own, timestamp=ts)
+        sp_eff = sp_own + sp_in - sp_out
+        return {"timestamp": ts, "vests": own, "delegated_vests_in": din, "delegated_vests_out": dout,
+                "sp_own": sp_own, "sp_eff": sp_eff, "steem": self._to_amount(series["own_steem"][index], 1),
+                "sbd": self._to_amount(series["own_sbd"][index], 2), "index": index}
+
+    def _get_token_per_mvest_series(self):
+        """ Returns the series and the token per MVESTS ratio of all series rows"""
+        series = self.get_series()
+        # the conversion rates of already known rows are reused
+        known = len(self._token_per_mvest)
+        token_per_mvest = [self.blockchain.get_token_per_mvest(time_stamp=ts)
+                           for ts in series["timestamp"][known:].tolist()]
+        self._token_per_mvest = np.concatenate((self._token_per_mvest, np.array(token_per_mvest, dtype=np.float64)))
+        return series, self._token_per_mvest
+
+    def build_sp_arrays(self):
+        """ Builds the own_sp and eff_sp array"""
+        series, token_per_mvest = self._get_token_per_mvest_series()
+        self.own_sp = series["own_vests"] / 1e6 / 1e6 * token_per_mvest
+        sp_in = series["delegated_vests_in"] / 1e6 / 1e6 * token_per_mvest
+        sp_out = series["delegated_vests_out"] / 1e6 / 1e6 * token_per_mvest
+        self.eff_sp = self.own_sp + sp_in - sp_out
+
+    def _get_curation_per_1000_SP_per_reward(self):
+        """ Returns the timestamps and the curation reward per 1000 SP of all curation rewards"""
+        self._flush()
+        curation = self.columns["reward_curation"]
+        reward_timestamps = self.columns["reward_timestamp"][curation != 0]
+        curation = curation[curation != 0]
+        series, token_per_mvest = self._get_token_per_mvest_series()
+        eff_vests = series["own_vests"] + series["delegated_vests_in"] - series["delegated_vests_out"]
+        sp_eff = eff_vests / 1e6 / 1e6 * token_per_mvest
+        # snapshot row before each reward, -1 when the reward is older than the snapshot
+        index = np.searchsorted(series["timestamp"], reward_timestamps, side="left") - 1
+        sp_eff = np.where(index >= 0, sp_eff[index], 0)
+        reward_token_per_mvest = np.array([self.blockchain.get_token_per_mvest(time_stamp=ts)
+                                           for ts in reward_timestamps.tolist()], dtype=np.float64)
+        sp = curation / 1e6 / 1e6 * reward_token_per_mvest
+        values = np.zeros(len(sp), dtype=np.float64)
+        np.divide(sp * 1000, sp_eff, out=values, where=sp_eff > 0)
+        return ArraySeries(reward_timestamps, self._to_datetime), values
+
+    def _sum_windows(self, timestamps, values, end_dates, window_days):
+        """ Sums values in the windows (end_date - window_days, end_date] with prefix sums"""
+        if not isinstance(timestamps, ArraySeries):
+            return super(ArrayAccountSnapshot, self)._sum_windows(timestamps, values, end_dates, window_days)
+        if len(end_dates) == 0:
+            return []
+        prefix_sum = np.concatenate(([0.], np.cumsum(values)))
+        end_seconds = self._to_seconds(end_dates)
+        start_seconds = self._to_seconds([end_date - timedelta(days=window_days) for end_date in end_dates])
+        window_sums = (prefix_sum[np.searchsorted(timestamps.values, end_seconds, side="right")] -
+                       prefix_sum[np.searchsorted(timestamps.values, start_seconds, side="right")])
+        return window_sums.tolist()
+
+    def build_vp_arrays(self):
+        """ Build vote power arrays"""
+        self._flush()
+        first_timestamp = int(self.get_series()["timestamp"][1]) * 1000000
+        hf_21 = int((datetime(2019, 8, 27, 15, tzinfo=pytz.utc) - addTzInfo(datetime(1970, 1, 1))).total_seconds()) * 1000000
+
+        def recharge_time(current_mana_pct):
+            missing_pct = 100 - current_mana_pct
+            if missing_pct < 0:
+                return 0
+            recharge_seconds = missing_pct * 100 * STEEM_VOTING_MANA_REGENERATION_SECONDS / STEEM_100_PERCENT
+            return timedelta(seconds=recharge_seconds) // timedelta(microseconds=1)
+
+        def regenerate(ts, last_ts):
+            return ((ts - last_ts) / 1000000) * STEEM_100_PERCENT / STEEM_VOTE_REGENERATION_SECONDS
+
+        vp_timestamp = [first_timestamp]
+        vp = [STEEM_100_PERCENT]
+        downvote_vp_timestamp = [first_timestamp if first_timestamp > hf_21 else hf_21]
+        downvote_vp = [STEEM_100_PERCENT]
+        for ts, weight in zip((self.columns["out_vote_timestamp"] * 1000000).tolist(),
+                              self.columns["out_vote_weight"].tolist()):
+            regenerated_vp = 0
+            if ts > hf_21 and weight < 0:
+                downvote_vp.append(downvote_vp[-1])
+                if downvote_vp[-1] < STEEM_100_PERCENT:
+                    regenerated_vp = regenerate(ts, downvote_vp_timestamp[-1])
+                    downvote_vp[-1] += int(regenerated_vp)
+                if downvote_vp[-1] > STEEM_100_PERCENT:
+                    downvote_vp[-1] = STEEM_100_PERCENT
+                    # Add full downvote VP once fully charged
+                    downvote_vp_timestamp.append(downvote_vp_timestamp[-1] + recharge_time(downvote_vp[-2] / 100))
+                    downvote_vp.append(STEEM_100_PERCENT)
+                # Add charged downvote VP just before new Vote
+                downvote_vp_timestamp.append(ts - 1000000)
+                downvote_vp.append(min([STEEM_100_PERCENT, downvote_vp[-1] + regenerated_vp]))
+                # Downvote mana pool is 1/4th of the upvote mana pool, so it gets drained 4 times as quick
+                downvote_vp[-1] -= self.blockchain._calc_resulting_vote(STEEM_100_PERCENT, weight) * 4
+                if downvote_vp[-1] < 0:
+                    vp.append(vp[-1])
+                    if vp[-1] < STEEM_100_PERCENT:
+                        regenerated_vp = regenerate(ts, vp_timestamp[-1])
+                        vp[-1] += int(regenerated_vp)
+                    if vp[-1] > STEEM_100_PERCENT:
+                        vp[-1] = STEEM_100_PERCENT
+                        vp_timestamp.append(vp_timestamp[-1] + recharge_time(vp[-2] / 100))
+                        vp.append(STEEM_100_PERCENT)
+                    if vp[-1] == STEEM_100_PERCENT and ts - vp_timestamp[-1] > 1000000:
+                        vp_timestamp.append(ts - 1000000)
+                        vp.append(min([STEEM_100_PERCENT, vp[-1] + regenerated_vp]))
+                    vp[-1] += downvote_vp[-1] / 4
+                    if vp[-1] < 0:
+                        vp[-1] = 0
+                    vp_timestamp.append(ts)
+                    downvote_vp[-1] = 0
+                downvote_vp_timestamp.append(ts)
+            else:
+                vp.append(vp[-1])
+                if vp[-1] < STEEM_100_PERCENT:
+                    regenerated_vp = regenerate(ts, vp_timestamp[-1])
+                    vp[-1] += int(regenerated_vp)
+                if vp[-1] > STEEM_100_PERCENT:
+                    vp[-1] = STEEM_100_PERCENT
+                    # Add full VP once fully charged
+                    vp_timestamp.append(vp_timestamp[-1] + recharge_time(vp[-2] / 100))
+                    vp.append(STEEM_100_PERCENT)
+                if vp[-1] == STEEM_100_PERCENT and ts - vp_timestamp[-1] > 1000000:
+                    # Add charged VP just before new Vote
+                    vp_timestamp.append(ts - 1000000)
+                    vp.append(min([STEEM_100_PERCENT, vp[-1] + regenerated_vp]))
+                vp[-1] -= self.blockchain._calc_resulting_vote(vp[-1], weight)
+                if vp[-1] < 0:
+                    vp[-1] = 0
+                vp_timestamp.append(ts)
+
+        if self.account.get_voting_power() == 100:
+            vp.append(10000)
+            vp_timestamp.append(vp_timestamp[-1] + recharge_time(vp[-2] / 100))
+        if self.account.get_downvoting_power() == 100:
+            downvote_vp.append(10000)
+            downvote_vp_timestamp.append(vp_timestamp[-1] + recharge_time(downvote_vp[-2] / 100))
+
+        epoch = addTzInfo(datetime(1970, 1, 1))
+        self.vp = vp + [self.account.get_voting_power() * 100]
+        self.downvote_vp = downvote_vp + [self.account.get_downvoting_power() * 100]
+        self.vp_timestamp = [epoch + timedelta(microseconds=ts) for ts in vp_timestamp] + [datetime.utcnow()]
+        self.downvote_vp_timestamp = [epoch + timedelta(microseconds=ts) for ts in downvote_vp_timestamp] + [datetime.utcnow()]
+
+
+class NodeRateLimiter(object):
+    """ Limits the number of requests per second which are sent to each node.
+        It can be shared between threads.
+
+        :param float requests_per_second: maximum number of requests per node and second,
+            None disables the limit
+    """
+    def __init__(self, requests_per_second=None):
+        self.requests_per_second = requests_per_second
+        self.next_request = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        """ Blocks until a request to ``url`` is allowed"""
+        if not self.requests_per_second:
+            return
+        with self.lock:
+            now = timelib.time()
+            request_time = max(now, self.next_request.get(url, now))
+            self.next_request[url] = request_time + 1. / self.requests_per_second
+        if request_time > now:
+            timelib.sleep(request_time - now)
+
+
+_worker_blockchains = {}
+
+
+def _build_snapshot(snapshot_class, account, history, build_kwargs, build_arrays, blockchain_instance=None,
+                    blockchain_class=None):
+    """ Builds the snapshot of a single account from its fetched history. Worker
+        processes use an offline instance of ``blockchain_class``.
+    """
+    if blockchain_instance is None:
+        if blockchain_class not in _worker_blockchains:
+            _worker_blockchains[blockchain_class] = blockchain_class(offline=True)
+        blockchain_instance = _worker_blockchains[blockchain_class]
+    snapshot = snapshot_class(account, account_history=history, blockchain_instance=blockchain_instance)
+    snapshot.build(**build_kwargs)
+    if build_arrays:
+        snapshot.build_sp_arrays()
+    return snapshot
+
+
+class AccountSnapshotBatch(object):
+    """ Builds the snapshots of many accounts in parallel. The account histories
+        are fetched by ``thread_num`` threads, each connected to its own node, and
+        the snapshots are built from the fetched histories in ``process_num``
+        processes, which do not connect to any node.
+
+        :param list accounts: account names (or account dicts/:class:`beem.account.Account` objects)
+        :param Steem blockchain_instance: Steem/Hive instance
+        :param snapshot_class: :class:`AccountSnapshot` or :class:`ArrayAccountSnapshot`
+        :param int thread_num: number of threads which fetch account histories
+        :param float requests_per_second: maximum number of history requests per node and second,
+            None disables the limit
+        :param int process_num: number of processes which build snapshots (default is the number
+            of CPUs), when set to 1 the snapshots are built in the calling process. Incoming votes
+            need process_num=1.
+        :param dict block_time_index: maps datetimes to block numbers. It is shared by all accounts
+            and can be reused between runs, so that start and stop times are only estimated once.
+
+        .. code-block:: python
+
+            >>> from beem.snapshot import AccountSnapshotBatch, ArrayAccountSnapshot
+            >>> from beem import Hive
+            >>> batch = AccountSnapshotBatch(["beembot", "holger80"], snapshot_class=ArrayAccountSnapshot,
+            ...                              blockchain_instance=Hive(), thread_num=4)  # doctest: +SKIP
+            >>> for snapshot in batch.stream(build_kwargs={"enable_rewards": True}):  # doctest: +SKIP
+            ...     print(snapshot.account["name"], snapshot.own_vests[-1])  # doctest: +SKIP
+
+    """
+    def __init__(self, accounts, blockchain_instance=None, snapshot_class=AccountSnapshot, thread_num=8,
+                 requests_per_second=None, process_num=None, block_time_index=None, **kwargs):
+        if blockchain_instance is None:
+            if kwargs.get("steem_instance"):
+                blockchain_instance = kwargs["steem_instance"]
+            elif kwargs.get("hive_instance"):
+                blockchain_instance = kwargs["hive_instance"]
+        self.blockchain = blockchain_instance or shared_blockchain_instance()
+        self.accounts = accounts
+        self.snapshot_class = snapshot_class
+        self.thread_num = max(1, min(thread_num, len(accounts)))
+        self.rate_limiter = NodeRateLimiter(requests_per_second)
+        self.process_num = process_num
+        if block_time_index is None:
+            block_time_index = {}
+        self.block_time_index = block_time_index
+
+    def get_block_num(self, timestamp):
+        """ Returns the estimated block number of ``timestamp`` from the block time index"""
+        timestamp = addTzInfo(timestamp)
+        if timestamp not in self.block_time_index:
+            from beem.blockchain import Blockchain
+            blockchain = Blockchain(blockchain_instance=self.blockchain)
+            self.block_time_index[timestamp] = blockchain.get_estimated_block_num(timestamp)
+        return self.block_time_index[timestamp]
+
+    def fetch_history(self, account, blockchain_instance=None, start=None, stop=None, use_block_num=True,
+                      batch_size=1000):
+        """ Returns the account json and the history of a single account. The rate
+            limit is applied to each requested history page.
+        """
+        blockchain_instance = blockchain_instance or self.blockchain
+        account = Account(account, blockchain_instance=blockchain_instance)
+        url = blockchain_instance.rpc.url if blockchain_instance.rpc is not None else None
+        history = []
+        self.rate_limiter.wait(url)
+        for op in account.history(start=start, stop=stop, use_block_num=use_block_num, batch_size=batch_size):
+            history.append(op)
+            if len(history) % batch_size == 0:
+                self.rate_limiter.wait(url)
+        return account.json(), history
+
+    def stream(self, start=None, stop=None, use_block_num=True, batch_size=1000, build_kwargs={},
+               build_arrays=False):
+        """ Yields the built snapshots in the order in which they are finished
+
+            :param start: start block number/virtual op number/datetime of the histories
+            :param stop: stop block number/virtual op number/datetime of the histories
+            :param bool use_block_num: if true, start and stop are block numbers,
+                otherwise virtual OP count numbers.
+            :param int batch_size: number of operations per history request
+            :param dict build_kwargs: parameters of :func:`AccountSnapshot.build`. Incoming votes
+                (``enable_in_votes`` or ``"vote"`` in ``only_ops``) are fetched from a node for
+                every vote and can only be built with ``process_num=1``.
+            :param bool build_arrays: when True, the sp and vp arrays are built as well. The vp arrays
+                depend on the dynamic global properties and are built in the calling process,
+                so that the properties are fetched only once.
+            :raises ValueError: when incoming votes are requested and ``process_num`` is not 1
+        """
+        if FUTURES_MODULE is None:
+            raise ImportError("concurrent.futures is needed for AccountSnapshotBatch")
+        if self.process_num != 1 and (build_kwargs.get("enable_in_votes") or
+                                      "vote" in build_kwargs.get("only_ops", [])):
+            # worker processes are offline and cannot fetch the votes
+            raise ValueError("Incoming votes can only be built with process_num=1!")
+        if use_block_num:
+            if isinstance(start, (datetime, date)):
+                start = self.get_block_num(start)
+            if isinstance(stop, (datetime, date)):
+                stop = self.get_block_num(stop)
+        blockchain_instances = get_thread_instances(self.blockchain, self.thread_num)
+        fetch_pool = ThreadPoolExecutor(max_workers=self.thread_num)
+        build_pool = None
+        if self.process_num != 1:
+            build_pool = ProcessPoolExecutor(max_workers=self.process_num)
+        try:
+            fetch_futures = [fetch_pool.submit(self.fetch_history, account, blockchain_instances[i % self.thread_num],
+                                               start=start, stop=stop, use_block_num=use_block_num,
+                                               batch_size=batch_size)
+                             for i, account in enumerate(self.accounts)]
+            build_futures = []
+            for future in as_completed(fetch_futures):
+                account, history = future.result()
+                if build_pool is None:
+                    yield self._attach(_build_snapshot(self.snapshot_class, account, history, build_kwargs,
+                                                       build_arrays, blockchain_instance=self.blockchain),
+                                       build_arrays)
+                    continue
+                build_futures.append(build_pool.submit(_build_snapshot, self.snapshot_class, account, history,
+                                                       build_kwargs, build_arrays,
+                                                       blockchain_class=self.blockchain.__class__))
+                # finished snapshots are returned while histories are still fetched
+                for build_future in [f for f in build_futures if f.done()]:
+                    build_futures.remove(build_future)
+                    yield self._attach(build_future.result(), build_arrays)
+            for build_future in as_completed(build_futures):
+                yield self._attach(build_future.result(), build_arrays)
+        finally:
+            fetch_pool.shutdown(wait=False)
+            if build_pool is not None:
+                build_pool.shutdown(wait=True)
+
+    def run(self, start=None, stop=None, use_block_num=True, batch_size=1000, build_kwargs={}, build_arrays=False):
+        """ Returns a dict with the account names as keys and the built snapshots as values.
+            The parameters are the same as in :func:`stream`.
+        """
+        snapshots = {}
+        for snapshot in self.stream(start=start, stop=stop, use_block_num=use_block_num, batch_size=batch_size,
+                                    build_kwargs=build_kwargs, build_arrays=build_arrays):
+            snapshots[snapshot.account["name"]] = snapshot
+        return snapshots
+
+    def _attach(self, snapshot, build_arrays=False):
+        """ Replaces the offline blockchain instance of a snapshot built in a worker process"""
+        snapshot.blockchain = self.blockchain
+        snapshot.account.blockchain = self.blockchain
+        if build_arrays:
+            snapshot.build_vp_arrays()
+        return snapshot
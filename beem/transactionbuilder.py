@@ -1,15 +1,15 @@
 # -*- coding: utf-8 -*-
 import logging
-import struct
 #import time (not currently used)
 from datetime import timedelta
-from binascii import unhexlify
 from beemgraphenebase.py23 import bytes_types, integer_types, string_types, text_type
 from .account import Account
 from .utils import formatTimeFromNow, formatTimeString
+from .refblock import fetch_block_params, get_ref_block_provider
+from .authoritycache import get_authority_cache
 from beembase.objects import Operation
 from beemgraphenebase.account import PrivateKey, PublicKey
-from beembase.signedtransactions import Signed_Transaction
+from beembase.signedtransactions import Signed_Transaction, get_transaction_hex
 from beembase.ledgertransactions import Ledger_Transaction
 from beembase import operations #removed deprecated transactions module
 from .exceptions import (
@@ -210,6 +210,18 @@ class TransactionBuilder(dict):
             return
         if permission not in ["active", "owner", "posting"]:
             raise AssertionError("Invalid permission")
+        if isinstance(account, string_types) and not self._use_ledger and \
+                not (self.blockchain.use_sc2 and self.blockchain.steemconnect is not None):
+            # Signing keys which were resolved before for this account
+            cached = get_authority_cache(self.blockchain).get(account, permission)
+            if cached is not None:
+                if self.blockchain.wallet.locked():
+                    raise WalletLocked()
+                if account not in self.signing_accounts:
+                    for wif in cached["wifs"]:
+                        self.appendWif(wif)
+                    self.signing_accounts.append(account)
+                return
         account = Account(account, blockchain_instance=self.blockchain)
         auth_field = self._get_auth_field(permission)
         if auth_field not in account:
@@ -273,6 +285,9 @@ class TransactionBuilder(dict):
                     keys.extend(_keys)
                 for x in keys:
                     self.appendWif(x[0])
+                if keys:
+                    get_authority_cache(self.blockchain).set(account["name"], permission, [x[0] for x in keys],
+                                                             sum([x[1] for x in keys]), required_treshold)
 
             self.signing_accounts.append(account["name"])
 
@@ -373,30 +388,21 @@ class TransactionBuilder(dict):
         super(TransactionBuilder, self).update(self.tx.json())
         self._unset_require_reconstruction()
 
-    def get_block_params(self, use_head_block=False):
+    def get_block_params(self, use_head_block=False, use_cache=True):
         """ Auxiliary method to obtain ``ref_block_num`` and
             ``ref_block_prefix``. Requires a connection to a
             node!
-        """
 
-        dynBCParams = self.blockchain.get_dynamic_global_properties(use_stored_data=False)
-        # fix for corner case where last_irreversible_block_num == head_block_number
-        # then int(dynBCParams["last_irreversible_block_num"]) + 1 does not exists
-        # and BlockHeader throws error
-        if use_head_block or int(dynBCParams["last_irreversible_block_num"]) == int(dynBCParams["head_block_number"]):
-            ref_block_num = dynBCParams["head_block_number"] & 0xFFFF
-            ref_block_prefix = struct.unpack_from(
-                "<I", unhexlify(dynBCParams["head_block_id"]), 4
-            )[0]
-        else:
-            # need to get subsequent block because block head doesn't return 'id' - stupid
-            from .block import BlockHeader
-            block = BlockHeader(int(dynBCParams["last_irreversible_block_num"]) + 1, blockchain_instance=self.blockchain)
-            ref_block_num = dynBCParams["last_irreversible_block_num"] & 0xFFFF
-            ref_block_prefix = struct.unpack_from(
-                "<I", unhexlify(block["previous"]), 4
-            )[0]
-        return ref_block_num, ref_block_prefix
+            :param bool use_head_block: use the head block instead of the
+                last irreversible block
+            :param bool use_cache: when True (default), the values are
+                shared by all TransactionBuilders of the blockchain instance
+                and fetched at most once per block interval
+                (see :class:`beem.refblock.RefBlockProvider`)
+        """
+        if not use_cache:
+            return fetch_block_params(self.blockchain, use_head_block=use_head_block)
+        return get_ref_block_provider(self.blockchain).get_block_params(use_head_block=use_head_block)
 
     def sign(self, reconstruct_tx=True):
         """ Sign a provided transaction with the provided key(s)
@@ -476,9 +482,19 @@ class TransactionBuilder(dict):
             ret = ret["keys"]
         return ret
 
-    def get_transaction_hex(self):
+    def get_transaction_hex(self, local=True):
         """ Returns a hex value of the transaction
+
+            :param bool local: when True (default), the transaction is
+                serialized locally, the node is only asked when this fails
         """
+        if local:
+            try:
+                return get_transaction_hex(self.json(), prefix=self.blockchain.prefix)
+            except Exception as e:
+                if not self.blockchain.is_connected():
+                    raise e
+                log.debug("Could not serialize transaction locally: %s" % str(e))
         if not self.blockchain.is_connected():
             raise OfflineHasNoRPCException("No RPC available in offline mode!")
         self.blockchain.rpc.set_next_node_on_empty_reply(False)
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import logging
 import os
-from beemgraphenebase.account import PrivateKey
+from beemgraphenebase.account import PrivateKey, clear_private_key_cache
 from beem.instance import shared_blockchain_instance
+from .authoritycache import get_authority_cache
 from .account import Account
 from .exceptions import (
     MissingKeyError,
@@ -134,6 +135,7 @@ class Wallet(object):
         for wif in loadkeys:
             pub = self.publickey_from_wif(wif)
             self.store.add(str(wif), pub)
+        get_authority_cache(self.blockchain).invalidate()
 
     def is_encrypted(self):
         """ Is the key store encrypted?
@@ -154,6 +156,8 @@ class Wallet(object):
         lock_ok = False
         if self.store.is_encrypted():
             lock_ok =  self.store.lock()       
+        get_authority_cache(self.blockchain).invalidate()
+        clear_private_key_cache()
         return lock_ok
 
     def unlocked(self):
@@ -220,6 +224,7 @@ class Wallet(object):
         if str(pub) in self.store:
             raise KeyAlreadyInStoreException("Key already in the store")
         self.store.add(str(wif), str(pub))
+        get_authority_cache(self.blockchain).invalidate()
 
     def getPrivateKeyForPublicKey(self, pub):
         """ Obtain the private key for a given public key
@@ -236,6 +241,8 @@ class Wallet(object):
             :param str pub: Public key
         """
         self.store.delete(str(pub))
+        get_authority_cache(self.blockchain).invalidate()
+        clear_private_key_cache()
 
     def removeAccount(self, account):
         """ Remove all keys associated with a given account
@@ -246,6 +253,8 @@ class Wallet(object):
         for a in accounts:
             if a["name"] == account:
                 self.store.delete(a["pubkey"])
+        get_authority_cache(self.blockchain).invalidate()
+        clear_private_key_cache()
 
     def getKeyForAccount(self, name, key_type):
         """ Obtain `key_type` Private Key for an account from the wallet database
@@ -1,11 +1,13 @@
 """ beembase."""
 from .version import version as __version__
 __all__ = [
+    'deserializer',
     'memo',
     'objects',
     'objecttypes',
     'operationids',
     'operations',
+    'signatureverifier',
     'signedtransactions',
     'ledgertransactions',
     'transactions',
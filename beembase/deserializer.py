@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import struct
+from binascii import hexlify
+from beemgraphenebase.deserializer import Deserializer, Stream
+from beemgraphenebase.chains import known_chains
+from .operationids import ops
+
+_amount_struct = struct.Struct("<qB7s")
+
+authority = [
+    ("weight_threshold", "uint32"),
+    ("account_auths", ("map", "string", "uint16")),
+    ("key_auths", ("map", "public_key", "uint16")),
+]
+
+price = [
+    ("base", "amount"),
+    ("quote", "amount"),
+]
+
+chain_properties = [
+    ("account_creation_fee", "amount"),
+    ("maximum_block_size", "uint32"),
+    ("sbd_interest_rate", "uint16"),
+]
+
+beneficiary = [
+    ("account", "string"),
+    ("weight", "uint16"),
+]
+
+extensions = ("array", "void_extension")
+
+block_id = ("fixed_bytes", 20)
+digest = ("fixed_bytes", 32)
+
+pow2_input = [
+    ("worker_account", "string"),
+    ("prev_block", block_id),
+    ("nonce", "uint64"),
+]
+
+signed_block_header = [
+    ("previous", block_id),
+    ("timestamp", "point_in_time"),
+    ("witness", "string"),
+    ("transaction_merkle_root", ("fixed_bytes", 20)),
+    ("extensions", ("array", "block_header_extension")),
+    ("witness_signature", "signature"),
+]
+
+#: Wire format of the operations, as list of ``(name, type)`` fields
+operation_structs = {
+    "vote": [("voter", "string"), ("author", "string"), ("permlink", "string"), ("weight", "int16")],
+    "comment": [("parent_author", "string"), ("parent_permlink", "string"), ("author", "string"),
+                ("permlink", "string"), ("title", "string"), ("body", "string"), ("json_metadata", "string")],
+    "transfer": [("from", "string"), ("to", "string"), ("amount", "amount"), ("memo", "string")],
+    "transfer_to_vesting": [("from", "string"), ("to", "string"), ("amount", "amount")],
+    "withdraw_vesting": [("account", "string"), ("vesting_shares", "amount")],
+    "limit_order_create": [("owner", "string"), ("orderid", "uint32"), ("amount_to_sell", "amount"),
+                           ("min_to_receive", "amount"), ("fill_or_kill", "bool"), ("expiration", "point_in_time")],
+    "limit_order_cancel": [("owner", "string"), ("orderid", "uint32")],
+    "feed_publish": [("publisher", "string"), ("exchange_rate", "price")],
+    "convert": [("owner", "string"), ("requestid", "uint32"), ("amount", "amount")],
+    "account_create": [("fee", "amount"), ("creator", "string"), ("new_account_name", "string"),
+                       ("owner", "authority"), ("active", "authority"), ("posting", "authority"),
+                       ("memo_key", "public_key"), ("json_metadata", "string")],
+    "account_update": [("account", "string"), ("owner", ("optional", "authority")),
+                       ("active", ("optional", "authority")), ("posting", ("optional", "authority")),
+                       ("memo_key", "public_key"), ("json_metadata", "string")],
+    "witness_update": [("owner", "string"), ("url", "string"), ("block_signing_key", "public_key"),
+                       ("props", "chain_properties"), ("fee", "amount")],
+    "account_witness_vote": [("account", "string"), ("witness", "string"), ("approve", "bool")],
+    "account_witness_proxy": [("account", "string"), ("proxy", "string")],
+    "pow": [("worker_account", "string"), ("block_id", block_id), ("nonce", "uint64"), ("work", "pow_data"),
+            ("props", "chain_properties")],
+    "custom": [("required_auths", ("array", "string")), ("id", "uint16"), ("data", "bytes")],
+    "report_over_production": [("reporter", "string"), ("first_block", "signed_block_header"),
+                               ("second_block", "signed_block_header")],
+    "delete_comment": [("author", "string"), ("permlink", "string")],
+    "custom_json": [("required_auths", ("array", "string")), ("required_posting_auths", ("array", "string")),
+                    ("id", "string"), ("json", "string")],
+    "comment_options": [("author", "string"), ("permlink", "string"), ("max_accepted_payout", "amount"),
+                        ("percent_steem_dollars", "uint16"), ("allow_votes", "bool"),
+                        ("allow_curation_rewards", "bool"), ("extensions", ("array", "comment_options_extension"))],
+    "set_withdraw_vesting_route": [("from_account", "string"), ("to_account", "string"), ("percent", "uint16"),
+                                   ("auto_vest", "bool")],
+    "pow2": [("work", "pow2_work"), ("new_owner_key", ("optional", "public_key")),
+             ("props", "chain_properties")],
+    "limit_order_create2": [("owner", "string"), ("orderid", "uint32"), ("amount_to_sell", "amount"),
+                            ("fill_or_kill", "bool"), ("exchange_rate", "price"), ("expiration", "point_in_time")],
+    "claim_account": [("creator", "string"), ("fee", "amount"), ("extensions", extensions)],
+    "create_claimed_account": [("creator", "string"), ("new_account_name", "string"), ("owner", "authority"),
+                               ("active", "authority"), ("posting", "authority"), ("memo_key", "public_key"),
+                               ("json_metadata", "string"), ("extensions", extensions)],
+    "request_account_recovery": [("recovery_account", "string"), ("account_to_recover", "string"),
+                                 ("new_owner_authority", "authority"), ("extensions", extensions)],
+    "recover_account": [("account_to_recover", "string"), ("new_owner_authority", "authority"),
+                        ("recent_owner_authority", "authority"), ("extensions", extensions)],
+    "change_recovery_account": [("account_to_recover", "string"), ("new_recovery_account", "string"),
+                                ("extensions", extensions)],
+    "escrow_transfer": [("from", "string"), ("to", "string"), ("agent", "string"), ("escrow_id", "uint32"),
+                        ("sbd_amount", "amount"), ("steem_amount", "amount"), ("fee", "amount"),
+                        ("ratification_deadline", "point_in_time"), ("escrow_expiration", "point_in_time"),
+                        ("json_meta", "string")],
+    "escrow_dispute": [("from", "string"), ("to", "string"), ("agent", "string"), ("who", "string"),
+                       ("escrow_id", "uint32")],
+    "escrow_release": [("from", "string"), ("to", "string"), ("agent", "string"), ("who", "string"),
+                       ("receiver", "string"), ("escrow_id", "uint32"), ("sbd_amount", "amount"),
+                       ("steem_amount", "amount")],
+    "escrow_approve": [("from", "string"), ("to", "string"), ("agent", "string"), ("who", "string"),
+                       ("escrow_id", "uint32"), ("approve", "bool")],
+    "transfer_to_savings": [("from", "string"), ("to", "string"), ("amount", "amount"), ("memo", "string")],
+    "transfer_from_savings": [("from", "string"), ("request_id", "uint32"), ("to", "string"),
+                              ("amount", "amount"), ("memo", "string")],
+    "cancel_transfer_from_savings": [("from", "string"), ("request_id", "uint32")],
+    "reset_account": [("reset_account", "string"), ("account_to_reset", "string"),
+                      ("new_owner_authority", "authority")],
+    "set_reset_account": [("account", "string"), ("current_reset_account", "string"),
+                          ("reset_account", "string")],
+    "custom_binary": [("required_owner_auths", ("array", "string")), ("required_active_auths", ("array", "string")),
+                      ("required_posting_auths", ("array", "string")), ("required_auths", ("array", "authority")),
+                      ("id", "string"), ("data", "bytes")],
+    "decline_voting_rights": [("account", "string"), ("decline", "bool")],
+    "claim_reward_balance": [("account", "string"), ("reward_steem", "amount"), ("reward_sbd", "amount"),
+                             ("reward_vests", "amount")],
+    "delegate_vesting_shares": [("delegator", "string"), ("delegatee", "string"), ("vesting_shares", "amount")],
+    "account_create_with_delegation": [("fee", "amount"), ("delegation", "amount"), ("creator", "string"),
+                                       ("new_account_name", "string"), ("owner", "authority"),
+                                       ("active", "authority"), ("posting", "authority"),
+                                       ("memo_key", "public_key"), ("json_metadata", "string"),
+                                       ("extensions", extensions)],
+    "witness_set_properties": [("owner", "string"), ("props", ("map", "string", "bytes")),
+                               ("extensions", extensions)],
+    "account_update2": [("account", "string"), ("owner", ("optional", "authority")),
+                        ("active", ("optional", "authority")), ("posting", ("optional", "authority")),
+                        ("memo_key", ("optional", "public_key")), ("json_metadata", "string"),
+                        ("posting_json_metadata", "string"), ("extensions", extensions)],
+    "create_proposal": [("creator", "string"), ("receiver", "string"), ("start_date", "point_in_time"),
+                        ("end_date", "point_in_time"), ("daily_pay", "amount"), ("subject", "string"),
+                        ("permlink", "string"), ("extensions", extensions)],
+    "update_proposal_votes": [("voter", "string"), ("proposal_ids", ("array", "int64")), ("approve", "bool"),
+                              ("extensions", extensions)],
+    "remove_proposal": [("proposal_owner", "string"), ("proposal_ids", ("array", "int64")),
+                        ("extensions", extensions)],
+    "update_proposal": [("proposal_id", "int64"), ("creator", "string"), ("daily_pay", "amount"),
+                        ("subject", "string"), ("permlink", "string"),
+                        ("extensions", ("array", "update_proposal_extension"))],
+    "collateralized_convert": [("owner", "string"), ("requestid", "uint32"), ("amount", "amount")],
+    "recurrent_transfer": [("from", "string"), ("to", "string"), ("amount", "amount"), ("memo", "string"),
+                           ("recurrence", "uint16"), ("executions", "uint16"),
+                           ("extensions", ("array", "recurrent_transfer_extension"))],
+}
+
+transaction = [
+    ("ref_block_num", "uint16"),
+    ("ref_block_prefix", "uint32"),
+    ("expiration", "point_in_time"),
+    ("operations", ("array", "operation")),
+    ("extensions", extensions),
+]
+
+signed_transaction = transaction + [
+    ("signatures", ("array", "signature")),
+]
+
+#: Field names of Hive, which differ from the Steem names
+hive_field_names = {
+    "percent_steem_dollars": "percent_hbd",
+    "sbd_interest_rate": "hbd_interest_rate",
+    "sbd_amount": "hbd_amount",
+    "steem_amount": "hive_amount",
+    "reward_steem": "reward_hive",
+    "reward_sbd": "reward_hbd",
+}
+
+#: Asset symbols which are replaced on the wire by ``Amount.__bytes__``
+wire_symbols = {"HBD": "SBD", "HIVE": "STEEM"}
+
+
+class ChainDeserializer(Deserializer):
+    """ Parses transactions and operations of a steem based chain from their
+        wire format into the json which is returned by the nodes.
+
+        :param str chain: name of a known chain (default is ``"STEEM"``) or
+            a dict with chain params. Amount symbols and the field names
+            which differ between Hive and Steem are taken from its assets
+        :param bool appbase: when True, operations are returned as
+            ``{"type": "vote_operation", "value": {...}}`` and amounts as
+            NAI dicts, otherwise operations are ``["vote", {...}]`` lists
+            and amounts are strings
+
+        .. code-block:: python
+
+            from beembase.deserializer import ChainDeserializer
+            d = ChainDeserializer(chain="HIVE")
+            tx = d.read_transaction(tx_hex)
+            trx_id = d.get_transaction_id(tx_hex)
+
+    """
+    def __init__(self, chain=u"STEEM", appbase=False):
+        if chain is None:
+            chain = u"STEEM"
+        if isinstance(chain, dict):
+            chain_params = chain
+        else:
+            chain_params = known_chains[chain]
+        super(ChainDeserializer, self).__init__(prefix=chain_params.get("prefix", "STM"), appbase=appbase)
+        self.assets = {}
+        self.hive = False
+        for asset in chain_params["chain_assets"]:
+            if asset["symbol"] in wire_symbols:
+                self.hive = True
+            symbol = wire_symbols.get(asset["symbol"], asset["symbol"])
+            self.assets[symbol] = asset
+        self.readers["amount"] = self.read_amount
+        self.readers["version"] = self.read_version
+        self.register_struct("authority", authority)
+        self.register_struct("price", price)
+        self.register_struct("chain_properties", chain_properties)
+        self.register_struct("beneficiary", beneficiary)
+        self.register_struct("comment_payout_beneficiaries", [("beneficiaries", ("array", "beneficiary"))])
+        self.register_struct("update_proposal_end_date", [("end_date", "point_in_time")])
+        self.register_struct("recurrent_transfer_pair_id", [("pair_id", "uint8")])
+        self.register_struct("pow_data", [("worker", "public_key"), ("input", digest), ("signature", "signature"),
+                                     ("work", digest)])
+        self.register_struct("pow2_input", pow2_input)
+        self.register_struct("pow2_data", [("input", "pow2_input"), ("pow_summary", "uint32")])
+        self.register_struct("equihash_proof", [("n", "uint32"), ("k", "uint32"), ("seed", digest),
+                                                ("inputs", ("array", "uint32"))])
+        self.register_struct("equihash_pow", [("input", "pow2_input"), ("proof", "equihash_proof"),
+                                              ("prev_block", block_id), ("pow_summary", "uint32")])
+        self.register_static_variant("pow2_work", {0: ("pow2", "pow2_data"), 1: ("equihash_pow", "equihash_pow")})
+        self.register_struct("hardfork_version_vote", [("hf_version", "version"), ("hf_time", "point_in_time")])
+        self.register_static_variant("block_header_extension",
+                                     {0: ("void_t", "void"), 1: ("version", "version"),
+                                      2: ("hardfork_version_vote", "hardfork_version_vote")})
+        self.register_struct("signed_block_header", signed_block_header)
+        self.register_static_variant("void_extension", {0: ("void", "void")})
+        self.register_static_variant("comment_options_extension",
+                                     {0: ("comment_payout_beneficiaries", "comment_payout_beneficiaries")})
+        self.register_static_variant("update_proposal_extension",
+                                     {0: ("void", "void"), 1: ("update_proposal_end_date", "update_proposal_end_date")})
+        self.register_static_variant("recurrent_transfer_extension",
+                                     {0: ("recurrent_transfer_pair_id", "recurrent_transfer_pair_id")})
+        for name, fields in operation_structs.items():
+            self.register_struct(name, fields)
+        self.register_static_variant("operation", dict([(ops.index(name), (name, name))
+                                                        for name in operation_structs]))
+        self.register_struct("transaction", transaction)
+        self.register_struct("signed_transaction", signed_transaction)
+
+    def get_field_name(self, type_name, name):
+        if self.hive:
+            return hive_field_names.get(name, name)
+        return name
+
+    def read_static_variant(self, stream, type_name):
+        if type_name != "operation":
+            return super(ChainDeserializer, self).read_static_variant(stream, type_name)
+        type_id = stream.read_varint()
+        if type_id not in self.variants["operation"]:
+            raise ValueError("Unsupported operation id %d" % type_id)
+        name = ops[type_id]
+        value = self.read_struct(stream, name)
+        if self.appbase:
+            return {"type": name + "_operation", "value": value}
+        return [name, value]
+
+    def read_amount(self, stream):
+        start = stream.pos
+        stream.read(_amount_struct.size)
+        amount, precision, symbol = _amount_struct.unpack_from(stream.data, start)
+        symbol = symbol.rstrip(b"\x00").decode("ascii")
+        asset = self.assets.get(symbol)
+        if self.appbase:
+            if asset is None:
+                raise ValueError("Unknown asset %s" % symbol)
+            return {"amount": str(amount), "precision": precision, "nai": asset["asset"]}
+        if asset is not None:
+            symbol = asset["symbol"]
+        if precision == 0:
+            return "%d %s" % (amount, symbol)
+        sign = "-" if amount < 0 else ""
+        amount = abs(amount)
+        return "%s%d.%0*d %s" % (sign, amount // 10 ** precision, precision, amount % 10 ** precision, symbol)
+
+    def read_version(self, stream):
+        version = self.read_type(stream, "uint32")
+        return "%d.%d.%d" % (version >> 24, (version >> 16) & 0xff, version & 0xffff)
+
+    def read_operation(self, data):
+        """ Returns the json of a serialized :class:`beembase.objects.Operation`
+
+            :param data: serialized operation as bytes or hex string
+        """
+        return self.read(data, "operation")
+
+    def read_transaction(self, data, signed=True):
+        """ Returns the json of a serialized transaction
+
+            :param data: serialized transaction as bytes or hex string, e.g.
+                the result of ``get_transaction_hex``
+            :param bool signed: when False, ``data`` contains no signatures
+                (as the serialized transaction in the signing digest)
+        """
+        return self.read(data, "signed_transaction" if signed else "transaction")
+
+    def read_transactions(self, data):
+        """ Yields the json of each signed transaction in ``data``, which
+            contains serialized transactions one after another
+        """
+        stream = Stream(self.to_bytes(data))
+        while not stream.at_end():
+            yield self.read_type(stream, "signed_transaction")
+
+    def get_transaction_id(self, data, signed=True):
+        """ Returns the transaction id of a serialized transaction, which is
+            the hash of the transaction without its signatures
+        """
+        stream = Stream(self.to_bytes(data))
+        for name, field_type in transaction:
+            self.read_type(stream, field_type)
+        end = stream.pos
+        if signed:
+            self.read_type(stream, ("array", "signature"))
+        if not stream.at_end():
+            raise ValueError("%d unused bytes at position %d" % (len(stream.data) - stream.pos, stream.pos))
+        return hexlify(hashlib.sha256(stream.data[:end]).digest()[:20]).decode("ascii")
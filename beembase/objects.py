@@ -15,6 +15,7 @@ from beemgraphenebase.objects import GrapheneObject, isArgsThisClass
 from .objecttypes import object_type
 from beemgraphenebase.account import PublicKey
 from beemgraphenebase.objects import Operation as GPHOperation
+from beemgraphenebase.serializer import serializer
 from beemgraphenebase.chains import known_chains
 from .operationids import operations
 import struct
@@ -26,28 +27,44 @@ def value_to_decimal(value, decimal_places):
     return decimal.Decimal(str(float(value))).quantize(decimal.Decimal('1e-{}'.format(decimal_places)))
 
 
+_chain_assets = (0, {})
+
+
+def get_chain_assets(prefix):
+    """ Returns the assets of all known chains with ``prefix`` as two dicts.
+        The first maps symbols and asset names to ``(symbol, asset, precision)``,
+        where the first matching chain wins. The second maps asset names to
+        the symbol, where the last matching chain wins. The dicts are rebuilt
+        when custom chains were added to the known chains.
+    """
+    global _chain_assets
+    chain_count, chain_assets = _chain_assets
+    if chain_count != len(known_chains):
+        chain_assets = {}
+        _chain_assets = (len(known_chains), chain_assets)
+    if prefix not in chain_assets:
+        by_symbol = {}
+        symbols = {}
+        for c in known_chains:
+            if known_chains[c]["prefix"] != prefix:
+                continue
+            for asset in known_chains[c]["chain_assets"]:
+                by_symbol.setdefault(asset["symbol"], (asset["symbol"], asset["asset"], asset["precision"]))
+                by_symbol.setdefault(asset["asset"], (asset["symbol"], asset["asset"], asset["precision"]))
+                symbols[asset["asset"]] = asset["symbol"]
+        chain_assets[prefix] = (by_symbol, symbols)
+    return chain_assets[prefix]
+
+
 class Amount(object):
     def __init__(self, d, prefix=default_prefix, json_str=False):
         self.json_str = json_str
         if isinstance(d, string_types):
             self.amount, self.symbol = d.strip().split(" ")
-            self.precision = None
-            for c in known_chains:
-                if self.precision is not None:
-                    continue
-                if known_chains[c]["prefix"] != prefix:
-                    continue
-                for asset in known_chains[c]["chain_assets"]:
-                    if self.precision is not None:
-                        continue
-                    if asset["symbol"] == self.symbol:
-                        self.precision = asset["precision"]
-                        self.asset = asset["asset"]
-                    elif asset["asset"] == self.symbol:
-                        self.precision = asset["precision"]
-                        self.asset = asset["asset"]
-            if self.precision is None:
+            by_symbol = get_chain_assets(prefix)[0]
+            if self.symbol not in by_symbol:
                 raise Exception("Asset unknown")
+            self.asset, self.precision = by_symbol[self.symbol][1:]
             self.amount = round(value_to_decimal(self.amount, self.precision) * 10 ** self.precision)
             # Workaround to allow transfers in HIVE
 
@@ -56,26 +73,14 @@ class Amount(object):
             self.amount = d[0]
             self.asset = d[2]
             self.precision = d[1]
-            self.symbol = None
-            for c in known_chains:
-                if known_chains[c]["prefix"] != prefix:
-                    continue
-                for asset in known_chains[c]["chain_assets"]:
-                    if asset["asset"] == self.asset:
-                        self.symbol = asset["symbol"]
+            self.symbol = get_chain_assets(prefix)[1].get(self.asset)
             if self.symbol is None:
                 raise ValueError("Unknown NAI, cannot resolve symbol")
             a = Array([String(d[0]), d[1], d[2]])
             self.str_repr = str(a.__str__())
         elif isinstance(d, dict) and "nai" in d:
             self.asset = d["nai"]
-            self.symbol = None
-            for c in known_chains:
-                if known_chains[c]["prefix"] != prefix:
-                    continue
-                for asset in known_chains[c]["chain_assets"]:
-                    if asset["asset"] == d["nai"]:
-                        self.symbol = asset["symbol"]
+            self.symbol = get_chain_assets(prefix)[1].get(self.asset)
             if self.symbol is None:
                 raise ValueError("Unknown NAI, cannot resolve symbol")
             self.amount = d["amount"]
@@ -84,8 +89,9 @@ class Amount(object):
         else:
             self.amount = d.amount
             self.symbol = d.symbol
-            self.asset = d.asset["asset"]
-            self.precision = d.asset["precision"]
+            asset = d["asset"] if isinstance(d, dict) and "asset" in d else d.asset
+            self.asset = asset["asset"]
+            self.precision = asset["precision"]
             self.amount = round(value_to_decimal(self.amount, self.precision) * 10 ** self.precision)
             self.str_repr = str(d)
             # self.str_repr = json.dumps((d.json()))
@@ -108,6 +114,26 @@ class Amount(object):
         return self.str_repr
 
 
+_amount_struct = struct.Struct("<qb7s")
+_amount_symbols = {"HBD": b"SBD", "HIVE": b"STEEM"}
+
+
+def write_amount(buf, amount):
+    """ Appends the wire format of an :class:`Amount` to ``buf``, with the
+        same HIVE and HBD workaround as ``Amount.__bytes__``
+    """
+    symbol = _amount_symbols.get(amount.symbol)
+    if symbol is None:
+        symbol = py23_bytes(amount.symbol, "ascii")
+    if len(symbol) > 7:
+        buf += py23_bytes(amount)
+        return
+    buf += _amount_struct.pack(int(amount.amount), amount.precision, symbol)
+
+
+serializer.register(Amount, write_amount)
+
+
 class Operation(GPHOperation):
     def __init__(self, *args, **kwargs):
         self.appbase = kwargs.pop("appbase", False)
@@ -144,6 +170,9 @@ class Operation(GPHOperation):
             return json.dumps([self.name.lower(), self.op.toJson()])
 
 
+serializer.register(Operation, serializer.write_operation)
+
+
 class Memo(GrapheneObject):
     def __init__(self, *args, **kwargs):
         if isArgsThisClass(self, args):
@@ -358,15 +387,16 @@ class UpdateProposalExtensions(Static_variant):
     """
     def __init__(self, o):
         if isinstance(o, dict) and 'type' in o and 'value' in o:
-            if o['type'] == "update_proposal_end_date":
+            if o['type'] in ["update_proposal_end_date", 1]:
                 type_id = 1
             else:
                 type_id = ~0
+            data = o['value']
         else:
             type_id, data = o
 
         if type_id == 1:
-            data = (UpdateProposalEndDate(o['value']))
+            data = (UpdateProposalEndDate(data))
         else:
             raise Exception("Unknown UpdateProposalExtension")
         super(UpdateProposalExtensions, self).__init__(data, type_id, False)
@@ -434,6 +434,8 @@ class Update_proposal(GrapheneObject):
         if "end_date" in kwargs and kwargs["end_date"]:
             extension = { 'type': 'update_proposal_end_date', 'value': {'end_date': kwargs["end_date"]} }
             extensions = Array([UpdateProposalExtensions(extension)])
+        elif "extensions" in kwargs and kwargs["extensions"]:
+            extensions = Array([UpdateProposalExtensions(o) for o in kwargs["extensions"]])
 
 
         super(Update_proposal, self).__init__(
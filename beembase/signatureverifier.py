@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+from binascii import hexlify
+from beemgraphenebase.account import PublicKey
+from beemgraphenebase.chains import known_chains
+from beemgraphenebase.py23 import py23_bytes
+from beemgraphenebase import ecdsasig
+from beemgraphenebase.ecdsasig import recover_signer
+from .signedtransactions import Signed_Transaction, non_protocol_operations
+import logging
+log = logging.getLogger(__name__)
+
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
+
+
+def recover_signers(items):
+    """ Returns the list of compressed signer keys of each
+        ``(digest, signatures)`` item, signatures which cannot be recovered
+        are left out
+    """
+    result = []
+    for digest, signatures in items:
+        keys = []
+        for signature in signatures:
+            key = recover_signer(digest, signature)
+            if key is not None:
+                keys.append(key)
+        result.append(keys)
+    return result
+
+
+def _recover_chunk(items, module):
+    ecdsasig.SECP256K1_MODULE = module
+    return recover_signers(items)
+
+
+class SignatureVerifier(object):
+    """ Recovers the signing keys of many transactions, e.g. of all
+        transactions of a block range.
+
+        The digest of every transaction is computed from its serialized
+        form, the signer of each signature is recovered directly with the
+        recovery id stored in the first signature byte. The recovery can be
+        spread over a process pool. Transactions with one of the
+        ``non_protocol_operations`` cannot be serialized locally, None is
+        returned for them instead of a set of keys.
+
+        :param str chain: identifier for the chain or chain params dict
+        :param str prefix: prefix of the returned public keys, the chain
+            prefix is used when not set
+        :param int processes: number of worker processes, when None or 1
+            (or when concurrent.futures is not available) everything runs
+            in the current process
+        :param int chunk_size: number of transactions which are sent to a
+            worker process at once
+
+        .. code-block:: python
+
+            from beem.block import Block
+            from beembase.signatureverifier import SignatureVerifier
+            verifier = SignatureVerifier(chain="HIVE", processes=4)
+            signers = verifier.verify_block(Block(50000000))
+
+    """
+    def __init__(self, chain="STEEM", prefix=None, processes=None, chunk_size=256):
+        if isinstance(chain, dict):
+            self.chain_params = chain
+        else:
+            self.chain_params = known_chains[chain]
+        self.prefix = prefix or self.chain_params["prefix"]
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ Shuts down the process pool"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def get_digest(self, tx):
+        """ Returns the digest and the signatures of a transaction
+
+            :param tx: transaction as dict or
+                :class:`beembase.signedtransactions.Signed_Transaction`
+
+            None is returned when the transaction contains one of the
+            ``non_protocol_operations``.
+        """
+        if not isinstance(tx, Signed_Transaction):
+            tx = dict(tx)
+            tx["prefix"] = self.prefix
+            tx = Signed_Transaction(tx)
+        for op in tx.data["operations"].data:
+            if op.name.lower() in non_protocol_operations:
+                log.debug("%s cannot be serialized locally, the signers are not recovered" % op.name.lower())
+                return None
+        tx.deriveDigest(self.chain_params)
+        return tx.digest, [py23_bytes(signature) for signature in tx.data["signatures"].data]
+
+    def verify_transactions(self, transactions):
+        """ Returns a set of signing public keys for each transaction,
+            or None for transactions with one of the ``non_protocol_operations``
+
+            :param list transactions: transactions as dict or
+                :class:`beembase.signedtransactions.Signed_Transaction`
+        """
+        digests = [self.get_digest(tx) for tx in transactions]
+        items = [item for item in digests if item is not None]
+        if self.processes is not None and self.processes > 1 and FUTURES_MODULE is not None and \
+                len(items) > self.chunk_size:
+            keys = self.recover_parallel(items)
+        else:
+            keys = recover_signers(items)
+        keys = iter(keys)
+        result = []
+        for item in digests:
+            if item is None:
+                result.append(None)
+                continue
+            result.append(set([format(PublicKey(hexlify(key).decode("ascii"), prefix=self.prefix), self.prefix)
+                               for key in next(keys)]))
+        return result
+
+    def recover_parallel(self, items):
+        """ Recovers the signers in the process pool"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        futures = []
+        for i in range(0, len(items), self.chunk_size):
+            futures.append(self.executor.submit(_recover_chunk, items[i:i + self.chunk_size],
+                                                ecdsasig.SECP256K1_MODULE))
+        keys = []
+        for future in futures:
+            keys.extend(future.result())
+        return keys
+
+    def get_block_transactions(self, block):
+        if hasattr(block, "json_transactions"):
+            return block.json_transactions
+        return block.get("transactions", [])
+
+    def verify_block(self, block):
+        """ Returns a set of signing public keys for each transaction of a
+            block
+
+            :param block: :class:`beem.block.Block` or block dict
+        """
+        return self.verify_transactions(self.get_block_transactions(block))
+
+    def verify_blocks(self, blocks):
+        """ Returns for each block a list with a set of signing public keys
+            for each transaction. The transactions of all blocks are
+            verified together.
+
+            :param list blocks: list of :class:`beem.block.Block` or block dicts
+        """
+        counts = []
+        transactions = []
+        for block in blocks:
+            trxs = self.get_block_transactions(block)
+            counts.append(len(trxs))
+            transactions.extend(trxs)
+        signers = self.verify_transactions(transactions)
+        result = []
+        start = 0
+        for count in counts:
+            result.append(signers[start:start + count])
+            start += count
+        return result
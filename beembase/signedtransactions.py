@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+from binascii import hexlify
 from beemgraphenebase.signedtransactions import Signed_Transaction as GrapheneSigned_Transaction
+from beemgraphenebase.serializer import serialize
 from .operations import Operation
 from beemgraphenebase.chains import known_chains
 import logging
@@ -42,3 +44,46 @@ class Signed_Transaction(GrapheneSigned_Transaction):
 
     def getKnownChains(self):
         return self.known_chains
+
+
+#: Operations whose classes in :mod:`beembase.operations` do not write the
+#: wire format of the nodes, their hex and trx_id cannot be computed locally
+non_protocol_operations = ["custom", "custom_binary", "escrow_dispute", "escrow_release"]
+
+
+def _get_signed_transaction(transaction, prefix):
+    if not isinstance(transaction, Signed_Transaction):
+        transaction = dict(transaction)
+        transaction["prefix"] = prefix
+        transaction = Signed_Transaction(transaction)
+    for op in transaction.data["operations"].data:
+        if op.name.lower() in non_protocol_operations:
+            raise ValueError("%s cannot be serialized locally!" % op.name.lower())
+    return transaction
+
+
+def get_transaction_hex(transaction, prefix="STM"):
+    """ Returns the serialized transaction as hex string, as returned by
+        the ``get_transaction_hex`` api call, without using an RPC node
+
+        :param dict transaction: transaction json in legacy or appbase
+            format, e.g. from a block (extra keys such as ``transaction_id``
+            are ignored) or a :class:`Signed_Transaction`
+        :param str prefix: prefix of the public keys in the transaction
+        :raises ValueError: when the transaction contains one of the
+            ``non_protocol_operations``
+    """
+    return hexlify(serialize(_get_signed_transaction(transaction, prefix))).decode("ascii")
+
+
+def get_transaction_id(transaction, prefix="STM"):
+    """ Returns the transaction id (trx_id) of a transaction without using
+        an RPC node
+
+        :param dict transaction: transaction json in legacy or appbase
+            format or a :class:`Signed_Transaction`
+        :param str prefix: prefix of the public keys in the transaction
+        :raises ValueError: when the transaction contains one of the
+            ``non_protocol_operations``
+    """
+    return _get_signed_transaction(transaction, prefix).id
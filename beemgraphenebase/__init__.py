@@ -10,13 +10,16 @@ from .version import version as __version__
 __all__ = ['account',
            'aes',
            'base58',
+           'batchsigner',
            'bip32',
            'bip38',
+           'deserializer',
            'types',
            'ecdasig',
            'chains',
            'objects',
            'operations',
+           'serializer',
            'signedtransactions',
            'unsignedtransactions',
            'objecttypes',
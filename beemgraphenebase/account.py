@@ -12,17 +12,129 @@ import hmac
 import itertools
 from binascii import hexlify, unhexlify
 import unicodedata
+import threading
+from collections import OrderedDict
 
 from .base58 import ripemd160, Base58, doublesha256
 from .bip32 import BIP32Key, parse_path
 from .dictionary import words as BrainKeyDictionary
 from .dictionary import words_bip39 as MnemonicDictionary
-from .py23 import py23_bytes, PY2
+from .py23 import py23_bytes, PY2, string_types
 from .prefix import Prefix
 
 
 PBKDF2_ROUNDS = 2048
 
+
+class KeyCache(object):
+    """ Bounded thread safe LRU cache for parsed, derived and formatted
+        keys
+
+        :param int maxsize: maximum number of stored entries
+        :param bool enabled: when False, nothing is stored
+    """
+    def __init__(self, maxsize=4096, enabled=True):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """ Returns the stored value or None"""
+        if not self.enabled:
+            return None
+        with self.lock:
+            value = self.data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Mark as recently used
+            del self.data[key]
+            self.data[key] = value
+            return value
+
+    def set(self, key, value):
+        if not self.enabled or self.maxsize <= 0:
+            return
+        with self.lock:
+            if key in self.data:
+                del self.data[key]
+            self.data[key] = value
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """ Returns hits, misses, size and maxsize as dict"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.data), "maxsize": self.maxsize}
+
+
+#: Caches of :class:`PublicKey`, :class:`Address` and :class:`PrivateKey`
+key_caches = {
+    "public_key": KeyCache(),  # (key, prefix) -> hex of the compressed key
+    "address": KeyCache(),  # (address, prefix) -> hex
+    "private_key": KeyCache(enabled=False),  # wif -> hex, stores secrets and is disabled by default
+    "derived_public_key": KeyCache(),  # sha256 of the private key -> hex of the compressed public key
+    "format": KeyCache(),  # (hex, format) -> formatted public key
+}
+
+#: Caches which hold private key material
+private_key_caches = ["private_key"]
+
+
+def set_key_cache(enabled=True, maxsize=None, private_keys=False):
+    """ Enables or disables (and clears) all key caches
+
+        :param bool enabled: when False, keys are parsed without cache
+        :param int maxsize: new maximum number of entries of each cache
+        :param bool private_keys: when True, parsed wif keys are cached as
+            well. The cache holds the secrets in cleartext until
+            :func:`clear_private_key_cache` is called.
+    """
+    for name, cache in key_caches.items():
+        cache.enabled = enabled and (private_keys or name not in private_key_caches)
+        if maxsize is not None:
+            cache.maxsize = maxsize
+        if not cache.enabled or maxsize is not None:
+            cache.clear()
+
+
+def clear_key_cache():
+    """ Clears all key caches and their statistics"""
+    for cache in key_caches.values():
+        cache.clear()
+
+
+def clear_private_key_cache():
+    """ Clears the caches which are derived from private keys, the wallet
+        calls this when it is locked or keys are removed
+    """
+    for name in private_key_caches + ["derived_public_key"]:
+        key_caches[name].clear()
+
+
+def get_key_cache_stats():
+    """ Returns the statistics of all key caches
+
+        .. code-block:: python
+
+            >>> from beemgraphenebase.account import get_key_cache_stats
+            >>> stats = get_key_cache_stats()
+            >>> sorted(stats["public_key"].keys())
+            ['hits', 'maxsize', 'misses', 'size']
+
+    """
+    return dict([(name, cache.stats()) for name, cache in key_caches.items()])
+
 # From <https://stackoverflow.com/questions/212358/binary-search-bisection-in-python/2233940#2233940>
 def binary_search(a, x, lo=0, hi=None):  # can't use a to specify default for hi
     hi = hi if hi is not None else len(a)  # hi defaults to len(a)
@@ -460,6 +572,13 @@ class Address(Prefix):
     """
     def __init__(self, address, prefix=None):
         self.set_prefix(prefix)
+        if isinstance(address, string_types):
+            cache_key = (address, self.prefix)
+            address_hex = key_caches["address"].get(cache_key)
+            if address_hex is None:
+                address_hex = repr(Base58(address, prefix=self.prefix))
+                key_caches["address"].set(cache_key, address_hex)
+            address = address_hex
         self._address = Base58(address, prefix=self.prefix)
 
     @classmethod
@@ -572,8 +691,16 @@ class PublicKey(Prefix):
         """
         self.set_prefix(prefix)
         if isinstance(pk, PublicKey):
-            pk = format(pk, self.prefix)
-            
+            self._pk = Base58(repr(pk), prefix=self.prefix)
+            return
+        cache_key = None
+        if isinstance(pk, string_types):
+            cache_key = (pk, self.prefix)
+            pk_hex = key_caches["public_key"].get(cache_key)
+            if pk_hex is not None:
+                self._pk = Base58(pk_hex, prefix=self.prefix)
+                return
+
         if str(pk).startswith("04"):
             # We only ever deal with compressed keys, so let's make it
             # compressed
@@ -585,6 +712,8 @@ class PublicKey(Prefix):
             pk = hexlify(chr(2 + (p.y() & 1)).encode("ascii") + x_str).decode("ascii")
 
         self._pk = Base58(pk, prefix=self.prefix)
+        if cache_key is not None:
+            key_caches["public_key"].set(cache_key, repr(self._pk))
 
     @property
     def pubkey(self):
@@ -648,6 +777,10 @@ class PublicKey(Prefix):
     def from_privkey(cls, privkey, prefix=None):
         """ Derive uncompressed public key """
         privkey = PrivateKey(privkey, prefix=prefix or Prefix.prefix)
+        cache_key = hashlib.sha256(unhexlify(repr(privkey))).hexdigest()
+        compressed = key_caches["derived_public_key"].get(cache_key)
+        if compressed is not None:
+            return cls(compressed, prefix=prefix or Prefix.prefix)
         secret = unhexlify(repr(privkey))
         order = ecdsa.SigningKey.from_string(
             secret, curve=ecdsa.SECP256k1
@@ -662,6 +795,7 @@ class PublicKey(Prefix):
         )
         # uncompressed = hexlify(
         #    chr(4).encode('ascii') + x_str + y_str).decode('ascii')
+        key_caches["derived_public_key"].set(cache_key, compressed)
         return cls(compressed, prefix=prefix or Prefix.prefix)
 
     def __repr__(self):
@@ -672,11 +806,16 @@ class PublicKey(Prefix):
         """ Returns the readable Graphene public key. This call is equivalent to
             ``format(PublicKey, "STM")``
         """
-        return format(self._pk, self.prefix)
+        return self.__format__(self.prefix)
 
     def __format__(self, _format):
         """ Formats the instance of:doc:`Base58 <base58>` according to ``_format`` """
-        return format(self._pk, _format)
+        cache_key = (repr(self._pk), _format)
+        result = key_caches["format"].get(cache_key)
+        if result is None:
+            result = format(self._pk, _format)
+            key_caches["format"].set(cache_key, result)
+        return result
 
     def __bytes__(self):
         """ Returns the raw public key (has length 33)"""
@@ -732,6 +871,12 @@ class PrivateKey(Prefix):
             self._wif = wif._wif    
         elif isinstance(wif, Base58):
             self._wif = wif
+        elif isinstance(wif, string_types):
+            wif_hex = key_caches["private_key"].get(wif)
+            if wif_hex is None:
+                wif_hex = repr(Base58(wif))
+                key_caches["private_key"].set(wif, wif_hex)
+            self._wif = Base58(wif_hex)
         else:
             self._wif = Base58(wif)
 
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from binascii import hexlify, unhexlify
-from .py23 import py23_bytes, py23_chr, bytes_types, integer_types, string_types, text_type
+from .py23 import py23_bytes, bytes_types, string_types, text_type
 from .prefix import Prefix
 import hashlib
 import string
@@ -37,7 +37,7 @@ class Base58(Prefix):
         self.set_prefix(prefix)
         if isinstance(data, Base58):
             data = repr(data)
-        if all(c in string.hexdigits for c in data):
+        if _hexdigits.issuperset(data):
             self._hex = data
         elif data[0] == "5" or data[0] == "6":
             self._hex = base58CheckDecode(data)
@@ -94,44 +94,94 @@ class Base58(Prefix):
 # https://github.com/tochev/python3-cryptocoins/raw/master/cryptocoins/base58.py
 BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
 
+_alphabet = BASE58_ALPHABET.decode("ascii")
+# Numbers are converted two digits at once (base 58 ** 2)
+_digit_pairs = [a + b for a in _alphabet for b in _alphabet]
+_pair_values = dict([(pair, i) for i, pair in enumerate(_digit_pairs)])
+_digit_values = dict([(c, i) for i, c in enumerate(_alphabet)])
+_hexdigits = frozenset(string.hexdigits)
+
+
+def base58encode_bytes(data):
+    """ Returns the base58 encoding of ``data`` (bytes) as str"""
+    data = py23_bytes(data)
+    stripped = data.lstrip(b"\x00")
+    leading_zeroes_count = len(data) - len(stripped)
+    n = int.from_bytes(stripped, "big")
+    if n == 0:
+        return _alphabet[0] * (leading_zeroes_count + 1)
+    pairs = _digit_pairs
+    res = []
+    while n:
+        n, pair = divmod(n, 3364)
+        res.append(pairs[pair])
+    return _alphabet[0] * leading_zeroes_count + "".join(reversed(res)).lstrip(_alphabet[0])
+
+
+def base58decode_bytes(base58_str):
+    """ Returns the bytes encoded in ``base58_str``
+
+        :raises ValueError: if base58_str contains invalid characters
+    """
+    if isinstance(base58_str, bytes_types):
+        base58_str = base58_str.decode("ascii")
+    stripped = base58_str.lstrip(_alphabet[0])
+    leading_zeroes_count = len(base58_str) - len(stripped)
+    pair_values = _pair_values
+    try:
+        if len(stripped) % 2:
+            n = _digit_values[stripped[0]]
+            start = 1
+        else:
+            n = 0
+            start = 0
+        for i in range(start, len(stripped), 2):
+            n = n * 3364 + pair_values[stripped[i:i + 2]]
+    except KeyError:
+        raise ValueError("Invalid base58 character in %s" % base58_str)
+    if n == 0:
+        return b"\x00" * (leading_zeroes_count + 1)
+    return b"\x00" * leading_zeroes_count + n.to_bytes((n.bit_length() + 7) // 8, "big")
+
 
 def base58decode(base58_str):
-    base58_text = py23_bytes(base58_str, "ascii")
-    n = 0
-    leading_zeroes_count = 0
-    for b in base58_text:
-        if isinstance(b, integer_types):
-            n = n * 58 + BASE58_ALPHABET.find(py23_chr(b))
-        else:
-            n = n * 58 + BASE58_ALPHABET.find(b)
-        if n == 0:
-            leading_zeroes_count += 1
-    res = bytearray()
-    while n >= 256:
-        div, mod = divmod(n, 256)
-        res.insert(0, mod)
-        n = div
-    else:
-        res.insert(0, n)
-    return hexlify(bytearray(1) * leading_zeroes_count + res).decode('ascii')
+    return hexlify(base58decode_bytes(base58_str)).decode('ascii')
 
 
 def base58encode(hexstring):
-    byteseq = py23_bytes(unhexlify(py23_bytes(hexstring, 'ascii')))
-    n = 0
-    leading_zeroes_count = 0
-    for c in byteseq:
-        n = n * 256 + c
-        if n == 0:
-            leading_zeroes_count += 1
-    res = bytearray()
-    while n >= 58:
-        div, mod = divmod(n, 58)
-        res.insert(0, BASE58_ALPHABET[mod])
-        n = div
-    else:
-        res.insert(0, BASE58_ALPHABET[n])
-    return (BASE58_ALPHABET[0:1] * leading_zeroes_count + res).decode('ascii')
+    return base58encode_bytes(unhexlify(py23_bytes(hexstring, 'ascii')))
+
+
+def base58encode_batch(items):
+    """ Returns the base58 encoding of each bytes object in ``items``"""
+    return [base58encode_bytes(data) for data in items]
+
+
+def base58decode_batch(items):
+    """ Returns the decoded bytes of each base58 string in ``items``"""
+    return [base58decode_bytes(base58_str) for base58_str in items]
+
+
+def encode_keys(items, prefix="STM"):
+    """ Returns the readable graphene keys or addresses (e.g. ``STM...``)
+        of a list of hex encoded public keys or addresses
+    """
+    return [prefix + gphBase58CheckEncode(hexstring) for hexstring in items]
+
+
+def decode_keys(items, prefix="STM"):
+    """ Returns the hex encoded public keys or addresses of a list of
+        readable graphene keys or addresses
+
+        :raises ValueError: if a key has another prefix
+        :raises AssertionError: if a checksum is wrong
+    """
+    result = []
+    for key in items:
+        if key[:len(prefix)] != prefix:
+            raise ValueError("%s does not start with %s" % (key, prefix))
+        result.append(gphBase58CheckDecode(key[len(prefix):]))
+    return result
 
 
 def ripemd160(s):
@@ -174,15 +224,12 @@ def base58CheckDecode(s, skip_first_bytes=True):
 
 
 def gphBase58CheckEncode(s):
-    checksum = ripemd160(s)[:4]
-    result = s + hexlify(checksum).decode('ascii')
-    return base58encode(result)
+    data = unhexlify(s)
+    return base58encode_bytes(data + hashlib.new('ripemd160', data).digest()[:4])
 
 
 def gphBase58CheckDecode(s):
-    s = unhexlify(base58decode(s))
-    dec = hexlify(s[:-4]).decode('ascii')
-    checksum = ripemd160(dec)[:4]
-    if not (s[-4:] == checksum):
+    data = base58decode_bytes(s)
+    if not (hashlib.new('ripemd160', data[:-4]).digest()[:4] == data[-4:]):
         raise AssertionError()
-    return dec
+    return hexlify(data[:-4]).decode('ascii')
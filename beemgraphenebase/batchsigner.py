@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from .types import Array, Signature
+from . import ecdsasig
+from .ecdsasig import NativePrivateKey, sign_message
+import logging
+log = logging.getLogger(__name__)
+
+FUTURES_MODULE = None
+if not FUTURES_MODULE:
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        FUTURES_MODULE = "futures"
+    except ImportError:
+        FUTURES_MODULE = None
+
+# Parsed keys of a worker process, keyed by (SECP256K1_MODULE, wif)
+_worker_keys = {}
+
+
+def sign_messages(messages, keys):
+    """ Signs every message with every key and returns a list with the
+        list of signatures of each message
+
+        :param list messages: messages as bytes
+        :param list keys: list of :class:`beemgraphenebase.ecdsasig.NativePrivateKey`
+    """
+    return [[sign_message(message, key) for key in keys] for message in messages]
+
+
+def _sign_chunk(messages, wifs, module):
+    """ Signs a chunk of messages in a worker process. The keys are parsed
+        once per process and reused for all following chunks.
+    """
+    ecdsasig.SECP256K1_MODULE = module
+    keys = []
+    for wif in wifs:
+        key = _worker_keys.get((module, wif))
+        if key is None:
+            key = _worker_keys[(module, wif)] = NativePrivateKey(wif)
+        keys.append(key)
+    return sign_messages(messages, keys)
+
+
+class BatchSigner(object):
+    """ Signs many transactions with the same set of private keys.
+
+        The wif keys are parsed once into the key objects of the active
+        ``SECP256K1_MODULE`` and reused for all transactions. The digests
+        of all transactions are computed first, the signing itself can be
+        spread over a process pool. Every worker process parses the keys
+        once as well.
+
+        :param list wifkeys: private keys in wif format
+        :param str chain: identifier for the chain or chain params dict
+        :param int processes: number of worker processes, when None or 1
+            (or when concurrent.futures is not available) all transactions
+            are signed in the current process
+        :param int chunk_size: number of transactions which are sent to a
+            worker process at once
+
+        .. code-block:: python
+
+            from beembase.signedtransactions import Signed_Transaction
+            from beemgraphenebase.batchsigner import BatchSigner
+            txs = [Signed_Transaction(ref_block_num=ref_block_num, ref_block_prefix=ref_block_prefix,
+                                      expiration=expiration, operations=[op]) for op in ops]
+            with BatchSigner([wif], chain="HIVE", processes=4) as signer:
+                signer.sign(txs)
+
+    """
+    def __init__(self, wifkeys, chain="STEEM", processes=None, chunk_size=64):
+        self.wifs = []
+        for wif in wifkeys:
+            wif = str(wif)
+            if wif not in self.wifs:
+                self.wifs.append(wif)
+        self.chain = chain
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.keys = None
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ Shuts down the process pool"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def get_keys(self):
+        """ Returns the parsed keys, they are parsed again when
+            ``SECP256K1_MODULE`` has been changed
+        """
+        if self.keys is None or any([key.module != ecdsasig.SECP256K1_MODULE for key in self.keys]):
+            self.keys = [NativePrivateKey(wif) for wif in self.wifs]
+        return self.keys
+
+    def get_messages(self, transactions):
+        """ Derives the digests of all transactions and returns the
+            messages which are signed
+        """
+        messages = []
+        for tx in transactions:
+            tx.deriveDigest(self.chain)
+            messages.append(tx.message)
+        return messages
+
+    def sign(self, transactions):
+        """ Signs all transactions and returns them in the given order.
+            Existing signatures are replaced.
+
+            :param list transactions: list of
+                :class:`beemgraphenebase.signedtransactions.Signed_Transaction`
+        """
+        transactions = list(transactions)
+        messages = self.get_messages(transactions)
+        if self.processes is not None and self.processes > 1 and FUTURES_MODULE is not None and \
+                len(messages) > self.chunk_size:
+            signatures = self.sign_parallel(messages)
+        else:
+            signatures = sign_messages(messages, self.get_keys())
+        for tx, sigs in zip(transactions, signatures):
+            tx.privkeys = list(self.wifs)
+            tx.data["signatures"] = Array([Signature(sig) for sig in sigs])
+        return transactions
+
+    def sign_parallel(self, messages):
+        """ Signs the messages in the process pool"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        futures = []
+        for i in range(0, len(messages), self.chunk_size):
+            futures.append(self.executor.submit(_sign_chunk, messages[i:i + self.chunk_size],
+                                                self.wifs, ecdsasig.SECP256K1_MODULE))
+        signatures = []
+        for future in futures:
+            signatures.extend(future.result())
+        return signatures
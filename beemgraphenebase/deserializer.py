@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import struct
+from binascii import hexlify
+from datetime import datetime, timedelta
+from .account import PublicKey
+from .py23 import bytes_types, string_types
+
+timeformat = '%Y-%m-%dT%H:%M:%S'
+_epoch = datetime(1970, 1, 1)
+
+_uint8 = struct.Struct("<B")
+_int16 = struct.Struct("<h")
+_uint16 = struct.Struct("<H")
+_uint32 = struct.Struct("<I")
+_int64 = struct.Struct("<q")
+_uint64 = struct.Struct("<Q")
+
+
+class Stream(object):
+    """ Reads from serialized data and keeps the current position
+
+        :param bytes data: serialized data
+        :param int pos: start position
+    """
+    def __init__(self, data, pos=0):
+        if isinstance(data, bytearray):
+            data = bytes(data)
+        self.data = data
+        self.pos = pos
+
+    def read(self, length):
+        """ Returns the next ``length`` bytes"""
+        start = self.pos
+        end = start + length
+        if end > len(self.data):
+            raise ValueError("Unexpected end of data at position %d" % start)
+        self.pos = end
+        return self.data[start:end]
+
+    def unpack(self, fmt):
+        """ Returns the next value unpacked with the ``struct.Struct`` ``fmt``"""
+        start = self.pos
+        if start + fmt.size > len(self.data):
+            raise ValueError("Unexpected end of data at position %d" % start)
+        self.pos = start + fmt.size
+        return fmt.unpack_from(self.data, start)[0]
+
+    def read_varint(self):
+        """ Returns the next varint"""
+        shift = 0
+        result = 0
+        while True:
+            b = self.unpack(_uint8)
+            result |= ((b & 0x7f) << shift)
+            if not (b & 0x80):
+                return result
+            shift += 7
+
+    def at_end(self):
+        return self.pos >= len(self.data)
+
+
+class Deserializer(object):
+    """ Parses the wire format written by :class:`GrapheneObject` and the
+        types in :mod:`beemgraphenebase.types` back into json.
+
+        Types are given by name or as tuple of a container name and its
+        item types:
+
+        * ``"uint8"``, ``"int16"``, ``"uint16"``, ``"uint32"``, ``"int64"``,
+          ``"uint64"``, ``"varint32"``, ``"bool"``, ``"string"``, ``"bytes"``
+          (hex encoded), ``"void"``, ``"point_in_time"``, ``"public_key"``,
+          ``"signature"`` and the names of registered structs and static
+          variants
+        * ``("array", type)``, ``("optional", type)``, ``("map", key_type,
+          value_type)``, ``("fixed_bytes", length)``
+
+        Structs are registered by :func:`register_struct` as list of
+        ``(name, type)`` tuples, static variants by
+        :func:`register_static_variant` as dict which maps the type id to
+        ``(name, type)``. Empty optional fields are left out of structs.
+
+        :param str prefix: prefix of public keys
+        :param bool appbase: when True, static variants are returned as
+            ``{"type": name, "value": value}``, otherwise as
+            ``[type_id, value]``
+    """
+    def __init__(self, prefix="STM", appbase=False):
+        self.prefix = prefix
+        self.appbase = appbase
+        self.structs = {}
+        self.variants = {}
+        self.readers = {
+            "uint8": lambda stream: stream.unpack(_uint8),
+            "int16": lambda stream: stream.unpack(_int16),
+            "uint16": lambda stream: stream.unpack(_uint16),
+            "uint32": lambda stream: stream.unpack(_uint32),
+            "int64": lambda stream: stream.unpack(_int64),
+            "uint64": lambda stream: stream.unpack(_uint64),
+            "varint32": lambda stream: stream.read_varint(),
+            "bool": lambda stream: bool(stream.unpack(_uint8)),
+            "string": self.read_string,
+            "bytes": self.read_bytes,
+            "void": lambda stream: {},
+            "point_in_time": self.read_point_in_time,
+            "public_key": self.read_public_key,
+            "signature": lambda stream: hexlify(stream.read(65)).decode("ascii"),
+        }
+
+    def register_struct(self, name, fields):
+        """ Registers a struct ``name`` with a list of ``(name, type)`` fields"""
+        self.structs[name] = fields
+
+    def register_static_variant(self, name, variants):
+        """ Registers a static variant ``name`` with a dict, which maps the
+            type ids to ``(name, type)``
+        """
+        self.variants[name] = variants
+
+    def read(self, data, type_name, pos=0):
+        """ Returns the json of ``type_name`` serialized in ``data``. All
+            bytes have to be used.
+
+            :param data: serialized data as bytes or hex string
+        """
+        stream = Stream(self.to_bytes(data), pos)
+        value = self.read_type(stream, type_name)
+        if not stream.at_end():
+            raise ValueError("%d unused bytes at position %d" % (len(stream.data) - stream.pos, stream.pos))
+        return value
+
+    def read_type(self, stream, type_name):
+        """ Reads ``type_name`` from ``stream``"""
+        if isinstance(type_name, tuple):
+            container = type_name[0]
+            if container == "array":
+                return [self.read_type(stream, type_name[1]) for i in range(stream.read_varint())]
+            elif container == "optional":
+                if stream.unpack(_uint8):
+                    return self.read_type(stream, type_name[1])
+                return None
+            elif container == "map":
+                return [[self.read_type(stream, type_name[1]), self.read_type(stream, type_name[2])]
+                        for i in range(stream.read_varint())]
+            elif container == "fixed_bytes":
+                return hexlify(stream.read(type_name[1])).decode("ascii")
+            raise ValueError("Unknown container %s" % container)
+        reader = self.readers.get(type_name)
+        if reader is not None:
+            return reader(stream)
+        if type_name in self.structs:
+            return self.read_struct(stream, type_name)
+        if type_name in self.variants:
+            return self.read_static_variant(stream, type_name)
+        raise ValueError("Unknown type %s" % type_name)
+
+    def read_struct(self, stream, type_name):
+        result = {}
+        for name, field_type in self.structs[type_name]:
+            value = self.read_type(stream, field_type)
+            if value is None and isinstance(field_type, tuple) and field_type[0] == "optional":
+                continue
+            result[self.get_field_name(type_name, name)] = value
+        return result
+
+    def read_static_variant(self, stream, type_name):
+        type_id = stream.read_varint()
+        variants = self.variants[type_name]
+        if type_id not in variants:
+            raise ValueError("Unknown type id %d of %s" % (type_id, type_name))
+        name, value_type = variants[type_id]
+        value = self.read_type(stream, value_type)
+        if self.appbase:
+            return {"type": name, "value": value}
+        return [type_id, value]
+
+    def get_field_name(self, type_name, name):
+        """ Returns the json name of the field ``name`` of a struct, can be
+            overwritten for chain specific names
+        """
+        return name
+
+    def read_string(self, stream):
+        return stream.read(stream.read_varint()).decode("utf-8")
+
+    def read_bytes(self, stream):
+        return hexlify(stream.read(stream.read_varint())).decode("ascii")
+
+    def read_point_in_time(self, stream):
+        return (_epoch + timedelta(seconds=stream.unpack(_uint32))).strftime(timeformat)
+
+    def read_public_key(self, stream):
+        return format(PublicKey(hexlify(stream.read(33)).decode("ascii"), prefix=self.prefix), self.prefix)
+
+    def to_bytes(self, data):
+        if isinstance(data, string_types) and not isinstance(data, bytes_types):
+            return bytes(bytearray.fromhex(data))
+        return bytes(data)
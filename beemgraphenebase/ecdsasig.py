@@ -44,8 +44,190 @@ if not SECP256K1_MODULE:
         CRYPTOGRAPHY_AVAILABLE = False
         log.debug("Cryptography not available")
 
+try:
+    import coincurve
+    COINCURVE_AVAILABLE = True
+except ImportError:
+    COINCURVE_AVAILABLE = False
+
 log.debug("Using SECP256K1 module: %s" % SECP256K1_MODULE)
 
+# secp256k1 curve parameters for the pure python public key recovery
+_P = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F
+_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+_G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+      0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+_G_WINDOW = 8
+_R_WINDOW = 5
+_G_TABLE = []
+
+
+def _jacobian_double(X, Y, Z):
+    if not Z or not Y:
+        return (0, 1, 0)
+    YY = Y * Y % _P
+    S = 4 * X * YY % _P
+    M = 3 * X * X % _P
+    X3 = (M * M - 2 * S) % _P
+    return (X3, (M * (S - X3) - 8 * YY * YY) % _P, 2 * Y * Z % _P)
+
+
+def _jacobian_add_affine(X1, Y1, Z1, x2, y2):
+    """ Adds the affine point (x2, y2) to a point in jacobian coordinates"""
+    if not Z1:
+        return (x2, y2, 1)
+    Z1Z1 = Z1 * Z1 % _P
+    H = (x2 * Z1Z1 - X1) % _P
+    r = (y2 * Z1 * Z1Z1 - Y1) % _P
+    if not H:
+        if not r:
+            return _jacobian_double(X1, Y1, Z1)
+        return (0, 1, 0)
+    HH = H * H % _P
+    HHH = H * HH % _P
+    V = X1 * HH % _P
+    X3 = (r * r - HHH - 2 * V) % _P
+    return (X3, (r * (V - X3) - Y1 * HHH) % _P, Z1 * H % _P)
+
+
+def _to_affine(points):
+    """ Converts jacobian points to affine points with one inversion"""
+    products = []
+    acc = 1
+    for X, Y, Z in points:
+        products.append(acc)
+        acc = acc * Z % _P
+    inv = pow(acc, _P - 2, _P)
+    result = [None] * len(points)
+    for j in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[j]
+        zinv = inv * products[j] % _P
+        inv = inv * Z % _P
+        zinv2 = zinv * zinv % _P
+        result[j] = (X * zinv2 % _P, Y * zinv2 * zinv % _P)
+    return result
+
+
+def _odd_multiples(point, window):
+    """ Returns the affine odd multiples 1P, 3P, ..., (2^(window-1)-1)P"""
+    x, y = point
+    double = _jacobian_double(x, y, 1)
+    double = _to_affine([double])[0]
+    points = [(x, y, 1)]
+    for j in range(1, 1 << (window - 2)):
+        X, Y, Z = points[-1]
+        points.append(_jacobian_add_affine(X, Y, Z, double[0], double[1]))
+    return _to_affine(points)
+
+
+def _wnaf(k, window):
+    """ Returns the width-``window`` non adjacent form of k, least
+        significant digit first
+    """
+    digits = []
+    width = 1 << window
+    half = width >> 1
+    while k:
+        if k & 1:
+            d = k & (width - 1)
+            if d >= half:
+                d -= width
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+
+def _mul_add(u1, u2, point):
+    """ Returns u1 * G + u2 * point as affine point or None for infinity,
+        using a precomputed wNAF table for G
+    """
+    if not _G_TABLE:
+        _G_TABLE.extend(_odd_multiples(_G, _G_WINDOW))
+    r_table = _odd_multiples(point, _R_WINDOW)
+    naf1 = _wnaf(u1, _G_WINDOW)
+    naf2 = _wnaf(u2, _R_WINDOW)
+    X, Y, Z = (0, 1, 0)
+    for j in range(max(len(naf1), len(naf2)) - 1, -1, -1):
+        X, Y, Z = _jacobian_double(X, Y, Z)
+        d = naf1[j] if j < len(naf1) else 0
+        if d > 0:
+            x, y = _G_TABLE[d >> 1]
+            X, Y, Z = _jacobian_add_affine(X, Y, Z, x, y)
+        elif d < 0:
+            x, y = _G_TABLE[(-d) >> 1]
+            X, Y, Z = _jacobian_add_affine(X, Y, Z, x, _P - y)
+        d = naf2[j] if j < len(naf2) else 0
+        if d > 0:
+            x, y = r_table[d >> 1]
+            X, Y, Z = _jacobian_add_affine(X, Y, Z, x, y)
+        elif d < 0:
+            x, y = r_table[(-d) >> 1]
+            X, Y, Z = _jacobian_add_affine(X, Y, Z, x, _P - y)
+    if not Z:
+        return None
+    return _to_affine([(X, Y, Z)])[0]
+
+
+def recover_public_key_point(digest, signature, i, use_coincurve=None):
+    """ Recovers the public key point ``(x, y)`` from a 64 byte signature
+        ``r || s`` of ``digest`` with the recovery id ``i``. Uses coincurve
+        (libsecp256k1) when it is installed and a pure python wNAF
+        multiplication otherwise. Returns None when there is no such key.
+    """
+    if use_coincurve is None:
+        use_coincurve = COINCURVE_AVAILABLE
+    if use_coincurve:
+        try:
+            key = coincurve.PublicKey.from_signature_and_message(
+                py23_bytes(signature) + struct.pack("<B", i), digest, hasher=None)
+        except Exception:
+            return None
+        return key.point()
+    r = int(hexlify(signature[:32]), 16)
+    s = int(hexlify(signature[32:64]), 16)
+    if not (0 < r < _N and 0 < s < _N):
+        return None
+    x = r + (i // 2) * _N
+    if x >= _P:
+        return None
+    alpha = (x * x * x + 7) % _P
+    beta = pow(alpha, (_P + 1) // 4, _P)
+    if beta * beta % _P != alpha:
+        return None
+    y = beta if (beta - i) % 2 == 0 else _P - beta
+    e = int(hexlify(digest), 16)
+    r_inv = pow(r, _N - 2, _N)
+    return _mul_add((-e * r_inv) % _N, s * r_inv % _N, (x, y))
+
+
+def recover_compressed_pubkey(digest, signature, i, use_coincurve=None):
+    """ Returns the 33 byte compressed public key recovered from the
+        signature or None
+    """
+    point = recover_public_key_point(digest, signature, i, use_coincurve=use_coincurve)
+    if point is None:
+        return None
+    return struct.pack("<B", 2 + (point[1] & 1)) + ecdsa.util.number_to_string(point[0], _N)
+
+
+def recover_signer(digest, signature, use_coincurve=None):
+    """ Returns the 33 byte compressed public key of the signer of a 65
+        byte compact signature or None. The recovery id is taken from the
+        first byte, no other candidates are tried.
+    """
+    signature = py23_bytes(signature)
+    if len(signature) != 65:
+        return None
+    recover_parameter = bytearray(signature)[0] - 27
+    if recover_parameter >= 4:
+        recover_parameter -= 4   # compressed
+    if not 0 <= recover_parameter < 4:
+        return None
+    return recover_compressed_pubkey(digest, signature[1:], recover_parameter, use_coincurve=use_coincurve)
+
 
 def _is_canonical(sig):
     sig = bytearray(sig)
@@ -74,41 +256,20 @@ def recover_public_key(digest, signature, i, message=None):
     """
 
     # See http: //www.secg.org/download/aid-780/sec1-v2.pdf section 4.1.6 primarily
-    curve = ecdsa.SECP256k1.curve
-    G = ecdsa.SECP256k1.generator
-    order = ecdsa.SECP256k1.order
-    yp = (i % 2)
-    r, s = ecdsa.util.sigdecode_string(signature, order)
-    # 1.1
-    x = r + (i // 2) * order
-    # 1.3. This actually calculates for either effectively 02||X or 03||X depending on 'k' instead of always for 02||X as specified.
-    # This substitutes for the lack of reversing R later on. -R actually is defined to be just flipping the y-coordinate in the elliptic curve.
-    alpha = ((x * x * x) + (curve.a() * x) + curve.b()) % curve.p()
-    beta = ecdsa.numbertheory.square_root_mod_prime(alpha, curve.p())
-    y = beta if (beta - yp) % 2 == 0 else curve.p() - beta
-    # 1.4 Constructor of Point is supposed to check if nR is at infinity.
-    R = ecdsa.ellipticcurve.Point(curve, x, y, order)
-    # 1.5 Compute e
-    e = ecdsa.util.string_to_number(digest)
-    # 1.6 Compute Q = r^-1(sR - eG)
-    Q = ecdsa.numbertheory.inverse_mod(r, order) * (s * R + (-e % order) * G)
-
+    point = recover_public_key_point(digest, signature, i)
+    if point is None:
+        raise ValueError("Public key could not be recovered from the signature")
     if SECP256K1_MODULE == "cryptography" and message is not None:
         if not isinstance(message, bytes_types):
             message = py23_bytes(message, "utf-8")
+        order = ecdsa.SECP256k1.order
+        r, s = ecdsa.util.sigdecode_string(signature, order)
         sigder = encode_dss_signature(r, s)
-        try:
-            Q_point = Q.to_affine()
-            public_key = ec.EllipticCurvePublicNumbers(Q_point.x(), Q_point.y(), ec.SECP256K1()).public_key(default_backend())
-        except:
-            try:
-                public_key = ec.EllipticCurvePublicNumbers(Q._Point__x, Q._Point__y, ec.SECP256K1()).public_key(default_backend())
-            except:
-                Q_point = Q.to_affine()
-                public_key = ec.EllipticCurvePublicNumbers(int(Q_point.x()), int(Q_point.y()), ec.SECP256K1()).public_key(default_backend())
+        public_key = ec.EllipticCurvePublicNumbers(point[0], point[1], ec.SECP256K1()).public_key(default_backend())
         public_key.verify(sigder, message, ec.ECDSA(hashes.SHA256()))
         return public_key
     else:
+        Q = ecdsa.ellipticcurve.Point(ecdsa.SECP256k1.curve, point[0], point[1], ecdsa.SECP256k1.order)
         # Not strictly necessary, but let's verify the message for paranoia's sake.
         if not ecdsa.VerifyingKey.from_public_point(Q, curve=ecdsa.SECP256k1).verify_digest(signature, digest, sigdecode=ecdsa.util.sigdecode_string):
             return None
@@ -121,17 +282,19 @@ def recoverPubkeyParameter(message, digest, signature, pubkey):
     """
     if not isinstance(message, bytes_types):
         message = py23_bytes(message, "utf-8")
+    pubkey_comp = None
     for i in range(0, 4):
         if SECP256K1_MODULE == "secp256k1":
             sig = pubkey.ecdsa_recoverable_deserialize(signature, i)
             p = secp256k1.PublicKey(pubkey.ecdsa_recover(message, sig))
             if p.serialize() == pubkey.serialize():
                 return i
-        elif SECP256K1_MODULE == "cryptography" and not isinstance(pubkey, PublicKey):
-            p = recover_public_key(digest, signature, i, message)
-            p_comp = hexlify(compressedPubkey(p))
-            pubkey_comp = hexlify(compressedPubkey(pubkey))
-            if (p_comp == pubkey_comp):
+        elif not isinstance(pubkey, PublicKey):
+            # The recovered key is the only key for which the signature is
+            # valid, comparing it with pubkey needs no verification
+            if pubkey_comp is None:
+                pubkey_comp = compressedPubkey(pubkey)
+            if recover_compressed_pubkey(digest, signature, i) == pubkey_comp:
                 return i
         else:  # pragma: no cover
             p = recover_public_key(digest, signature, i)
@@ -147,24 +310,48 @@ def recoverPubkeyParameter(message, digest, signature, pubkey):
     return None
 
 
+class NativePrivateKey(object):
+    """ A private key which is parsed once into the key objects of the
+        active ``SECP256K1_MODULE``. It can be given to :func:`sign_message`
+        instead of the wif for signing many messages with the same key.
+
+        :param str wif: Private key in wif format or as :class:`PrivateKey`
+    """
+    def __init__(self, wif):
+        if isinstance(wif, NativePrivateKey):
+            wif = wif.private_key
+        self.module = SECP256K1_MODULE
+        self.private_key = PrivateKey(wif)
+        self.public_key = None
+        if self.module == "secp256k1":
+            self.key = secp256k1.PrivateKey(py23_bytes(self.private_key), raw=True)
+        elif self.module == "cryptography":
+            self.key = ec.derive_private_key(int(repr(self.private_key), 16), ec.SECP256K1(), default_backend())
+            self.public_key = self.key.public_key()
+        else:
+            self.key = ecdsa.SigningKey.from_string(py23_bytes(self.private_key), curve=ecdsa.SECP256k1)
+            self.public_key = self.key.get_verifying_key()
+
+
 def sign_message(message, wif, hashfn=hashlib.sha256):
     """ Sign a digest with a wif key
 
-        :param str wif: Private key in
+        :param str wif: Private key in wif format or as
+            :class:`NativePrivateKey`, which skips parsing the key again
     """
 
     if not isinstance(message, bytes_types):
         message = py23_bytes(message, "utf-8")
 
     digest = hashfn(message).digest()
-    priv_key = PrivateKey(wif)
+    if not isinstance(wif, NativePrivateKey) or wif.module != SECP256K1_MODULE:
+        wif = NativePrivateKey(wif)
     if SECP256K1_MODULE == "secp256k1":
-        p = py23_bytes(priv_key)
+        privkey = wif.key
         ndata = secp256k1.ffi.new("const int *ndata")
         ndata[0] = 0
         while True:
             ndata[0] += 1
-            privkey = secp256k1.PrivateKey(p, raw=True)
             sig = secp256k1.ffi.new('secp256k1_ecdsa_recoverable_signature *')
             signed = secp256k1.lib.secp256k1_ecdsa_sign_recoverable(
                 privkey.ctx,
@@ -183,8 +370,8 @@ def sign_message(message, wif, hashfn=hashlib.sha256):
                 break
     elif SECP256K1_MODULE == "cryptography":
         cnt = 0
-        private_key = ec.derive_private_key(int(repr(priv_key), 16), ec.SECP256K1(), default_backend())
-        public_key = private_key.public_key()
+        private_key = wif.key
+        public_key = wif.public_key
         while True:
             cnt += 1
             if not cnt % 20:
@@ -208,8 +395,7 @@ def sign_message(message, wif, hashfn=hashlib.sha256):
                 break
     else:  # pragma: no branch  # pragma: no cover
         cnt = 0
-        p = py23_bytes(priv_key)
-        sk = ecdsa.SigningKey.from_string(p, curve=ecdsa.SECP256k1)
+        sk = wif.key
         while 1:
             cnt += 1
             if not cnt % 20:
@@ -247,7 +433,7 @@ def sign_message(message, wif, hashfn=hashlib.sha256):
                 # Derive the recovery parameter
                 #
                 i = recoverPubkeyParameter(
-                    message, digest, signature, sk.get_verifying_key())
+                    message, digest, signature, wif.public_key)
                 i += 4   # compressed
                 i += 27  # compact
                 break
@@ -291,7 +477,10 @@ def verify_message(message, signature, hashfn=hashlib.sha256, recover_parameter=
         verifyPub.ecdsa_verify(message, normalSig)
         phex = verifyPub.serialize(compressed=True)
     elif SECP256K1_MODULE == "cryptography":
-        p = recover_public_key(digest, sig, recover_parameter, message)
+        point = recover_public_key_point(digest, sig, recover_parameter)
+        if point is None:
+            raise InvalidSignature()
+        p = ec.EllipticCurvePublicNumbers(point[0], point[1], ec.SECP256K1()).public_key(default_backend())
         order = ecdsa.SECP256k1.order
         r, s = ecdsa.util.sigdecode_string(sig, order)
         sigder = encode_dss_signature(r, s)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import re
+import struct
+import sys
+import time
+from calendar import timegm
+from binascii import unhexlify
+from datetime import datetime
+from .types import (
+    Uint8, Int16, Uint16, Uint32, Uint64,
+    Varint32, Int64, String, HexString, Bytes, Hash, Void,
+    Array, PointInTime, Signature, Optional, Static_variant,
+    Map, Id, varint, timeformat
+)
+from .objects import GrapheneObject, Operation
+from .py23 import py23_bytes, string_types
+
+#: struct format characters of the fixed width types
+fixed_formats = {
+    Uint8: "B",
+    Int16: "h",
+    Uint16: "H",
+    Uint32: "I",
+    Uint64: "Q",
+    Int64: "q",
+    PointInTime: "I",
+}
+
+_varints = [bytes(bytearray([n])) for n in range(0x80)]
+_escape_chars = re.compile(u"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_point_in_time_cache = {}
+
+
+def _varint(n):
+    if 0 <= n < 0x80:
+        return _varints[n]
+    return varint(n)
+
+
+def _fixed_value(value):
+    return value.data
+
+
+def _point_in_time_value(value):
+    """ Returns the unix time of a :class:`PointInTime` as unsigned 32 bit
+        integer, which gives the same bytes as the signed value that is
+        used for dates before 1970.
+    """
+    data = value.data
+    if isinstance(data, datetime):
+        unixtime = timegm(data.timetuple())
+    else:
+        unixtime = _point_in_time_cache.get(data)
+        if unixtime is None:
+            if sys.version > '3':
+                unixtime = timegm(time.strptime((data + "UTC"), timeformat))
+            else:
+                unixtime = timegm(time.strptime((data + "UTC"), timeformat.encode("utf-8")))
+            if len(_point_in_time_cache) > 10000:
+                _point_in_time_cache.clear()
+            _point_in_time_cache[data] = unixtime
+    return unixtime & 0xffffffff
+
+
+def _encode_string(data):
+    """ Encodes a string the same way as :func:`String.unicodify`"""
+    if _escape_chars.search(data) is None:
+        return data.encode("utf-8")
+    return String(data).unicodify()
+
+
+class Serializer(object):
+    """ Compiles the wire format of :class:`GrapheneObject` classes into
+        flat encoding plans and writes objects into a single ``bytearray``.
+
+        The plan of an object class is derived once from the types of its
+        fields. Neighbouring fixed width fields (integers, bools and
+        :class:`PointInTime`) are merged into one precompiled
+        ``struct.Struct``. A class which builds different fields depending
+        on its arguments gets one plan per field layout.
+
+        The result is byte-identical to ``bytes(obj)``. Types without a
+        registered writer, and subclasses which override ``__bytes__``,
+        fall back to ``bytes(obj)``.
+
+        .. code-block:: python
+
+            from beemgraphenebase.serializer import serialize
+            from beembase.operations import Vote
+            op = Vote(voter="a", author="b", permlink="c", weight=10000)
+            assert serialize(op) == bytes(op)
+
+    """
+    def __init__(self):
+        self.registered = {}
+        self.writers = {}
+        self.plans = {}
+        self.register(Void, self.write_void)
+        for klass in [Varint32, Id]:
+            self.register(klass, self.write_varint)
+        self.register(String, self.write_string)
+        for klass in [HexString, Bytes]:
+            self.register(klass, self.write_bytes)
+        self.register(Hash, self.write_hash)
+        self.register(Signature, self.write_signature)
+        self.register(Array, self.write_array)
+        self.register(Map, self.write_map)
+        self.register(Optional, self.write_optional)
+        self.register(Static_variant, self.write_static_variant)
+        self.register(Operation, self.write_operation)
+        self.register(GrapheneObject, self.write_object)
+        for klass in fixed_formats:
+            self.register(klass, self._get_fixed_writer(klass))
+
+    def register(self, klass, writer):
+        """ Registers ``writer(buf, value)`` for objects of ``klass`` and of
+            its subclasses which do not override ``__bytes__``. The writer
+            has to append the same bytes as ``bytes(value)`` to ``buf``.
+        """
+        self.registered[klass] = writer
+        self.writers = dict(self.registered)
+        self.plans = {}
+
+    def get_writer(self, klass):
+        """ Returns the writer for ``klass``, which is inherited from the
+            closest registered base class that uses the same ``__bytes__``
+        """
+        writer = self.writers.get(klass)
+        if writer is not None:
+            return writer
+        writer = self.write_fallback
+        for base in klass.__mro__:
+            if base in self.registered and getattr(klass, "__bytes__", None) is getattr(base, "__bytes__", None):
+                writer = self.registered[base]
+                break
+        self.writers[klass] = writer
+        return writer
+
+    def serialize(self, obj):
+        """ Returns the wire format of ``obj`` as bytes"""
+        buf = bytearray()
+        self.write(buf, obj)
+        return bytes(buf)
+
+    def write(self, buf, obj):
+        """ Appends the wire format of ``obj`` to ``buf``"""
+        writer = self.writers.get(type(obj))
+        if writer is None:
+            writer = self.get_writer(type(obj))
+        writer(buf, obj)
+
+    def compile(self, klass, types):
+        """ Returns the encoding plan for a :class:`GrapheneObject` class
+            whose data values have the given ``types``. The plan is a list of
+            ``step(buf, values)`` functions.
+        """
+        plan = []
+        fixed = []
+
+        def flush():
+            if fixed:
+                plan.append(self._get_fixed_step(list(fixed)))
+                del fixed[:]
+
+        for index, value_type in enumerate(types):
+            fixed_type = self._get_fixed_type(value_type)
+            if fixed_type is not None:
+                fixed.append((index, fixed_type))
+                continue
+            flush()
+            if issubclass(value_type, string_types):
+                plan.append(self._get_text_step(index))
+            else:
+                plan.append(self._get_value_step(index, self.get_writer(value_type)))
+        flush()
+        return plan
+
+    def get_plan(self, klass, values):
+        """ Returns the cached encoding plan for an object of ``klass`` with
+            ``values`` and compiles it on first use
+        """
+        types = tuple([type(value) for value in values])
+        plans = self.plans.get(klass)
+        if plans is None:
+            plans = self.plans[klass] = {}
+        plan = plans.get(types)
+        if plan is None:
+            plan = plans[types] = self.compile(klass, types)
+        return plan
+
+    def _get_fixed_type(self, klass):
+        if klass in self.registered and klass not in fixed_formats:
+            return None
+        for fixed_type in fixed_formats:
+            if issubclass(klass, fixed_type) and klass.__bytes__ is fixed_type.__bytes__:
+                return fixed_type
+        return None
+
+    def _get_fixed_writer(self, klass):
+        pack = struct.Struct("<" + fixed_formats[klass]).pack
+        get_value = _point_in_time_value if klass is PointInTime else _fixed_value
+
+        def write_fixed(buf, value):
+            buf += pack(get_value(value))
+        return write_fixed
+
+    def _get_fixed_step(self, fields):
+        pack = struct.Struct("<" + "".join([fixed_formats[fixed_type] for index, fixed_type in fields])).pack
+        getters = [(index, _point_in_time_value if fixed_type is PointInTime else _fixed_value)
+                   for index, fixed_type in fields]
+
+        def step(buf, values):
+            buf += pack(*[get_value(values[index]) for index, get_value in getters])
+        return step
+
+    def _get_text_step(self, index):
+        def step(buf, values):
+            buf += py23_bytes(values[index], 'utf-8')
+        return step
+
+    def _get_value_step(self, index, writer):
+        def step(buf, values):
+            writer(buf, values[index])
+        return step
+
+    def write_object(self, buf, obj):
+        if obj.data is None:
+            return
+        values = list(obj.data.values())
+        for step in self.get_plan(type(obj), values):
+            step(buf, values)
+
+    def write_void(self, buf, value):
+        pass
+
+    def write_varint(self, buf, value):
+        buf += _varint(int(value.data) if isinstance(value, Varint32) else int(value.data.data))
+
+    def write_string(self, buf, value):
+        if isinstance(value.data, string_types):
+            data = _encode_string(value.data)
+        else:
+            data = value.unicodify()
+        buf += _varint(len(data))
+        buf += data
+
+    def write_bytes(self, buf, value):
+        data = unhexlify(value.data)
+        buf += _varint(len(data))
+        buf += data
+
+    def write_hash(self, buf, value):
+        buf += unhexlify(value.data)
+
+    def write_signature(self, buf, value):
+        buf += value.data
+
+    def write_array(self, buf, value):
+        buf += _varint(len(value.data))
+        write = self.write
+        for item in value.data:
+            write(buf, item)
+
+    def write_map(self, buf, value):
+        buf += _varint(len(value.data))
+        write = self.write
+        for key, item in value.data:
+            write(buf, key)
+            write(buf, item)
+
+    def write_optional(self, buf, value):
+        if not value.data:
+            buf += b"\x00"
+            return
+        start = len(buf)
+        buf += b"\x01"
+        self.write(buf, value.data)
+        if len(buf) == start + 1:
+            buf[start] = 0
+
+    def write_static_variant(self, buf, value):
+        buf += _varint(value.type_id)
+        self.write(buf, value.data)
+
+    def write_operation(self, buf, value):
+        buf += _varint(value.opId)
+        self.write(buf, value.op)
+
+    def write_fallback(self, buf, value):
+        if isinstance(value, string_types):
+            buf += py23_bytes(value, 'utf-8')
+        else:
+            buf += py23_bytes(value)
+
+
+#: Default serializer, chain specific types are registered by beembase
+serializer = Serializer()
+
+
+def serialize(obj):
+    """ Returns the wire format of ``obj`` using the default
+        :class:`Serializer`. The result is identical to ``bytes(obj)``.
+    """
+    return serializer.serialize(obj)
@@ -17,6 +17,7 @@ from .types import (
 from .objects import GrapheneObject, isArgsThisClass
 from .operations import Operation
 from .chains import known_chains
+from .serializer import serialize
 from .ecdsasig import sign_message, verify_message
 import logging
 log = logging.getLogger(__name__)
@@ -73,7 +74,7 @@ class Signed_Transaction(GrapheneObject):
         self.data.pop("signatures", None)
 
         # Generage Hash of the seriliazed version
-        h = hashlib.sha256(py23_bytes(self)).digest()
+        h = hashlib.sha256(serialize(self)).digest()
 
         # recover signatures
         self.data["signatures"] = sigs
@@ -124,7 +125,7 @@ class Signed_Transaction(GrapheneObject):
         # Get message to sign
         #   bytes(self) will give the wire formated data according to
         #   GrapheneObject and the data given in __init__()
-        self.message = unhexlify(self.chainid) + py23_bytes(self)
+        self.message = unhexlify(self.chainid) + serialize(self)
         self.digest = hashlib.sha256(self.message).digest()
 
         # restore signatures
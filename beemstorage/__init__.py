@@ -14,8 +14,9 @@ from .base import (
     SqliteEncryptedTokenStore,    
 )
 from .sqlite import SQLiteFile, SQLiteCommon
+from .history import SqliteAccountHistoryStore
 
-__all__ = ["interfaces", "masterpassword", "base", "sqlite", "ram"]
+__all__ = ["interfaces", "masterpassword", "base", "sqlite", "ram", "history"]
 
 
 def get_default_config_store(*args, **kwargs):
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from .sqlite import SQLiteFile, SQLiteCommon
+
+log = logging.getLogger(__name__)
+
+
+class SqliteAccountHistoryStore(SQLiteFile, SQLiteCommon):
+    """ Stores the raw output of ``get_account_history`` in a SQLite3
+        database. Operations are stored by account name and operation
+        index, so that only operations above the highest stored index have
+        to be fetched from the node.
+
+        :param str profile: Name of the sqlite file (default: account_history)
+        :param str data_dir: Directory in which the sqlite file is stored
+
+        .. code-block:: python
+
+            >>> from beemstorage import SqliteAccountHistoryStore
+            >>> store = SqliteAccountHistoryStore(profile="testing_history")
+            >>> store.add_history("beembot", [[0, {"block": 1, "timestamp": "2020-01-01T00:00:00", "op": ["vote", {}]}]])
+            >>> store.get_max_index("beembot")
+            0
+            >>> store.wipe()
+
+    """
+
+    #: The table name for the account history
+    __tablename__ = "account_history"
+
+    def __init__(self, *args, **kwargs):
+        kwargs["profile"] = kwargs.get("profile", "account_history")
+        SQLiteFile.__init__(self, *args, **kwargs)
+        if not self.exists():  # pragma: no cover
+            self.create()
+
+    def exists(self):
+        """ Check if the database table exists
+        """
+        query = (
+            "SELECT name FROM sqlite_master " + "WHERE type='table' AND name=?",
+            (self.__tablename__,),
+        )
+        return True if self.sql_fetchone(query) else False
+
+    def create(self):  # pragma: no cover
+        """ Create the new table and its indices in the SQLite database
+        """
+        query = (
+            """
+            CREATE TABLE {} (
+                account STRING(16) NOT NULL,
+                op_index INTEGER NOT NULL,
+                block INTEGER,
+                timestamp STRING(19),
+                op_type STRING(64),
+                data TEXT,
+                PRIMARY KEY (account, op_index)
+            )""".format(self.__tablename__),
+        )
+        self.sql_execute(query)
+        query = (
+            "CREATE INDEX {0}_op_type ON {0} (account, op_type, op_index)".format(self.__tablename__),
+        )
+        self.sql_execute(query)
+        query = (
+            "CREATE INDEX {0}_block ON {0} (account, block)".format(self.__tablename__),
+        )
+        self.sql_execute(query)
+        query = (
+            "CREATE INDEX {0}_timestamp ON {0} (account, timestamp)".format(self.__tablename__),
+        )
+        self.sql_execute(query)
+
+    @staticmethod
+    def _get_op_type(event):
+        if isinstance(event['op'], list):
+            return event['op'][0]
+        op_type = event['op']['type']
+        if len(op_type) > 10 and op_type[len(op_type) - 10:] == "_operation":
+            op_type = op_type[:-10]
+        return op_type
+
+    def add_history(self, account, history):
+        """ Stores a list of raw account history items
+
+            :param str account: Name of the account
+            :param list history: list of ``[index, event]`` items as returned by
+                ``get_account_history``
+        """
+        rows = []
+        for item_index, event in history:
+            rows.append((account, item_index, event["block"], event["timestamp"],
+                         self._get_op_type(event), json.dumps(event)))
+        if len(rows) == 0:
+            return
+        query = (
+            "INSERT OR REPLACE INTO {} (account, op_index, block, timestamp, op_type, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)".format(self.__tablename__),
+            rows,
+        )
+        self.sql_executemany(query)
+
+    def get_max_index(self, account):
+        """ Returns the highest stored operation index of an account or None
+            when no operation was stored.
+        """
+        query = (
+            "SELECT MAX(op_index) FROM {} WHERE account=?".format(self.__tablename__),
+            (account,),
+        )
+        result = self.sql_fetchone(query)
+        if result is None:
+            return None
+        return result[0]
+
+    def count(self, account):
+        """ Returns the number of stored operations of an account"""
+        query = (
+            "SELECT COUNT(*) FROM {} WHERE account=?".format(self.__tablename__),
+            (account,),
+        )
+        return self.sql_fetchone(query)[0]
+
+    def get_history(self, account, start_index=None, stop_index=None, start_block=None, stop_block=None,
+                    start_time=None, stop_time=None, only_ops=[], exclude_ops=[], order=1):
+        """ Returns the stored raw account history items of an account
+
+            :param str account: Name of the account
+            :param int start_index: lowest operation index (*optional*)
+            :param int stop_index: highest operation index (*optional*)
+            :param int start_block: lowest block number (*optional*)
+            :param int stop_block: highest block number (*optional*)
+            :param str start_time: earliest timestamp in the
+                format ``%Y-%m-%dT%H:%M:%S`` (*optional*)
+            :param str stop_time: latest timestamp (*optional*)
+            :param array only_ops: Limit result by these operations (*optional*)
+            :param array exclude_ops: Exclude these operations (*optional*)
+            :param int order: 1 for chronological, -1 for reverse order
+        """
+        where = ["account=?"]
+        args = [account]
+        for column, operator, value in [("op_index", ">=", start_index), ("op_index", "<=", stop_index),
+                                        ("block", ">=", start_block), ("block", "<=", stop_block),
+                                        ("timestamp", ">=", start_time), ("timestamp", "<=", stop_time)]:
+            if value is not None:
+                where.append("{} {} ?".format(column, operator))
+                args.append(value)
+        if len(only_ops) > 0:
+            where.append("op_type IN ({})".format(", ".join(["?"] * len(only_ops))))
+            args.extend(only_ops)
+        if len(exclude_ops) > 0:
+            where.append("op_type NOT IN ({})".format(", ".join(["?"] * len(exclude_ops))))
+            args.extend(exclude_ops)
+        query = (
+            "SELECT op_index, data FROM {} WHERE {} ORDER BY op_index {}".format(
+                self.__tablename__, " AND ".join(where), "ASC" if order == 1 else "DESC"),
+            tuple(args),
+        )
+        return [[item_index, json.loads(data)] for item_index, data in self.sql_fetchall(query)]
+
+    def delete(self, account):
+        """ Delete all stored operations of an account
+        """
+        query = (
+            "DELETE FROM {} WHERE account=?".format(self.__tablename__),
+            (account,),
+        )
+        self.sql_execute(query)
+
+    def wipe(self):
+        """ Wipe the store
+        """
+        query = ("DELETE FROM {}".format(self.__tablename__),)
+        self.sql_execute(query)
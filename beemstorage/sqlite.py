@@ -169,6 +169,15 @@ class SQLiteCommon(object):
             connection.close()
         return ret
 
+    def sql_executemany(self, query):
+        connection = sqlite3.connect(self.sqlite_file)
+        try:
+            cursor = connection.cursor()
+            cursor.executemany(*query)
+            connection.commit()
+        finally:
+            connection.close()
+
 
 class SQLiteStore(SQLiteFile, SQLiteCommon, StoreInterface):
     """ The SQLiteStore deals with the sqlite3 part of storing data into a
@@ -0,0 +1,38 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from beem.hive import Hive
+from beem.amount import Amount, FixedAmount
+from beem.amountarray import AmountArray
+
+
+class Benchmark(object):
+    goal_time = 1
+
+
+class Amounts(Benchmark):
+    def setup(self):
+        self.stm = Hive(offline=True)
+        self.amounts = ["%d.%03d HIVE" % (i % 1000, i % 997) for i in range(10000)]
+        self.fixed_amounts = [FixedAmount(amount, blockchain_instance=self.stm) for amount in self.amounts]
+        self.amount_array = AmountArray(self.amounts, blockchain_instance=self.stm)
+        self.accounts = ["account%d" % (i % 100) for i in range(10000)]
+
+    def time_parse_amount(self):
+        for amount in self.amounts:
+            Amount(amount, blockchain_instance=self.stm)
+
+    def time_parse_fixed_amount(self):
+        for amount in self.amounts:
+            FixedAmount(amount, blockchain_instance=self.stm)
+
+    def time_sum_fixed_amount(self):
+        sum(self.fixed_amounts)
+
+    def time_parse_amount_array(self):
+        AmountArray(self.amounts, blockchain_instance=self.stm)
+
+    def time_groupby_amount_array(self):
+        self.amount_array.groupby(self.accounts)
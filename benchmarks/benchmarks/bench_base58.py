@@ -0,0 +1,56 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from beemgraphenebase.base58 import (
+    Base58,
+    base58encode,
+    base58decode,
+    base58encode_batch,
+    base58decode_batch,
+    encode_keys,
+    decode_keys,
+    gphBase58CheckEncode,
+    gphBase58CheckDecode
+)
+from beemgraphenebase.account import PrivateKey
+
+
+class Benchmark(object):
+    goal_time = 1
+
+
+class Base58Codec(Benchmark):
+    def setup(self):
+        self.wif = "5HueCGU8rMjxEXxiPuD5BDku4MkFqeZyd4dZ1jvhTVqvbTLvyTJ"
+        self.hex = base58decode(self.wif)
+        self.pubkeys = [repr(PrivateKey(repr(Base58("%064x" % (i + 1)))).pubkey) for i in range(100)]
+        self.keys = encode_keys(self.pubkeys)
+        self.raw = [bytes(bytearray.fromhex(pubkey)) for pubkey in self.pubkeys]
+        self.encoded = base58encode_batch(self.raw)
+
+    def time_base58encode(self):
+        base58encode(self.hex)
+
+    def time_base58decode(self):
+        base58decode(self.wif)
+
+    def time_Base58_wif(self):
+        format(Base58(self.wif), "WIF")
+
+    def time_base58encode_batch(self):
+        base58encode_batch(self.raw)
+
+    def time_base58decode_batch(self):
+        base58decode_batch(self.encoded)
+
+    def time_encode_keys(self):
+        encode_keys(self.pubkeys)
+
+    def time_decode_keys(self):
+        decode_keys(self.keys)
+
+    def time_gphBase58Check_keys(self):
+        for pubkey in self.pubkeys:
+            gphBase58CheckDecode(gphBase58CheckEncode(pubkey))
@@ -118,3 +118,18 @@ class Secp256k1(Benchmark):
         signature = b' 7\x82\xe2\xad\xdc\xdb]~\xd6\xa8J\xdc\xa5\xf4\x13<i\xb9\xc0\xdcEc\x10\xd0)t\xc7^\xecw\x05 U\x91\x0f\xa2\xce\x04\xa1\xdb\xb0\nQ\xbd\xafP`\\\x8bb\x99\xcf\xe0;\x01*\xe9D]\xad\xd9l\x1f\x05'        
         pubkey = ecda.verify_message(message, signature)
 
+
+class Recovery(Benchmark):
+    def setup(self):
+        ecda.SECP256K1_MODULE = "ecdsa"
+        self.message = 'This is a short Message'
+        self.digest = hashlib.sha256(py23_bytes(self.message, "ascii")).digest()
+        self.signature = b'\x1f9\xb6_\x85\xbdr7\\\xb2N\xfb~\x82\xb7E\x80\xf1M\xa4EP=\x8elJ\x1d[t\xab%v~a\xb7\xdbS\x86;~N\xd2!\xf1k=\xb6tMm-\xf1\xd9\xfc\xf3`\xbf\xd5)\x1b\xb3N\x92u/'
+
+    def time_recover_python(self):
+        ecda.recover_compressed_pubkey(self.digest, self.signature[1:], 0, use_coincurve=False)
+
+    def time_recover_coincurve(self):
+        if not ecda.COINCURVE_AVAILABLE:
+            raise NotImplementedError("coincurve not available")
+        ecda.recover_compressed_pubkey(self.digest, self.signature[1:], 0, use_coincurve=True)
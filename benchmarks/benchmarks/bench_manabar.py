@@ -0,0 +1,46 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from datetime import datetime
+from beem.hive import Hive
+from beem.account import Account
+from beem.manabar import ManabarTable
+
+
+class Benchmark(object):
+    goal_time = 1
+
+
+class Manabar(Benchmark):
+    def setup(self):
+        self.stm = Hive(offline=True)
+        self.now = datetime(2020, 1, 3, 12, 0, 0)
+        self.accounts = []
+        for i in range(5000):
+            self.accounts.append({"name": "test%d" % i, "vesting_shares": "%d.000000 VESTS" % (1000 + i * 997),
+                                  "delegated_vesting_shares": "0.000000 VESTS",
+                                  "received_vesting_shares": "%d.123456 VESTS" % i,
+                                  "next_vesting_withdrawal": "1969-12-31T23:59:59",
+                                  "voting_manabar": {"current_mana": i * 1000000, "last_update_time": 1577836800 + i},
+                                  "downvote_manabar": {"current_mana": i * 100000, "last_update_time": 1577836800 + i}})
+        self.account_objects = [Account(account, blockchain_instance=self.stm) for account in self.accounts[:500]]
+        self.table = ManabarTable(self.accounts, blockchain_instance=self.stm)
+
+    def time_table_from_json(self):
+        ManabarTable(self.accounts, blockchain_instance=self.stm)
+
+    def time_table_manabar(self):
+        self.table.get_manabar(now=self.now)
+        self.table.get_downvote_manabar(now=self.now)
+
+    def time_table_voting_power(self):
+        self.table.get_voting_power(now=self.now)
+
+    def time_table_recharge(self):
+        self.table.get_recharge_seconds(now=self.now)
+
+    def time_scalar_voting_power_500(self):
+        for account in self.account_objects:
+            account.get_voting_power()
@@ -0,0 +1,43 @@
+# This Python file uses the following encoding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from datetime import datetime, timedelta
+from beem.hive import Hive
+from beem.utils import formatTimeString
+from beem.snapshot import AccountSnapshot, ArrayAccountSnapshot
+
+
+class Benchmark(object):
+    goal_time = 1
+
+
+class Snapshot(Benchmark):
+    def setup(self):
+        self.stm = Hive(offline=True)
+        self.account = {"name": "beembot"}
+        start = datetime(2016, 3, 24)
+        self.history = []
+        for i in range(20000):
+            timestamp = formatTimeString(start + timedelta(seconds=i * 7200))
+            if i % 50 == 0:
+                op = {"type": "delegate_vesting_shares", "delegator": "test%d" % (i % 7), "delegatee": "beembot",
+                      "vesting_shares": "%d.000000 VESTS" % (i * 3 + 1)}
+            elif i % 3 == 0:
+                op = {"type": "claim_reward_balance", "account": "beembot", "reward_steem": "1.000 HIVE",
+                      "reward_sbd": "2.000 HBD", "reward_vests": "3.000000 VESTS"}
+            else:
+                op = {"type": "producer_reward", "producer": "beembot", "vesting_shares": "123.456789 VESTS"}
+            op.update({"index": i, "block": 1000 + i, "timestamp": timestamp})
+            self.history.append(op)
+
+    def time_build(self):
+        snapshot = AccountSnapshot(self.account, account_history=self.history, blockchain_instance=self.stm)
+        snapshot.build()
+        snapshot.build_sp_arrays()
+
+    def time_build_arrays(self):
+        snapshot = ArrayAccountSnapshot(self.account, account_history=self.history, blockchain_instance=self.stm)
+        snapshot.build()
+        snapshot.build_sp_arrays()
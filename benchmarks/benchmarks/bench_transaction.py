@@ -23,6 +23,8 @@ from beemgraphenebase.account import PrivateKey
 from beemgraphenebase import account
 from beembase.operationids import getOperationNameForId
 from beemgraphenebase.py23 import py23_bytes, bytes_types
+from beemgraphenebase.serializer import serialize
+from beemgraphenebase.batchsigner import BatchSigner
 from beem.amount import Amount
 from beem.asset import Asset
 from beem.steem import Steem
@@ -419,3 +421,42 @@ class Transaction(Benchmark):
 
         self.doit()
 
+
+class Serialization(Benchmark):
+    def setup(self):
+        ops = []
+        for i in range(50):
+            ops.append(Operation(operations.Vote(voter="foobara", author="foobarc", permlink="post-%d" % i,
+                                                 weight=10000, prefix=u"STM")))
+            ops.append(Operation(operations.Custom_json(required_auths=[], required_posting_auths=["foobara"],
+                                                        id="follow", json=["follow", {"follower": "foobara",
+                                                                                      "following": "foobarc",
+                                                                                      "what": ["blog"]}],
+                                                        prefix=u"STM")))
+        self.tx = Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213,
+                                     expiration="2016-04-06T08:29:27", operations=ops)
+
+    def time_bytes(self):
+        py23_bytes(self.tx)
+
+    def time_serialize(self):
+        serialize(self.tx)
+
+
+class BatchSigning(Benchmark):
+    def setup(self):
+        self.wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+        self.txs = [Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213,
+                                       expiration="2016-04-06T08:29:27",
+                                       operations=[Operation(operations.Vote(voter="foobara", author="foobarc",
+                                                                             permlink="post-%d" % i, weight=10000,
+                                                                             prefix=u"STM"))])
+                    for i in range(20)]
+        self.signer = BatchSigner([self.wif], chain="STEEM")
+
+    def time_sign(self):
+        for tx in self.txs:
+            tx.sign([self.wif], chain="STEEM")
+
+    def time_batch_sign(self):
+        self.signer.sign(self.txs)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+import tempfile
+import shutil
+import mock
+from datetime import datetime, timedelta
+from beem import Hive
+from beem.account import Account
+from beem.utils import formatTimeString
+from beemapi.exceptions import RPCError
+from beemstorage import SqliteAccountHistoryStore
+from beembase.operationids import operations
+
+
+class FakeHistoryRPC(object):
+    """ Mimics the account_history api of a node for a single account. api.hive.blog
+        returns ``limit`` operations, all other nodes ``limit + 1`` operations.
+    """
+    def __init__(self, op_count=100, url="https://api.fake.node", filter_support=False):
+        self.url = url
+        self.filter_support = filter_support
+        self.calls = []
+        self.lock = threading.Lock()
+        start_time = datetime(2020, 1, 1, 0, 0, 0)
+        self.history = []
+        for index in range(op_count):
+            if index % 20 == 7:
+                op = ["custom_json", {"required_auths": [], "required_posting_auths": ["beembot"], "id": "test", "json": "{}"}]
+            elif index % 3 == 0:
+                op = ["transfer", {"from": "beembot", "to": "test", "amount": "1.000 HIVE", "memo": str(index)}]
+            else:
+                op = ["vote", {"voter": "beembot", "author": "test", "permlink": "p%d" % index, "weight": 100}]
+            self.history.append([index, {"trx_id": "%040x" % index, "block": 1000 + index * 2,
+                                         "trx_in_block": 0, "op_in_trx": 0, "virtual_op": 0,
+                                         "timestamp": formatTimeString(start_time + timedelta(seconds=6 * index)),
+                                         "op": op}])
+
+    def get_use_appbase(self):
+        return True
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_account_history(self, params, api=None):
+        with self.lock:
+            self.calls.append(params)
+        start = params["start"]
+        limit = params["limit"]
+        if start < 0 or start >= len(self.history):
+            start = len(self.history) - 1
+        if self.filter_support and "operation_filter_low" in params:
+            history = []
+            for item in reversed(self.history[:start + 1]):
+                op_id = operations[item[1]["op"][0]]
+                if op_id < 64 and params["operation_filter_low"] & 2 ** op_id:
+                    history.insert(0, item)
+                elif op_id >= 64 and params["operation_filter_high"] & 2 ** (op_id - 64):
+                    history.insert(0, item)
+                if len(history) == limit:
+                    break
+            return {"history": history}
+        if self.url == "https://api.hive.blog":
+            limit -= 1
+        history = self.history[max(0, start - limit):start + 1]
+        return {"history": history}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.stm = Hive(offline=True)
+        self.rpc = FakeHistoryRPC(op_count=100)
+        self.stm.rpc = self.rpc
+        self.account = Account({"name": "beembot"}, blockchain_instance=self.stm)
+        Account.clear_history_probes()
+
+    def test_history(self):
+        h_list = [h[0] for h in self.account.history(use_block_num=False, batch_size=10, raw_output=True)]
+        self.assertEqual(h_list, list(range(100)))
+        h_list = [h["index"] for h in self.account.history(start=5, stop=47, use_block_num=False, batch_size=10)]
+        self.assertEqual(h_list, list(range(5, 48)))
+
+    def test_history_threading(self):
+        self.account._get_thread_instances = lambda thread_num: [self.stm] * thread_num
+        h_list = [h[0] for h in self.account.history(use_block_num=False, batch_size=7, raw_output=True,
+                                                       threading=True, thread_num=4)]
+        self.assertEqual(h_list, list(range(100)))
+        h_list = [h["index"] for h in self.account.history(start=5, stop=47, use_block_num=False, batch_size=10,
+                                                           threading=True, thread_num=3)]
+        self.assertEqual(h_list, list(range(5, 48)))
+        h_list = [h["index"] for h in self.account.history(only_ops=["transfer"], use_block_num=False, batch_size=10,
+                                                           threading=True, thread_num=3)]
+        self.assertEqual(h_list, [i for i in range(0, 100, 3) if i % 20 != 7])
+        h_list = [h["block"] for h in self.account.history(start=1010, stop=1020, batch_size=10,
+                                                           threading=True, thread_num=3)]
+        self.assertEqual(h_list, list(range(1010, 1021, 2)))
+
+    def test_history_threading_hive_blog(self):
+        self.rpc.url = "https://api.hive.blog"
+        self.account._get_thread_instances = lambda thread_num: [self.stm] * thread_num
+        h_sequential = [h[0] for h in self.account.history(use_block_num=False, batch_size=10, raw_output=True)]
+        h_threaded = [h[0] for h in self.account.history(use_block_num=False, batch_size=10, raw_output=True,
+                                                         threading=True, thread_num=4)]
+        self.assertEqual(h_threaded, list(range(100)))
+        self.assertEqual(h_threaded, h_sequential)
+
+    def test_history_store(self):
+        data_dir = tempfile.mkdtemp()
+        try:
+            store = SqliteAccountHistoryStore(profile="testing_history", data_dir=data_dir)
+            self.rpc.history = self.rpc.history[:50]
+            h_list = [h["index"] for h in self.account.history(start=5, stop=47, use_block_num=False,
+                                                               history_store=store)]
+            self.assertEqual(h_list, list(range(5, 48)))
+            self.assertEqual(store.get_max_index("beembot"), 49)
+            h_uncached = list(self.account.history(only_ops=["transfer"]))
+
+            # only new operations are fetched
+            self.rpc.history = FakeHistoryRPC(op_count=100).history
+            self.assertEqual(self.account.sync_history(store), 50)
+            self.rpc.calls = []
+            self.assertEqual(self.account.sync_history(store), 0)
+            for params in self.rpc.calls:
+                self.assertTrue(params["start"] in [-1, 99])
+
+            h_list = list(self.account.history(only_ops=["transfer"], stop=1099, history_store=store))
+            self.assertEqual(h_list, h_uncached)
+            h_list = [h[0] for h in self.account.history_reverse(start=-1, stop=-10, use_block_num=False,
+                                                                 exclude_ops=["transfer"], raw_output=True,
+                                                                 history_store=store)]
+            self.assertEqual(h_list, [98, 97, 95, 94, 92, 91, 89])
+            start = formatTimeString(self.rpc.history[10][1]["timestamp"])
+            stop = formatTimeString(self.rpc.history[5][1]["timestamp"])
+            h_list = [h["index"] for h in self.account.history_reverse(start=start, stop=stop, history_store=store)]
+            self.assertEqual(h_list, list(range(10, 4, -1)))
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_operation_filter_support(self):
+        self.assertFalse(self.account.supports_operation_filter())
+        self.assertFalse(Account.operation_filter_support[self.rpc.url])
+        self.rpc.url = "https://api.fake-filter.node"
+        self.rpc.filter_support = True
+        self.assertTrue(self.account.supports_operation_filter())
+        self.assertTrue(Account.operation_filter_support[self.rpc.url])
+
+    def test_operation_filter_support_error(self):
+        self.rpc.url = "https://api.fake-timeout.node"
+        with mock.patch.object(self.rpc, "get_account_history", side_effect=RPCError("timeout")):
+            self.assertFalse(self.account.supports_operation_filter())
+        self.assertNotIn(self.rpc.url, Account.operation_filter_support)
+        self.rpc.filter_support = True
+        self.assertTrue(self.account.supports_operation_filter())
+        self.assertTrue(Account.operation_filter_support[self.rpc.url])
+
+    def test_history_operation_filter(self):
+        expected = [i for i in range(100) if i % 20 == 7]
+        h_list = [h["index"] for h in self.account.history(only_ops=["custom_json"], batch_size=10)]
+        self.assertEqual(h_list, expected)
+        calls_without_filter = len(self.rpc.calls)
+        self.rpc.url = "https://api.fake-filter.node"
+        self.rpc.filter_support = True
+        self.rpc.calls = []
+        h_list = [h["index"] for h in self.account.history(only_ops=["custom_json"], batch_size=10)]
+        self.assertEqual(h_list, expected)
+        self.assertTrue(len(self.rpc.calls) < calls_without_filter)
+        with self.assertLogs("beem.account", level="DEBUG"):
+            h_list = [h["index"] for h in self.account.history(only_ops=["custom_json"], batch_size=10,
+                                                               threading=True)]
+        self.assertEqual(h_list, expected)
+        h_list = [h["index"] for h in self.account.history(only_ops=["transfer", "custom_json"], batch_size=4)]
+        self.assertEqual(h_list, [i for i in range(100) if i % 20 == 7 or i % 3 == 0])
+        h_list = [h["index"] for h in self.account.history(start=10, stop=60, use_block_num=False,
+                                                           exclude_ops=["vote"], batch_size=10)]
+        self.assertEqual(h_list, [i for i in range(10, 61) if i % 20 == 7 or i % 3 == 0])
+        h_list = [h["index"] for h in self.account.history_reverse(only_ops=["custom_json"], batch_size=2)]
+        self.assertEqual(h_list, expected[::-1])
+        h_list = [h["index"] for h in self.account.history_reverse(start=80, stop=10, use_block_num=False,
+                                                                   only_ops=["transfer"], batch_size=5)]
+        self.assertEqual(h_list, [i for i in range(80, 9, -1) if i % 3 == 0 and i % 20 != 7])
+
+    def test_estimate_virtual_op_num(self):
+        self.rpc = FakeHistoryRPC(op_count=5000)
+        self.stm.rpc = self.rpc
+        for block_num in [999, 1000, 1001, 1002, 1003, 5000, 8000, 10997, 10998, 10999]:
+            self.rpc.calls = []
+            op_num = self.account.estimate_virtual_op_num(block_num)
+            expected = min([i for i, h in self.rpc.history if h["block"] >= block_num] + [4999])
+            self.assertEqual(op_num, expected)
+            # virtual_op_count, first, latest and at most 2 * log2(5000) probes
+            self.assertTrue(len(self.rpc.calls) <= 3 + 2 * 13)
+        start_time = formatTimeString(self.rpc.history[1234][1]["timestamp"])
+        self.assertEqual(self.account.estimate_virtual_op_num(start_time), 1234)
+        self.assertEqual(self.account.estimate_virtual_op_num(start_time - timedelta(seconds=3)), 1234)
+
+        # probes are shared between Account objects of the same account
+        self.rpc.calls = []
+        account = Account({"name": "beembot"}, blockchain_instance=self.stm)
+        self.assertEqual(account.estimate_virtual_op_num(8000), 3500)
+        # only virtual_op_count and the latest operation are requested
+        self.assertEqual(len(self.rpc.calls), 2)
+
+    def test_history_probes_maxsize(self):
+        self.rpc = FakeHistoryRPC(op_count=5000)
+        self.stm.rpc = self.rpc
+        with mock.patch.object(Account, "history_probes_maxsize", 4), \
+                mock.patch.object(Account, "history_probes_account_maxsize", 3):
+            self.assertEqual(self.account.estimate_virtual_op_num(8000), 3500)
+            self.assertEqual(len(self.account._get_history_probes()), 3)
+            for i in range(5):
+                Account({"name": "beembot%d" % i}, blockchain_instance=self.stm)._get_history_probes()
+            self.assertEqual(len(Account._history_probes), 4)
+            self.assertNotIn((self.stm.chain_params.get("chain_id"), "beembot"), Account._history_probes)
+        Account.clear_history_probes()
+        self.assertEqual(len(Account._history_probes), 0)
+
+    def test_history_start_block(self):
+        self.rpc = FakeHistoryRPC(op_count=5000)
+        self.stm.rpc = self.rpc
+        h_list = [h["index"] for h in self.account.history(start=9001, stop=9010, batch_size=100)]
+        self.assertEqual(h_list, [4001, 4002, 4003, 4004, 4005])
+        start_time = formatTimeString(self.rpc.history[4001][1]["timestamp"])
+        h_list = [h["index"] for h in self.account.history(start=start_time, stop=9010, batch_size=100)]
+        self.assertEqual(h_list, [4001, 4002, 4003, 4004, 4005])
+        h_list = [h["index"] for h in self.account.history_reverse(start=9010, stop=9001, batch_size=100)]
+        self.assertEqual(h_list, [4005, 4004, 4003, 4002, 4001])
+        h_list = [h["index"] for h in self.account.history_reverse(start=start_time, stop=9001, batch_size=100)]
+        self.assertEqual(h_list, [4001])
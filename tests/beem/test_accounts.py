@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+import threading
+import mock
+from beem import Hive
+from beem.account import Account, Accounts
+from beem.blockchainobject import BlockchainObject
+from beemgraphenebase.chains import known_chains
+
+
+class FakeAccountsRPC(object):
+    url = "https://api.fake.node"
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def get_use_appbase(self):
+        return True
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_config(self, api=None):
+        return {}
+
+    def get_network(self, props=None):
+        return known_chains["HIVE"]
+
+    def find_accounts(self, params, api=None):
+        with self.lock:
+            self.calls.append(params["accounts"])
+            self.threads.add(threading.current_thread().name)
+        return {"accounts": [{"id": int(name[4:]), "name": name, "balance": "1.000 HIVE",
+                              "vesting_shares": "1000.000000 VESTS", "json_metadata": "{}",
+                              "created": "2020-01-01T00:00:00",
+                              "voting_manabar": {"current_mana": 1000, "last_update_time": 1577836800}}
+                             for name in params["accounts"]]}
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        BlockchainObject.clear_cache()
+        self.stm = Hive(offline=True)
+        self.rpc = FakeAccountsRPC()
+        self.stm.rpc = self.rpc
+        self.name_list = ["test%d" % i for i in range(250)]
+
+    def test_accounts(self):
+        accounts = Accounts(self.name_list, batch_limit=100, blockchain_instance=self.stm)
+        self.assertEqual([acc["name"] for acc in accounts], self.name_list)
+        self.assertEqual(len(self.rpc.calls), 3)
+        self.assertEqual(str(accounts[0]["balance"]), "1.000 HIVE")
+
+        # loaded accounts are cached
+        account = Account("test42", blockchain_instance=self.stm, use_cache=True)
+        self.assertEqual(account["id"], 42)
+        self.assertEqual(str(account["balance"]), "1.000 HIVE")
+        self.assertEqual(len(self.rpc.calls), 3)
+        # the cached data is copied
+        account["voting_manabar"]["current_mana"] = 0
+        self.assertEqual(accounts[42]["voting_manabar"]["current_mana"], 1000)
+        # without use_cache the account is fetched again
+        Account("test42", blockchain_instance=self.stm)
+        self.assertEqual(len(self.rpc.calls), 4)
+
+    def test_accounts_threading(self):
+        with mock.patch("beem.account.get_thread_instances", lambda stm, thread_num: [stm] * thread_num):
+            accounts = Accounts(self.name_list, batch_limit=10, threading=True, thread_num=4,
+                                blockchain_instance=self.stm)
+        self.assertEqual([acc["name"] for acc in accounts], self.name_list)
+        self.assertEqual(len(self.rpc.calls), 25)
+        self.assertTrue(len(self.rpc.threads) > 1)
+
+    def test_accounts_light(self):
+        accounts = Accounts(self.name_list[:5], full=False, blockchain_instance=self.stm)
+        self.assertEqual(sorted(accounts[0].keys()), sorted(["id", "name", "balance", "vesting_shares", "voting_manabar"]))
+        self.assertFalse(accounts[0].full)
+        self.assertEqual(len(self.rpc.calls), 1)
+        # a full account is not served by a lightweight cached one
+        Account("test1", blockchain_instance=self.stm, use_cache=True)
+        self.assertEqual(len(self.rpc.calls), 2)
+        Account("test2", full=False, blockchain_instance=self.stm, use_cache=True)
+        self.assertEqual(len(self.rpc.calls), 2)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import unittest
+from datetime import datetime, date
+from beem import Hive
+from beem.amount import Amount, FixedAmount
+from beem.amountarray import AmountArray, PriceSeries
+from beem.price import Price
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.hv = Hive(offline=True)
+
+    def test_init(self):
+        hv = self.hv
+        inputs = ["1.000 HIVE", {"amount": "2500", "precision": 3, "nai": "@@000000021"}, ["-300", 3, "@@000000021"],
+                  Amount("0.001 HIVE", blockchain_instance=hv), FixedAmount("4.5 HIVE", blockchain_instance=hv),
+                  "0.0019 HIVE"]
+        amounts = AmountArray(inputs, blockchain_instance=hv)
+        self.assertEqual(len(amounts), 6)
+        self.assertEqual(amounts.symbol, "HIVE")
+        self.assertEqual(amounts.satoshi.tolist(), [1000, 2500, -300, 1, 4500, 1])
+        self.assertEqual(amounts[0], Amount("1.000 HIVE", blockchain_instance=hv))
+        self.assertIsInstance(amounts[1], Amount)
+        self.assertEqual([str(a) for a in amounts[1:3]], ["2.500 HIVE", "-0.300 HIVE"])
+        self.assertEqual(amounts.sum(), Amount("7.702 HIVE", blockchain_instance=hv))
+        self.assertEqual(amounts.cumsum().satoshi.tolist(), [1000, 3500, 3200, 3201, 7701, 7702])
+        self.assertEqual(len(amounts.append(["1.000 HIVE"])), 7)
+        self.assertRaises(AssertionError, AmountArray, ["1.000 HIVE", "1.000 HBD"], blockchain_instance=hv)
+        self.assertRaises(ValueError, AmountArray, [], blockchain_instance=hv)
+        self.assertEqual(AmountArray([], asset="HBD", blockchain_instance=hv).sum(), Amount("0.000 HBD", blockchain_instance=hv))
+        self.assertEqual(AmountArray.from_satoshi([1, 2], "VESTS", blockchain_instance=hv).sum(),
+                         Amount("0.000003 VESTS", blockchain_instance=hv))
+
+    def test_arithmetic(self):
+        hv = self.hv
+        amounts = AmountArray(["1.000 HBD", "-2.001 HBD", "3.333 HBD"], blockchain_instance=hv)
+        self.assertEqual((amounts + Amount("1.000 HBD", blockchain_instance=hv)).satoshi.tolist(), [2000, -1001, 4333])
+        self.assertEqual((amounts - "0.001 HBD").satoshi.tolist(), [999, -2002, 3332])
+        self.assertEqual((amounts + amounts).satoshi.tolist(), [2000, -4002, 6666])
+        self.assertEqual((amounts + 1).satoshi.tolist(), [2000, -1001, 4333])
+        self.assertEqual((-amounts).satoshi.tolist(), [-1000, 2001, -3333])
+        for factor in [3, 0.5, 1.1, -0.25]:
+            expected = [int(Amount(a, blockchain_instance=hv) * factor) for a in ["1.000 HBD", "-2.001 HBD", "3.333 HBD"]]
+            self.assertEqual((amounts * factor).satoshi.tolist(), expected)
+        self.assertEqual((amounts / 3).satoshi.tolist(), [333, -667, 1111])
+        self.assertEqual((amounts > 0).tolist(), [True, False, True])
+        self.assertEqual((amounts == FixedAmount("1.000 HBD", blockchain_instance=hv)).tolist(), [True, False, False])
+        self.assertRaises(AssertionError, amounts.__add__, Amount("1.000 HIVE", blockchain_instance=hv))
+
+    def test_groupby(self):
+        hv = self.hv
+        amounts = AmountArray(["1.000 HIVE", "2.000 HIVE", "0.500 HIVE", "0.250 HIVE"], blockchain_instance=hv)
+        groups = amounts.groupby(["bob", "alice", "bob", "carol"])
+        self.assertEqual(sorted(groups.keys()), ["alice", "bob", "carol"])
+        self.assertEqual(groups["bob"], Amount("1.500 HIVE", blockchain_instance=hv))
+        days = amounts.groupby_day([datetime(2020, 1, 1, 23, 59, 59), "2020-01-02T00:00:00", 1577836800,
+                                    datetime(2020, 1, 2, 12)])
+        self.assertEqual(days, {date(2020, 1, 1): Amount("1.500 HIVE", blockchain_instance=hv),
+                                date(2020, 1, 2): Amount("2.250 HIVE", blockchain_instance=hv)})
+        self.assertRaises(ValueError, amounts.groupby, ["bob"])
+        # sums above the int64 range do not overflow
+        vests = AmountArray.from_satoshi([2 ** 62, 2 ** 62, 1], "VESTS", blockchain_instance=hv)
+        groups = vests.groupby(["bob", "bob", "alice"])
+        self.assertEqual(int(groups["bob"]), 2 ** 63)
+        self.assertEqual(int(groups["alice"]), 1)
+
+    def test_convert(self):
+        hv = self.hv
+        values = ["1.000 HIVE", "-2.001 HIVE", "3.333 HIVE"]
+        amounts = AmountArray(values, blockchain_instance=hv)
+        price = Price("0.315 HBD/HIVE", blockchain_instance=hv)
+        hbd = amounts.convert(price)
+        self.assertEqual(hbd.symbol, "HBD")
+        for value, converted in zip(values, hbd):
+            self.assertEqual(converted, Amount(value, blockchain_instance=hv) * price)
+        self.assertEqual((amounts * price).satoshi.tolist(), hbd.satoshi.tolist())
+        hive = hbd.convert(price)
+        self.assertEqual(hive.symbol, "HIVE")
+        self.assertEqual(hive.satoshi.tolist(), [int(a / price) for a in hbd])
+        self.assertRaises(AssertionError, AmountArray(["1.000 VESTS"], blockchain_instance=hv).convert, price)
+
+        feed = PriceSeries(["2020-01-02T00:00:00", "2020-01-01T00:00:00"],
+                           [{"base": "0.500 HBD", "quote": "1.000 HIVE"},
+                            Price("0.250 HBD/HIVE", blockchain_instance=hv)], blockchain_instance=hv)
+        self.assertEqual(len(feed), 2)
+        self.assertEqual(float(feed.get_price("2020-01-01T12:00:00")), 0.25)
+        timestamps = ["2019-12-31T00:00:00", "2020-01-01T12:00:00", "2020-01-02T00:00:00"]
+        hbd = amounts.convert(feed, timestamps)
+        self.assertEqual(hbd.satoshi.tolist(), [250, -500, 1666])
+        self.assertEqual(hbd.convert(feed, timestamps).satoshi.tolist(), [1000, -2000, 3332])
+        self.assertRaises(ValueError, amounts.convert, feed)
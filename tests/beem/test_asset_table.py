@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+import mock
+from beem import Hive, Steem
+from beem.amount import Amount
+from beem.asset import Asset, AssetDescriptor, get_asset_table
+from beem.price import Price
+from beem.exceptions import AssetDoesNotExistsException
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.hv = Hive(offline=True)
+
+    def test_amount(self):
+        hv = self.hv
+        with mock.patch.object(Asset, "refresh") as refresh:
+            amounts = [Amount("1.000 HIVE", blockchain_instance=hv),
+                       Amount({"amount": "1000", "precision": 3, "nai": "@@000000021"}, blockchain_instance=hv),
+                       Amount(["1000", 3, "@@000000021"], blockchain_instance=hv),
+                       Amount(1, "HIVE", blockchain_instance=hv),
+                       Amount({"amount": 1000, "asset_id": 1}, blockchain_instance=hv)]
+            for amount in amounts:
+                self.assertTrue(amount["asset"] is get_asset_table(hv)["HIVE"])
+                self.assertEqual(str(amount), "1.000 HIVE")
+                self.assertEqual(amount, amounts[0])
+            self.assertEqual(str(amounts[0] + amounts[1]), "2.000 HIVE")
+            self.assertRaises(AssertionError, amounts[0].__add__, Amount("1.000 HBD", blockchain_instance=hv))
+            price = Price("0.315 HBD/HIVE", blockchain_instance=hv)
+            self.assertEqual(price["base"]["symbol"], "HBD")
+            self.assertEqual(str(amounts[0] * price), "0.315 HBD")
+            self.assertEqual(refresh.call_count, 0)
+        self.assertRaises(AssetDoesNotExistsException, Amount, "1.000 FOO", blockchain_instance=hv)
+        self.assertIsInstance(Amount("1.000 HIVE", blockchain_instance=hv).asset, Asset)
+        self.assertEqual(str(Amount("1.000 STEEM", blockchain_instance=Steem(offline=True))), "1.000 STEEM")
+
+    def test_asset_descriptor(self):
+        descriptor = get_asset_table(self.hv)["HBD"]
+        self.assertIsInstance(descriptor, AssetDescriptor)
+        self.assertEqual(descriptor, {"symbol": "HBD", "asset": "@@000000013", "precision": 3, "id": 0})
+        self.assertEqual(descriptor, "HBD")
+        self.assertRaises(TypeError, descriptor.__setitem__, "precision", 4)
+        self.assertEqual(Amount(1, descriptor, blockchain_instance=self.hv).json(), "1.000 HBD")
+        self.assertEqual(str(Price(2, base=descriptor, quote=get_asset_table(self.hv)["HIVE"],
+                                   blockchain_instance=self.hv)), "2.000000 HBD/HIVE")
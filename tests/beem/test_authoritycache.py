@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import time
+import unittest
+import mock
+from beem import Hive
+from beem.authoritycache import AuthorityCache, get_authority_cache
+from beem.transactionbuilder import TransactionBuilder
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+pub = "STM6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+
+
+class Testcases(unittest.TestCase):
+
+    def test_cache(self):
+        cache = AuthorityCache(ttl=60)
+        self.assertIsNone(cache.get("test", "posting"))
+        cache.set("test", "posting", [wif], 1, 1)
+        cache.set("test", "active", [wif], 1, 1)
+        cache.set("test2", "posting", [wif], 1, 1)
+        self.assertEqual(cache.get("test", "posting")["wifs"], [wif])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.invalidate("test", "posting")
+        self.assertIsNone(cache.get("test", "posting"))
+        self.assertIsNotNone(cache.get("test", "active"))
+        cache.invalidate("test")
+        self.assertIsNone(cache.get("test", "active"))
+        self.assertIsNotNone(cache.get("test2", "posting"))
+        cache.invalidate()
+        self.assertEqual(cache.entries, {})
+
+    def test_ttl(self):
+        cache = AuthorityCache(ttl=60)
+        cache.set("test", "posting", [wif], 1, 1)
+        cache.entries[("test", "posting")]["expires"] = time.time() - 1
+        self.assertIsNone(cache.get("test", "posting"))
+        self.assertEqual(cache.entries, {})
+
+        cache = AuthorityCache(ttl=0)
+        cache.set("test", "posting", [wif], 1, 1)
+        self.assertIsNone(cache.get("test", "posting"))
+
+    def test_append_signer(self):
+        hv = Hive(offline=True, keys=[wif])
+        self.assertIs(get_authority_cache(hv), get_authority_cache(hv))
+        account = {"name": "test", "posting": {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []},
+                   "active": {"weight_threshold": 1, "key_auths": [], "account_auths": []},
+                   "owner": {"weight_threshold": 1, "key_auths": [], "account_auths": []}}
+        with mock.patch.object(hv, "is_connected", return_value=True), \
+                mock.patch("beem.transactionbuilder.Account", return_value=account) as get_account:
+            for i in range(5):
+                tx = TransactionBuilder(blockchain_instance=hv)
+                tx.appendSigner("test", "posting")
+                self.assertEqual(tx.wifs, set([wif]))
+                self.assertIn("test", tx.signing_accounts)
+            self.assertEqual(get_account.call_count, 1)
+            self.assertEqual(get_authority_cache(hv).get("test", "posting")["threshold"], 1)
+
+            # Changing the wallet keys removes the stored keys
+            hv.wallet.removePrivateKeyFromPublicKey(pub)
+            self.assertIsNone(get_authority_cache(hv).get("test", "posting"))
+            hv.wallet.setKeys([wif])
+            TransactionBuilder(blockchain_instance=hv).appendSigner("test", "posting")
+            self.assertEqual(get_account.call_count, 2)
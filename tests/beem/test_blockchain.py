@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 import unittest
+import mock
 from parameterized import parameterized
 from datetime import datetime, timedelta
 import pytz
 import time
 from pprint import pprint
-from beem import Steem
+from beem import Hive, Steem
 from beem.blockchain import Blockchain
 from beem.exceptions import BlockWaitTimeExceeded
 from beem.block import Block
@@ -256,3 +257,14 @@ class Testcases(unittest.TestCase):
         accounts = [rep['name'] for rep in reps_constr]
         for rep in reps_limit:
             self.assertTrue(rep['name'] in accounts)
+
+
+class OfflineTestcases(unittest.TestCase):
+
+    def test_awaitTxConfirmation_limit(self):
+        b = Blockchain(blockchain_instance=Hive(offline=True))
+        transaction = {"trx_id": "00" * 20, "signatures": []}
+        blocks = ({"transactions": [], "transaction_ids": [], "block_num": i} for i in range(100))
+        with mock.patch.object(b, "blocks", return_value=blocks):
+            self.assertRaises(Exception, b.awaitTxConfirmation, transaction, limit=10)
+        self.assertEqual(next(blocks)["block_num"], 11)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import unittest
+import mock
+from datetime import timedelta
+from beem import Hive
+from beem.block import Block
+from beem.broadcastqueue import BroadcastQueue
+from beem.exceptions import MissingKeyError, TransactionExpired
+from beem.utils import formatTimeString
+from beemapi.exceptions import RPCError
+from beembase import operations
+from beembase.signatureverifier import SignatureVerifier
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+pub = "STM6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+head_block_id = "02faf0804e47bce3f1ad6d1f4fcb9d4cb65fd1b4"
+props = {"head_block_number": 50000000, "last_irreversible_block_num": 50000000,
+         "head_block_id": head_block_id, "time": "2020-12-01T12:00:00"}
+
+
+def get_account(name, **kwargs):
+    authority = {"weight_threshold": 1, "key_auths": [[pub, 1]], "account_auths": []}
+    return {"name": name, "posting": authority, "active": authority, "owner": authority}
+
+
+def transfer(receiver, amount="1.000 HIVE"):
+    return operations.Transfer(**{"from": "test", "to": receiver, "amount": amount, "memo": "", "prefix": "STM"})
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.hv = Hive(offline=True, keys=[wif])
+        self.hv.rpc = mock.MagicMock()
+        self.patches = [mock.patch.object(self.hv, "is_connected", return_value=True),
+                        mock.patch.object(self.hv, "get_dynamic_global_properties", return_value=props),
+                        mock.patch.object(self.hv, "get_block_interval", return_value=3),
+                        mock.patch("beem.transactionbuilder.Account", side_effect=get_account)]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def test_pack(self):
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_ops=3, confirm=False)
+        for i in range(4):
+            queue.append(transfer("test%d" % i), "test", "active")
+        queue.append([transfer("test5"), transfer("test6")], "test2", "active")
+        queue.append(transfer("test7"), "test", "posting")
+        transactions = queue.pack(queue.pending)
+        self.assertEqual([(tx["account"], tx["permission"], len(tx["ops"])) for tx in transactions],
+                         [("test", "active", 3), ("test", "active", 1), ("test2", "active", 2), ("test", "posting", 1)])
+
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_size=60, confirm=False)
+        for i in range(4):
+            queue.append(transfer("test%d" % i), "test", "active")
+        self.assertEqual([len(tx["ops"]) for tx in queue.pack(queue.pending)], [2, 2])
+
+    def test_flush(self):
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_ops=2, batch_size=2, confirm=False)
+        futures = [queue.append(transfer("test%d" % i), "test", "active") for i in range(5)]
+        with mock.patch.object(self.hv, "offline", False):
+            futures.append(self.hv.finalizeOp(transfer("test5"), "test", "active", append_to=queue))
+        results = queue.flush()
+        self.assertEqual(len(results), 3)
+        self.assertEqual(queue.pending, [])
+
+        calls = self.hv.rpc.broadcast_transaction.call_args_list
+        self.assertEqual([call[1]["add_to_queue"] for call in calls], [True, False, False])
+        for i, future in enumerate(futures):
+            self.assertEqual(future.result(timeout=0), results[i // 2])
+        verifier = SignatureVerifier(chain=self.hv.chain_params)
+        self.assertEqual(verifier.verify_transactions(results), [set([pub])] * 3)
+        self.assertEqual(len(set([result["trx_id"] for result in results])), 3)
+        # done futures are dropped
+        self.assertEqual(queue.futures, [])
+
+    def test_failed_batch(self):
+        batch = []
+
+        def broadcast(args, api=None, add_to_queue=False):
+            batch.append(args["trx"]["operations"][0]["value"]["to"])
+            if not add_to_queue:
+                receivers = list(batch)
+                del batch[:]
+                if "test1" in receivers:
+                    raise RPCError("Insufficient funds")
+
+        self.hv.rpc.broadcast_transaction.side_effect = broadcast
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_ops=1, batch_size=3, confirm=False)
+        futures = [queue.append(transfer("test%d" % i), "test", "active") for i in range(3)]
+        with mock.patch.object(self.hv, "config", {"use_condenser": False}):
+            queue.flush()
+        self.assertEqual(self.hv.rpc.broadcast_transaction.call_count, 6)
+        self.assertIsNotNone(futures[0].result(timeout=0))
+        self.assertRaises(RPCError, futures[1].result, timeout=0)
+        self.assertIsNotNone(futures[2].result(timeout=0))
+
+    def test_failed_signer(self):
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_ops=1, confirm=False)
+        get_signer = queue.get_signer
+
+        def get_signer_or_fail(account, permission):
+            if account == "test2":
+                raise MissingKeyError("No key for test2")
+            return get_signer(account, permission)
+
+        futures = [queue.append(transfer("test0"), "test", "active"),
+                   queue.append(transfer("test1"), "test2", "active"),
+                   queue.append(transfer("test2"), "test", "posting")]
+        with mock.patch.object(queue, "get_signer", side_effect=get_signer_or_fail):
+            results = queue.flush()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.hv.rpc.broadcast_transaction.call_count, 2)
+        self.assertEqual(futures[0].result(timeout=0), results[0])
+        self.assertRaises(MissingKeyError, futures[1].result, timeout=0)
+        self.assertEqual(futures[2].result(timeout=0), results[1])
+
+    def test_confirm(self):
+        queue = BroadcastQueue(blockchain_instance=self.hv, max_ops=1)
+        futures = [queue.append(transfer("test%d" % i), "test", "active") for i in range(3)]
+        with mock.patch.object(queue, "start_confirmation") as start_confirmation:
+            results = queue.flush()
+            self.assertEqual(start_confirmation.call_count, 1)
+        self.assertEqual(queue.confirm_block_num, 50000000)
+        self.assertFalse(futures[0].done())
+
+        timestamp = formatTimeString(props["time"]) + timedelta(seconds=3)
+        block = Block({"block_id": "%08x" % 50000001 + "00" * 16, "timestamp": timestamp,
+                       "transactions": [results[0]], "transaction_ids": [results[0]["trx_id"]]},
+                      blockchain_instance=self.hv)
+        queue.confirm_block(block)
+        self.assertEqual(futures[0].result(timeout=0)["block_num"], 50000001)
+        self.assertEqual(futures[0].result(timeout=0)["trx_num"], 0)
+
+        # blocks without transaction_ids
+        escrow_release = dict(results[2], operations=[["escrow_release", {
+            "from": "alice", "to": "bob", "who": "charlie", "agent": "charlie", "receiver": "bob",
+            "escrow_id": 72526562, "sbd_amount": "5.000 SBD", "steem_amount": "0.000 STEEM"}]])
+        block = Block({"block_id": "%08x" % 50000002 + "00" * 16, "timestamp": timestamp,
+                       "transactions": [escrow_release, results[2]]},
+                      blockchain_instance=self.hv)
+        queue.confirm_block(block)
+        self.assertEqual(futures[2].result(timeout=0)["block_num"], 50000002)
+        self.assertEqual(futures[2].result(timeout=0)["trx_num"], 1)
+        self.assertFalse(futures[1].done())
+
+        timestamp = formatTimeString(results[1]["expiration"]) + timedelta(seconds=3)
+        block = Block({"block_id": "%08x" % 50000200 + "00" * 16, "timestamp": timestamp,
+                       "transactions": [], "transaction_ids": []},
+                      blockchain_instance=self.hv)
+        queue.confirm_block(block)
+        self.assertRaises(TransactionExpired, futures[1].result, timeout=0)
+        self.assertEqual(queue.unconfirmed, {})
+        self.assertEqual(queue.futures, [])
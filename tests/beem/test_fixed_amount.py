@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import unittest
+from decimal import Decimal
+from beem import Hive, Steem
+from beem.amount import Amount, FixedAmount
+from beem.asset import AssetDescriptor, get_asset_table
+from beem.exceptions import AssetDoesNotExistsException
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.hv = Hive(offline=True)
+
+    def test_init(self):
+        hv = self.hv
+        for amount in ["1.000 HIVE", "-0.5 HBD", "1.23456 HIVE", "12 VESTS", "-1.0000009 VESTS", "1e3 HIVE",
+                       "0.001 HBD", "+2.5 HIVE"]:
+            fixed_amount = FixedAmount(amount, blockchain_instance=hv)
+            expected = Amount(amount, blockchain_instance=hv)
+            self.assertEqual(str(fixed_amount), str(expected))
+            self.assertEqual(int(fixed_amount), int(expected))
+            self.assertEqual(fixed_amount.symbol, expected.symbol)
+            self.assertEqual(fixed_amount.amount_decimal, expected.amount_decimal.quantize(Decimal("1e-%d" % fixed_amount.precision), rounding="ROUND_DOWN"))
+        nai = {"amount": "1234", "precision": 3, "nai": "@@000000013"}
+        fixed_amount = FixedAmount(nai, blockchain_instance=hv)
+        self.assertEqual(str(fixed_amount), "1.234 HBD")
+        self.assertEqual(fixed_amount.json(), nai)
+        self.assertEqual(fixed_amount.json(new_appbase_format=False), ["1234", 3, "@@000000013"])
+        self.assertEqual(FixedAmount(["1234", 3, "@@000000013"], blockchain_instance=hv), fixed_amount)
+        self.assertEqual(FixedAmount(str(fixed_amount), blockchain_instance=hv).json(), nai)
+        self.assertEqual(FixedAmount(Amount("1.234 HBD", blockchain_instance=hv)), fixed_amount)
+        self.assertEqual(FixedAmount(fixed_amount).json(), nai)
+        self.assertEqual(str(FixedAmount(1.3, "HBD", blockchain_instance=hv)), "1.300 HBD")
+        self.assertEqual(str(FixedAmount(2, "@@000000037", blockchain_instance=hv)), "2.000000 VESTS")
+        self.assertEqual(int(FixedAmount.from_satoshi(5, fixed_amount.asset)), 5)
+        self.assertEqual(fixed_amount.to_amount(hv), Amount("1.234 HBD", blockchain_instance=hv))
+        self.assertIs(fixed_amount.to_amount(hv)["asset"], fixed_amount.asset)
+        self.assertEqual(str(FixedAmount(0, "HBD", blockchain_instance=hv).to_amount(hv)), "0.000 HBD")
+        self.assertRaises(AssetDoesNotExistsException, FixedAmount, "1.000 FOO", blockchain_instance=hv)
+        self.assertRaises(ValueError, FixedAmount, 1.0, blockchain_instance=hv)
+
+    def test_asset_table(self):
+        table = get_asset_table(self.hv)
+        self.assertTrue(get_asset_table(self.hv) is table)
+        self.assertTrue(table["HIVE"] is table["@@000000021"])
+        self.assertTrue(table[2] is table["VESTS"])
+        self.assertIsInstance(table["HBD"], AssetDescriptor)
+        self.assertEqual(table["HBD"]["precision"], 3)
+        self.assertEqual(table["HBD"], {"symbol": "HBD", "asset": "@@000000013", "precision": 3})
+        # the same NAI has a different symbol on each chain
+        stm = Steem(offline=True)
+        self.assertEqual(str(FixedAmount({"amount": "1000", "precision": 3, "nai": "@@000000021"},
+                                         blockchain_instance=stm)), "1.000 STEEM")
+        self.assertEqual(str(FixedAmount({"amount": "1000", "precision": 3, "nai": "@@000000021"},
+                                         blockchain_instance=self.hv)), "1.000 HIVE")
+
+    def test_arithmetic(self):
+        hv = self.hv
+        a = FixedAmount("1.001 HIVE", blockchain_instance=hv)
+        b = FixedAmount("0.500 HIVE", blockchain_instance=hv)
+        self.assertEqual(str(a + b), "1.501 HIVE")
+        self.assertEqual(str(a - b), "0.501 HIVE")
+        self.assertEqual(str(b - a), "-0.501 HIVE")
+        self.assertEqual(str(a + 1), "2.001 HIVE")
+        self.assertEqual(str(a * 2), "2.002 HIVE")
+        self.assertEqual(str(3 * a), "3.003 HIVE")
+        self.assertEqual(str(a * 1.5), "1.501 HIVE")
+        self.assertEqual(str(a / 3), "0.333 HIVE")
+        self.assertEqual(str(-a / 3), "-0.333 HIVE")
+        self.assertEqual(str(a / 0.5), "2.002 HIVE")
+        self.assertEqual(a / b, 2.002)
+        self.assertEqual(str(a % b), "0.001 HIVE")
+        self.assertEqual(str(abs(-a)), "1.001 HIVE")
+        self.assertEqual(str(sum([b] * 1000)), "500.000 HIVE")
+        self.assertTrue(b < a)
+        self.assertTrue(b <= a)
+        self.assertTrue(a > b)
+        self.assertTrue(a >= 1)
+        self.assertTrue(a != b)
+        self.assertTrue(a == Amount("1.001 HIVE", blockchain_instance=hv))
+        self.assertTrue(a == 1.001)
+        self.assertFalse(FixedAmount("0.000 HIVE", blockchain_instance=hv))
+        self.assertEqual(len(set([a, a.copy(), b])), 2)
+        hbd = FixedAmount("1.000 HBD", blockchain_instance=hv)
+        self.assertRaises(AssertionError, a.__add__, hbd)
+        self.assertRaises(AssertionError, a.__lt__, hbd)
+        self.assertRaises(AssertionError, a.__add__, Amount("1.000 HBD", blockchain_instance=hv))
+        self.assertRaises(TypeError, a.__mul__, b)
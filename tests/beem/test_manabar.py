@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import unittest
+import mock
+from datetime import datetime, timedelta
+from beem import Hive
+from beem.account import Account
+from beem.manabar import ManabarTable
+from beemgraphenebase.chains import known_chains
+
+NOW = datetime(2020, 1, 3, 12, 0, 0, 123456)
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def utcnow(cls):
+        return NOW
+
+
+class FakeChainRPC(object):
+    url = "https://api.fake.node"
+
+    def get_use_appbase(self):
+        return True
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_config(self, api=None):
+        return {"HIVE_VOTE_DUST_THRESHOLD": 50000000}
+
+    def get_network(self, props=None):
+        return known_chains["HIVE"]
+
+    def get_dynamic_global_properties(self, api=None):
+        return {"vote_power_reserve_rate": 10}
+
+    def get_witness_schedule(self, api=None):
+        return {"median_props": {"account_creation_fee": "3.000 HIVE"}}
+
+    def get_reward_funds(self, api=None):
+        return {"funds": [{"reward_balance": "800000.000 HIVE", "recent_claims": "500000000000000000"}]}
+
+    def get_feed_history(self, api=None):
+        return {"current_median_history": {"base": "0.250 HBD", "quote": "1.000 HIVE"}}
+
+
+def account_json(name, vests, current_mana, last_update_time, down_mana=None, delegated="0.000000 VESTS",
+                 received="0.000000 VESTS", next_vesting_withdrawal="1969-12-31T23:59:59"):
+    account = {"name": name, "vesting_shares": vests, "delegated_vesting_shares": delegated,
+               "received_vesting_shares": received, "vesting_withdraw_rate": "1000.000000 VESTS",
+               "to_withdraw": 13000000000, "withdrawn": 1000000000,
+               "next_vesting_withdrawal": next_vesting_withdrawal,
+               "voting_manabar": {"current_mana": current_mana, "last_update_time": last_update_time}}
+    if down_mana is not None:
+        account["downvote_manabar"] = {"current_mana": down_mana, "last_update_time": last_update_time}
+    return account
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.stm = Hive(offline=True)
+        self.stm.rpc = FakeChainRPC()
+        self.patcher = mock.patch.object(self.stm, "get_hive_per_mvest", return_value=583.1234567)
+        self.patcher.start()
+        self.json_accounts = [
+            account_json("test1", "1234567.891011 VESTS", 500000000000, 1577836800, down_mana=100000000000),
+            account_json("test2", "20.000000 VESTS", 1000000, 1578000000, down_mana=0),
+            account_json("test3", "0.000000 VESTS", 0, 1577000000),
+            account_json("test4", "300000000.000001 VESTS", 100000000000000, 1578050000, down_mana=10000,
+                         delegated="1000.123456 VESTS"),
+            account_json("test5", "99999.000000 VESTS", 90000000000, 1577990000, down_mana=5000000000,
+                         received="15000.500000 VESTS", next_vesting_withdrawal="2020-01-05T00:00:00"),
+            account_json("test6", "88000000000.000000 VESTS", 80000000000000000, 1578050000, down_mana=10000000000000),
+            account_json("test7", "3.000000 VESTS", 10, 1578052000, down_mana=1),
+        ]
+        self.accounts = [Account(account, blockchain_instance=self.stm) for account in self.json_accounts]
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_manabar(self):
+        with mock.patch("beem.account.datetime", FrozenDatetime):
+            for accounts in [self.accounts, self.json_accounts]:
+                table = ManabarTable(accounts, blockchain_instance=self.stm)
+                self.assertEqual(len(table), 7)
+                manabar = table.get_manabar(now=NOW)
+                down_manabar = table.get_downvote_manabar(now=NOW)
+                for i, account in enumerate(self.accounts):
+                    expected = account.get_manabar()
+                    for key in expected:
+                        self.assertEqual(manabar[key][i], expected[key])
+                    expected = account.get_downvote_manabar()
+                    self.assertEqual(down_manabar["has_downvote_manabar"][i], expected is not None)
+                    if expected is None:
+                        continue
+                    for key in expected:
+                        self.assertEqual(down_manabar[key][i], expected[key])
+
+    def test_voting_power(self):
+        legacy_account = Account({"name": "test8", "vesting_shares": "10.000000 VESTS", "voting_power": 9000,
+                                  "last_vote_time": "2020-01-03T10:00:00"}, blockchain_instance=self.stm)
+        accounts = self.accounts + [legacy_account]
+        with mock.patch("beem.account.datetime", FrozenDatetime):
+            table = ManabarTable(accounts, blockchain_instance=self.stm)
+            vp = table.get_voting_power(now=NOW)
+            vp_without_regeneration = table.get_voting_power(now=NOW, with_regeneration=False)
+            down_vp = table.get_downvoting_power(now=NOW)
+            recharge_seconds = table.get_recharge_seconds(voting_power_goal=98, now=NOW)
+            recharge = table.get_recharge_timedelta(voting_power_goal=98, now=NOW)
+            for i, account in enumerate(accounts):
+                self.assertEqual(vp[i], account.get_voting_power())
+                self.assertEqual(vp_without_regeneration[i], account.get_voting_power(with_regeneration=False))
+                if "voting_manabar" in account:
+                    self.assertEqual(down_vp[i], account.get_downvoting_power())
+                self.assertEqual(recharge[i], account.get_recharge_timedelta(voting_power_goal=98))
+                if recharge[i] == 0:
+                    self.assertEqual(recharge_seconds[i], 0)
+                else:
+                    self.assertEqual(timedelta(seconds=recharge_seconds[i]), recharge[i])
+
+    def test_voting_value(self):
+        with mock.patch("beem.account.datetime", FrozenDatetime), \
+                mock.patch.object(self.stm, "get_dust_threshold", return_value=50000000):
+            table = ManabarTable(self.accounts, blockchain_instance=self.stm)
+            for voting_weight, post_rshares, not_broadcasted_vote in [(100, 0, True), (-50, 0, True),
+                                                                       (1, 10 ** 12, False), (33.3, 10 ** 15, True)]:
+                vote_value = table.get_voting_value(voting_weight=voting_weight, post_rshares=post_rshares,
+                                                    not_broadcasted_vote=not_broadcasted_vote, now=NOW)
+                for i, account in enumerate(self.accounts):
+                    expected = account.get_voting_value(voting_weight=voting_weight, post_rshares=post_rshares,
+                                                        not_broadcasted_vote=not_broadcasted_vote)
+                    self.assertEqual(vote_value[i], expected)
+                    self.assertEqual(table.get_token_power()[i], account.get_token_power())
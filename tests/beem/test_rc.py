@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import unittest
+import mock
+from binascii import hexlify
+from beem import Hive
+from beem.rc import RC
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beemgraphenebase.py23 import py23_bytes
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+resource_types = ["resource_history_bytes", "resource_new_accounts", "resource_market_bytes",
+                  "resource_state_bytes", "resource_execution_time"]
+params = {t: {"resource_dynamics_params": {"resource_unit": 1},
+              "price_curve_params": {"coeff_a": "1000000", "coeff_b": "100000", "shift": 10}}
+          for t in resource_types}
+pools = {t: {"pool": "100000000"} for t in resource_types}
+vote = {"voter": "foobara", "author": "foobarc", "permlink": "foobard", "weight": 1000}
+custom_json = {"json": ["reblog", {"account": "xeroc", "author": "chainsquad", "permlink": "streemian"}],
+               "required_auths": [], "required_posting_auths": ["xeroc"], "id": "follow"}
+transfer = {"from": "foo", "to": "baar", "amount": "111.110 HIVE", "memo": "Fooo", "prefix": "STM"}
+comment = {"permlink": "test", "author": "holger80", "body": "test", "parent_permlink": "hive",
+           "parent_author": "", "title": "test", "json_metadata": {"foo": "bar"}}
+
+
+class Testcases(unittest.TestCase):
+
+    def test_tx_size(self):
+        rc = RC(blockchain_instance=Hive(offline=True))
+        ops = [operations.Vote(**vote), operations.Custom_json(**custom_json), operations.Transfer(**transfer)]
+        for op in ops:
+            tx = Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213,
+                                    expiration="2016-04-06T08:29:27", operations=[Operation(op)])
+            tx = tx.sign([wif], chain="STEEM")
+            self.assertEqual(rc.get_tx_size(op), len(hexlify(py23_bytes(tx))))
+
+    def test_estimate(self):
+        rc = RC(blockchain_instance=Hive(offline=True), ttl=None)
+        rc.set_rc_params(pools, params, 1e9)
+        ops = [operations.Vote(**vote), operations.Custom_json(**custom_json), operations.Transfer(**transfer),
+               ["comment", comment]]
+        self.assertEqual(rc.estimate_operations(ops),
+                         [rc.vote_dict(vote), rc.custom_json_dict(custom_json), rc.transfer_dict(transfer),
+                          rc.comment_dict(comment)])
+        self.assertGreater(rc.estimate_transaction(ops[:2]), rc.estimate_operations(ops[:1])[0])
+
+    def test_rc_params_ttl(self):
+        hv = Hive(offline=True)
+        with mock.patch.object(hv, "get_resource_pool", return_value=pools) as get_pool, \
+                mock.patch.object(hv, "get_resource_params", return_value=params), \
+                mock.patch.object(hv, "get_rc_regen", return_value=1e9):
+            rc = RC(blockchain_instance=hv, ttl=60)
+            rc.estimate_operations([operations.Vote(**vote)] * 10)
+            rc.vote_dict(vote)
+            self.assertEqual(get_pool.call_count, 1)
+            rc.rc_params_updated -= 61
+            rc.vote_dict(vote)
+            self.assertEqual(get_pool.call_count, 2)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import struct
+import threading
+import unittest
+import mock
+from binascii import unhexlify
+from datetime import datetime, timedelta
+from beem import Hive
+from beem.refblock import RefBlockProvider, get_ref_block_provider
+from beem.transactionbuilder import TransactionBuilder
+
+head_block_id = "02faf0804e47bce3f1ad6d1f4fcb9d4cb65fd1b4"
+
+
+class FakeInstance(object):
+    def __init__(self):
+        self.calls = 0
+        self.head_block_number = 50000000
+
+    def get_block_interval(self):
+        return 3
+
+    def get_dynamic_global_properties(self, use_stored_data=True):
+        self.calls += 1
+        return {"head_block_number": self.head_block_number, "last_irreversible_block_num": self.head_block_number,
+                "head_block_id": head_block_id}
+
+
+class Testcases(unittest.TestCase):
+
+    def test_get_block_params(self):
+        instance = FakeInstance()
+        provider = RefBlockProvider(instance)
+        expected = (50000000 & 0xFFFF, struct.unpack_from("<I", unhexlify(head_block_id), 4)[0])
+        self.assertEqual(provider.get_block_params(), expected)
+        self.assertEqual(provider.get_block_params(), expected)
+        self.assertEqual(instance.calls, 1)
+        self.assertEqual(provider.get_block_params(use_head_block=True), expected)
+        self.assertEqual(instance.calls, 2)
+
+        # Expired values are fetched again
+        provider.params[False] = provider.params[False][:3] + (provider.params[False][3] - 4, )
+        provider.get_block_params()
+        self.assertEqual(instance.calls, 3)
+
+    def test_threads(self):
+        instance = FakeInstance()
+        provider = RefBlockProvider(instance, max_age=60)
+        results = []
+
+        def build():
+            for i in range(20):
+                results.append(provider.get_block_params())
+
+        threads = [threading.Thread(target=build) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), 160)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(instance.calls, 1)
+
+    def test_update(self):
+        instance = FakeInstance()
+        provider = RefBlockProvider(instance, max_age=60)
+        block_id = "%08x" % 50000123 + "11223344" + "00" * 12
+        provider.update({"block_id": block_id, "timestamp": datetime.utcnow()})
+        self.assertEqual(provider.get_block_params(), (50000123 & 0xFFFF, 0x44332211))
+        self.assertEqual(instance.calls, 0)
+
+        # Old and reversible blocks are not used for the irreversible parameters
+        provider.update({"block_id": "%08x" % 50000124 + "00" * 16, "timestamp": datetime.utcnow() - timedelta(hours=1)})
+        provider.update({"block_id": "%08x" % 50000125 + "00" * 16, "timestamp": datetime.utcnow()}, irreversible=False)
+        self.assertEqual(provider.get_block_params(), (50000123 & 0xFFFF, 0x44332211))
+        self.assertEqual(provider.get_block_params(use_head_block=True), (50000125 & 0xFFFF, 0))
+        self.assertEqual(instance.calls, 0)
+
+    def test_transactionbuilder(self):
+        hv = Hive(offline=True)
+        self.assertIs(get_ref_block_provider(hv), get_ref_block_provider(hv))
+        props = {"head_block_number": 50000000, "last_irreversible_block_num": 50000000,
+                 "head_block_id": head_block_id}
+        with mock.patch.object(hv, "get_dynamic_global_properties", return_value=props) as get_props:
+            params = [TransactionBuilder(blockchain_instance=hv).get_block_params() for i in range(20)]
+            self.assertEqual(get_props.call_count, 1)
+            self.assertEqual(len(set(params)), 1)
+            TransactionBuilder(blockchain_instance=hv).get_block_params(use_cache=False)
+            self.assertEqual(get_props.call_count, 2)
@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import shutil
+import tempfile
+import mock
+import time
+from datetime import datetime, timedelta
+from beem import Hive
+from beem.snapshot import AccountSnapshot, ArrayAccountSnapshot, AccountSnapshotBatch, NodeRateLimiter
+from beem.utils import formatTimeString, parse_time
+from beemgraphenebase.chains import known_chains
+
+
+class FakeChainRPC(object):
+    url = "https://api.fake.node"
+
+    def get_use_appbase(self):
+        return True
+
+    def set_next_node_on_empty_reply(self, next_node_on_empty_reply=True):
+        pass
+
+    def get_config(self, api=None):
+        return {}
+
+    def get_network(self, props=None):
+        return known_chains["HIVE"]
+
+    def get_dynamic_global_properties(self, api=None):
+        return {"vote_power_reserve_rate": 10}
+
+
+class FakeHistoryRPC(FakeChainRPC):
+    def __init__(self, history):
+        self.calls = []
+        self.history = []
+        for op in history:
+            data = {key: value for key, value in op.items() if key not in ["type", "index", "block", "timestamp"]}
+            self.history.append([op["index"], {"trx_id": "%040x" % op["index"], "block": op["block"],
+                                               "trx_in_block": 0, "op_in_trx": 0, "virtual_op": 0,
+                                               "timestamp": op["timestamp"], "op": [op["type"], data]}])
+
+    def get_account_history(self, params, api=None):
+        self.calls.append(params)
+        start = params["start"]
+        if start < 0 or start >= len(self.history):
+            start = len(self.history) - 1
+        return {"history": self.history[max(0, start - params["limit"]):start + 1]}
+
+
+class FakeBatchRPC(FakeChainRPC):
+    def __init__(self, histories):
+        self.calls = []
+        self.histories = {name: FakeHistoryRPC(history).history for name, history in histories.items()}
+
+    def get_account_history(self, params, api=None):
+        self.calls.append(params)
+        history = self.histories[params["account"]]
+        start = params["start"]
+        if start < 0 or start >= len(history):
+            start = len(history) - 1
+        return {"history": history[max(0, start - params["limit"]):start + 1]}
+
+
+ACCOUNT = {"name": "beembot", "vesting_shares": "1000.000000 VESTS", "delegated_vesting_shares": "0.000000 VESTS",
+           "received_vesting_shares": "0.000000 VESTS", "next_vesting_withdrawal": "1969-12-31T23:59:59",
+           "voting_manabar": {"current_mana": 500000000, "last_update_time": 1577836800},
+           "downvote_manabar": {"current_mana": 250000000, "last_update_time": 1577836800}}
+
+
+def get_history():
+    start = datetime(2019, 8, 1, 0, 0, 0)
+    ops = [
+        {"type": "account_create_with_delegation", "fee": "3.000 HIVE", "delegation": "30000.000000 VESTS",
+         "creator": "creator", "new_account_name": "beembot"},
+        {"type": "transfer_to_vesting", "from": "beembot", "to": "beembot", "amount": "10.000 HIVE"},
+        {"type": "delegate_vesting_shares", "delegator": "beembot", "delegatee": "test", "vesting_shares": "100.000000 VESTS"},
+        {"type": "delegate_vesting_shares", "delegator": "whale", "delegatee": "beembot", "vesting_shares": "5000.123456 VESTS"},
+        {"type": "producer_reward", "producer": "beembot", "vesting_shares": "123.456789 VESTS"},
+        {"type": "delegate_vesting_shares", "delegator": "beembot", "delegatee": "test", "vesting_shares": "50.000000 VESTS"},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": 10000},
+        {"type": "delegate_vesting_shares", "delegator": "beembot", "delegatee": "test", "vesting_shares": "0.000000 VESTS"},
+        {"type": "return_vesting_delegation", "account": "beembot", "vesting_shares": "50.000000 VESTS"},
+        {"type": "delegate_vesting_shares", "delegator": "creator", "delegatee": "beembot", "vesting_shares": "0.000000 VESTS"},
+        {"type": "curation_reward", "curator": "beembot", "reward": "1.000001 VESTS", "comment_author": "test",
+         "comment_permlink": "p"},
+        {"type": "claim_reward_balance", "account": "beembot", "reward_steem": "1.000 HIVE",
+         "reward_sbd": "2.000 HBD", "reward_vests": "3.000000 VESTS"},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": -5000},
+        {"type": "fill_vesting_withdraw", "from_account": "beembot", "to_account": "beembot",
+         "withdrawn": "7.500000 VESTS", "deposited": "0.004 HIVE"},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": 2000},
+        {"type": "comment", "author": "beembot", "permlink": "p"},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": -10000},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": -10000},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": -10000},
+        {"type": "vote", "voter": "beembot", "author": "test", "permlink": "p", "weight": 10000},
+    ]
+    history = []
+    for i, op in enumerate(ops):
+        op = dict(op)
+        op["index"] = i
+        op["block"] = 1000 + i
+        # ops are not sorted by timestamp
+        op["timestamp"] = formatTimeString(start + timedelta(days=i * 2, seconds=(i * 7919) % 600 if i != 4 else 0))
+        history.append(op)
+    history[3], history[4] = history[4], history[3]
+    return history
+
+
+def get_curation_history():
+    start = datetime(2020, 3, 1, 0, 0, 0)
+    ops = [
+        {"type": "account_create_with_delegation", "fee": "3.000 HIVE", "delegation": "30000.000000 VESTS",
+         "creator": "creator", "new_account_name": "beembot"},
+        {"type": "transfer_to_vesting", "from": "beembot", "to": "beembot", "amount": "100.000 HIVE"},
+    ]
+    for i in range(120):
+        if i == 60:
+            ops.append({"type": "delegate_vesting_shares", "delegator": "whale", "delegatee": "beembot",
+                        "vesting_shares": "200000.000000 VESTS"})
+        ops.append({"type": "curation_reward", "curator": "beembot", "reward": "%d.%06d VESTS" % (i % 7 + 1, i * 7919),
+                    "comment_author": "test", "comment_permlink": "p%d" % i})
+    history = []
+    for i, op in enumerate(ops):
+        op["index"] = i
+        op["block"] = 1000 + i
+        op["timestamp"] = formatTimeString(start + timedelta(hours=i * 11, seconds=i * 13))
+        history.append(op)
+    return history
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.stm = Hive(offline=True)
+        self.stm.rpc = FakeChainRPC()
+
+    def assert_snapshots_equal(self, snapshot, array_snapshot):
+        self.assertEqual(len(array_snapshot.timestamps), len(snapshot.timestamps))
+        self.assertEqual(list(array_snapshot.timestamps), list(snapshot.timestamps))
+        # the legacy snapshot adds converted float vests without rounding them to satoshi
+        for own_vests, array_own_vests in zip(snapshot.own_vests, array_snapshot.own_vests):
+            self.assertAlmostEqual(float(own_vests), float(array_own_vests), places=6)
+        self.assertEqual(list(array_snapshot.own_steem), list(snapshot.own_steem))
+        self.assertEqual(list(array_snapshot.own_sbd), list(snapshot.own_sbd))
+        self.assertEqual(list(array_snapshot.delegated_vests_in), list(snapshot.delegated_vests_in))
+        self.assertEqual(list(array_snapshot.delegated_vests_out), list(snapshot.delegated_vests_out))
+        self.assertEqual(array_snapshot.timestamps[1:3], snapshot.timestamps[1:3])
+        self.assertAlmostEqual(float(array_snapshot.own_vests[-1]), float(snapshot.own_vests[-1]), places=6)
+
+    def test_build(self):
+        history = get_history()
+        snapshot = AccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        snapshot.build(enable_rewards=True, enable_out_votes=True)
+        array_snapshot = ArrayAccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        array_snapshot.build(enable_rewards=True, enable_out_votes=True)
+        self.assert_snapshots_equal(snapshot, array_snapshot)
+        self.assertEqual(array_snapshot.ops_statistics, snapshot.ops_statistics)
+        self.assertEqual(list(array_snapshot.reward_timestamps), snapshot.reward_timestamps)
+        self.assertEqual(list(array_snapshot.curation_rewards), snapshot.curation_rewards)
+        self.assertEqual(list(array_snapshot.out_vote_timestamp), snapshot.out_vote_timestamp)
+        self.assertEqual(list(array_snapshot.out_vote_weight), snapshot.out_vote_weight)
+        fee_vests = self.stm.hp_to_vests(3., timestamp=parse_time(history[0]["timestamp"])) * 1e6
+        power_up_vests = self.stm.hp_to_vests(10., timestamp=parse_time(history[1]["timestamp"])) * 1e6
+        self.assertEqual(array_snapshot.get_series()["own_vests"][-1],
+                         round(fee_vests) + round(power_up_vests) + 123456789 + 3000000 - 7500000)
+        self.assertEqual(array_snapshot.get_series()["own_steem"][-1], -10000 + 1000)
+
+        for ts in [datetime(2019, 8, 1), datetime(2019, 8, 5, 12), array_snapshot.timestamps[6],
+                   array_snapshot.timestamps[6] + timedelta(microseconds=1), datetime(2030, 1, 1)]:
+            data = snapshot.get_data(ts)
+            array_data = array_snapshot.get_data(ts)
+            self.assertEqual(sorted(data.keys()), sorted(array_data.keys()))
+            for key in data:
+                if key in ["sp_own", "sp_eff"]:
+                    self.assertAlmostEqual(data[key], array_data[key])
+                elif key == "vests":
+                    self.assertAlmostEqual(float(data[key]), float(array_data[key]), places=6)
+                else:
+                    self.assertEqual(data[key], array_data[key])
+
+    def test_build_arrays(self):
+        history = get_history()
+        snapshot = AccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        snapshot.build(enable_out_votes=True)
+        snapshot.build_sp_arrays()
+        snapshot.build_vp_arrays()
+        array_snapshot = ArrayAccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        array_snapshot.build(enable_out_votes=True)
+        array_snapshot.build_sp_arrays()
+        array_snapshot.build_vp_arrays()
+        self.assertEqual(len(array_snapshot.own_sp), len(snapshot.own_sp))
+        for own_sp, array_own_sp in zip(snapshot.own_sp, array_snapshot.own_sp):
+            self.assertAlmostEqual(own_sp, array_own_sp, places=9)
+        for eff_sp, array_eff_sp in zip(snapshot.eff_sp, array_snapshot.eff_sp):
+            self.assertAlmostEqual(eff_sp, array_eff_sp, places=9)
+        self.assertEqual(array_snapshot.vp[:-1], snapshot.vp[:-1])
+        self.assertEqual(array_snapshot.vp_timestamp[:-1], snapshot.vp_timestamp[:-1])
+        self.assertEqual(array_snapshot.downvote_vp[:-1], snapshot.downvote_vp[:-1])
+        self.assertEqual(array_snapshot.downvote_vp_timestamp[:-1], snapshot.downvote_vp_timestamp[:-1])
+
+    def test_build_incremental(self):
+        history = sorted(get_history(), key=lambda h: h["timestamp"])
+        snapshot = AccountSnapshot(ACCOUNT, account_history=history[:8], blockchain_instance=self.stm)
+        snapshot.build()
+        snapshot.extend(history[8:])
+        snapshot.build()
+        array_snapshot = ArrayAccountSnapshot(ACCOUNT, account_history=history[:8], blockchain_instance=self.stm)
+        array_snapshot.build()
+        array_snapshot.extend(history[8:])
+        array_snapshot.build()
+        self.assert_snapshots_equal(snapshot, array_snapshot)
+
+    def test_save_load_update(self):
+        history = sorted(get_history(), key=lambda h: h["timestamp"])
+        for i, op in enumerate(history):
+            op["index"] = i
+        rpc = FakeHistoryRPC(history[:9])
+        self.stm.rpc = rpc
+        data_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(data_dir, "beembot.npz")
+            array_snapshot = ArrayAccountSnapshot(ACCOUNT, blockchain_instance=self.stm)
+            array_snapshot.get_account_history()
+            array_snapshot.build(enable_out_votes=True)
+            array_snapshot.build_sp_arrays()
+            self.assertEqual(array_snapshot.last_op_index, 8)
+            array_snapshot.save(filename)
+
+            rpc.history = FakeHistoryRPC(history).history
+            rpc.calls = []
+            loaded_snapshot = ArrayAccountSnapshot(ACCOUNT, blockchain_instance=self.stm)
+            loaded_snapshot.load(filename)
+            self.assertEqual(loaded_snapshot.last_op_index, 8)
+            self.assertEqual(list(loaded_snapshot.timestamps), list(array_snapshot.timestamps))
+            self.assertEqual(loaded_snapshot.update(), len(history) - 9)
+            for params in rpc.calls:
+                self.assertTrue(params["start"] < 0 or params["start"] >= 9)
+            self.assertEqual(loaded_snapshot.update(), 0)
+            self.assertEqual(loaded_snapshot.last_op_index, len(history) - 1)
+            loaded_snapshot.build_sp_arrays()
+            loaded_snapshot.build_vp_arrays()
+
+            snapshot = ArrayAccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+            snapshot.build(enable_out_votes=True)
+            snapshot.build_sp_arrays()
+            snapshot.build_vp_arrays()
+            self.assert_snapshots_equal(snapshot, loaded_snapshot)
+            self.assertEqual(list(loaded_snapshot.out_vote_timestamp), list(snapshot.out_vote_timestamp))
+            self.assertEqual(list(loaded_snapshot.own_sp), list(snapshot.own_sp))
+            self.assertEqual(loaded_snapshot.vp[:-1], snapshot.vp[:-1])
+            self.assertEqual(loaded_snapshot.ops_statistics, snapshot.ops_statistics)
+
+            other_snapshot = ArrayAccountSnapshot({"name": "test"}, blockchain_instance=self.stm)
+            self.assertRaises(ValueError, other_snapshot.load, filename)
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_save_load_update_list(self):
+        history = sorted(get_history(), key=lambda h: h["timestamp"])
+        for i, op in enumerate(history):
+            op["index"] = i
+        rpc = FakeHistoryRPC(history[:9])
+        self.stm.rpc = rpc
+        data_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(data_dir, "beembot.json")
+            snapshot = AccountSnapshot(ACCOUNT, blockchain_instance=self.stm)
+            snapshot.get_account_history()
+            snapshot.build(enable_out_votes=True, enable_rewards=True)
+            self.assertEqual(snapshot.last_op_index, 8)
+            snapshot.save(filename)
+
+            rpc.history = FakeHistoryRPC(history).history
+            loaded_snapshot = AccountSnapshot(ACCOUNT, blockchain_instance=self.stm)
+            loaded_snapshot.load(filename)
+            self.assertEqual(loaded_snapshot.last_op_index, 8)
+            self.assertEqual(loaded_snapshot.timestamps, snapshot.timestamps)
+            self.assertEqual(loaded_snapshot.own_vests, snapshot.own_vests)
+            self.assertEqual(loaded_snapshot.update(), len(history) - 9)
+            self.assertEqual(loaded_snapshot.update(), 0)
+
+            snapshot = AccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+            snapshot.build(enable_out_votes=True, enable_rewards=True)
+            for key in AccountSnapshot.state_keys:
+                self.assertEqual(getattr(loaded_snapshot, key), getattr(snapshot, key))
+            self.assertEqual(loaded_snapshot.ops_statistics, snapshot.ops_statistics)
+
+            other_snapshot = AccountSnapshot({"name": "test"}, blockchain_instance=self.stm)
+            self.assertRaises(ValueError, other_snapshot.load, filename)
+        finally:
+            shutil.rmtree(data_dir)
+
+    def test_curation_per_1000_sp(self):
+        history = get_curation_history()
+        snapshot = AccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        snapshot.build(enable_rewards=True)
+        array_snapshot = ArrayAccountSnapshot(ACCOUNT, account_history=history, blockchain_instance=self.stm)
+        array_snapshot.build(enable_rewards=True)
+
+        rewards = []
+        for ts, vests in zip(snapshot.reward_timestamps, snapshot.curation_rewards):
+            sp_eff = snapshot.get_data(ts)["sp_eff"]
+            rewards.append((ts, self.stm.vests_to_hp(vests, timestamp=ts) / sp_eff * 1000))
+        window_days = [1, 7, 30]
+        curation = snapshot.get_curation_per_1000_SP(window_days=window_days)
+        array_curation = array_snapshot.get_curation_per_1000_SP(window_days=window_days)
+        for days in window_days:
+            end_dates, values = curation[days]
+            self.assertEqual(end_dates[-1], snapshot.reward_timestamps[-1])
+            self.assertEqual(array_curation[days][0], end_dates)
+            for end_date, value, array_value in zip(end_dates, values, array_curation[days][1]):
+                expected = sum([v for ts, v in rewards if end_date - timedelta(days=days) < ts <= end_date]) / days * 7
+                self.assertAlmostEqual(value, expected)
+                self.assertAlmostEqual(array_value, expected)
+
+        end_dates, values = array_snapshot.get_curation_per_1000_SP(window_days=[7], step_days=1)[7]
+        self.assertEqual(len(end_dates), (rewards[-1][0] - rewards[0][0]).days + 1)
+        self.assertEqual(end_dates[1] - end_dates[0], timedelta(days=1))
+
+        snapshot.build_curation_arrays(sum_days=7)
+        array_snapshot.build_curation_arrays(sum_days=7)
+        self.assertEqual(array_snapshot.curation_per_1000_SP_timestamp, snapshot.curation_per_1000_SP_timestamp)
+        self.assertEqual(snapshot.curation_per_1000_SP_timestamp[-1], snapshot.reward_timestamps[-1])
+        for value, array_value in zip(snapshot.curation_per_1000_SP, array_snapshot.curation_per_1000_SP):
+            self.assertAlmostEqual(value, array_value)
+        # all rewards after the first window end are counted once
+        first_end_date = snapshot.curation_per_1000_SP_timestamp[0]
+        self.assertAlmostEqual(sum(snapshot.curation_per_1000_SP[1:]),
+                               sum([v for ts, v in rewards if ts > first_end_date]))
+        self.assertRaises(ValueError, array_snapshot.build_curation_arrays, sum_days=0)
+
+    def test_snapshot_batch(self):
+        names = ["beembot", "test1", "test2", "test3"]
+        histories = {}
+        for i, name in enumerate(names):
+            history = sorted(get_history(), key=lambda h: h["timestamp"])[:12 + i * 2]
+            for index, op in enumerate(history):
+                op["index"] = index
+            histories[name] = history
+        self.stm.rpc = FakeBatchRPC(histories)
+        accounts = [dict(ACCOUNT, name=name) for name in names]
+        with mock.patch("beem.snapshot.get_thread_instances", lambda stm, n: [stm] * n):
+            for process_num in [1, 2]:
+                batch = AccountSnapshotBatch(accounts, blockchain_instance=self.stm, snapshot_class=ArrayAccountSnapshot,
+                                             thread_num=2, process_num=process_num)
+                snapshots = batch.run(use_block_num=False, batch_size=5, build_kwargs={"enable_out_votes": True},
+                                      build_arrays=True)
+                self.assertEqual(sorted(snapshots.keys()), sorted(names))
+                for name in names:
+                    snapshot = ArrayAccountSnapshot(dict(ACCOUNT, name=name), account_history=histories[name],
+                                                    blockchain_instance=self.stm)
+                    snapshot.build(enable_out_votes=True)
+                    snapshot.build_sp_arrays()
+                    snapshot.build_vp_arrays()
+                    self.assertTrue(snapshots[name].blockchain is self.stm)
+                    self.assertEqual(len(snapshots[name]), len(histories[name]))
+                    self.assert_snapshots_equal(snapshot, snapshots[name])
+                    self.assertEqual(list(snapshots[name].own_sp), list(snapshot.own_sp))
+                    self.assertEqual(snapshots[name].vp[:-1], snapshot.vp[:-1])
+            streamed = list(batch.stream(use_block_num=False))
+            self.assertEqual(sorted([s.account["name"] for s in streamed]), sorted(names))
+
+        for build_kwargs in [{"enable_in_votes": True}, {"only_ops": ["vote"]}]:
+            batch = AccountSnapshotBatch(accounts, blockchain_instance=self.stm, process_num=2)
+            self.assertRaises(ValueError, batch.run, build_kwargs=build_kwargs)
+
+        batch = AccountSnapshotBatch(accounts, blockchain_instance=self.stm, block_time_index={})
+        with mock.patch("beem.blockchain.Blockchain.get_estimated_block_num", return_value=1234) as estimate:
+            self.assertEqual(batch.get_block_num(datetime(2020, 1, 1)), 1234)
+            self.assertEqual(batch.get_block_num(datetime(2020, 1, 1)), 1234)
+            self.assertEqual(estimate.call_count, 1)
+
+    def test_node_rate_limiter(self):
+        limiter = NodeRateLimiter(requests_per_second=50)
+        start = time.time()
+        for i in range(6):
+            limiter.wait("https://api.fake.node")
+            limiter.wait("https://api.other.node")
+        self.assertTrue(time.time() - start >= 5 / 50.)
+        self.assertTrue(time.time() - start < 1)
@@ -2,12 +2,13 @@
 import unittest
 from parameterized import parameterized
 from pprint import pprint
-from beem import Steem, exceptions
+from beem import Hive, Steem, exceptions
 from beem.account import Account
 from beem.amount import Amount
 from beem.asset import Asset
 from beem.wallet import Wallet
 from beem.instance import set_shared_steem_instance, shared_steem_instance
+from beemgraphenebase.account import PrivateKey, key_caches, set_key_cache
 from .nodes import get_hive_nodes, get_steem_nodes
 
 wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
@@ -132,3 +133,20 @@ class Testcases(unittest.TestCase):
         ):
             self.wallet.getPostingKeysForAccount("test")
 
+
+
+class OfflineTestcases(unittest.TestCase):
+
+    def test_lock_clears_private_key_cache(self):
+        hv = Hive(offline=True, keys=[wif])
+        try:
+            set_key_cache(True, private_keys=True)
+            for method, args in [(hv.wallet.lock, []),
+                                 (hv.wallet.removePrivateKeyFromPublicKey, [hv.wallet.publickey_from_wif(wif)])]:
+                PrivateKey(wif).pubkey
+                self.assertEqual(key_caches["private_key"].stats()["size"], 1)
+                method(*args)
+                self.assertEqual(key_caches["private_key"].stats()["size"], 0)
+                self.assertEqual(key_caches["derived_public_key"].stats()["size"], 0)
+        finally:
+            set_key_cache(True)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import unittest
+from parameterized import parameterized
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beemgraphenebase.account import PrivateKey
+from beemgraphenebase.batchsigner import BatchSigner
+import beemgraphenebase.ecdsasig as ecda
+
+wifs = ["5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3",
+        "5J4KCbg1G3my9b9hCaQXnHSm6vrwW9xQTJS6ZciW2Kek7cCkCEk"]
+
+
+def unsigned_transactions(n):
+    return [Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213, expiration="2016-04-06T08:29:27",
+                               operations=[Operation(operations.Vote(voter="foo", author="bar",
+                                                                     permlink="p%d" % i, weight=i))])
+            for i in range(n)]
+
+
+class Testcases(unittest.TestCase):
+
+    def assertSigned(self, txs, n):
+        self.assertEqual([tx.data["operations"].data[0].op.data["permlink"].data for tx in txs],
+                         ["p%d" % i for i in range(n)])
+        pubkeys = [PrivateKey(wif).pubkey for wif in wifs]
+        for tx in txs:
+            self.assertEqual(len(tx.data["signatures"].data), 2)
+            tx.verify(pubkeys, "STEEM")
+
+    @parameterized.expand([
+        ("cryptography"),
+        ("secp256k1"),
+        ("ecdsa")
+    ])
+    def test_sign(self, module):
+        if module == "cryptography" and not ecda.CRYPTOGRAPHY_AVAILABLE:
+            return
+        if module == "secp256k1" and not ecda.SECP256K1_AVAILABLE:
+            return
+        old_module = ecda.SECP256K1_MODULE
+        ecda.SECP256K1_MODULE = module
+        try:
+            signer = BatchSigner(wifs + [wifs[0]], chain="STEEM")
+            self.assertEqual(signer.wifs, wifs)
+            txs = signer.sign(unsigned_transactions(5))
+            self.assertSigned(txs, 5)
+            self.assertEqual([key.module for key in signer.get_keys()], [module, module])
+            single = unsigned_transactions(1)[0].sign(wifs, chain="STEEM")
+            self.assertEqual(single.id, txs[0].id)
+        finally:
+            ecda.SECP256K1_MODULE = old_module
+
+    def test_sign_parallel(self):
+        with BatchSigner(wifs, chain="STEEM", processes=2, chunk_size=3) as signer:
+            txs = signer.sign(unsigned_transactions(10))
+            self.assertIsNotNone(signer.executor)
+        self.assertIsNone(signer.executor)
+        self.assertSigned(txs, 10)
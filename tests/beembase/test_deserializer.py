@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+import copy
+import random
+import unittest
+from binascii import hexlify, unhexlify
+from beembase import operations, operationids
+from beembase.objects import Amount, Permission
+from beembase.deserializer import ChainDeserializer
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction, get_transaction_hex, get_transaction_id
+from beemgraphenebase import types
+from beemgraphenebase.account import PrivateKey, PublicKey
+from beemgraphenebase.py23 import py23_bytes
+from .test_serializer import op_args
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+ref_block_num = 34294
+ref_block_prefix = 3707022213
+expiration = "2016-04-06T08:29:27"
+
+# These beembase operations do not use the wire format of the nodes
+not_protocol_ops = ["Custom", "Custom_binary", "Recurring_transfer", "Escrow_dispute", "Escrow_release"]
+
+
+def signed_transaction(ops):
+    tx = Signed_Transaction(ref_block_num=ref_block_num, ref_block_prefix=ref_block_prefix,
+                            expiration=expiration, operations=[Operation(op) for op in ops])
+    tx.sign([wif], chain="STEEM")
+    return tx
+
+
+class Testcases(unittest.TestCase):
+
+    def assertRoundTrip(self, tx, chain):
+        data = py23_bytes(tx)
+        result = None
+        for appbase in [False, True]:
+            deserializer = ChainDeserializer(chain=chain, appbase=appbase)
+            tx_json = deserializer.read_transaction(data)
+            self.assertEqual(py23_bytes(Signed_Transaction(**copy.deepcopy(tx_json))), data)
+            self.assertEqual(deserializer.read_transaction(hexlify(data).decode("ascii")), tx_json)
+            self.assertEqual(deserializer.get_transaction_id(data), tx.id)
+            if result is None:
+                result = tx_json
+        return result
+
+    def test_transfer(self):
+        tx = signed_transaction([operations.Transfer(**{"from": "foo", "to": "baar", "amount": "111.110 STEEM",
+                                                        "memo": "Fooo", "prefix": "STM"})])
+        data = py23_bytes(tx)
+        self.assertEqual(ChainDeserializer().read_transaction(data), {
+            "ref_block_num": ref_block_num, "ref_block_prefix": ref_block_prefix, "expiration": expiration,
+            "operations": [["transfer", {"from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"}]],
+            "extensions": [], "signatures": tx.json()["signatures"]})
+        op = ChainDeserializer(chain="HIVE", appbase=True).read_transaction(data)["operations"][0]
+        self.assertEqual(op, {"type": "transfer_operation",
+                              "value": {"from": "foo", "to": "baar", "memo": "Fooo",
+                                        "amount": {"amount": "111110", "precision": 3, "nai": "@@000000021"}}})
+        self.assertEqual(ChainDeserializer().read_operation(py23_bytes(tx.data["operations"].data[0])),
+                         ["transfer", {"from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"}])
+
+    def test_all_operations(self):
+        for name in op_args:
+            if name in not_protocol_ops:
+                continue
+            for args in op_args[name]:
+                if name == "Transfer" and isinstance(args.get("memo"), dict):
+                    continue
+                if name == "Claim_reward_balance" and len(args) != 4:
+                    continue
+                op = getattr(operations, name)(**dict(args, prefix="STM"))
+                tx = signed_transaction([op])
+                for chain in ["STEEM", "HIVE"]:
+                    tx_json = self.assertRoundTrip(tx, chain)
+                    self.assertEqual(tx_json["operations"][0][0], name.lower())
+
+    def test_transaction_hex(self):
+        for name in op_args:
+            if name == "Recurring_transfer":
+                continue
+            for args in op_args[name]:
+                if name == "Transfer" and isinstance(args.get("memo"), dict):
+                    continue
+                if name == "Claim_reward_balance" and len(args) != 4:
+                    continue
+                op = getattr(operations, name)(**dict(args, prefix="STM"))
+                tx = signed_transaction([op])
+                if name in not_protocol_ops:
+                    self.assertRaises(ValueError, get_transaction_hex, tx)
+                    self.assertRaises(ValueError, get_transaction_id, tx)
+                    continue
+                tx_hex = get_transaction_hex(tx)
+                tx_json = ChainDeserializer().read_transaction(tx_hex)
+                self.assertEqual(get_transaction_hex(tx_json), tx_hex)
+                self.assertEqual(get_transaction_id(tx_json), tx.id)
+
+    def test_hive_names(self):
+        op = operations.Comment_options(**{"author": "xeroc", "permlink": "piston",
+                                           "max_accepted_payout": "1000.000 HBD", "percent_hbd": 5000,
+                                           "allow_votes": True, "allow_curation_rewards": True,
+                                           "beneficiaries": [{"account": "null", "weight": 5000}], "prefix": "STM"})
+        tx = signed_transaction([op])
+        op_json = ChainDeserializer(chain="HIVE").read_transaction(py23_bytes(tx))["operations"][0][1]
+        self.assertEqual(op_json["percent_hbd"], 5000)
+        self.assertEqual(op_json["max_accepted_payout"], "1000.000 HBD")
+        self.assertEqual(op_json["extensions"], [[0, {"beneficiaries": [{"account": "null", "weight": 5000}]}]])
+        op_json = ChainDeserializer(chain="STEEM").read_transaction(py23_bytes(tx))["operations"][0][1]
+        self.assertEqual(op_json["percent_steem_dollars"], 5000)
+        self.assertEqual(op_json["max_accepted_payout"], "1000.000 SBD")
+
+    def test_random_round_trip(self):
+        rnd = random.Random(42)
+
+        def text(length):
+            return u"".join([rnd.choice(u"abcdefghijklmnopqrstuvwxyz0123456789-. ä☃") for i in range(length)])
+
+        for i in range(50):
+            ops = []
+            for j in range(rnd.randint(0, 5)):
+                kind = rnd.randint(0, 2)
+                if kind == 0:
+                    ops.append(operations.Vote(voter=text(8), author=text(8), permlink=text(rnd.randint(0, 300)),
+                                               weight=rnd.randint(-10000, 10000)))
+                elif kind == 1:
+                    amount = "%d.%03d %s" % (rnd.randint(0, 10 ** 9), rnd.randint(0, 999),
+                                             rnd.choice(["STEEM", "SBD", "HIVE", "HBD"]))
+                    ops.append(operations.Transfer(**{"from": text(8), "to": text(8), "amount": amount,
+                                                      "memo": text(rnd.randint(0, 200)), "prefix": "STM"}))
+                else:
+                    ops.append(operations.Custom_json(required_auths=[], required_posting_auths=[text(8)],
+                                                      id=text(10), json={"n": rnd.randint(0, 2 ** 40)}))
+            tx = Signed_Transaction(ref_block_num=rnd.randint(0, 2 ** 16 - 1),
+                                    ref_block_prefix=rnd.randint(0, 2 ** 32 - 1),
+                                    expiration="20%02d-%02d-%02dT%02d:%02d:%02d" % (
+                                        rnd.randint(0, 30), rnd.randint(1, 12), rnd.randint(1, 28),
+                                        rnd.randint(0, 23), rnd.randint(0, 59), rnd.randint(0, 59)),
+                                    operations=[Operation(op) for op in ops])
+            if rnd.randint(0, 1):
+                tx.sign([wif], chain="STEEM")
+            self.assertRoundTrip(tx, rnd.choice(["STEEM", "HIVE"]))
+
+    def test_historical_operations(self):
+        pub = format(PrivateKey(wif).pubkey, "STM")
+        authority = {"weight_threshold": 1, "account_auths": [], "key_auths": [[pub, 1]]}
+        props = {"account_creation_fee": "0.100 STEEM", "maximum_block_size": 131072, "sbd_interest_rate": 1000}
+        block_id = "0001e24000e7ab5b0be6ee3dd0ba51e7bf6b7e1f"
+
+        def serialize(name, fields):
+            return py23_bytes(types.Varint32(operationids.ops.index(name))) + \
+                b"".join([py23_bytes(field) for field in fields])
+
+        def authority_bytes():
+            return py23_bytes(Permission(**dict(authority, prefix="STM")))
+
+        def props_bytes():
+            return py23_bytes(Amount("0.100 STEEM")) + py23_bytes(types.Uint32(131072)) + \
+                py23_bytes(types.Uint16(1000))
+
+        pow2_input = [types.String("miner"), unhexlify(block_id), types.Uint64(2 ** 40)]
+        expected = {
+            "pow": serialize("pow", [types.String("miner"), unhexlify(block_id), types.Uint64(42),
+                                     PublicKey(pub, prefix="STM"), b"\x11" * 32, b"\x22" * 65, b"\x33" * 32,
+                                     props_bytes()]),
+            "pow2": serialize("pow2", [types.Varint32(0)] + pow2_input + [types.Uint32(123),
+                                       types.Optional(PublicKey(pub, prefix="STM")), props_bytes()]),
+            "report_over_production": serialize("report_over_production", [types.String("reporter")] + [
+                unhexlify(block_id), types.PointInTime("2016-04-06T08:29:27"), types.String("witness"),
+                b"\x44" * 20, types.Varint32(2), types.Varint32(1), types.Uint32(0x00130000),
+                types.Varint32(2), types.Uint32(0x00140000), types.PointInTime("2017-06-20T15:00:00"),
+                b"\x55" * 65] * 2),
+            "reset_account": serialize("reset_account", [types.String("bob"), types.String("alice"),
+                                                         authority_bytes()]),
+            "set_reset_account": serialize("set_reset_account", [types.String("alice"), types.String(""),
+                                                                 types.String("bob")]),
+        }
+        header = {"previous": block_id, "timestamp": "2016-04-06T08:29:27", "witness": "witness",
+                  "transaction_merkle_root": "44" * 20,
+                  "extensions": [[1, "0.19.0"], [2, {"hf_version": "0.20.0", "hf_time": "2017-06-20T15:00:00"}]],
+                  "witness_signature": "55" * 65}
+        d = ChainDeserializer()
+        self.assertEqual(d.read_operation(expected["pow"]), ["pow", {
+            "worker_account": "miner", "block_id": block_id, "nonce": 42, "props": props,
+            "work": {"worker": pub, "input": "11" * 32, "signature": "22" * 65, "work": "33" * 32}}])
+        self.assertEqual(d.read_operation(expected["pow2"]), ["pow2", {
+            "work": [0, {"input": {"worker_account": "miner", "prev_block": block_id, "nonce": 2 ** 40},
+                         "pow_summary": 123}],
+            "new_owner_key": pub, "props": props}])
+        self.assertEqual(d.read_operation(expected["report_over_production"]), ["report_over_production", {
+            "reporter": "reporter", "first_block": header, "second_block": header}])
+        self.assertEqual(d.read_operation(expected["reset_account"]), ["reset_account", {
+            "reset_account": "bob", "account_to_reset": "alice", "new_owner_authority": authority}])
+        self.assertEqual(d.read_operation(expected["set_reset_account"]), ["set_reset_account", {
+            "account": "alice", "current_reset_account": "", "reset_account": "bob"}])
+
+    def test_read_transactions(self):
+        txs = [signed_transaction([operations.Vote(voter="a", author="b", permlink="p%d" % i, weight=i)])
+               for i in range(3)]
+        data = b"".join([py23_bytes(tx) for tx in txs])
+        deserializer = ChainDeserializer()
+        result = list(deserializer.read_transactions(data))
+        self.assertEqual([tx_json["operations"][0][1]["permlink"] for tx_json in result], ["p0", "p1", "p2"])
+        self.assertRaises(ValueError, deserializer.read_transaction, data)
+        self.assertRaises(ValueError, deserializer.read_transaction, py23_bytes(txs[0])[:-1])
+        unsigned = py23_bytes(txs[0])[:-66]
+        self.assertEqual(deserializer.get_transaction_id(unsigned, signed=False), txs[0].id)
+        self.assertEqual(deserializer.read_transaction(unsigned, signed=False)["operations"][0][0], "vote")
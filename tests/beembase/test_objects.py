@@ -35,6 +35,21 @@ class Testcases(unittest.TestCase):
 
 
 
+    def test_Amount_custom_chain(self):
+        from beembase.objects import get_chain_assets
+        from beemgraphenebase.chains import known_chains
+        self.assertEqual(get_chain_assets("STM")[0]["HBD"], ("HBD", "@@000000013", 3))
+        self.assertRaises(Exception, Amount, "1.000 TESTX", prefix="TSX")
+        known_chains["TESTXCHAIN"] = {"chain_id": "0" * 64, "min_version": "0.0.0", "prefix": "TSX",
+                                      "chain_assets": [{"asset": "@@000000021", "symbol": "TESTX", "precision": 3, "id": 1}]}
+        try:
+            t = Amount("1.000 TESTX", prefix="TSX")
+            self.assertEqual(t.asset, "@@000000021")
+            t = Amount({"amount": "1000", "precision": 3, "nai": "@@000000021"}, prefix="TSX")
+            self.assertEqual(t.symbol, "TESTX")
+        finally:
+            known_chains.pop("TESTXCHAIN")
+
     def test_Amount_overflow(self):
         a = "0.9999 STEEM"
         t = Amount(a)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import unittest
+from binascii import hexlify
+from datetime import datetime
+from beembase import operations
+from beembase.objects import Operation
+from beembase.operationids import operations as operation_ids
+from beembase.signedtransactions import Signed_Transaction
+from beemgraphenebase.py23 import py23_bytes
+from beemgraphenebase.serializer import Serializer, serialize
+from beemgraphenebase.types import Array, Optional, PointInTime, String, Uint16
+
+prefix = "STM"
+key1 = "STM6zLNtyFVToBsBZDsgMhgjpwysYVbsQD6YhP3kRkQhANUB4w7Qp"
+key2 = "STM5jYVokmZHdEpwo5oCG3ES2Ca4VYzy6tM8pWWkGdgVnwo2mFLFq"
+authority = {"weight_threshold": 1, "account_auths": [["bob", 1], ["alice", 2]],
+             "key_auths": [[key1, 1], [key2, 1]]}
+memo = {"from": key1, "to": key2, "nonce": 56789, "check": 1234, "encrypted": "aabbcc", "prefix": prefix}
+
+# One or more arguments per operation class, covering the branches which
+# produce different field layouts
+op_args = {
+    "Transfer": [{"from": "foo", "to": "baar", "amount": "111.110 STEEM", "memo": "Fooo"},
+                 {"from": "foo", "to": "baar", "amount": "1.000 HBD", "memo": memo},
+                 {"from": "foo", "to": "baar", "amount": {"amount": "1000", "precision": 3, "nai": "@@000000021"},
+                  "json_str": True}],
+    "Recurring_transfer": [{"from": "foo", "to": "baar", "amount": "1.000 HIVE", "memo": "monthly",
+                            "recurrence": 24, "executions": 12}],
+    "Vote": [{"voter": "foobara", "author": "foobarc", "permlink": "foobard", "weight": -1000}],
+    "Transfer_to_vesting": [{"from": "foo", "to": "baar", "amount": "111.110 STEEM"}],
+    "Withdraw_vesting": [{"account": "foo", "vesting_shares": "100.000000 VESTS"}],
+    "Account_witness_vote": [{"account": "foobara", "witness": "foobarc", "approve": True}],
+    "Account_witness_proxy": [{"account": "alice", "proxy": "bob"}],
+    "Custom": [{"required_auths": ["bytemaster"], "id": 777, "data": "0a627974656d617374657207737465656d697402a3d13897d82114466ad87a74b73a53292d8331d1bd1d3082da6bfbcff19ed097029db013797711c88cccca3692407f9ff9b9ce7221aaa2d797f1692be2215d0a5f6d2a8cab6832050078bc5729201e3ea24ea9f7873e6dbdc65a6bd9899053b9acda876dc69f11a13df9ca8b26b6"}],
+    "Custom_binary": [{"id": 42, "data": "binary"}],
+    "Account_create": [{"fee": "10.000 STEEM", "creator": "xeroc", "new_account_name": "fsafaasf",
+                        "owner": authority, "active": authority, "posting": authority, "memo_key": key1,
+                        "json_metadata": {"profile": {"name": "x"}}}],
+    "Account_create_with_delegation": [{"fee": "3.000 HIVE", "delegation": "0.000000 VESTS", "creator": "steemit",
+                                        "new_account_name": "alice", "owner": authority, "active": authority,
+                                        "posting": authority, "memo_key": key1, "json_metadata": ""}],
+    "Account_update": [{"account": "streemian", "posting": authority, "memo_key": key1, "json_metadata": ""},
+                       {"account": "streemian", "owner": authority, "active": authority, "posting": authority,
+                        "memo_key": key1, "json_metadata": "{}"}],
+    "Account_update2": [{"account": "alice", "json_metadata": "", "posting_json_metadata": {"a": 1}},
+                        {"account": "alice", "owner": authority, "memo_key": key2}],
+    "Create_proposal": [{"creator": "alice", "receiver": "bob", "start_date": "2019-07-01T00:00:00",
+                         "end_date": "2019-08-01T00:00:00", "daily_pay": "10.000 HBD", "subject": "Proposal",
+                         "permlink": "proposal"}],
+    "Update_proposal_votes": [{"voter": "alice", "proposal_ids": [1, 2, 3], "approve": True}],
+    "Remove_proposal": [{"proposal_owner": "alice", "proposal_ids": [4, 2 ** 40]}],
+    "Update_proposal": [{"proposal_id": 3, "creator": "alice", "daily_pay": "1.000 HBD", "subject": "s",
+                         "permlink": "p"},
+                        {"proposal_id": 3, "creator": "alice", "daily_pay": "1.000 HBD", "subject": "s",
+                         "permlink": "p", "end_date": "2021-04-05T13:39:48"}],
+    "Witness_set_properties": [{"owner": "init-1", "props": [["account_creation_fee", "3.000 STEEM"],
+                                                              ["key", key1], ["maximum_block_size", 65536],
+                                                              ["sbd_interest_rate", 0],
+                                                              ["sbd_exchange_rate", {"base": "1.000 SBD",
+                                                                                     "quote": "1.000 STEEM"}],
+                                                              ["url", "https://steemit.com"]]}],
+    "Witness_update": [{"owner": "xeroc", "url": "foooobar", "block_signing_key": key1, "fee": "10.000 STEEM",
+                        "props": {"account_creation_fee": "10.000 STEEM", "maximum_block_size": 1111111,
+                                  "sbd_interest_rate": 1000}},
+                       {"owner": "xeroc", "url": "", "block_signing_key": None, "fee": "0.000 HIVE",
+                        "props": {"account_creation_fee": "3.000 HIVE", "maximum_block_size": 65536,
+                                  "hbd_interest_rate": 0}}],
+    "Comment": [{"parent_author": "", "parent_permlink": "tag", "author": "foobarc", "permlink": "foobard",
+                 "title": u"Tïtle ☃", "body": u"line\nbreak\ttab\x01\x08\x0b\x0c\x1f \U0001F600",
+                 "json_metadata": {"tags": ["a", "b"]}}],
+    "Custom_json": [{"required_auths": [], "required_posting_auths": ["xeroc"], "id": "follow",
+                     "json": ["follow", {"follower": "xeroc", "following": "chainsquad", "what": ["blog"]}]}],
+    "Comment_options": [{"author": "xeroc", "permlink": "piston", "max_accepted_payout": "1000000.000 SBD",
+                         "percent_steem_dollars": 10000, "allow_votes": True, "allow_curation_rewards": True,
+                         "beneficiaries": [{"account": "good-karma", "weight": 2000},
+                                           {"account": "null", "weight": 5000}]},
+                        {"author": "xeroc", "permlink": "piston", "max_accepted_payout": "1000.000 HBD",
+                         "percent_hbd": 5000, "allow_votes": False, "allow_curation_rewards": False,
+                         "extensions": []}],
+    "Delete_comment": [{"author": "turbot", "permlink": "testpost"}],
+    "Feed_publish": [{"publisher": "xeroc", "exchange_rate": {"base": "1.000 SBD", "quote": "4.123 STEEM"}}],
+    "Convert": [{"owner": "xeroc", "requestid": 2342343235, "amount": "100.000 SBD"}],
+    "Collateralized_convert": [{"owner": "xeroc", "requestid": 3, "amount": "100.000 HIVE"}],
+    "Set_withdraw_vesting_route": [{"from_account": "xeroc", "to_account": "xeroc", "percent": 1000,
+                                    "auto_vest": False}],
+    "Limit_order_cancel": [{"owner": "", "orderid": 2141244}],
+    "Claim_account": [{"creator": "alice", "fee": "0.000 HIVE"}],
+    "Create_claimed_account": [{"creator": "alice", "new_account_name": "bob", "owner": authority,
+                                "active": authority, "posting": authority, "memo_key": key1,
+                                "json_metadata": {}}],
+    "Delegate_vesting_shares": [{"delegator": "alice", "delegatee": "bob", "vesting_shares": "94599167.138276 VESTS"}],
+    "Limit_order_create": [{"owner": "", "orderid": 0, "amount_to_sell": "0.000 STEEM",
+                            "min_to_receive": "0.000 STEEM", "fill_or_kill": False,
+                            "expiration": "2016-12-31T23:59:59"}],
+    "Limit_order_create2": [{"owner": "alice", "orderid": 492991, "amount_to_sell": "1.000 HBD",
+                             "exchange_rate": {"base": "1.000 HBD", "quote": "10.000 HIVE"}, "fill_or_kill": False,
+                             "expiration": datetime(2017, 1, 1, 12, 30, 45)}],
+    "Change_recovery_account": [{"account_to_recover": "barrie", "new_recovery_account": "boombastic"}],
+    "Transfer_from_savings": [{"from": "testuser", "request_id": 9001, "to": "testser", "amount": "100.000 SBD",
+                               "memo": "memohere"}],
+    "Cancel_transfer_from_savings": [{"from": "tesuser", "request_id": 9001}],
+    "Claim_reward_balance": [{"account": "alice", "reward_steem": "0.000 STEEM", "reward_sbd": "0.000 SBD",
+                              "reward_vests": "0.000001 VESTS"},
+                             {"account": "alice", "reward_hive": "1.000 HIVE", "reward_hbd": "2.000 HBD",
+                              "reward_vests": "3.000000 VESTS"},
+                             {"account": "alice", "reward_hive": "1.000 HIVE", "reward_vests": "3.000000 VESTS"},
+                             {"account": "alice", "reward_steem": "1.000 STEEM", "reward_vests": "3.000000 VESTS"}],
+    "Transfer_to_savings": [{"from": "testuser", "to": "testuser", "amount": "100.000 SBD", "memo": "testmemo"}],
+    "Request_account_recovery": [{"recovery_account": "steem", "account_to_recover": "alice",
+                                  "new_owner_authority": authority}],
+    "Recover_account": [{"account_to_recover": "alice", "new_owner_authority": authority,
+                         "recent_owner_authority": authority}],
+    "Escrow_transfer": [{"from": "alice", "to": "bob", "agent": "charlie", "escrow_id": 72526562,
+                         "sbd_amount": "5.000 SBD", "steem_amount": "10.000 STEEM", "fee": "0.100 STEEM",
+                         "ratification_deadline": "2018-04-25T10:00:00",
+                         "escrow_expiration": "2022-04-25T10:00:00", "json_meta": {"a": 1}},
+                        {"from": "alice", "to": "bob", "agent": "charlie", "escrow_id": 1,
+                         "hbd_amount": "5.000 HBD", "hive_amount": "10.000 HIVE", "fee": "0.100 HIVE",
+                         "ratification_deadline": "1969-04-25T10:00:00",
+                         "escrow_expiration": "2100-04-25T10:00:00", "json_meta": ""}],
+    "Escrow_dispute": [{"from": "alice", "to": "bob", "who": "alice", "escrow_id": 72526562}],
+    "Escrow_release": [{"from": "alice", "to": "bob", "who": "charlie", "escrow_id": 72526562,
+                        "sbd_amount": "5.000 SBD", "steem_amount": "10.000 STEEM"},
+                       {"from": "alice", "to": "bob", "who": "charlie", "escrow_id": 72526562,
+                        "hbd_amount": "5.000 HBD", "hive_amount": "10.000 HIVE"}],
+    "Escrow_approve": [{"from": "alice", "to": "bob", "agent": "charlie", "who": "charlie",
+                        "escrow_id": 72526562, "approve": True}],
+    "Decline_voting_rights": [{"account": "judy", "decline": True}],
+}
+
+
+class Testcases(unittest.TestCase):
+
+    def test_all_operations(self):
+        # Op_wrapper has no operation id and cannot be constructed
+        names = [name for name in dir(operations)
+                 if isinstance(getattr(operations, name), type) and name != "Op_wrapper" and
+                 getattr(operations, name).__module__ == operations.__name__]
+        self.assertEqual(sorted(names), sorted(op_args.keys()))
+        for name in names:
+            for args in op_args[name]:
+                args = dict(args, prefix=prefix)
+                op = getattr(operations, name)(**args)
+                self.assertEqual(hexlify(serialize(op)), hexlify(py23_bytes(op)), name)
+                if name.lower() not in operation_ids:
+                    continue
+                op = Operation(op)
+                self.assertEqual(hexlify(serialize(op)), hexlify(py23_bytes(op)), name)
+
+    def test_transaction(self):
+        ops = [Operation(operations.Vote(voter="foobara", author="foobarc", permlink="p%d" % i, weight=i * 100))
+               for i in range(10)]
+        ops.append(Operation(operations.Custom_json(required_auths=[], required_posting_auths=["foobara"],
+                                                    id="follow", json={"a": list(range(200))})))
+        tx = Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213, expiration="2016-04-06T08:29:27",
+                                operations=ops)
+        self.assertEqual(serialize(tx), py23_bytes(tx))
+        tx.sign(["5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"], chain="STEEM")
+        self.assertEqual(serialize(tx), py23_bytes(tx))
+        tx.data["signatures"] = []
+        self.assertEqual(serialize(tx), py23_bytes(tx))
+
+    def test_types(self):
+        class Weight(Uint16):
+            def __bytes__(self):
+                return b"weight"
+
+        values = [Array([Weight(1), Uint16(2), Optional(None), Optional(String("")),
+                         PointInTime(datetime(1960, 1, 1)), PointInTime("2099-01-01T00:00:00")]),
+                  Array([String(u"\x00\x07\x0e"), String(u"\u2603")])]
+        for value in values:
+            self.assertEqual(serialize(value), py23_bytes(value))
+
+        serializer = Serializer()
+        serializer.register(Weight, lambda buf, value: buf.extend(b"w"))
+        self.assertEqual(serializer.serialize(Array([Weight(1), Uint16(2)])), b"\x02w\x02\x00")
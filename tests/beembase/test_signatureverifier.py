@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import unittest
+from beembase import operations
+from beembase.objects import Operation
+from beembase.signedtransactions import Signed_Transaction
+from beembase.signatureverifier import SignatureVerifier
+from beemgraphenebase.account import PrivateKey
+from beemgraphenebase.batchsigner import BatchSigner
+
+wifs = ["5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3",
+        "5J4KCbg1G3my9b9hCaQXnHSm6vrwW9xQTJS6ZciW2Kek7cCkCEk"]
+
+
+def signed_transactions(n, keys):
+    txs = [Signed_Transaction(ref_block_num=34294, ref_block_prefix=3707022213, expiration="2016-04-06T08:29:27",
+                              operations=[Operation(operations.Vote(voter="foo", author="bar",
+                                                                    permlink="p%d" % i, weight=i))])
+           for i in range(n)]
+    return BatchSigner(keys, chain="STEEM").sign(txs)
+
+
+class Testcases(unittest.TestCase):
+
+    def test_verify_transactions(self):
+        pubkeys = [format(PrivateKey(wif).pubkey, "STM") for wif in wifs]
+        txs = signed_transactions(3, wifs) + signed_transactions(2, wifs[1:])
+        verifier = SignatureVerifier(chain="STEEM")
+        expected = [set(pubkeys)] * 3 + [set(pubkeys[1:])] * 2
+        self.assertEqual(verifier.verify_transactions(txs), expected)
+        self.assertEqual(verifier.verify_transactions([tx.json() for tx in txs]), expected)
+
+        # The signature of another chain gives another key
+        self.assertNotEqual(SignatureVerifier(chain="HIVE2").verify_transactions(txs[:1])[0], set(pubkeys))
+        self.assertEqual(SignatureVerifier(chain="STEEM", prefix="TST").verify_transactions(txs[:1])[0],
+                         set([format(PrivateKey(wif).pubkey, "TST") for wif in wifs]))
+
+    def test_verify_blocks(self):
+        pubkey = format(PrivateKey(wifs[0]).pubkey, "STM")
+        blocks = [{"transactions": [tx.json() for tx in signed_transactions(n, wifs[:1])]} for n in [2, 0, 3]]
+        invalid = signed_transactions(1, wifs[:1])[0].json()
+        invalid["signatures"] = ["00" * 65]
+        blocks.append({"transactions": [invalid]})
+        with SignatureVerifier(chain="STEEM", processes=2, chunk_size=2) as verifier:
+            self.assertEqual(verifier.verify_blocks(blocks),
+                             [[set([pubkey])] * 2, [], [set([pubkey])] * 3, [set()]])
+            self.assertIsNotNone(verifier.executor)
+            self.assertEqual(verifier.verify_block(blocks[0]), [set([pubkey])] * 2)
+
+    def test_non_protocol_operations(self):
+        pubkey = format(PrivateKey(wifs[0]).pubkey, "STM")
+        escrow_release = Signed_Transaction(
+            ref_block_num=34294, ref_block_prefix=3707022213, expiration="2016-04-06T08:29:27",
+            operations=[Operation(operations.Escrow_release(**{
+                "from": "alice", "to": "bob", "who": "charlie", "agent": "charlie", "receiver": "bob",
+                "escrow_id": 72526562, "sbd_amount": "5.000 SBD", "steem_amount": "0.000 STEEM",
+                "prefix": "STM"}))])
+        txs = signed_transactions(1, wifs[:1]) + BatchSigner(wifs[:1], chain="STEEM").sign([escrow_release])
+        verifier = SignatureVerifier(chain="STEEM")
+        self.assertIsNone(verifier.get_digest(txs[1]))
+        self.assertEqual(verifier.verify_transactions(txs), [set([pubkey]), None])
+        self.assertEqual(verifier.verify_blocks([{"transactions": [txs[1].json(), txs[0].json()]}]),
+                         [[None, set([pubkey])]])
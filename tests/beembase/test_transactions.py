@@ -6,10 +6,11 @@ from builtins import bytes
 from builtins import chr
 from builtins import range
 from builtins import super
+import hashlib
 import random
 import unittest
 from pprint import pprint
-from binascii import hexlify
+from binascii import hexlify, unhexlify
 from collections import OrderedDict
 
 from beembase import (
@@ -19,11 +20,12 @@ from beembase import (
     objects
 )
 from beembase.objects import Operation
-from beembase.signedtransactions import Signed_Transaction
+from beembase.signedtransactions import Signed_Transaction, get_transaction_hex, get_transaction_id, non_protocol_operations
 from beemgraphenebase.account import PrivateKey
 from beemgraphenebase import account
 from beembase.operationids import getOperationNameForId
 from beemgraphenebase.py23 import py23_bytes, bytes_types
+from beemgraphenebase.serializer import serialize
 from beem.amount import Amount
 from beem.asset import Asset
 from beem.steem import Steem
@@ -57,11 +59,20 @@ class Testcases(unittest.TestCase):
         tx = tx.sign([wif], chain=prefix)
         tx.verify([PrivateKey(wif, prefix=u"STM").pubkey], prefix)
         txWire = hexlify(py23_bytes(tx)).decode("ascii")
+        self.assertEqual(hexlify(serialize(tx)).decode("ascii"), txWire)
         if printWire:
             print()
             print(txWire)
             print()
         self.assertEqual(self.cm[:-130], txWire[:-130])
+        # Local hex and trx_id from the transaction json, the id is
+        # cross-checked with the recorded wire format without signature
+        if any([op.name.lower() in non_protocol_operations for op in ops]):
+            self.assertRaises(ValueError, get_transaction_hex, tx.json())
+        else:
+            self.assertEqual(get_transaction_hex(tx.json()), txWire)
+            self.assertEqual(get_transaction_id(tx.json()), tx.id)
+        self.assertEqual(tx.id, hexlify(hashlib.sha256(unhexlify(self.cm[:-132])).digest()[:20]).decode("ascii"))
 
         if TEST_AGAINST_CLI_WALLET:
             from grapheneapi.grapheneapi import GrapheneAPI
@@ -987,6 +998,25 @@ class Testcases(unittest.TestCase):
                    'b36f77aa63fa0d8278fc07472c5d20927d2b7fdebcc3820da489')
         self.doit()
 
+    def test_transaction_hex_from_block(self):
+        tx = Signed_Transaction(ref_block_num=ref_block_num, ref_block_prefix=ref_block_prefix,
+                                expiration=expiration,
+                                operations=[Operation(operations.Transfer(**{"from": "foo", "to": "baar",
+                                                                             "amount": "111.110 STEEM",
+                                                                             "memo": "Fooo", "prefix": default_prefix}))])
+        tx = tx.sign([wif], chain=prefix)
+        txWire = hexlify(py23_bytes(tx)).decode("ascii")
+        # Transaction as returned by an appbase node inside a block
+        block_tx = {"ref_block_num": ref_block_num, "ref_block_prefix": ref_block_prefix, "expiration": expiration,
+                    "operations": [{"type": "transfer_operation",
+                                    "value": {"from": "foo", "to": "baar", "memo": "Fooo",
+                                              "amount": {"amount": "111110", "precision": 3, "nai": "@@000000021"}}}],
+                    "extensions": [], "signatures": tx.json()["signatures"],
+                    "transaction_id": tx.id, "block_num": 1, "transaction_num": 0}
+        self.assertEqual(get_transaction_hex(block_tx), txWire)
+        self.assertEqual(get_transaction_id(block_tx), tx.id)
+        self.assertEqual(block_tx["operations"][0]["value"]["amount"]["amount"], "111110")
+
     def test_account_create_with_delegation(self):
         self.op = operations.Account_create_with_delegation(
             **{
@@ -8,6 +8,7 @@ import unittest
 from beemgraphenebase.base58 import Base58, base58encode
 from beemgraphenebase.bip32 import BIP32Key
 from beemgraphenebase.account import BrainKey, Address, PublicKey, PrivateKey, PasswordKey, Mnemonic, MnemonicKey, BitcoinAddress
+from beemgraphenebase.account import KeyCache, key_caches, set_key_cache, clear_key_cache, clear_private_key_cache, get_key_cache_stats
 from binascii import hexlify, unhexlify
 import sys
 import hashlib
@@ -539,3 +540,63 @@ class Testcases(unittest.TestCase):
         self.assertEqual(
             repr(p2), "0c5fae344a513a4cfab312b24c08df2b2d6afa25c0ead0d3d1d0d3e76794109b"
         )
+
+    def test_key_cache(self):
+        wif = "5JWcdkhL3w4RkVPcZMdJsjos22yB5cSkPExerktvKnRNZR5gx1S"
+        pub = "STM5z5e3BawwMY6UmcBQxYpkKZ8QQm4wdtS4KMZiWAcWBUC3RJuLT"
+        try:
+            for enabled in [True, False]:
+                set_key_cache(enabled, private_keys=True)
+                clear_key_cache()
+                for i in range(3):
+                    p = PrivateKey(wif)
+                    self.assertEqual(format(p.pubkey, "STM"), pub)
+                    self.assertEqual(str(PublicKey(pub)), pub)
+                    self.assertEqual(format(PublicKey("GPH" + pub[3:], prefix="GPH"), "STM"), pub)
+                    self.assertEqual(format(PublicKey(PublicKey(pub)), "STM"), pub)
+                    self.assertEqual(str(Address("STMFN9r6VYzBK8EKtMewfNbfiGCr56pHDBFi")),
+                                     "STMFN9r6VYzBK8EKtMewfNbfiGCr56pHDBFi")
+                stats = get_key_cache_stats()
+                for name in ["public_key", "private_key", "derived_public_key", "format", "address"]:
+                    if enabled:
+                        self.assertTrue(stats[name]["hits"] > 0)
+                        self.assertTrue(stats[name]["size"] > 0)
+                    else:
+                        self.assertEqual(stats[name]["size"], 0)
+            # Cached keys are only valid for their prefix
+            self.assertRaises(ValueError, PublicKey, pub, prefix="GPH")
+        finally:
+            set_key_cache(True)
+
+    def test_private_key_cache(self):
+        wif = "5JWcdkhL3w4RkVPcZMdJsjos22yB5cSkPExerktvKnRNZR5gx1S"
+        secret = repr(Base58(wif))
+        clear_key_cache()
+        PrivateKey(wif).pubkey
+        # No wif or secret is stored by default
+        self.assertEqual(key_caches["private_key"].stats()["size"], 0)
+        for cache in key_caches.values():
+            for key, value in cache.data.items():
+                self.assertNotIn(wif, str(key) + str(value))
+                self.assertNotIn(secret, str(key) + str(value))
+        self.assertEqual(key_caches["derived_public_key"].stats()["size"], 1)
+        try:
+            set_key_cache(True, private_keys=True)
+            PrivateKey(wif)
+            self.assertEqual(key_caches["private_key"].stats()["size"], 1)
+            clear_private_key_cache()
+            self.assertEqual(key_caches["private_key"].stats()["size"], 0)
+            self.assertEqual(key_caches["derived_public_key"].stats()["size"], 0)
+        finally:
+            set_key_cache(True)
+
+    def test_key_cache_lru(self):
+        cache = KeyCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats(), {"hits": 3, "misses": 1, "size": 2, "maxsize": 2})
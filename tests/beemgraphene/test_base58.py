@@ -4,6 +4,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import unittest
+from binascii import hexlify
 from beemgraphenebase.base58 import (
     Base58,
     base58decode,
@@ -12,7 +13,13 @@ from beemgraphenebase.base58 import (
     base58CheckEncode,
     base58CheckDecode,
     gphBase58CheckEncode,
-    gphBase58CheckDecode)
+    gphBase58CheckDecode,
+    base58encode_bytes,
+    base58decode_bytes,
+    base58encode_batch,
+    base58decode_batch,
+    encode_keys,
+    decode_keys)
 
 
 class Testcases(unittest.TestCase):
@@ -108,6 +115,26 @@ class Testcases(unittest.TestCase):
                           "5Jete5oFNjjk3aUMkKuxgAXsp7ZyhgJbYNiNjHLvq5xzXkiqw7R",
                           "5KDT58ksNsVKjYShG4Ls5ZtredybSxzmKec8juj7CojZj6LPRF7"])
 
+    def test_base58_bytes(self):
+        data = [b"", b"\x00", b"\x00\x00\x01", b"\x01\x00", b"\xff" * 37, bytes(bytearray(range(1, 64)))]
+        encoded = base58encode_batch(data)
+        self.assertEqual(encoded[:4], ["1", "11", "112", "5R"])
+        self.assertEqual(encoded, [base58encode(hexlify(d).decode("ascii")) for d in data])
+        self.assertEqual(base58decode_batch(encoded[3:]), data[3:])
+        self.assertEqual(base58decode_bytes("112"), b"\x00\x00\x01")
+        self.assertEqual(base58encode_bytes(base58decode_bytes(b"5HueCGU8rMjxEXxiPuD5BDku4MkFqeZyd4dZ1jvhTVqvbTLvyTJ")),
+                         "5HueCGU8rMjxEXxiPuD5BDku4MkFqeZyd4dZ1jvhTVqvbTLvyTJ")
+        self.assertRaises(ValueError, base58decode_bytes, "5Hue0")
+
+    def test_keys(self):
+        keys = ["02e649f63f8e8121345fd7f47d0d185a3ccaa843115cd2e9392dcd9b7263",
+                "021c7359cd885c0e319924d97e3980206ad64387aff54908241125b3a88b55ca16"]
+        encoded = encode_keys(keys, prefix="BTS")
+        self.assertEqual(encoded, ["BTS" + gphBase58CheckEncode(k) for k in keys])
+        self.assertEqual(decode_keys(encoded, prefix="BTS"), keys)
+        self.assertRaises(ValueError, decode_keys, encoded, prefix="STM")
+        self.assertRaises(AssertionError, decode_keys, [encoded[0][:-1] + "1"], prefix="BTS")
+
 
 if __name__ == '__main__':
     unittest.main()
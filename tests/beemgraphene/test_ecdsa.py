@@ -89,6 +89,28 @@ class Testcases(unittest.TestCase):
         pub_key_sig2 = ecda.verify_message("Foobar2", signature)
         self.assertTrue(hexlify(pub_key_sig2) != pub_key)
 
+    def test_recover_public_key(self):
+        ecda.SECP256K1_MODULE = "ecdsa"
+        pub_key = PrivateKey(wif).pubkey
+        backends = [False]
+        if ecda.COINCURVE_AVAILABLE:
+            backends.append(True)
+        for message in ["Foobar", "foo", "1234567890", "This is a short Message"]:
+            signature = ecda.sign_message(message, wif)
+            i = signature[0] - 4 - 27 if isinstance(signature[0], int) else ord(signature[0]) - 4 - 27
+            digest = hashlib.sha256(py23_bytes(message, "utf-8")).digest()
+            for use_coincurve in backends:
+                self.assertEqual(ecda.recover_compressed_pubkey(digest, signature[1:], i, use_coincurve),
+                                 py23_bytes(pub_key))
+                # Other recovery ids give another (or no) key
+                for j in range(4):
+                    if j != i:
+                        self.assertNotEqual(ecda.recover_compressed_pubkey(digest, signature[1:], j, use_coincurve),
+                                            py23_bytes(pub_key))
+        digest = hashlib.sha256(b"Foobar").digest()
+        self.assertIsNone(ecda.recover_public_key_point(digest, b"\x00" * 64, 0, False))
+        self.assertIsNone(ecda.recover_public_key_point(digest, b"\xff" * 64, 0, False))
+
 
 if __name__ == '__main__':
     unittest.main()
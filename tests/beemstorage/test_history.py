@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import unittest
+import shutil
+import tempfile
+from beemstorage import SqliteAccountHistoryStore
+
+
+def history_item(index, op_type="vote"):
+    return [index, {"block": 100 + index, "timestamp": "2020-01-01T00:00:%02d" % index,
+                    "op": [op_type, {"index": index}]}]
+
+
+class Testcases(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.store = SqliteAccountHistoryStore(profile="testing_history", data_dir=self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_add_history(self):
+        self.assertIsNone(self.store.get_max_index("beembot"))
+        self.store.add_history("beembot", [history_item(i, "transfer" if i % 2 else "vote") for i in range(10)])
+        self.store.add_history("test", [history_item(i) for i in range(3)])
+        self.assertEqual(self.store.get_max_index("beembot"), 9)
+        self.assertEqual(self.store.count("beembot"), 10)
+        self.assertEqual(self.store.count("test"), 3)
+        # storing the same index twice replaces the stored operation
+        self.store.add_history("beembot", [history_item(9)])
+        self.assertEqual(self.store.count("beembot"), 10)
+        self.store.delete("test")
+        self.assertEqual(self.store.count("test"), 0)
+        self.store.wipe()
+        self.assertIsNone(self.store.get_max_index("beembot"))
+
+    def test_get_history(self):
+        self.store.add_history("beembot", [history_item(i, "transfer" if i % 2 else "vote") for i in range(10)])
+        history = self.store.get_history("beembot")
+        self.assertEqual(history, [history_item(i, "transfer" if i % 2 else "vote") for i in range(10)])
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", order=-1)], list(range(9, -1, -1)))
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", only_ops=["transfer"])], [1, 3, 5, 7, 9])
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", exclude_ops=["transfer"])], [0, 2, 4, 6, 8])
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", start_index=2, stop_index=4)], [2, 3, 4])
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", start_block=105)], [5, 6, 7, 8, 9])
+        self.assertEqual([h[0] for h in self.store.get_history("beembot", stop_time="2020-01-01T00:00:01")], [0, 1])